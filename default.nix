@@ -49,6 +49,7 @@ let
 
   extra_pkgs = with pkgs; [
     # Define other Nix packages for your project here
+    python3Packages.numpy # cache model (iob_cache_model)
   ];
 
 in
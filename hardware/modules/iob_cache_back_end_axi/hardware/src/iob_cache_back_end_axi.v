@@ -12,29 +12,105 @@ module iob_cache_back_end_axi #(
    `include "iob_cache_back_end_axi_io.vs"
 );
 
+   // read channel, shared with the instruction cache if HARVARD=1
+   wire                                          rd_replace_valid;
+   wire                                          rd_replace;
+   wire [FE_ADDR_W-(BE_NBYTES_W+LINE2BE_W)-1:0] rd_replace_addr;
+   wire [                         LINE2BE_W-1:0] rd_replace_word;
+   wire                                          rd_valid;
+   wire                                          rd_last;
+
+   generate
+      if (HARVARD) begin : g_harvard
+         iob_cache_read_arb #(
+            .LINE_W   (FE_ADDR_W - (BE_NBYTES_W + LINE2BE_W)),
+            .LINE2BE_W(LINE2BE_W),
+            .PRIO     (ARB_PRIO)
+         ) read_arb (
+            .clk_i (clk_i),
+            .arst_i(arst_i),
+
+            .replace0_valid_i(replace_valid_i),
+            .replace0_ready_o(replace_ready_o),
+            .replace0_o      (replace_o),
+            .replace0_addr_i (replace_addr_i),
+            .replace0_word_i (replace_word_i),
+            .read0_valid_o   (read_valid_o),
+            .read0_last_o    (read_last_o),
+
+            .replace1_valid_i(replace1_valid_i),
+            .replace1_ready_o(replace1_ready_o),
+            .replace1_o      (replace1_o),
+            .replace1_addr_i (replace1_addr_i),
+            .replace1_word_i (replace1_word_i),
+            .read1_valid_o   (read1_valid_o),
+            .read1_last_o    (read1_last_o),
+
+            .replace_valid_o(rd_replace_valid),
+            .replace_i      (rd_replace),
+            .replace_addr_o (rd_replace_addr),
+            .replace_word_o (rd_replace_word),
+            .read_valid_i   (rd_valid),
+            .read_last_i    (rd_last)
+         );
+      end else begin : g_no_harvard
+         assign rd_replace_valid = replace_valid_i;
+         assign rd_replace_addr  = replace_addr_i;
+         assign rd_replace_word  = replace_word_i;
+         assign replace_ready_o  = 1'b1;
+         assign replace_o        = rd_replace;
+         assign read_valid_o     = rd_valid;
+         assign read_last_o      = rd_last;
+
+         assign replace1_ready_o = 1'b0;
+         assign replace1_o       = 1'b0;
+         assign read1_valid_o    = 1'b0;
+         assign read1_last_o     = 1'b0;
+      end
+   endgenerate
+
+   wire ar_valid;
+   wire ar_wait;  // read burst waits for the posted writes to the same line
+   reg  ar_hold;  // read burst already presented (AR valid is not withdrawn)
+   wire ar_go = ~ar_wait | ar_hold;
+
+   assign axi_arvalid_o = ar_valid & ar_go;
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) ar_hold <= 1'b0;
+      else ar_hold <= axi_arvalid_o & ~axi_arready_i;
+   end
+
    iob_cache_read_channel_axi #(
-      .ADDR_W       (FE_ADDR_W),
-      .DATA_W       (FE_DATA_W),
-      .BE_ADDR_W    (AXI_ADDR_W),
-      .BE_DATA_W    (AXI_DATA_W),
-      .WORD_OFFSET_W(WORD_OFFSET_W),
-      .AXI_ADDR_W   (AXI_ADDR_W),
-      .AXI_DATA_W   (AXI_DATA_W),
-      .AXI_ID_W     (AXI_ID_W),
-      .AXI_LEN_W    (AXI_LEN_W),
-      .AXI_ID       (AXI_ID)
+      .ADDR_W         (FE_ADDR_W),
+      .DATA_W         (FE_DATA_W),
+      .BE_ADDR_W      (AXI_ADDR_W),
+      .BE_DATA_W      (AXI_DATA_W),
+      .WORD_OFFSET_W  (WORD_OFFSET_W),
+      .CRIT_WORD_FIRST(CRIT_WORD_FIRST),
+      .RD_TXN_W       (RD_TXN_W),
+      .RD_ID_W        (RD_ID_W),
+      .AXI_ADDR_W     (AXI_ADDR_W),
+      .AXI_DATA_W     (AXI_DATA_W),
+      .AXI_ID_W       (AXI_ID_W),
+      .AXI_LEN_W      (AXI_LEN_W),
+      .AXI_ID         (AXI_ID)
    ) read_fsm (
-      .replace_valid_i(replace_valid_i),
-      .replace_addr_i (replace_addr_i),
-      .replace_o      (replace_o),
-      .read_valid_o   (read_valid_o),
+      .replace_valid_i(rd_replace_valid),
+      .replace_addr_i (rd_replace_addr),
+      .replace_word_i (rd_replace_word),
+      .replace_id_i   (replace_id_i),
+      .replace_o      (rd_replace),
+      .read_valid_o   (rd_valid),
       .read_addr_o    (read_addr_o),
       .read_rdata_o   (read_rdata_o),
+      .read_id_o      (read_id_o),
+      .read_last_o    (rd_last),
 
       .axi_araddr_o (axi_araddr_o),
       .axi_arprot_o  (),
-      .axi_arvalid_o(axi_arvalid_o),
-      .axi_arready_i(axi_arready_i),
+      .axi_arvalid_o(ar_valid),
+      .axi_arready_i(axi_arready_i & ar_go),
       .axi_rdata_i  (axi_rdata_i),
       .axi_rresp_i  (axi_rresp_i),
       .axi_rvalid_i (axi_rvalid_i),
@@ -59,7 +135,9 @@ module iob_cache_back_end_axi #(
       .BE_ADDR_W    (AXI_ADDR_W),
       .BE_DATA_W    (AXI_DATA_W),
       .WRITE_POL    (WRITE_POL),
+      .WTBUF_COMB_W (WTBUF_COMB_W),
       .WORD_OFFSET_W(WORD_OFFSET_W),
+      .WR_TXN_W     (WR_TXN_W),
       .AXI_ADDR_W   (AXI_ADDR_W),
       .AXI_DATA_W   (AXI_DATA_W),
       .AXI_ID_W     (AXI_ID_W),
@@ -71,6 +149,10 @@ module iob_cache_back_end_axi #(
       .wstrb_i(write_wstrb_i),
       .wdata_i(write_wdata_i),
       .ready_o(write_ready_o),
+      .idle_o (write_idle_o),
+
+      .ar_addr_i(axi_araddr_o),
+      .ar_wait_o(ar_wait),
 
       .axi_awaddr_o (axi_awaddr_o),
       .axi_awprot_o (),
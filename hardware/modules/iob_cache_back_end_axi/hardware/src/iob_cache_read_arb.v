@@ -0,0 +1,73 @@
+// SPDX-FileCopyrightText: 2026 IObundle
+//
+// SPDX-License-Identifier: CERN-OHL-S-2.0
+
+`timescale 1ns / 1ps
+
+// Shares the back-end read channel between two blocking caches: the data
+// cache on port 0 and the instruction cache on port 1. A cache only requests
+// a line refill while it is ready (replace_ready_o), so that the request is
+// accepted in the same clock cycle: the read channel is idle and the other
+// cache, if it has priority (PRIO), is not requesting. The read channel then
+// stays with that cache until the refill ends.
+module iob_cache_read_arb #(
+   parameter LINE_W    = 16,  // line address width
+   parameter LINE2BE_W = 1,
+   parameter PRIO      = 0    // port 0 (0) or port 1 (1) first
+) (
+   input clk_i,
+   input arst_i,
+
+   // port 0
+   input                  replace0_valid_i,
+   output                 replace0_ready_o,
+   output                 replace0_o,
+   input  [   LINE_W-1:0] replace0_addr_i,
+   input  [LINE2BE_W-1:0] replace0_word_i,
+   output                 read0_valid_o,
+   output                 read0_last_o,
+
+   // port 1
+   input                  replace1_valid_i,
+   output                 replace1_ready_o,
+   output                 replace1_o,
+   input  [   LINE_W-1:0] replace1_addr_i,
+   input  [LINE2BE_W-1:0] replace1_word_i,
+   output                 read1_valid_o,
+   output                 read1_last_o,
+
+   // read channel
+   output                 replace_valid_o,
+   input                  replace_i,
+   output [   LINE_W-1:0] replace_addr_o,
+   output [LINE2BE_W-1:0] replace_word_o,
+   input                  read_valid_i,
+   input                  read_last_i
+);
+
+   reg  owner;  // port of the refill in progress
+
+   // the port without priority waits while the other one requests
+   assign replace0_ready_o = ~replace_i & ((PRIO == 0) | ~replace1_valid_i);
+   assign replace1_ready_o = ~replace_i & ((PRIO == 1) | ~replace0_valid_i);
+
+   // at most one port requests while the read channel is idle
+   wire sel = replace_i ? owner : replace1_valid_i;
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) owner <= 1'b0;
+      else if (~replace_i & (replace0_valid_i | replace1_valid_i)) owner <= replace1_valid_i;
+   end
+
+   assign replace_valid_o = replace0_valid_i | replace1_valid_i;
+   assign replace_addr_o  = sel ? replace1_addr_i : replace0_addr_i;
+   assign replace_word_o  = sel ? replace1_word_i : replace0_word_i;
+
+   assign replace0_o      = replace_i & ~owner;
+   assign read0_valid_o   = read_valid_i & ~owner;
+   assign read0_last_o    = read_last_i & ~owner;
+   assign replace1_o      = replace_i & owner;
+   assign read1_valid_o   = read_valid_i & owner;
+   assign read1_last_o    = read_last_i & owner;
+
+endmodule
@@ -7,27 +7,34 @@
 `include "iob_cache_axi_conf.vh"
 
 module iob_cache_read_channel_axi #(
-   parameter                ADDR_W        = 1,
-   parameter                DATA_W        = 32,
-   parameter                BE_ADDR_W     = `IOB_CACHE_AXI_BE_ADDR_W,
-   parameter                BE_DATA_W     = `IOB_CACHE_AXI_BE_DATA_W,
-   parameter                WORD_OFFSET_W = `IOB_CACHE_AXI_WORD_OFFSET_W,
-   parameter                AXI_ID_W      = `IOB_CACHE_AXI_AXI_ID_W,
-   parameter [AXI_ID_W-1:0] AXI_ID        = `IOB_CACHE_AXI_AXI_ID,
-   parameter                AXI_LEN_W     = `IOB_CACHE_AXI_AXI_LEN_W,
-   parameter                AXI_ADDR_W    = BE_ADDR_W,
-   parameter                AXI_DATA_W    = BE_DATA_W,
+   parameter                ADDR_W          = 1,
+   parameter                DATA_W          = 32,
+   parameter                BE_ADDR_W       = `IOB_CACHE_AXI_BE_ADDR_W,
+   parameter                BE_DATA_W       = `IOB_CACHE_AXI_BE_DATA_W,
+   parameter                WORD_OFFSET_W   = `IOB_CACHE_AXI_WORD_OFFSET_W,
+   parameter                CRIT_WORD_FIRST = 0,
+   parameter                RD_TXN_W        = 0,
+   parameter                RD_ID_W         = 1,
+   parameter                AXI_ID_W        = `IOB_CACHE_AXI_AXI_ID_W,
+   parameter [AXI_ID_W-1:0] AXI_ID          = `IOB_CACHE_AXI_AXI_ID,
+   parameter                AXI_LEN_W       = `IOB_CACHE_AXI_AXI_LEN_W,
+   parameter                AXI_ADDR_W      = BE_ADDR_W,
+   parameter                AXI_DATA_W      = BE_DATA_W,
    //derived parameters
-   parameter                BE_NBYTES     = BE_DATA_W / 8,
-   parameter                BE_NBYTES_W   = $clog2(BE_NBYTES),
-   parameter                LINE2BE_W     = WORD_OFFSET_W - $clog2(BE_DATA_W / DATA_W)
+   parameter                BE_NBYTES       = BE_DATA_W / 8,
+   parameter                BE_NBYTES_W     = $clog2(BE_NBYTES),
+   parameter                LINE2BE_W       = WORD_OFFSET_W - $clog2(BE_DATA_W / DATA_W)
 ) (
    input                                           replace_valid_i,
    input      [ADDR_W-(BE_NBYTES_W+LINE2BE_W)-1:0] replace_addr_i,
+   input      [                     LINE2BE_W-1:0] replace_word_i,
+   input      [                       RD_ID_W-1:0] replace_id_i,
    output reg                                      replace_o,
    output                                          read_valid_o,
    output reg [                     LINE2BE_W-1:0] read_addr_o,
    output     [                     BE_DATA_W-1:0] read_rdata_o,
+   output     [                       RD_ID_W-1:0] read_id_o,
+   output                                          read_last_o,
 
    output [AXI_ADDR_W-1:0] axi_araddr_o,
    output [         3-1:0] axi_arprot_o,
@@ -59,7 +66,109 @@ module iob_cache_read_channel_axi #(
 
 
    generate
-      if (LINE2BE_W > 0) begin : g_line2be_w
+      if (RD_TXN_W > 0) begin : g_multi_txn
+         // up to 2**RD_TXN_W line refills are outstanding: the low RD_TXN_W
+         // bits of the AXI ID carry the refill tag, so read data bursts may be
+         // returned in any order and interleaved
+         localparam N_TXN = 2 ** RD_TXN_W;
+         localparam LINE_W = ADDR_W - (BE_NBYTES_W + LINE2BE_W);
+         localparam BEAT_W = (LINE2BE_W > 0) ? LINE2BE_W : 1;
+         localparam WRAP = CRIT_WORD_FIRST && (LINE2BE_W > 0) && (LINE2BE_W <= 4);
+         localparam [AXI_ID_W-1:0] TXN_MASK = N_TXN - 1;
+
+         wire [BEAT_W-1:0] first_word = WRAP ? replace_word_i : {BEAT_W{1'b0}};
+
+         // refills: line and first word, to issue the burst (and issue it
+         // again after a slave error), and next beat
+         reg  [LINE_W-1:0] txn_line  [N_TXN-1:0];
+         reg  [BEAT_W-1:0] txn_word  [N_TXN-1:0];
+         reg  [BEAT_W-1:0] txn_beat  [N_TXN-1:0];
+         reg  [ N_TXN-1:0] txn_error;
+         reg  [ N_TXN-1:0] txn_retry;
+
+         // address channel: a refill waits here for the AR handshake
+         reg                ar_v;
+         reg [RD_TXN_W-1:0] ar_id;
+         reg [RD_TXN_W-1:0] retry_id;
+
+         integer i;
+         always @* begin
+            retry_id = {RD_TXN_W{1'b0}};
+            for (i = N_TXN - 1; i >= 0; i = i - 1) if (txn_retry[i]) retry_id = i;
+         end
+
+         wire [RD_TXN_W-1:0] r_id = axi_rid_i[RD_TXN_W-1:0];
+         wire r_error = txn_error[r_id] | (axi_rresp_i != 2'b00);
+         wire [LINE_W+BEAT_W-1:0] ar_beat_addr = {txn_line[ar_id], txn_word[ar_id]} >> (BEAT_W - LINE2BE_W);
+
+         // Constant AXI signals
+         assign axi_arid_o    = (AXI_ID & ~TXN_MASK) | ar_id;
+         assign axi_arlock_o  = 1'b0;
+         assign axi_arcache_o = 4'b0011;
+         assign axi_arprot_o  = 3'd0;
+         assign axi_arqos_o   = 4'd0;
+
+         // Burst parameters
+         assign axi_arlen_o   = 2**LINE2BE_W - 1'b1;
+         assign axi_arsize_o  = BE_NBYTES_W[3-1:0];
+         assign axi_arburst_o = WRAP ? 2'b10 : ((LINE2BE_W > 0) ? 2'b01 : 2'b00);
+         assign axi_araddr_o  = {BE_ADDR_W{1'b0}} + {ar_beat_addr, {BE_NBYTES_W{1'b0}}};
+
+         // Read Line values
+         assign read_rdata_o  = axi_rdata_i;
+         assign read_valid_o  = axi_rvalid_i;
+         assign read_id_o     = r_id;
+         // bursts with a slave error are issued again
+         assign read_last_o   = axi_rvalid_i & axi_rlast_i & ~r_error;
+
+         always @* begin
+            axi_arvalid_int = ar_v;
+            axi_rready_int  = 1'b1;
+            replace_o       = ar_v | (|txn_retry);
+            read_addr_o     = txn_beat[r_id];
+         end
+
+         always @(posedge clk_i, posedge reset_i) begin
+            if (reset_i) begin
+               ar_v      <= 1'b0;
+               ar_id     <= {RD_TXN_W{1'b0}};
+               txn_error <= {N_TXN{1'b0}};
+               txn_retry <= {N_TXN{1'b0}};
+            end else begin
+               if (ar_v) begin
+                  if (axi_arready_i) ar_v <= 1'b0;
+               end else if (|txn_retry) begin
+                  ar_v                <= 1'b1;
+                  ar_id               <= retry_id;
+                  txn_retry[retry_id] <= 1'b0;
+               end else if (replace_valid_i) begin
+                  ar_v  <= 1'b1;
+                  ar_id <= replace_id_i[RD_TXN_W-1:0];
+               end
+
+               if (ar_v & axi_arready_i) txn_error[ar_id] <= 1'b0;
+               if (axi_rvalid_i) begin
+                  if (axi_rresp_i != 2'b00) txn_error[r_id] <= 1'b1;
+                  if (axi_rlast_i & r_error) txn_retry[r_id] <= 1'b1;
+               end
+            end
+         end
+
+         always @(posedge clk_i) begin
+            if (~replace_o & replace_valid_i) begin
+               txn_line[replace_id_i[RD_TXN_W-1:0]] <= replace_addr_i;
+               txn_word[replace_id_i[RD_TXN_W-1:0]] <= first_word;
+            end
+            if (ar_v & axi_arready_i) txn_beat[ar_id] <= txn_word[ar_id];
+            if (axi_rvalid_i) txn_beat[r_id] <= txn_beat[r_id] + 1'b1;
+         end
+
+      end else if (LINE2BE_W > 0) begin : g_line2be_w
+         // critical-word-first: the burst wraps around the line starting at
+         // the requested word (AXI4 WRAP bursts are limited to 16 beats)
+         localparam WRAP = CRIT_WORD_FIRST && (LINE2BE_W <= 4);
+         wire [LINE2BE_W-1:0] first_word = WRAP ? replace_word_i : {LINE2BE_W{1'b0}};
+
          // Constant AXI signals
          assign axi_arid_o = AXI_ID;
          assign axi_arlock_o = 1'b0;
@@ -70,18 +179,22 @@ module iob_cache_read_channel_axi #(
          // Burst parameters
          assign axi_arlen_o   = 2**LINE2BE_W - 1'b1; // will choose the burst lenght depending on the cache's and slave's data width
          assign axi_arsize_o  = BE_NBYTES_W[3-1:0];         // each word will be the width of the memory for maximum bandwidth
-         assign axi_arburst_o = 2'b01;  // incremental burst
-         assign axi_araddr_o  = {BE_ADDR_W{1'b0}} + {replace_addr_i, {(LINE2BE_W+BE_NBYTES_W){1'b0}}}; // base address for the burst, with width extension
+         assign axi_arburst_o = WRAP ? 2'b10 : 2'b01;  // wrapping or incremental burst
+         assign axi_araddr_o  = {BE_ADDR_W{1'b0}} + {replace_addr_i, first_word, {BE_NBYTES_W{1'b0}}}; // start address for the burst, with width extension
 
          // Read Line values
          assign read_rdata_o = axi_rdata_i;
          assign read_valid_o = axi_rvalid_i;
+         assign read_id_o    = {RD_ID_W{1'b0}};
 
          localparam idle = 2'd0, init_process = 2'd1, load_process = 2'd2, end_process = 2'd3;
 
          reg [1:0] state;
          reg                                 slave_error; // axi slave_error during reply (axi_rresp[1] == 1) - burst can't be interrupted, so a flag needs to be active
 
+         // the burst is requested again after a slave error
+         assign read_last_o  = (state == load_process) & axi_rvalid_i & axi_rlast_i & ~slave_error & (axi_rresp_i == 2'b00);
+
          always @(posedge clk_i, posedge reset_i) begin
             if (reset_i) begin
                state       <= idle;
@@ -93,13 +206,13 @@ module iob_cache_read_channel_axi #(
                case (state)
                   idle: begin
                      slave_error <= 0;
-                     read_addr_o <= 0;
+                     read_addr_o <= first_word;
                      if (replace_valid_i) state <= init_process;
                      else state <= idle;
                   end
                   init_process: begin
                      slave_error <= 0;
-                     read_addr_o <= 0;
+                     read_addr_o <= first_word;
                      if (axi_arready_i) state <= load_process;
                      else state <= init_process;
                   end
@@ -160,11 +273,14 @@ module iob_cache_read_channel_axi #(
          // Read Line values
          assign read_valid_o = axi_rvalid_i;
          assign read_rdata_o = axi_rdata_i;
+         assign read_id_o    = {RD_ID_W{1'b0}};
 
          localparam idle = 2'd0, init_process = 2'd1, load_process = 2'd2, end_process = 2'd3;
 
          reg [1:0] state;
 
+         assign read_last_o  = (state == load_process) & axi_rvalid_i & (axi_rresp_i == 2'b00);
+
          always @(posedge clk_i, posedge reset_i) begin
             if (reset_i) state <= idle;
             else
@@ -13,7 +13,9 @@ module iob_cache_write_channel_axi #(
    parameter                BE_ADDR_W     = `IOB_CACHE_AXI_BE_ADDR_W,
    parameter                BE_DATA_W     = `IOB_CACHE_AXI_BE_DATA_W,
    parameter                WRITE_POL     = `IOB_CACHE_AXI_WRITE_THROUGH,
+   parameter                WTBUF_COMB_W  = 0,
    parameter                WORD_OFFSET_W = `IOB_CACHE_AXI_WORD_OFFSET_W,
+   parameter                WR_TXN_W      = 0,
    parameter                AXI_ID_W      = `IOB_CACHE_AXI_AXI_ID_W,
    parameter [AXI_ID_W-1:0] AXI_ID        = `IOB_CACHE_AXI_AXI_ID,
    parameter                AXI_LEN_W     = `IOB_CACHE_AXI_AXI_LEN_W,
@@ -24,13 +26,19 @@ module iob_cache_write_channel_axi #(
    parameter                FE_NBYTES_W   = $clog2(FE_NBYTES),
    parameter                BE_NBYTES     = BE_DATA_W / 8,
    parameter                BE_NBYTES_W   = $clog2(BE_NBYTES),
-   parameter                LINE2BE_W     = WORD_OFFSET_W - $clog2(BE_DATA_W / FE_DATA_W)
+   parameter                LINE2BE_W     = WORD_OFFSET_W - $clog2(BE_DATA_W / FE_DATA_W),
+   parameter                COMB_W        = (1 - WRITE_POL) * WTBUF_COMB_W
 ) (
-   input                                                                    valid_i,
-   input      [           ADDR_W-1 : FE_NBYTES_W + WRITE_POL*WORD_OFFSET_W] addr_i,
-   input      [DATA_W + WRITE_POL*(DATA_W*(2**WORD_OFFSET_W)-DATA_W)-1 : 0] wdata_i,
-   input      [                                              FE_NBYTES-1:0] wstrb_i,
-   output reg                                                               ready_o,
+   input                                                                valid_i,
+   input      [ADDR_W-1 : FE_NBYTES_W + WRITE_POL*WORD_OFFSET_W + COMB_W] addr_i,
+   input      [     DATA_W*(2**(WRITE_POL*WORD_OFFSET_W + COMB_W))-1 : 0] wdata_i,
+   input      [                           FE_NBYTES*(2**COMB_W)-1 : 0] wstrb_i,
+   output reg                                                           ready_o,
+   output                                                               idle_o,     // all writes completed
+
+   // read bursts wait for the posted writes to the same line
+   input  [AXI_ADDR_W-1:0] ar_addr_i,
+   output                  ar_wait_o,
 
    output [  AXI_ADDR_W-1:0] axi_awaddr_o,
    output [           3-1:0] axi_awprot_o,
@@ -68,82 +76,239 @@ module iob_cache_write_channel_axi #(
    genvar i;
    generate
       if (WRITE_POL == `IOB_CACHE_AXI_WRITE_THROUGH) begin : g_write_through
+         // write-combining window wider than the back-end word: burst of several beats
+         localparam COMB_BEATS_W = (FE_NBYTES_W + COMB_W > BE_NBYTES_W) ? (FE_NBYTES_W + COMB_W - BE_NBYTES_W) : 0;
+
+         // write being sent
+         wire [ADDR_W-1 : FE_NBYTES_W + COMB_W] wr_addr;
+         wire [   DATA_W*(2**COMB_W)-1 : 0] wr_wdata;
+         wire [FE_NBYTES*(2**COMB_W)-1 : 0] wr_wstrb;
+
          // Constant AXI signals
          assign axi_awid_o = AXI_ID;
-         assign axi_awlen_o = {AXI_LEN_W{1'd0}};
 
          assign axi_awsize_o = BE_NBYTES_W[3-1:0];  // verify - Writes data of the size of BE_DATA_W
-         assign axi_awburst_o = 2'd0;
          assign axi_awlock_o = 1'b0;  // 00 - Normal Access
          assign axi_awcache_o = 4'b0011;
          assign axi_awprot_o = 3'd0;
          assign axi_awqos_o = 4'd0;
-         assign axi_wlast_o = axi_wvalid_o;
 
-         // AXI Buffer Output signals
-         assign axi_awaddr_o = {BE_ADDR_W{1'b0}} + {addr_i[ADDR_W-1 : BE_NBYTES_W], {BE_NBYTES_W{1'b0}}};
+         localparam idle = 2'd0, address = 2'd1, write = 2'd2, verif = 2'd3;
 
-         if (BE_DATA_W == DATA_W) begin : g_same_data_w
-            assign axi_wstrb_o = wstrb_i;
-            assign axi_wdata_o = wdata_i;
-         end else begin : g_not_same_data_w
-            wire [BE_NBYTES_W - FE_NBYTES_W -1 :0] word_align = addr_i[FE_NBYTES_W +: (BE_NBYTES_W - FE_NBYTES_W)];
-            assign axi_wstrb_o = wstrb_i << (word_align * FE_NBYTES);
+         reg [1:0] state;
+         wire      last_beat;
 
-            for (i = 0; i < BE_DATA_W / DATA_W; i = i + 1) begin : g_wdata_block
-               assign axi_wdata_o[(i+1)*DATA_W-1:i*DATA_W] = wdata_i;
+         if (COMB_BEATS_W > 0) begin : g_comb_burst
+            reg  [COMB_BEATS_W-1:0] word_counter;
+            reg  [COMB_BEATS_W-1:0] first_word;
+            reg  [COMB_BEATS_W-1:0] last_word;
+            wire [2**COMB_BEATS_W-1:0] word_used;
+            integer w;
+
+            for (i = 0; i < 2 ** COMB_BEATS_W; i = i + 1) begin : g_word_used
+               assign word_used[i] = |wr_wstrb[i*BE_NBYTES+:BE_NBYTES];
+            end
+
+            // the burst spans the words of the window with combined stores
+            always @* begin
+               first_word = {COMB_BEATS_W{1'b0}};
+               last_word  = {COMB_BEATS_W{1'b0}};
+               for (w = 2 ** COMB_BEATS_W - 1; w >= 0; w = w - 1) begin
+                  if (word_used[w]) first_word = w;
+               end
+               for (w = 0; w < 2 ** COMB_BEATS_W; w = w + 1) begin
+                  if (word_used[w]) last_word = w;
+               end
+            end
+
+            // Burst parameters
+            assign axi_awlen_o   = {AXI_LEN_W{1'b0}} + (last_word - first_word);
+            assign axi_awburst_o = 2'b01;  // incremental burst
+            assign axi_awaddr_o  = {BE_ADDR_W{1'b0}} + {wr_addr, first_word, {BE_NBYTES_W{1'b0}}};
+
+            assign axi_wdata_o   = wr_wdata >> (word_counter * BE_DATA_W);
+            assign axi_wstrb_o   = wr_wstrb >> (word_counter * BE_NBYTES);
+            assign axi_wlast_o   = (word_counter == last_word);
+            assign last_beat     = (word_counter == last_word);
+
+            always @(posedge clk_i, posedge reset_i) begin
+               if (reset_i) word_counter <= 0;
+               else if (state != write) word_counter <= first_word;
+               else if (axi_wready_i) word_counter <= word_counter + 1'b1;
+            end
+         end else begin : g_single_beat
+            assign axi_awlen_o   = {AXI_LEN_W{1'd0}};
+            assign axi_awburst_o = 2'd0;
+            assign axi_wlast_o   = axi_wvalid_o;
+            assign last_beat     = 1'b1;
+
+            // AXI Buffer Output signals
+            assign axi_awaddr_o  = {BE_ADDR_W{1'b0}} + {wr_addr[ADDR_W-1 : BE_NBYTES_W], {BE_NBYTES_W{1'b0}}};
+
+            if (FE_NBYTES_W + COMB_W == BE_NBYTES_W) begin : g_same_data_w
+               assign axi_wstrb_o = wr_wstrb;
+               assign axi_wdata_o = wr_wdata;
+            end else begin : g_not_same_data_w
+               wire [BE_NBYTES_W - (FE_NBYTES_W + COMB_W) -1 :0] word_align = wr_addr[FE_NBYTES_W + COMB_W +: (BE_NBYTES_W - (FE_NBYTES_W + COMB_W))];
+               assign axi_wstrb_o = wr_wstrb << (word_align * FE_NBYTES * (2 ** COMB_W));
+
+               for (i = 0; i < BE_DATA_W / (DATA_W * (2 ** COMB_W)); i = i + 1) begin : g_wdata_block
+                  assign axi_wdata_o[i*DATA_W*(2**COMB_W)+:DATA_W*(2**COMB_W)] = wr_wdata;
+               end
             end
          end
 
-         localparam idle = 2'd0, address = 2'd1, write = 2'd2, verif = 2'd3;
+         if (WR_TXN_W > 0) begin : g_posted
+            // posted writes: each write is retired by its B response, while
+            // the next ones are sent. Up to 2**WR_TXN_W writes are kept in a
+            // queue until then; all writes use the same AXI ID, so the B
+            // responses arrive in order. After a slave error, the writes in
+            // flight are drained and all writes not retired are sent again.
+            localparam N_WR = 2 ** WR_TXN_W;
+            localparam LINE_LSB = FE_NBYTES_W + WORD_OFFSET_W;
+
+            reg  [ADDR_W-1 : FE_NBYTES_W + COMB_W] q_addr [N_WR-1:0];
+            reg  [   DATA_W*(2**COMB_W)-1 : 0] q_wdata[N_WR-1:0];
+            reg  [FE_NBYTES*(2**COMB_W)-1 : 0] q_wstrb[N_WR-1:0];
+            reg  [WR_TXN_W:0] q_wptr, q_sptr, q_bptr;  // write, send and retire pointers
+            reg  [WR_TXN_W:0] drain_ptr;
+            reg               drain;
+            reg               push;  // write accepted in the last clock cycle (buffer read latency)
+            wire [WR_TXN_W:0] q_level = q_wptr - q_bptr;
+            wire              send = (q_sptr != q_wptr) & ~drain;
+            reg               line_busy;
+            integer           k;
+
+            assign wr_addr  = q_addr[q_sptr[WR_TXN_W-1:0]];
+            assign wr_wdata = q_wdata[q_sptr[WR_TXN_W-1:0]];
+            assign wr_wstrb = q_wstrb[q_sptr[WR_TXN_W-1:0]];
+
+            assign idle_o   = (q_wptr == q_bptr) & ~push;
+
+            // queued or accepted writes to the line of the read burst
+            always @* begin
+               line_busy = push & (addr_i[ADDR_W-1:LINE_LSB] == ar_addr_i[ADDR_W-1:LINE_LSB]);
+               for (k = 0; k < N_WR; k = k + 1) begin
+                  if ((k < q_level) & (q_addr[(q_bptr + k) % N_WR][ADDR_W-1:LINE_LSB] == ar_addr_i[ADDR_W-1:LINE_LSB]))
+                     line_busy = 1'b1;
+               end
+            end
+            assign ar_wait_o = line_busy;
 
-         reg [1:0] state;
+            always @(posedge clk_i) begin
+               if (push) begin
+                  q_addr[q_wptr[WR_TXN_W-1:0]]  <= addr_i;
+                  q_wdata[q_wptr[WR_TXN_W-1:0]] <= wdata_i;
+                  q_wstrb[q_wptr[WR_TXN_W-1:0]] <= wstrb_i;
+               end
+            end
 
-         always @(posedge clk_i, posedge reset_i) begin
-            if (reset_i) state <= idle;
-            else
-               case (state)
-                  idle: begin
-                     if (valid_i) state <= address;
-                     else state <= idle;
-                  end
-                  address: begin
-                     if (axi_awready_i) state <= write;
-                     else state <= address;
+            always @(posedge clk_i, posedge reset_i) begin
+               if (reset_i) begin
+                  state     <= idle;
+                  q_wptr    <= {(WR_TXN_W + 1) {1'b0}};
+                  q_sptr    <= {(WR_TXN_W + 1) {1'b0}};
+                  q_bptr    <= {(WR_TXN_W + 1) {1'b0}};
+                  drain_ptr <= {(WR_TXN_W + 1) {1'b0}};
+                  drain     <= 1'b0;
+                  push      <= 1'b0;
+               end else begin
+                  push <= valid_i & ready_o;
+                  if (push) q_wptr <= q_wptr + 1'b1;
+
+                  case (state)
+                     idle: begin
+                        if (send) state <= address;
+                     end
+                     address: begin
+                        if (axi_awready_i) state <= write;
+                     end
+                     default: begin  // write
+                        if (axi_wready_i & last_beat) begin
+                           q_sptr <= q_sptr + 1'b1;
+                           state  <= ((q_sptr + 1'b1 != q_wptr) & ~drain) ? address : idle;
+                        end
+                     end
+                  endcase
+
+                  if (axi_bvalid_i) begin
+                     if (drain) drain_ptr <= drain_ptr + 1'b1;
+                     else if (axi_bresp_i == 2'b00) q_bptr <= q_bptr + 1'b1;
+                     else begin
+                        drain     <= 1'b1;
+                        drain_ptr <= q_bptr + 1'b1;
+                     end
                   end
-                  write: begin
-                     if (axi_wready_i) state <= verif;
-                     else state <= write;
+                  // all writes sent were answered: send again from the oldest one
+                  if (drain & (drain_ptr == q_sptr) & (state == idle)) begin
+                     drain  <= 1'b0;
+                     q_sptr <= q_bptr;
                   end
-                  default: begin // verif - needs to be after the last word has been written, so this can't be optim
-                     if (axi_bvalid_i & (axi_bresp_i == 2'b00) & ~valid_i)
-                        state <= idle;  // no more words to write
-                     else if (axi_bvalid_i & (axi_bresp_i == 2'b00) & valid_i)
-                        state <= address;  // buffer still isn't empty
-                     else if (axi_bvalid_i & ~(axi_bresp_i == 2'b00))  // error
-                        state <= address;  // goes back to transfer the same data.
-                     else state <= verif;
+               end
+            end
+
+            always @* begin
+               ready_o         = ({1'b0, q_level} + push) < N_WR;
+               axi_awvalid_int = (state == address);
+               axi_wvalid_int  = (state == write);
+               axi_bready_int  = 1'b1;
+            end
+         end else begin : g_not_posted
+            assign wr_addr   = addr_i;
+            assign wr_wdata  = wdata_i;
+            assign wr_wstrb  = wstrb_i;
+            assign idle_o    = ready_o;
+            assign ar_wait_o = 1'b0;
+
+            always @(posedge clk_i, posedge reset_i) begin
+               if (reset_i) state <= idle;
+               else
+                  case (state)
+                     idle: begin
+                        if (valid_i) state <= address;
+                        else state <= idle;
+                     end
+                     address: begin
+                        if (axi_awready_i) state <= write;
+                        else state <= address;
+                     end
+                     write: begin
+                        if (axi_wready_i & last_beat) state <= verif;
+                        else state <= write;
+                     end
+                     default: begin // verif - needs to be after the last word has been written, so this can't be optim
+                        if (axi_bvalid_i & (axi_bresp_i == 2'b00) & ~valid_i)
+                           state <= idle;  // no more words to write
+                        else if (axi_bvalid_i & (axi_bresp_i == 2'b00) & valid_i)
+                           state <= address;  // buffer still isn't empty
+                        else if (axi_bvalid_i & ~(axi_bresp_i == 2'b00))  // error
+                           state <= address;  // goes back to transfer the same data.
+                        else state <= verif;
+                     end
+                  endcase
+            end
+
+            always @* begin
+               ready_o         = 1'b0;
+               axi_awvalid_int = 1'b0;
+               axi_wvalid_int  = 1'b0;
+               axi_bready_int  = 1'b0;
+
+               case (state)
+                  idle:    ready_o = 1'b1;
+                  address: axi_awvalid_int = 1'b1;
+                  write:   axi_wvalid_int = 1'b1;
+                  default: begin  // verif
+                     axi_bready_int = 1'b1;
+                     ready_o        = axi_bvalid_i & ~(|axi_bresp_i);
                   end
                endcase
-         end
-
-         always @* begin
-            ready_o         = 1'b0;
-            axi_awvalid_int = 1'b0;
-            axi_wvalid_int  = 1'b0;
-            axi_bready_int  = 1'b0;
-
-            case (state)
-               idle:    ready_o = 1'b1;
-               address: axi_awvalid_int = 1'b1;
-               write:   axi_wvalid_int = 1'b1;
-               default: begin  // verif
-                  axi_bready_int = 1'b1;
-                  ready_o        = axi_bvalid_i & ~(|axi_bresp_i);
-               end
-            endcase
+            end
          end
       end else begin : g_write_back  // if (WRITE_POL == `IOB_CACHE_AXI_WRITE_BACK)
+         assign idle_o    = ready_o;
+         assign ar_wait_o = 1'b0;
+
          if (LINE2BE_W > 0) begin : g_line2be_w
             // Constant AXI signals
             assign axi_awid_o = AXI_ID;
@@ -60,6 +60,54 @@ def setup(py_params: dict):
             "min": "0",
             "max": "1",
         },
+        {
+            "name": "WTBUF_COMB_W",
+            "descr": "Write-through buffer write-combining window (log2 of front-end words). Set to 0 to disable write combining.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "WORD_OFFSET_W",
+        },
+        {
+            "name": "CRIT_WORD_FIRST",
+            "descr": "Critical-word-first line refill (1) or not (0). If enabled, line refills start with the back-end word holding the requested data and wrap around the line.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "WR_TXN_W",
+            "descr": "Posted AXI writes (log2 of the writes in flight). Set to 0 to wait for the B response of each write before the next one. Write-through only.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "4",
+        },
+        {
+            "name": "RD_TXN_W",
+            "descr": "Outstanding AXI read bursts (log2). Set to 0 for one burst at a time. Otherwise, each line refill is issued with its own AXI ID (the low RD_TXN_W bits of the ID carry the refill tag) and read data may be returned out of order or interleaved.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "AXI_ID_W",
+        },
+        {
+            "name": "HARVARD",
+            "descr": "Read channel shared with an instruction cache (1) or not (0). If HARVARD=1, the line refills of the (read-only, blocking) instruction cache on read1_io and of the (blocking) data cache on read_io are arbitrated: a refill request is accepted while the read channel is idle and the read channel stays with that cache until the refill ends.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "ARB_PRIO",
+            "descr": "Read channel arbiter priority (HARVARD=1): refill requests of the data cache first (0) or of the instruction cache first (1).",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "1",
+        },
         {
             "name": "AXI_ID_W",
             "descr": "AXI ID width",
@@ -101,6 +149,13 @@ def setup(py_params: dict):
             "max": "32",
         },
         # Derived parameters
+        {
+            "name": "RD_ID_W",
+            "type": "D",
+            "val": "(RD_TXN_W > 0) ? RD_TXN_W : 1",
+            "min": "1",
+            "max": "32",
+        },
         {
             "name": "FE_NBYTES",
             "type": "D",
@@ -156,14 +211,15 @@ def setup(py_params: dict):
                 {"name": "write_valid_i", "width": 1},
                 {
                     "name": "write_addr_i",
-                    "width": "FE_ADDR_W - (FE_NBYTES_W + WRITE_POL*WORD_OFFSET_W)",
+                    "width": "FE_ADDR_W - (FE_NBYTES_W + WRITE_POL*WORD_OFFSET_W + (1-WRITE_POL)*WTBUF_COMB_W)",
                 },
                 {
                     "name": "write_wdata_i",
-                    "width": "FE_DATA_W + WRITE_POL*(FE_DATA_W*(2**WORD_OFFSET_W)-FE_DATA_W)",
+                    "width": "FE_DATA_W*(2**(WRITE_POL*WORD_OFFSET_W + (1-WRITE_POL)*WTBUF_COMB_W))",
                 },
-                {"name": "write_wstrb_i", "width": "FE_NBYTES"},
+                {"name": "write_wstrb_i", "width": "FE_NBYTES*(2**((1-WRITE_POL)*WTBUF_COMB_W))"},
                 {"name": "write_ready_o", "width": 1},
+                {"name": "write_idle_o", "width": 1},
             ],
         },
         {
@@ -171,14 +227,35 @@ def setup(py_params: dict):
             "descr": "Back-end read channel",
             "signals": [
                 {"name": "replace_valid_i", "width": 1},
+                {"name": "replace_ready_o", "width": 1},
                 {"name": "replace_o", "width": 1},
                 {
                     "name": "replace_addr_i",
                     "width": "FE_ADDR_W-(BE_NBYTES_W+LINE2BE_W)",
                 },
+                {"name": "replace_word_i", "width": "LINE2BE_W"},
+                {"name": "replace_id_i", "width": "RD_ID_W"},
                 {"name": "read_valid_o", "width": 1},
                 {"name": "read_addr_o", "width": "LINE2BE_W"},
                 {"name": "read_rdata_o", "width": "AXI_DATA_W"},
+                {"name": "read_id_o", "width": "RD_ID_W"},
+                {"name": "read_last_o", "width": 1},
+            ],
+        },
+        {
+            "name": "read1_io",
+            "descr": "Back-end read channel of the instruction cache (HARVARD=1). The read address and data are those of read_io.",
+            "signals": [
+                {"name": "replace1_valid_i", "width": 1},
+                {"name": "replace1_ready_o", "width": 1},
+                {"name": "replace1_o", "width": 1},
+                {
+                    "name": "replace1_addr_i",
+                    "width": "FE_ADDR_W-(BE_NBYTES_W+LINE2BE_W)",
+                },
+                {"name": "replace1_word_i", "width": "LINE2BE_W"},
+                {"name": "read1_valid_o", "width": 1},
+                {"name": "read1_last_o", "width": 1},
             ],
         },
         {
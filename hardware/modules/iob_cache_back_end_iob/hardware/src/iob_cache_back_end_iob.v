@@ -5,6 +5,7 @@
 `timescale 1ns / 1ps
 
 `include "iob_cache_back_end_iob_conf.vh"
+`include "iob_cache_iob_conf.vh"
 
 module iob_cache_back_end_iob #(
    `include "iob_cache_back_end_iob_params.vs"
@@ -17,6 +18,18 @@ module iob_cache_back_end_iob #(
    wire be_ack;
    wire be_wack;
    wire be_wack_r;
+   wire write_ready;
+   wire write_pend;
+
+   // line replacements and writes share the IOb port: pending writes are
+   // held while a line is being replaced (a write-back eviction requested
+   // during the replacement starts after it; write-through buffer writes are
+   // requested again, as a refill may follow)
+   assign write_ready_o = write_ready & ~replace_o;
+   // writes are completed when they are acknowledged
+   assign write_idle_o  = write_ready_o;
+   // line refills are requested while the read channel is idle
+   assign replace_ready_o = 1'b1;
 
    assign iob_addr_o  = (be_valid_read) ? be_addr_read : be_addr_write;
    assign iob_valid_o = be_valid_read | be_valid_write;
@@ -36,21 +49,40 @@ module iob_cache_back_end_iob #(
       .data_o(be_wack_r)
    );
 
+   iob_reg_care #(
+      .DATA_W (1),
+      .RST_VAL(0)
+   ) iob_reg_write_pend (
+      .clk_i (clk_i),
+      .arst_i(arst_i),
+      .cke_i (cke_i),
+      .rst_i (1'b0),
+      .en_i  (1'b1),
+      .data_i((WRITE_POL == `IOB_CACHE_IOB_WRITE_BACK) & replace_o & (write_valid_i | write_pend)),
+      .data_o(write_pend)
+   );
+
+   // line refills are not tagged: one refill at a time
+   assign read_id_o = {RD_ID_W{1'b0}};
+
    iob_cache_read_channel_iob #(
-      .FE_ADDR_W    (FE_ADDR_W),
-      .FE_DATA_W    (FE_DATA_W),
-      .BE_ADDR_W    (BE_ADDR_W),
-      .BE_DATA_W    (BE_DATA_W),
-      .WORD_OFFSET_W(WORD_OFFSET_W)
+      .FE_ADDR_W      (FE_ADDR_W),
+      .FE_DATA_W      (FE_DATA_W),
+      .BE_ADDR_W      (BE_ADDR_W),
+      .BE_DATA_W      (BE_DATA_W),
+      .WORD_OFFSET_W  (WORD_OFFSET_W),
+      .CRIT_WORD_FIRST(CRIT_WORD_FIRST)
    ) read_fsm (
       .clk_i          (clk_i),
       .reset_i        (arst_i),
       .replace_valid_i(replace_valid_i),
       .replace_addr_i (replace_addr_i),
+      .replace_word_i (replace_word_i),
       .replace_o      (replace_o),
       .read_valid_o   (read_valid_o),
       .read_addr_o    (read_addr_o),
       .read_rdata_o   (read_rdata_o),
+      .read_last_o    (read_last_o),
       .be_addr_o      (be_addr_read),
       .be_valid_o     (be_valid_read),
       .be_ack_i       (be_ack),
@@ -63,16 +95,17 @@ module iob_cache_back_end_iob #(
       .BE_ADDR_W    (BE_ADDR_W),
       .BE_DATA_W    (BE_DATA_W),
       .WRITE_POL    (WRITE_POL),
+      .WTBUF_COMB_W (WTBUF_COMB_W),
       .WORD_OFFSET_W(WORD_OFFSET_W)
    ) write_fsm (
       .clk_i  (clk_i),
       .reset_i(arst_i),
 
-      .valid_i(write_valid_i),
+      .valid_i((write_valid_i | write_pend) & ~replace_o),
       .addr_i (write_addr_i),
       .wstrb_i(write_wstrb_i),
       .wdata_i(write_wdata_i),
-      .ready_o(write_ready_o),
+      .ready_o(write_ready),
 
       .be_addr_o (be_addr_write),
       .be_valid_o(be_valid_write),
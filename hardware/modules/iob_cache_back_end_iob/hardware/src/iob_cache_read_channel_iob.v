@@ -7,24 +7,27 @@
 `include "iob_cache_iob_conf.vh"
 
 module iob_cache_read_channel_iob #(
-   parameter FE_ADDR_W     = 1,
-   parameter FE_DATA_W     = 32,
-   parameter BE_ADDR_W     = `IOB_CACHE_IOB_BE_ADDR_W,
-   parameter BE_DATA_W     = `IOB_CACHE_IOB_BE_DATA_W,
-   parameter WORD_OFFSET_W = `IOB_CACHE_IOB_WORD_OFFSET_W,
+   parameter FE_ADDR_W       = 1,
+   parameter FE_DATA_W       = 32,
+   parameter BE_ADDR_W       = `IOB_CACHE_IOB_BE_ADDR_W,
+   parameter BE_DATA_W       = `IOB_CACHE_IOB_BE_DATA_W,
+   parameter WORD_OFFSET_W   = `IOB_CACHE_IOB_WORD_OFFSET_W,
+   parameter CRIT_WORD_FIRST = 0,
    //derived parameters
-   parameter BE_NBYTES     = BE_DATA_W / 8,
-   parameter BE_NBYTES_W   = $clog2(BE_NBYTES),
-   parameter LINE2BE_W     = WORD_OFFSET_W - $clog2(BE_DATA_W / FE_DATA_W)
+   parameter BE_NBYTES       = BE_DATA_W / 8,
+   parameter BE_NBYTES_W     = $clog2(BE_NBYTES),
+   parameter LINE2BE_W       = WORD_OFFSET_W - $clog2(BE_DATA_W / FE_DATA_W)
 ) (
    input                                              clk_i,
    input                                              reset_i,
    input                                              replace_valid_i,
    input      [FE_ADDR_W-(BE_NBYTES_W+LINE2BE_W)-1:0] replace_addr_i,
+   input      [                        LINE2BE_W-1:0] replace_word_i,
    output reg                                         replace_o,
    output reg                                         read_valid_o,
    output reg [                        LINE2BE_W-1:0] read_addr_o,
    output     [                        BE_DATA_W-1:0] read_rdata_o,
+   output                                             read_last_o,
 
    // Native memory interface
    output     [BE_ADDR_W-1:0] be_addr_o,
@@ -37,8 +40,14 @@ module iob_cache_read_channel_iob #(
       if (LINE2BE_W > 0) begin : g_line2be_w
          reg [LINE2BE_W-1:0] word_counter;
 
+         // critical-word-first: the line words are read in rotated order,
+         // starting at the requested word
+         wire [LINE2BE_W-1:0] first_word = CRIT_WORD_FIRST ? replace_word_i : {LINE2BE_W{1'b0}};
+         wire [LINE2BE_W-1:0] last_word = first_word - 1'b1;
+
          assign be_addr_o = {BE_ADDR_W{1'b0}} + {replace_addr_i, word_counter, {BE_NBYTES_W{1'b0}}};
          assign read_rdata_o = be_rdata_i;
+         assign read_last_o  = read_valid_o & (read_addr_o == last_word);
 
          localparam
            idle             = 2'd0,
@@ -61,7 +70,7 @@ module iob_cache_read_channel_iob #(
                   end
                   handshake: begin
                      if (be_ack_i)
-                        if (read_addr_o == {LINE2BE_W{1'b1}}) begin
+                        if (read_addr_o == last_word) begin
                            state <= end_handshake;
                         end else begin
                            state <= handshake;
@@ -81,7 +90,7 @@ module iob_cache_read_channel_iob #(
          always @* begin
             be_valid_o   = 1'b0;
             replace_o    = 1'b1;
-            word_counter = 0;
+            word_counter = first_word;
             read_valid_o = 1'b0;
 
             case (state)
@@ -89,7 +98,7 @@ module iob_cache_read_channel_iob #(
                   replace_o = 1'b0;
                end
                handshake: begin
-                  be_valid_o   = ~be_ack_i | ~(&read_addr_o);
+                  be_valid_o   = ~be_ack_i | (read_addr_o != last_word);
                   if (be_ack_i) begin
                       word_counter = read_addr_o + 1;
                   end else begin
@@ -103,6 +112,7 @@ module iob_cache_read_channel_iob #(
       end else begin : g_no_line2be_w
          assign be_addr_o    = {BE_ADDR_W{1'b0}} + {replace_addr_i, {BE_NBYTES_W{1'b0}}};
          assign read_rdata_o = be_rdata_i;
+         assign read_last_o  = read_valid_o;
 
          localparam
            idle             = 2'd0,
@@ -13,21 +13,23 @@ module iob_cache_write_channel_iob #(
    parameter BE_ADDR_W     = `IOB_CACHE_IOB_BE_ADDR_W,
    parameter BE_DATA_W     = `IOB_CACHE_IOB_BE_DATA_W,
    parameter WRITE_POL     = `IOB_CACHE_IOB_WRITE_THROUGH,
+   parameter WTBUF_COMB_W  = 0,
    parameter WORD_OFFSET_W = `IOB_CACHE_IOB_WORD_OFFSET_W,
    //derived parameters
    parameter FE_NBYTES     = FE_DATA_W / 8,
    parameter FE_NBYTES_W   = $clog2(FE_NBYTES),
    parameter BE_NBYTES     = BE_DATA_W / 8,
    parameter BE_NBYTES_W   = $clog2(BE_NBYTES),
-   parameter LINE2BE_W     = WORD_OFFSET_W - $clog2(BE_DATA_W / FE_DATA_W)
+   parameter LINE2BE_W     = WORD_OFFSET_W - $clog2(BE_DATA_W / FE_DATA_W),
+   parameter COMB_W        = (1 - WRITE_POL) * WTBUF_COMB_W
 ) (
    input clk_i,
    input reset_i,
 
    input valid_i,
-   input [ADDR_W-1 : FE_NBYTES_W + WRITE_POL*WORD_OFFSET_W] addr_i,
-   input [FE_NBYTES-1:0] wstrb_i,
-   input [DATA_W + WRITE_POL*(DATA_W*(2**WORD_OFFSET_W)-DATA_W)-1:0] wdata_i, // try [DATA_W*((2**WORD_OFFSET_W)**WRITE_POL)-1:0] (f(x)=a*b^x)
+   input [ADDR_W-1 : FE_NBYTES_W + WRITE_POL*WORD_OFFSET_W + COMB_W] addr_i,
+   input [FE_NBYTES*(2**COMB_W)-1:0] wstrb_i,
+   input [DATA_W*(2**(WRITE_POL*WORD_OFFSET_W + COMB_W))-1:0] wdata_i,
    output reg ready_o,
 
    // Native Memory interface
@@ -42,37 +44,90 @@ module iob_cache_write_channel_iob #(
 
    generate
       if (WRITE_POL == `IOB_CACHE_IOB_WRITE_THROUGH) begin : g_write_through
-         assign be_addr_o = {BE_ADDR_W{1'b0}} + {addr_i[ADDR_W-1 : BE_NBYTES_W], {BE_NBYTES_W{1'b0}}};
+         // write-combining window wider than the back-end word: one write per beat
+         localparam COMB_BEATS_W = (FE_NBYTES_W + COMB_W > BE_NBYTES_W) ? (FE_NBYTES_W + COMB_W - BE_NBYTES_W) : 0;
 
          localparam idle = 1'd0, write = 1'd1;
 
          reg [0:0] state;
-         if (BE_DATA_W == DATA_W) begin : g_same_data_w
-            assign be_wdata_o = wdata_i;
+         wire      last_write;  // the write being acknowledged is the last one of the entry
 
-            always @* begin
-               be_wstrb_o = 0;
+         if (COMB_BEATS_W > 0) begin : g_comb_burst
+            localparam NBEATS = 2 ** COMB_BEATS_W;
 
-               case (state)
-                  write:   be_wstrb_o = wstrb_i;
-                  default: ;
-               endcase
+            reg  [      NBEATS-1:0] beat_done;
+            reg  [COMB_BEATS_W-1:0] beat_reg;  // beat being written
+            reg  [COMB_BEATS_W-1:0] beat;
+            wire [      NBEATS-1:0] beat_pending;
+            wire [      NBEATS-1:0] beat_acked = {{(NBEATS-1){1'b0}}, be_ack_i} << beat_reg;
+
+            // beats without combined stores are skipped
+            for (i = 0; i < NBEATS; i = i + 1) begin : g_beat_pending
+               assign beat_pending[i] = (|wstrb_i[i*BE_NBYTES+:BE_NBYTES]) & ~beat_done[i] & ~beat_acked[i];
             end
-         end else begin : g_not_same_data_w
-            wire [BE_NBYTES_W-FE_NBYTES_W -1 :0] word_align = addr_i[FE_NBYTES_W +: (BE_NBYTES_W - FE_NBYTES_W)];
 
-            for (i = 0; i < BE_DATA_W / DATA_W; i = i + 1) begin : g_wdata_block
-               assign be_wdata_o[(i+1)*DATA_W-1:i*DATA_W] = wdata_i;
+            integer b;
+            always @* begin
+               beat = {COMB_BEATS_W{1'b0}};
+               for (b = NBEATS - 1; b >= 0; b = b - 1) begin
+                  if (beat_pending[b]) beat = b;
+               end
             end
 
+            always @(posedge clk_i, posedge reset_i) begin
+               if (reset_i) begin
+                  beat_done <= {NBEATS{1'b0}};
+                  beat_reg  <= {COMB_BEATS_W{1'b0}};
+               end else begin
+                  beat_reg <= beat;
+                  if (ready_o) beat_done <= {NBEATS{1'b0}};  // next entry
+                  else beat_done <= beat_done | beat_acked;
+               end
+            end
+
+            assign be_addr_o  = {BE_ADDR_W{1'b0}} + {addr_i, beat, {BE_NBYTES_W{1'b0}}};
+            assign be_wdata_o = wdata_i >> (beat * BE_DATA_W);
+            assign last_write = be_ack_i & ~(|beat_pending);
+
             always @* begin
                be_wstrb_o = 0;
 
                case (state)
-                  write:   be_wstrb_o = wstrb_i << word_align * FE_NBYTES;
+                  write:   be_wstrb_o = wstrb_i >> (beat * BE_NBYTES);
                   default: ;
                endcase
             end
+         end else begin : g_single_beat
+            assign be_addr_o  = {BE_ADDR_W{1'b0}} + {addr_i[ADDR_W-1 : BE_NBYTES_W], {BE_NBYTES_W{1'b0}}};
+            assign last_write = be_ack_i;
+
+            if (FE_NBYTES_W + COMB_W == BE_NBYTES_W) begin : g_same_data_w
+               assign be_wdata_o = wdata_i;
+
+               always @* begin
+                  be_wstrb_o = 0;
+
+                  case (state)
+                     write:   be_wstrb_o = wstrb_i;
+                     default: ;
+                  endcase
+               end
+            end else begin : g_not_same_data_w
+               wire [BE_NBYTES_W-(FE_NBYTES_W+COMB_W)-1:0] word_align = addr_i[FE_NBYTES_W + COMB_W +: (BE_NBYTES_W - (FE_NBYTES_W + COMB_W))];
+
+               for (i = 0; i < BE_DATA_W / (DATA_W * (2 ** COMB_W)); i = i + 1) begin : g_wdata_block
+                  assign be_wdata_o[i*DATA_W*(2**COMB_W)+:DATA_W*(2**COMB_W)] = wdata_i;
+               end
+
+               always @* begin
+                  be_wstrb_o = 0;
+
+                  case (state)
+                     write:   be_wstrb_o = wstrb_i << word_align * FE_NBYTES * (2 ** COMB_W);
+                     default: ;
+                  endcase
+               end
+            end
          end
 
          always @(posedge clk_i, posedge reset_i) begin
@@ -84,8 +139,8 @@ module iob_cache_write_channel_iob #(
                      else state <= idle;
                   end
                   default: begin  // write
-                     if (be_ack_i & ~valid_i) state <= idle;
-                     else if (be_ack_i & valid_i)  // still has data to write
+                     if (last_write & ~valid_i) state <= idle;
+                     else if (last_write & valid_i)  // still has data to write
                         state <= write;
                      else state <= write;
                   end
@@ -99,8 +154,8 @@ module iob_cache_write_channel_iob #(
             case (state)
                idle: ready_o = 1'b1;
                default: begin  // write
-                  be_valid_o = ~be_ack_i;
-                  ready_o    = be_ack_i;
+                  be_valid_o = ~last_write;
+                  ready_o    = last_write;
                end
             endcase
          end
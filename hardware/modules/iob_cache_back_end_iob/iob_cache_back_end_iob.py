@@ -60,7 +60,38 @@ def setup(py_params: dict):
             "min": "0",
             "max": "1",
         },
+        {
+            "name": "WTBUF_COMB_W",
+            "descr": "Write-through buffer write-combining window (log2 of front-end words). Set to 0 to disable write combining.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "WORD_OFFSET_W",
+        },
+        {
+            "name": "CRIT_WORD_FIRST",
+            "descr": "Critical-word-first line refill (1) or not (0). If enabled, line refills start with the back-end word holding the requested data and wrap around the line.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "RD_TXN_W",
+            "descr": "Outstanding line refills (log2). The IOb back-end refills one line at a time.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "0",
+        },
         # Derived parameters
+        {
+            "name": "RD_ID_W",
+            "type": "D",
+            "val": "(RD_TXN_W > 0) ? RD_TXN_W : 1",
+            "min": "1",
+            "max": "32",
+        },
         {
             "name": "FE_NBYTES",
             "type": "D",
@@ -115,14 +146,15 @@ def setup(py_params: dict):
                 {"name": "write_valid_i", "width": 1},
                 {
                     "name": "write_addr_i",
-                    "width": "FE_ADDR_W - (FE_NBYTES_W + WRITE_POL*WORD_OFFSET_W)",
+                    "width": "FE_ADDR_W - (FE_NBYTES_W + WRITE_POL*WORD_OFFSET_W + (1-WRITE_POL)*WTBUF_COMB_W)",
                 },
                 {
                     "name": "write_wdata_i",
-                    "width": "FE_DATA_W + WRITE_POL*(FE_DATA_W*(2**WORD_OFFSET_W)-FE_DATA_W)",
+                    "width": "FE_DATA_W*(2**(WRITE_POL*WORD_OFFSET_W + (1-WRITE_POL)*WTBUF_COMB_W))",
                 },
-                {"name": "write_wstrb_i", "width": "FE_NBYTES"},
+                {"name": "write_wstrb_i", "width": "FE_NBYTES*(2**((1-WRITE_POL)*WTBUF_COMB_W))"},
                 {"name": "write_ready_o", "width": 1},
+                {"name": "write_idle_o", "width": 1},
             ],
         },
         {
@@ -130,14 +162,19 @@ def setup(py_params: dict):
             "descr": "Back-end read channel",
             "signals": [
                 {"name": "replace_valid_i", "width": 1},
+                {"name": "replace_ready_o", "width": 1},
                 {"name": "replace_o", "width": 1},
                 {
                     "name": "replace_addr_i",
                     "width": "FE_ADDR_W-(BE_NBYTES_W+LINE2BE_W)",
                 },
+                {"name": "replace_word_i", "width": "LINE2BE_W"},
+                {"name": "replace_id_i", "width": "RD_ID_W"},
                 {"name": "read_valid_o", "width": 1},
                 {"name": "read_addr_o", "width": "LINE2BE_W"},
                 {"name": "read_rdata_o", "width": "BE_DATA_W"},
+                {"name": "read_id_o", "width": "RD_ID_W"},
+                {"name": "read_last_o", "width": 1},
             ],
         },
         {
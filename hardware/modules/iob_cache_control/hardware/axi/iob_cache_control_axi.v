@@ -33,11 +33,79 @@ module iob_cache_control #(
    // ignore address LSBs
    assign addr_int = {addr_i[`IOB_CACHE_AXI_CSRS_ADDR_W-1:BYTE_SHIFT], {BYTE_SHIFT{1'b0}}} + byte_offset;
 
+   // prefetcher enable
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) prefetch_en_o <= 1'b1;
+      else if (valid_i & (|wstrb_i) & (addr_int == `IOB_CACHE_AXI_CSRS_PF_EN_ADDR))
+         prefetch_en_o <= wdata_i[byte_offset*8];
+   end
+
+   // way lockdown mask
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) way_lock_o <= {DATA_W{1'b0}};
+      else if (valid_i & (|wstrb_i) & (addr_int == `IOB_CACHE_AXI_CSRS_LOCK_MASK_ADDR))
+         way_lock_o <= wdata_i;
+   end
+
+   // scratchpad window: base address and number of ways
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         spm_base_o <= {DATA_W{1'b0}};
+         spm_ways_o <= 8'd0;
+      end else if (valid_i & (|wstrb_i)) begin
+         if (addr_int == `IOB_CACHE_AXI_CSRS_SPM_BASE_ADDR) spm_base_o <= wdata_i;
+         if (addr_int == `IOB_CACHE_AXI_CSRS_SPM_WAYS_ADDR) spm_ways_o <= wdata_i[byte_offset*8+:8];
+      end
+   end
+
+   // replacement policy selection (set-dueling after reset)
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) rep_sel_o <= 2'd2;
+      else if (valid_i & (|wstrb_i) & (addr_int == `IOB_CACHE_AXI_CSRS_REP_SEL_ADDR))
+         rep_sel_o <= wdata_i[byte_offset*8+:2];
+   end
+
+   // address-range maintenance: writing the command starts the operation
+   // single-line maintenance: writing the address starts a one-byte range operation
+   wire line_clean = valid_i & (|wstrb_i) & (addr_int == `IOB_CACHE_AXI_CSRS_LINE_CLEAN_ADDR);
+   wire line_inval = valid_i & (|wstrb_i) & (addr_int == `IOB_CACHE_AXI_CSRS_LINE_INVAL_ADDR);
+   wire line_clean_inval = valid_i & (|wstrb_i) & (addr_int == `IOB_CACHE_AXI_CSRS_LINE_CLEAN_INVAL_ADDR);
+   wire line_op = line_clean | line_inval | line_clean_inval;
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         maint_addr_o <= {DATA_W{1'b0}};
+         maint_len_o  <= {DATA_W{1'b0}};
+      end else if (valid_i & (|wstrb_i)) begin
+         if ((addr_int == `IOB_CACHE_AXI_CSRS_MAINT_ADDR_ADDR) | line_op) maint_addr_o <= wdata_i;
+         if (addr_int == `IOB_CACHE_AXI_CSRS_MAINT_LEN_ADDR) maint_len_o <= wdata_i;
+         else if (line_op) maint_len_o <= {{(DATA_W - 1) {1'b0}}, 1'b1};
+      end
+   end
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         maint_start_o <= 1'b0;
+         maint_cmd_o   <= 3'd0;
+      end else begin
+         maint_start_o <= (valid_i & (|wstrb_i) & (addr_int == `IOB_CACHE_AXI_CSRS_MAINT_CMD_ADDR)) | line_op;
+         maint_cmd_o   <= line_op ? {1'b0, line_inval | line_clean_inval, line_clean | line_clean_inval} : wdata_i[byte_offset*8+:3];
+      end
+   end
+
    generate
       if (USE_CTRL_CNT) begin : g_ctrl_cnt
          reg [DATA_W-1:0] read_hit_cnt, read_miss_cnt, write_hit_cnt, write_miss_cnt;
          reg [DATA_W-1:0] hit_cnt, miss_cnt;
+         reg [DATA_W-1:0] pf_useful_cnt, pf_useless_cnt;
+         reg [DATA_W-1:0] cycle_cnt;
+         reg [DATA_W-1:0] stall_miss_cnt, stall_raw_cnt, stall_wtbuf_cnt, stall_flush_cnt;
+         reg [DATA_W-1:0] be_read_beat_cnt, be_write_beat_cnt;
+         reg [DATA_W-1:0] dirty_evict_cnt;
+         reg [DATA_W-1:0] wtbuf_level_sum;
+         wire [DATA_W-1:0] lat_hist_bin;
          reg reset_counters;
+         reg lat_hist_clear;
 
          always @(posedge clk_i, posedge arst_i) begin
             if (arst_i) begin
@@ -75,10 +143,117 @@ module iob_cache_control #(
             end
          end
 
+         // prefetch counters
+         always @(posedge clk_i, posedge arst_i) begin
+            if (arst_i) begin
+               pf_useful_cnt  <= {DATA_W{1'b0}};
+               pf_useless_cnt <= {DATA_W{1'b0}};
+            end else if (reset_counters) begin
+               pf_useful_cnt  <= {DATA_W{1'b0}};
+               pf_useless_cnt <= {DATA_W{1'b0}};
+            end else begin
+               if (pf_useful_i) pf_useful_cnt <= pf_useful_cnt + 1'b1;
+               if (pf_useless_i) pf_useless_cnt <= pf_useless_cnt + 1'b1;
+            end
+         end
+
+         // cycle, stall, back-end and write-through buffer occupancy counters
+         always @(posedge clk_i, posedge arst_i) begin
+            if (arst_i) begin
+               cycle_cnt         <= {DATA_W{1'b0}};
+               stall_miss_cnt    <= {DATA_W{1'b0}};
+               stall_raw_cnt     <= {DATA_W{1'b0}};
+               stall_wtbuf_cnt   <= {DATA_W{1'b0}};
+               stall_flush_cnt   <= {DATA_W{1'b0}};
+               be_read_beat_cnt  <= {DATA_W{1'b0}};
+               be_write_beat_cnt <= {DATA_W{1'b0}};
+               dirty_evict_cnt   <= {DATA_W{1'b0}};
+               wtbuf_level_sum   <= {DATA_W{1'b0}};
+            end else if (reset_counters) begin
+               cycle_cnt         <= {DATA_W{1'b0}};
+               stall_miss_cnt    <= {DATA_W{1'b0}};
+               stall_raw_cnt     <= {DATA_W{1'b0}};
+               stall_wtbuf_cnt   <= {DATA_W{1'b0}};
+               stall_flush_cnt   <= {DATA_W{1'b0}};
+               be_read_beat_cnt  <= {DATA_W{1'b0}};
+               be_write_beat_cnt <= {DATA_W{1'b0}};
+               dirty_evict_cnt   <= {DATA_W{1'b0}};
+               wtbuf_level_sum   <= {DATA_W{1'b0}};
+            end else begin
+               cycle_cnt       <= cycle_cnt + 1'b1;
+               wtbuf_level_sum <= wtbuf_level_sum + wtbuf_level_i;
+               if (stall_miss_i) stall_miss_cnt <= stall_miss_cnt + 1'b1;
+               if (stall_raw_i) stall_raw_cnt <= stall_raw_cnt + 1'b1;
+               if (stall_wtbuf_i) stall_wtbuf_cnt <= stall_wtbuf_cnt + 1'b1;
+               if (stall_flush_i) stall_flush_cnt <= stall_flush_cnt + 1'b1;
+               if (be_read_beat_i) be_read_beat_cnt <= be_read_beat_cnt + 1'b1;
+               if (be_write_beat_i) be_write_beat_cnt <= be_write_beat_cnt + 1'b1;
+               if (dirty_evict_i) dirty_evict_cnt <= dirty_evict_cnt + 1'b1;
+            end
+         end
+
+         // line refill and back-end write latency histograms
+         if (LAT_HIST_BINS > 0) begin : g_lat_hist
+            localparam SEL_W = (LAT_HIST_BINS > 1) ? $clog2(LAT_HIST_BINS) : 1;
+
+            reg  [ SEL_W-1:0] lat_hist_sel;  // bin
+            reg               lat_hist_wsel;  // write (1) or line refill (0) histogram
+            wire [DATA_W-1:0] refill_bin, write_bin;
+
+            always @(posedge clk_i, posedge arst_i) begin
+               if (arst_i) begin
+                  lat_hist_sel  <= {SEL_W{1'b0}};
+                  lat_hist_wsel <= 1'b0;
+               end else if (valid_i & (|wstrb_i) & (addr_int == `IOB_CACHE_AXI_CSRS_LAT_HIST_SEL_ADDR)) begin
+                  lat_hist_sel  <= wdata_i[byte_offset*8+:SEL_W];
+                  lat_hist_wsel <= wdata_i[byte_offset*8+7];
+               end
+            end
+
+            // from the refill request to its last word
+            iob_cache_lat_hist #(
+               .NBINS (LAT_HIST_BINS),
+               .DATA_W(DATA_W),
+               .ID_W  (RD_ID_W)
+            ) refill_lat_hist (
+               .clk_i     (clk_i),
+               .arst_i    (arst_i),
+               .clear_i   (lat_hist_clear),
+               .start_i   (replace_req_i),
+               .start_id_i(replace_id_i),
+               .stop_i    (read_last_i),
+               .stop_id_i (read_id_i),
+               .sel_i     (lat_hist_sel),
+               .bin_o     (refill_bin)
+            );
+
+            // from the write request to the write channel acknowledge
+            iob_cache_lat_hist #(
+               .NBINS (LAT_HIST_BINS),
+               .DATA_W(DATA_W),
+               .ID_W  (1)
+            ) write_lat_hist (
+               .clk_i     (clk_i),
+               .arst_i    (arst_i),
+               .clear_i   (lat_hist_clear),
+               .start_i   (write_req_i),
+               .start_id_i(1'b0),
+               .stop_i    (write_ack_i),
+               .stop_id_i (1'b0),
+               .sel_i     (lat_hist_sel),
+               .bin_o     (write_bin)
+            );
+
+            assign lat_hist_bin = lat_hist_wsel ? write_bin : refill_bin;
+         end else begin : g_no_lat_hist
+            assign lat_hist_bin = {DATA_W{1'b0}};
+         end
+
          always @(posedge clk_i) begin
             rdata_o <= {DATA_W{1'b0}};
             invalidate_o <= 1'b0;
             reset_counters <= 1'b0;
+            lat_hist_clear <= 1'b0;
             ready_o <= valid_i;  // Sends acknowledge the next clock cycle after request (handshake)
 
             if (valid_i) begin
@@ -93,8 +268,28 @@ module iob_cache_control #(
                   else if (addr_i == `IOB_CACHE_AXI_CSRS_READ_MISS_ADDR) rdata_o <= read_miss_cnt;
                   else if (addr_i == `IOB_CACHE_AXI_CSRS_WRITE_HIT_ADDR) rdata_o <= write_hit_cnt;
                   else if (addr_i == `IOB_CACHE_AXI_CSRS_WRITE_MISS_ADDR) rdata_o <= write_miss_cnt;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_PF_EN_ADDR) rdata_o <= prefetch_en_o;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_MAINT_BUSY_ADDR) rdata_o <= maint_busy_i;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_LOCK_MASK_ADDR) rdata_o <= way_lock_o;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_SPM_BASE_ADDR) rdata_o <= spm_base_o;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_SPM_WAYS_ADDR) rdata_o <= spm_ways_o;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_REP_SEL_ADDR) rdata_o <= rep_sel_o;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_REP_PSEL_ADDR) rdata_o <= rep_psel_i;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_PF_USEFUL_ADDR) rdata_o <= pf_useful_cnt;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_PF_USELESS_ADDR) rdata_o <= pf_useless_cnt;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_CYCLE_CNT_ADDR) rdata_o <= cycle_cnt;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_STALL_MISS_ADDR) rdata_o <= stall_miss_cnt;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_STALL_RAW_ADDR) rdata_o <= stall_raw_cnt;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_STALL_WTB_ADDR) rdata_o <= stall_wtbuf_cnt;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_STALL_FLUSH_ADDR) rdata_o <= stall_flush_cnt;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_BE_READ_BEATS_ADDR) rdata_o <= be_read_beat_cnt;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_BE_WRITE_BEATS_ADDR) rdata_o <= be_write_beat_cnt;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_DIRTY_EVICT_ADDR) rdata_o <= dirty_evict_cnt;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_WTB_LEVEL_SUM_ADDR) rdata_o <= wtbuf_level_sum;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_LAT_HIST_BIN_ADDR) rdata_o <= lat_hist_bin;
                end else begin  // write operation
                   if (addr_int == `IOB_CACHE_AXI_CSRS_RST_CNTRS_ADDR) reset_counters <= 1'b1;
+                  else if (addr_int == `IOB_CACHE_AXI_CSRS_LAT_HIST_CLR_ADDR) lat_hist_clear <= 1'b1;
                   else if (addr_int == `IOB_CACHE_AXI_CSRS_INVALIDATE_ADDR) invalidate_o <= 1'b1;
                end
             end
@@ -110,6 +305,13 @@ module iob_cache_control #(
                   else if (addr_i == `IOB_CACHE_AXI_CSRS_WTB_FULL_ADDR) rdata_o <= wtbuf_full_i;
                   else if (addr_i == `IOB_CACHE_AXI_CSRS_VERSION_ADDR)
                      rdata_o <= `IOB_CACHE_AXI_CSRS_VERSION;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_PF_EN_ADDR) rdata_o <= prefetch_en_o;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_MAINT_BUSY_ADDR) rdata_o <= maint_busy_i;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_LOCK_MASK_ADDR) rdata_o <= way_lock_o;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_SPM_BASE_ADDR) rdata_o <= spm_base_o;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_SPM_WAYS_ADDR) rdata_o <= spm_ways_o;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_REP_SEL_ADDR) rdata_o <= rep_sel_o;
+                  else if (addr_i == `IOB_CACHE_AXI_CSRS_REP_PSEL_ADDR) rdata_o <= rep_psel_i;
                end else begin  // write operation
                   if (addr_int == `IOB_CACHE_AXI_CSRS_INVALIDATE_ADDR) invalidate_o <= 1'b1;
                end
@@ -0,0 +1,78 @@
+// SPDX-FileCopyrightText: 2026 IObundle
+//
+// SPDX-License-Identifier: CERN-OHL-S-2.0
+
+`timescale 1ns / 1ps
+
+// Latency histogram with log2-spaced bins. Measures the clock cycles from a
+// start event to the next stop event with the same ID, one measurement at a
+// time: start events seen while a measurement is in progress are not
+// measured. Bin 0 counts latencies below 2 cycles, bin b counts latencies in
+// [2**b, 2**(b+1)) cycles and the last bin also counts all longer latencies.
+module iob_cache_lat_hist #(
+   parameter NBINS  = 8,
+   parameter DATA_W = 32,
+   parameter ID_W   = 1,
+   parameter SEL_W  = (NBINS > 1) ? $clog2(NBINS) : 1
+) (
+   input clk_i,
+   input arst_i,
+
+   input clear_i,
+
+   // events
+   input            start_i,
+   input [ID_W-1:0] start_id_i,
+   input            stop_i,
+   input [ID_W-1:0] stop_id_i,
+
+   // bin read
+   input  [ SEL_W-1:0] sel_i,
+   output [DATA_W-1:0] bin_o
+);
+
+   reg  [DATA_W-1:0] hist_bins[NBINS-1:0];
+
+   reg              busy;
+   reg  [ID_W-1:0]  id;
+   reg  [NBINS-1:0] lat;  // saturates at the last bin
+   wire             stop = busy & stop_i & (stop_id_i == id);
+
+   // bin of the measured latency: position of its most significant bit
+   reg  [SEL_W-1:0] lat_bin;
+   integer b;
+   always @* begin
+      lat_bin = {SEL_W{1'b0}};
+      for (b = 1; b < NBINS; b = b + 1) if (lat[b]) lat_bin = b;
+   end
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         busy <= 1'b0;
+         id   <= {ID_W{1'b0}};
+         lat  <= {NBINS{1'b0}};
+      end else if ((~busy | stop) & start_i) begin
+         busy <= 1'b1;
+         id   <= start_id_i;
+         lat  <= {{(NBINS - 1) {1'b0}}, 1'b1};
+      end else if (stop) begin
+         busy <= 1'b0;
+      end else if (busy & ~(&lat)) begin
+         lat <= lat + 1'b1;
+      end
+   end
+
+   integer i;
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         for (i = 0; i < NBINS; i = i + 1) hist_bins[i] <= {DATA_W{1'b0}};
+      end else if (clear_i) begin
+         for (i = 0; i < NBINS; i = i + 1) hist_bins[i] <= {DATA_W{1'b0}};
+      end else if (stop) begin
+         hist_bins[lat_bin] <= hist_bins[lat_bin] + 1'b1;
+      end
+   end
+
+   assign bin_o = (sel_i < NBINS) ? hist_bins[sel_i] : {DATA_W{1'b0}};
+
+endmodule
@@ -35,6 +35,30 @@ def setup(py_params: dict):
             "min": "0",
             "max": "1",
         },
+        {
+            "name": "WTBUF_DEPTH_W",
+            "descr": "Write-through buffer depth (log2)",
+            "type": "P",
+            "val": "4",
+            "min": "NA",
+            "max": "NA",
+        },
+        {
+            "name": "RD_ID_W",
+            "descr": "Back-end line refill ID width",
+            "type": "P",
+            "val": "1",
+            "min": "NA",
+            "max": "NA",
+        },
+        {
+            "name": "LAT_HIST_BINS",
+            "descr": "Number of log2-spaced bins of the line refill and back-end write latency histograms (0 for no histograms). Requires USE_CTRL_CNT.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "16",
+        },
     ]
     #
     # Ports
@@ -55,15 +79,43 @@ def setup(py_params: dict):
                 {"name": "valid_i", "width": 1},
                 {"name": "addr_i", "width": f"`IOB_CACHE_{be_if.upper()}_CSRS_ADDR_W"},
                 {"name": "wstrb_i", "width": "DATA_W/8"},
+                {"name": "wdata_i", "width": "DATA_W"},
                 {"name": "wtbuf_full_i", "width": 1},
                 {"name": "wtbuf_empty_i", "width": 1},
                 {"name": "write_hit_i", "width": 1},
                 {"name": "write_miss_i", "width": 1},
                 {"name": "read_hit_i", "width": 1},
                 {"name": "read_miss_i", "width": 1},
+                {"name": "pf_useful_i", "width": 1},
+                {"name": "pf_useless_i", "width": 1},
+                {"name": "stall_miss_i", "width": 1},
+                {"name": "stall_raw_i", "width": 1},
+                {"name": "stall_wtbuf_i", "width": 1},
+                {"name": "stall_flush_i", "width": 1},
+                {"name": "be_read_beat_i", "width": 1},
+                {"name": "be_write_beat_i", "width": 1},
+                {"name": "dirty_evict_i", "width": 1},
+                {"name": "wtbuf_level_i", "width": "WTBUF_DEPTH_W+1"},
+                {"name": "replace_req_i", "width": 1},
+                {"name": "replace_id_i", "width": "RD_ID_W"},
+                {"name": "read_last_i", "width": 1},
+                {"name": "read_id_i", "width": "RD_ID_W"},
+                {"name": "write_req_i", "width": 1},
+                {"name": "write_ack_i", "width": 1},
+                {"name": "maint_busy_i", "width": 1},
+                {"name": "rep_psel_i", "width": 16},
                 {"name": "rdata_o", "width": "DATA_W", "isvar": True},
                 {"name": "ready_o", "width": 1, "isvar": True},
                 {"name": "invalidate_o", "width": 1, "isvar": True},
+                {"name": "prefetch_en_o", "width": 1, "isvar": True},
+                {"name": "maint_start_o", "width": 1, "isvar": True},
+                {"name": "maint_cmd_o", "width": 3, "isvar": True},
+                {"name": "maint_addr_o", "width": "DATA_W", "isvar": True},
+                {"name": "maint_len_o", "width": "DATA_W", "isvar": True},
+                {"name": "way_lock_o", "width": "DATA_W", "isvar": True},
+                {"name": "spm_base_o", "width": "DATA_W", "isvar": True},
+                {"name": "spm_ways_o", "width": 8, "isvar": True},
+                {"name": "rep_sel_o", "width": 2, "isvar": True},
             ],
         },
     ]
@@ -82,10 +134,12 @@ def setup(py_params: dict):
 
     # Copy correct iob_cache_control according to cache backend interface
     # Backend interface type ["axi", "iob"]
-    hw_src = os.path.dirname(os.path.realpath(__file__))
-    hw_src = f"{hw_src}/hardware/{be_if}/iob_cache_control_{be_if}.v"
+    hw_dir = os.path.dirname(os.path.realpath(__file__))
+    hw_src = f"{hw_dir}/hardware/{be_if}/iob_cache_control_{be_if}.v"
     hw_dst = f"{py_params['build_dir']}/hardware/src/"
     Path(hw_dst).mkdir(parents=True, exist_ok=True)
     shutil.copy2(hw_src, f"{hw_dst}/iob_cache_control.v")
+    # Latency histograms, common to both backend interfaces
+    shutil.copy2(f"{hw_dir}/hardware/src/iob_cache_lat_hist.v", hw_dst)
 
     return attributes_dict
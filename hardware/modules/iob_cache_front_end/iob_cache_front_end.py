@@ -4,8 +4,13 @@
 
 
 def setup(py_params: dict):
+    # Scratchpad window (spm_io) and scratchpad request outputs, or not (the
+    # second front-end port of a banked cache)
+    SPM_IO = py_params.get("spm_io", True)
+
     # Create dictionary with attributes of cache
     attributes_dict = {
+        "name": py_params.get("name", "iob_cache_front_end"),
         "generate_hw": True,
     }
     #
@@ -53,6 +58,22 @@ def setup(py_params: dict):
             "min": "0",
             "max": "1",
         },
+        {
+            "name": "SPM",
+            "descr": "Scratchpad window decoding (1) or not (0). The requests to the spm_ways_i way-sized blocks starting at spm_base_i are flagged as scratchpad accesses, with the way they map to.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "SPM_SHIFT",
+            "descr": "Way size (log2 of bytes) of the scratchpad window.",
+            "type": "P",
+            "val": "12",
+            "min": "NA",
+            "max": "NA",
+        },
     ]
     #
     # Ports
@@ -82,11 +103,20 @@ def setup(py_params: dict):
                 {"name": "data_addr_o", "width": "ADDR_W-USE_CTRL-FE_NBYTES_W"},
                 {"name": "data_rdata_i", "width": "DATA_W"},
                 {"name": "data_ack_i", "width": 1},
+                {"name": "data_rvalid_i", "width": 1},
                 {"name": "data_req_reg_o", "width": 1},
                 {"name": "data_addr_reg_o", "width": "ADDR_W-USE_CTRL-FE_NBYTES_W"},
                 {"name": "data_wdata_reg_o", "width": "DATA_W"},
                 {"name": "data_wstrb_reg_o", "width": "DATA_W/8"},
-            ],
+            ]
+            + (
+                [
+                    {"name": "data_spm_reg_o", "width": 1},
+                    {"name": "data_spm_way_reg_o", "width": 8},
+                ]
+                if SPM_IO
+                else []
+            ),
         },
         {
             "name": "ctrl_io",
@@ -94,12 +124,24 @@ def setup(py_params: dict):
             "signals": [
                 {"name": "ctrl_req_o", "width": 1},
                 {"name": "ctrl_addr_o", "width": "ADDR_W_CSRS"},
+                {"name": "ctrl_wdata_o", "width": "DATA_W"},
                 {"name": "ctrl_wstrb_o", "width": "DATA_W/8"},
                 {"name": "ctrl_rdata_i", "width": "DATA_W"},
                 {"name": "ctrl_ack_i", "width": 1},
             ],
         },
     ]
+    if SPM_IO:
+        attributes_dict["ports"].append(
+            {
+                "name": "spm_io",
+                "descr": "Scratchpad window.",
+                "signals": [
+                    {"name": "spm_base_i", "width": "DATA_W"},
+                    {"name": "spm_ways_i", "width": 8},
+                ],
+            }
+        )
     #
     # Wires
     #
@@ -112,41 +154,63 @@ def setup(py_params: dict):
                 {"name": "valid_int", "width": 1},
                 {"name": "ready_int", "width": 1},
                 {"name": "we_r", "width": 1},
+                {"name": "rd_pend", "width": 8},
                 {"name": "data_ready_int", "width": 1, "isvar": True},
+                {"name": "data_accept", "width": 1, "isvar": True},
             ],
         },
     ]
+    if SPM_IO:
+        attributes_dict["wires"][0]["signals"] += [
+            {"name": "spm_win", "width": 1},
+            {"name": "spm_way", "width": 8},
+        ]
     #
     # Combinatorial
     #
     attributes_dict["comb"] = {
         "code": """
-        // data output ports
-        data_addr_o  = valid_int ? iob_addr_i[ADDR_W-USE_CTRL-1:FE_NBYTES_W] : data_addr_reg_o;
-        data_req_o   = valid_int | data_req_reg_o;
+        // data output ports: a new request is looked up when accepted,
+        // otherwise the request waiting for its acknowledge is looked up again
+        data_addr_o  = data_accept ? iob_addr_i[ADDR_W-USE_CTRL-1:FE_NBYTES_W] : data_addr_reg_o;
+        data_req_o   = data_accept | data_req_reg_o;
 
-        iob_rvalid_o = we_r ? 1'b0 : ack;
+        // read data may be returned after the request is acknowledged
+        iob_rvalid_o = data_rvalid_i | (ctrl_ack_i & ~we_r);
         iob_ready_o  = ready_int;
 
         data_ready_int = data_req_reg_o ~^ data_ack_i;
+        data_accept = valid_int & data_ready_int;
 
-        // Register every input
-        data_req_reg_o_nxt = valid_int;
-        data_req_reg_o_en = valid_int | ack;
+        // Register every accepted input
+        data_req_reg_o_nxt = data_accept;
+        data_req_reg_o_en = data_accept | ack;
 
         data_addr_reg_o_nxt = iob_addr_i[ADDR_W-USE_CTRL-1:FE_NBYTES_W];
-        data_addr_reg_o_en = valid_int;
+        data_addr_reg_o_en = data_accept;
 
         data_wdata_reg_o_nxt = iob_wdata_i;
-        data_wdata_reg_o_en = valid_int;
+        data_wdata_reg_o_en = data_accept;
 
         data_wstrb_reg_o_nxt = iob_wstrb_i;
-        data_wstrb_reg_o_en = valid_int;
+        data_wstrb_reg_o_en = data_accept;
 
         we_r_nxt = |iob_wstrb_i;
         we_r_en = iob_valid_i;
+
+        // Outstanding cache memory reads (controller reads must not overtake them)
+        rd_pend_nxt = rd_pend + {7'd0, valid_int & ready_int & ~(|iob_wstrb_i)} - {7'd0, data_rvalid_i};
+        rd_pend_en = 1'b1;
 """
     }
+    if SPM_IO:
+        attributes_dict["comb"]["code"] += """
+        data_spm_reg_o_nxt = spm_win;
+        data_spm_reg_o_en = data_accept;
+
+        data_spm_way_reg_o_nxt = spm_way;
+        data_spm_way_reg_o_en = data_accept;
+"""
     #
     # Snippets
     #
@@ -162,13 +226,14 @@ def setup(py_params: dict):
 
          assign valid_int    = ~iob_addr_i[ADDR_W-1] & iob_valid_i;
 
-         assign ctrl_req_o   = iob_addr_i[ADDR_W-1] & iob_valid_i;
+         assign ctrl_req_o   = iob_addr_i[ADDR_W-1] & iob_valid_i & ~(|rd_pend);
          assign ctrl_addr_o  = iob_addr_i[ADDR_W_CSRS-1:0];
+         assign ctrl_wdata_o = iob_wdata_i;
          assign ctrl_wstrb_o = (ctrl_req_o) ? iob_wstrb_i : {(DATA_W/8){1'b0}};
 
          wire ctrl_ready_int;
          assign ctrl_ready_int = ctrl_req_o ~^ ctrl_ack_i;
-         assign ready_int = ctrl_req_o ? ctrl_ready_int : data_ready_int;
+         assign ready_int = (iob_addr_i[ADDR_W-1] & iob_valid_i) ? (ctrl_ready_int & ~(|rd_pend)) : data_ready_int;
 
       end else begin : g_no_ctrl
          // Front-end output signals
@@ -178,6 +243,7 @@ def setup(py_params: dict):
          // Controller signals unused.
          assign ctrl_req_o   = 1'b0;
          assign ctrl_addr_o  = {ADDR_W_CSRS{1'dx}};
+         assign ctrl_wdata_o = {DATA_W{1'dx}};
          assign ctrl_wstrb_o = {(DATA_W/8){1'b0}};
 
          assign ready_int = data_ready_int;
@@ -186,5 +252,28 @@ def setup(py_params: dict):
 """,
         },
     ]
+    if SPM_IO:
+        attributes_dict["snippets"].append(
+            {
+                "verilog_code": """
+   // scratchpad window: way-sized blocks starting at spm_base_i
+   generate
+      if (SPM) begin : g_spm
+         localparam SPM_TAG_W = ADDR_W - USE_CTRL - SPM_SHIFT;
+
+         // the base address may be narrower than the front-end address
+         wire [ADDR_W+DATA_W-1:0] spm_base_ext = {{ADDR_W{1'b0}}, spm_base_i};
+         wire [SPM_TAG_W-1:0] spm_tag = iob_addr_i[ADDR_W-USE_CTRL-1:SPM_SHIFT] - spm_base_ext[SPM_SHIFT+:SPM_TAG_W];
+
+         assign spm_win = ({{8{1'b0}}, spm_tag} < {{SPM_TAG_W{1'b0}}, spm_ways_i});
+         assign spm_way = spm_tag[0+:((SPM_TAG_W < 8) ? SPM_TAG_W : 8)];
+      end else begin : g_no_spm
+         assign spm_win = 1'b0;
+         assign spm_way = 8'd0;
+      end
+   endgenerate
+""",
+            }
+        )
 
     return attributes_dict
@@ -0,0 +1,6 @@
+# SPDX-FileCopyrightText: 2026 IObundle
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+VFLAGS+=--top-module $(LINT_TOP)
+VFLAGS+=--waiver-output cache_waivers.vlt
@@ -0,0 +1,7 @@
+// SPDX-FileCopyrightText: 2026 IObundle
+//
+// SPDX-License-Identifier: CERN-OHL-S-2.0
+
+`include "iob_uut_conf.vh"
+// FE_ADDR_W (no L1 cache controller)
+`define IOB_CSRS_ADDR_W (`IOB_UUT_FE_ADDR_W)
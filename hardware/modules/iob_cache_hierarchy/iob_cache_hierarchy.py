@@ -0,0 +1,421 @@
+# SPDX-FileCopyrightText: 2026 IObundle
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+
+def setup(py_params: dict):
+    VERSION = "0.7.1"
+
+    #
+    # List of supported python parameters
+    #
+
+    # Cache levels, from the processor side (L1) to the memory side: one dict
+    # per level with the iob_cache python parameters (lowercase keys, e.g.
+    # "nways_w", "write_pol", "be_data_w") and Verilog parameters (uppercase
+    # keys, e.g. "SET_INDEX_W", "WORD_OFFSET_W") of the level.
+    LEVELS = py_params.get(
+        "levels",
+        [
+            {"be_data_w": "32", "SET_INDEX_W": 7, "WORD_OFFSET_W": 3},
+            {"nways_w": 2, "write_pol": 1, "SET_INDEX_W": 9, "WORD_OFFSET_W": 4},
+        ],
+    )
+    # Inclusion policy: "inclusive" (the lines replaced in a level are
+    # back-invalidated in all the levels above it) or "non_inclusive"
+    INCLUSION = py_params.get("inclusion", "non_inclusive")
+    # Front-end (L1) data width
+    FE_DATA_W = int(py_params.get("fe_data_w", 32))
+    # Back-end (last level) interface type
+    BE_IF = py_params.get("be_if", "AXI4")
+    # Name of generated hierarchy's verilog
+    NAME = py_params.get("name", "iob_cache_hierarchy")
+    # Build directory. Usually auto-filled by Py2HWSW.
+    BUILD_DIR = py_params.get("build_dir", "") or f"../{NAME}_V{VERSION}"
+
+    N_LEVELS = len(LEVELS)
+
+    # Check if parameters are valid
+    assert BUILD_DIR, "Build directory is empty"
+    if not 1 <= N_LEVELS <= 4:
+        print("ERROR: a cache hierarchy must have between 1 and 4 levels")
+        exit(1)
+    if INCLUSION not in ["inclusive", "non_inclusive"]:
+        print("ERROR: inclusion must be inclusive or non_inclusive")
+        exit(1)
+    if BE_IF not in ["AXI4", "IOb"]:
+        print("ERROR: backend interface must be either AXI4 or IOb")
+        exit(1)
+    if FE_DATA_W not in [32, 64]:
+        print("ERROR: front-end data width must be 32 or 64")
+        exit(1)
+    for n, level in enumerate(LEVELS, 1):
+        for key in level:
+            if key in ["fe_if", "be_if", "name", "build_dir", "binv_w", "harvard"]:
+                print(f"ERROR: L{n} {key} is set by the cache hierarchy")
+                exit(1)
+            if key in ["FE_ADDR_W", "FE_DATA_W", "BE_ADDR_W", "BE_DATA_W", "BINV_W"]:
+                print(f"ERROR: L{n} {key} is set by the cache hierarchy (use be_data_w)")
+                exit(1)
+        if n > 1 and (level.get("use_ctrl", 0) or level.get("nbanks_w", 0)):
+            print(f"ERROR: L{n}: only L1 may have a cache controller or a second front-end port")
+            exit(1)
+        if n < N_LEVELS and str(level.get("be_data_w", "32")) not in ["32", "64"]:
+            print(f"ERROR: L{n} be_data_w must be 32 or 64 (front-end data width of L{n+1})")
+            exit(1)
+        if INCLUSION == "inclusive" and int(level.get("n_mshr", 0)):
+            print("ERROR: an inclusive hierarchy requires n_mshr=0 in all levels")
+            exit(1)
+        if INCLUSION == "inclusive" and n < N_LEVELS and int(level.get("write_pol", 0)):
+            print(f"ERROR: an inclusive hierarchy requires write_pol=0 in L{n} (only the last level may be write-back)")
+            exit(1)
+        # an intermediate level may not replace a line while forwarding a back-invalidation
+        if (
+            INCLUSION == "inclusive"
+            and 1 < n < N_LEVELS
+            and (int(level.get("n_victim", 0)) or level.get("prefetch", "none") != "none")
+        ):
+            print(f"ERROR: an inclusive hierarchy requires n_victim=0 and prefetch=none in L{n}")
+            exit(1)
+
+    # Data width and line size (log2 of bytes) of each level
+    data_w = [FE_DATA_W] + [int(level.get("be_data_w", "32")) for level in LEVELS]
+    line_bytes_w = [
+        (data_w[n] // 8).bit_length() - 1 + int(level.get("WORD_OFFSET_W", 3))
+        for n, level in enumerate(LEVELS)
+    ]
+    USE_CTRL = int(LEVELS[0].get("use_ctrl", 0))
+    be_if = "axi" if BE_IF == "AXI4" else "iob"
+
+    # Create dictionary with attributes of cache hierarchy
+    attributes_dict = {
+        "name": NAME,
+        "version": VERSION,
+        "build_dir": BUILD_DIR,
+        "generate_hw": True,
+        "description": f"{N_LEVELS}-level {INCLUSION.replace('_', '-')} cache hierarchy, made of iob_cache instances stacked through their IOb back-end interfaces.",
+    }
+    #
+    # Confs
+    #
+    attributes_dict["confs"] = [
+        {
+            "name": "FE_ADDR_W",
+            "descr": "Address width (log2) of all the levels: defines the total memory space accessible via the cache hierarchy.",
+            "type": "P",
+            "val": "24",
+            "min": "1",
+            "max": "64",
+        },
+        {
+            "name": "FE_DATA_W",
+            "descr": "Front-end (L1) data width.",
+            "type": "P",
+            "val": FE_DATA_W,
+            "min": "32",
+            "max": "64",
+        },
+        {
+            "name": "BE_DATA_W",
+            "descr": "Back-end (last level) data width.",
+            "type": "P",
+            "val": data_w[-1],
+            "min": "32",
+            "max": "256",
+        },
+        {
+            "name": "ADDR_W",
+            "descr": "Front-end address width, including the cache controller address bit of L1.",
+            "type": "D",
+            "val": f"{USE_CTRL} + FE_ADDR_W",
+            "min": "NA",
+            "max": "NA",
+        },
+    ]
+    if BE_IF == "AXI4":
+        attributes_dict["confs"] += [
+            {
+                "name": "AXI_ID_W",
+                "descr": "AXI ID width",
+                "type": "P",
+                "val": str(max(1, int(LEVELS[-1].get("rd_txn_w", 0)))),
+                "min": "0",
+                "max": "32",
+            },
+            {
+                "name": "AXI_LEN_W",
+                "descr": "AXI LEN width",
+                "type": "P",
+                "val": "4",
+                "min": "0",
+                "max": "8",
+            },
+            {
+                "name": "AXI_ADDR_W",
+                "descr": "AXI address width",
+                "type": "P",
+                "val": "FE_ADDR_W",
+                "min": "0",
+                "max": "32",
+            },
+            {
+                "name": "AXI_DATA_W",
+                "descr": "AXI data width",
+                "type": "P",
+                "val": "BE_DATA_W",
+                "min": "0",
+                "max": "256",
+            },
+        ]
+    #
+    # Ports
+    #
+    attributes_dict["ports"] = [
+        {
+            "name": "clk_en_rst_s",
+            "descr": "Clock, clock enable and reset",
+            "signals": {
+                "type": "iob_clk",
+            },
+        },
+        {
+            "name": "iob_s",
+            "descr": "Front-end interface (L1)",
+            "signals": {
+                "type": "iob",
+                "prefix": "fe_",
+                "ADDR_W": "ADDR_W",
+                "DATA_W": "FE_DATA_W",
+            },
+        },
+        {
+            "name": "ie_io",
+            "descr": "Cache invalidate and write-trough buffer IO chain of the hierarchy",
+            "signals": [
+                {
+                    "name": "invalidate_i",
+                    "descr": "Invalidates all the levels.",
+                    "width": 1,
+                },
+                {
+                    "name": "invalidate_o",
+                    "descr": "Asserted when the last level is invalidated.",
+                    "width": 1,
+                },
+                {
+                    "name": "wtb_empty_i",
+                    "descr": "Write-through buffers of the next-level cache empty, if there is one. It should be tied high otherwise.",
+                    "width": 1,
+                },
+                {
+                    "name": "wtb_empty_o",
+                    "descr": "Write-through buffers of all the levels empty.",
+                    "width": 1,
+                },
+            ],
+        },
+    ]
+    if BE_IF == "AXI4":
+        attributes_dict["ports"].append(
+            {
+                "name": "axi_m",
+                "descr": "Back-end interface (last level)",
+                "signals": {
+                    "type": "axi",
+                    "ID_W": "AXI_ID_W",
+                    "ADDR_W": "AXI_ADDR_W",
+                    "DATA_W": "AXI_DATA_W",
+                    "LEN_W": "AXI_LEN_W",
+                    "LOCK_W": 1,
+                },
+            }
+        )
+    else:
+        attributes_dict["ports"].append(
+            {
+                "name": "iob_m",
+                "descr": "Back-end interface (last level)",
+                "signals": {
+                    "type": "iob",
+                    "prefix": "be_",
+                    "ADDR_W": "FE_ADDR_W",
+                    "DATA_W": "BE_DATA_W",
+                },
+            }
+        )
+    #
+    # Wires
+    #
+    attributes_dict["wires"] = []
+    # invalidate and write-through buffer chain signals between levels
+    if N_LEVELS > 1:
+        chain_signals = []
+        for n in range(1, N_LEVELS):
+            chain_signals += [
+                {"name": f"l{n}_invalidate", "width": 1},
+                {"name": f"l{n+1}_wtb_empty", "width": 1},
+            ]
+        attributes_dict["wires"].append(
+            {
+                "name": "ie_chain",
+                "descr": "Invalidate and write-through buffer empty chain between levels",
+                "signals": chain_signals,
+            }
+        )
+    for n in range(1, N_LEVELS + 1):
+        attributes_dict["wires"].append(
+            {
+                "name": f"l{n}_ie",
+                "descr": f"L{n} invalidate and write-through buffer IO chain",
+                "signals": [
+                    {"name": "invalidate_i" if n == 1 else f"l{n-1}_invalidate"},
+                    {"name": "invalidate_o" if n == N_LEVELS else f"l{n}_invalidate"},
+                    {"name": "wtb_empty_i" if n == N_LEVELS else f"l{n+1}_wtb_empty"},
+                    {"name": "wtb_empty_o" if n == 1 else f"l{n}_wtb_empty"},
+                ],
+            }
+        )
+    for n in range(1, N_LEVELS):
+        attributes_dict["wires"].append(
+            {
+                "name": f"l{n}_l{n+1}_iob",
+                "descr": f"L{n} back-end to L{n+1} front-end bus",
+                "signals": {
+                    "type": "iob",
+                    "prefix": f"l{n}_be_",
+                    "ADDR_W": "FE_ADDR_W",
+                    "DATA_W": data_w[n],
+                },
+            }
+        )
+    if INCLUSION == "inclusive":
+        for n in range(1, N_LEVELS + 1):
+            attributes_dict["wires"].append(
+                {
+                    "name": f"l{n}_incl",
+                    "descr": f"L{n} inclusion port: evictions and back-invalidation by the lower levels",
+                    "signals": [
+                        {"name": f"l{n}_evict", "width": 1},
+                        {"name": f"l{n}_evict_addr", "width": "FE_ADDR_W"},
+                        {"name": f"l{n}_binv", "width": 1},
+                        {"name": f"l{n}_binv_addr", "width": "FE_ADDR_W"},
+                    ],
+                }
+            )
+    #
+    # Subblocks
+    #
+    attributes_dict["subblocks"] = []
+    for n, level in enumerate(LEVELS, 1):
+        last = n == N_LEVELS
+        level_be_if = BE_IF if last else "IOb"
+        parameters = {
+            "FE_ADDR_W": "FE_ADDR_W",
+            "FE_DATA_W": "FE_DATA_W" if n == 1 else data_w[n - 1],
+            "BE_ADDR_W": "FE_ADDR_W",
+            "BE_DATA_W": "BE_DATA_W" if last else data_w[n],
+        }
+        if level_be_if == "AXI4":
+            parameters.update(
+                {
+                    "AXI_ID_W": "AXI_ID_W",
+                    "AXI_LEN_W": "AXI_LEN_W",
+                    "AXI_ADDR_W": "AXI_ADDR_W",
+                    "AXI_DATA_W": "AXI_DATA_W",
+                }
+            )
+        parameters.update({k: v for k, v in level.items() if k.isupper()})
+        connect = {
+            "clk_en_rst_s": "clk_en_rst_s",
+            "iob_s": "iob_s" if n == 1 else f"l{n-1}_l{n}_iob",
+            "ie_io": f"l{n}_ie",
+            f"{'axi' if level_be_if == 'AXI4' else 'iob'}_m": (
+                f"{be_if}_m" if last else f"l{n}_l{n+1}_iob"
+            ),
+        }
+        if INCLUSION == "inclusive":
+            connect["incl_io"] = f"l{n}_incl"
+        attributes_dict["subblocks"].append(
+            {
+                "core_name": "iob_cache",
+                "instance_name": f"l{n}",
+                "instance_description": f"Level {n} cache",
+                "name": f"{NAME}_l{n}",
+                "fe_if": "IOb",
+                "be_if": level_be_if,
+                # back-invalidated by blocks of the largest lower-level line size
+                "binv_w": (
+                    max(line_bytes_w[n - 1 if last else n :])
+                    if INCLUSION == "inclusive"
+                    else 0
+                ),
+                **{k: v for k, v in level.items() if not k.isupper()},
+                "parameters": parameters,
+                "connect": connect,
+            }
+        )
+    # For simulation
+    attributes_dict["subblocks"].append(
+        {
+            "core_name": "iob_tasks",
+            "instance_name": "iob_tasks_inst",
+            "dest_dir": "hardware/simulation/src",
+            "instantiate": False,
+        }
+    )
+    #
+    # Superblocks
+    #
+    attributes_dict["superblocks"] = [
+        # Simulation wrapper
+        {
+            "core_name": "iob_cache_sim_wrapper",
+            "dest_dir": "hardware/simulation/src",
+            "uut": "iob_cache_hierarchy",
+            # the wrapper's testbench port and IOb memory use the iob_cache conf names
+            "cache_confs": [
+                conf for conf in attributes_dict["confs"] if conf["type"] in ["P", "D"]
+            ]
+            + [
+                {
+                    "name": "DATA_W",
+                    "descr": "Front-end (L1) data width.",
+                    "type": "D",
+                    "val": "FE_DATA_W",
+                    "min": "NA",
+                    "max": "NA",
+                },
+                {
+                    "name": "BE_ADDR_W",
+                    "descr": "Back-end (last level) address width.",
+                    "type": "D",
+                    "val": "FE_ADDR_W",
+                    "min": "NA",
+                    "max": "NA",
+                },
+            ],
+            "fe_if": "iob",
+            "be_if": be_if,
+        },
+    ]
+    #
+    # Snippets
+    #
+    if INCLUSION == "inclusive":
+        verilog_code = f"""
+   // no back-invalidation of the last level
+   assign l{N_LEVELS}_binv      = 1'b0;
+   assign l{N_LEVELS}_binv_addr = {{FE_ADDR_W{{1'b0}}}};
+"""
+        # a blocking level does not replace a line while the level below it
+        # serves one of its requests, so a level never evicts and forwards a
+        # back-invalidation in the same clock cycle
+        for n in range(N_LEVELS - 1, 0, -1):
+            verilog_code += f"""
+   // L{n} back-invalidated by the lines replaced in L{n+1} and the levels below it
+   assign l{n}_binv      = l{n+1}_evict | l{n+1}_binv;
+   assign l{n}_binv_addr = l{n+1}_evict ? l{n+1}_evict_addr : l{n+1}_binv_addr;
+"""
+        attributes_dict["snippets"] = [{"verilog_code": verilog_code}]
+
+    return attributes_dict
@@ -0,0 +1,81 @@
+/*
+ * SPDX-FileCopyrightText: 2026 IObundle
+ *
+ * SPDX-License-Identifier: GPL-3.0-only
+ */
+
+#include "iob_tasks.h"
+
+#include <stdint.h>
+#include <stdio.h>
+
+#define DATA_W (32)
+#define FE_NBYTES_W (2)
+// L1 line and size (bytes) of the default levels: 128 lines of 8 words
+#define L1_LINE (32)
+#define L1_SIZE (128 * L1_LINE)
+// lines mapped to the same L2 set by the default levels: 4 ways of 512 sets
+// of 64 byte lines
+#define L2_SET_STRIDE (512 * 64)
+#define L2_NWAYS (4)
+
+// stores and loads one word per L1 line of a region larger than L1, so that
+// L1 replaces its lines while L2 keeps them
+int span_test(uint32_t nbytes) {
+  uint32_t addr = 0;
+  uint32_t failed = 0;
+  uint32_t rdata = 0;
+
+  for (addr = 0; addr < nbytes; addr += L1_LINE) {
+    iob_write(addr, DATA_W, 0x5A000000 + addr);
+  }
+  for (addr = 0; addr < nbytes; addr += L1_LINE) {
+    rdata = iob_read(addr, DATA_W);
+    if (rdata != 0x5A000000 + addr) {
+      failed++;
+      printf("ERROR at address %x: got 0x%x, expected 0x%x\n", addr, rdata,
+             0x5A000000 + addr);
+    }
+  }
+  return failed;
+}
+
+// stores and loads more lines of the same L2 set than L2 ways, so that L2
+// replaces (writes back and, if inclusive, back-invalidates in L1) its lines
+int conflict_test() {
+  uint32_t i = 0;
+  uint32_t failed = 0;
+  uint32_t rdata = 0;
+  uint32_t n = 2 * L2_NWAYS;
+
+  for (i = 0; i < n; i++) {
+    iob_write(i * L2_SET_STRIDE, DATA_W, 0xC0F10000 + i);
+  }
+  // twice: the second pass loads the lines replaced in the first one
+  for (i = 0; i < 2 * n; i++) {
+    rdata = iob_read((i % n) * L2_SET_STRIDE, DATA_W);
+    if (rdata != 0xC0F10000 + (i % n)) {
+      failed++;
+      printf("ERROR at address %x: got 0x%x, expected 0x%x\n",
+             (i % n) * L2_SET_STRIDE, rdata, 0xC0F10000 + (i % n));
+    }
+  }
+  return failed;
+}
+
+int iob_core_tb() {
+
+  int failed = 0;
+
+  // print welcome message
+  printf("IOB CACHE HIERARCHY testbench\n");
+
+  // print the reset message
+  printf("Reset complete\n");
+
+  failed += span_test(4 * L1_SIZE);
+  failed += conflict_test();
+
+  printf("CACHE HIERARCHY test complete.\n");
+  return failed;
+}
@@ -0,0 +1,45 @@
+// SPDX-FileCopyrightText: 2026 IObundle
+//
+// SPDX-License-Identifier: CERN-OHL-S-2.0
+
+`timescale 1ns / 1ps
+
+/*----------------------------------------------------*/
+/* Dual-port RAM: read-write port A, read-only port B */
+/*----------------------------------------------------*/
+
+// Same read latency as iob_ram_sp on both ports. Port B lets a second lookup
+// read the memory without duplicating it.
+module iob_cache_dp_ram #(
+   parameter DATA_W = 32,
+   parameter ADDR_W = 10
+) (
+   input clk_i,
+
+   // port A
+   input                   en_a_i,
+   input                   we_a_i,
+   input      [ADDR_W-1:0] addr_a_i,
+   input      [DATA_W-1:0] d_a_i,
+   output reg [DATA_W-1:0] d_a_o,
+
+   // port B
+   input                   en_b_i,
+   input      [ADDR_W-1:0] addr_b_i,
+   output reg [DATA_W-1:0] d_b_o
+);
+
+   reg [DATA_W-1:0] ram[(2**ADDR_W)-1:0];
+
+   always @(posedge clk_i) begin
+      if (en_a_i) begin
+         if (we_a_i) ram[addr_a_i] <= d_a_i;
+         d_a_o <= ram[addr_a_i];
+      end
+   end
+
+   always @(posedge clk_i) begin
+      if (en_b_i) d_b_o <= ram[addr_b_i];
+   end
+
+endmodule
@@ -0,0 +1,96 @@
+// SPDX-FileCopyrightText: 2026 IObundle
+//
+// SPDX-License-Identifier: CERN-OHL-S-2.0
+
+`timescale 1ns / 1ps
+
+// Cache maintenance walker. Looks up, one at a time, the lines of an address
+// range (start byte address and length in bytes) in the cache memories, which
+// are taken over from the front-end between two of its requests. The cache
+// memory cleans and/or invalidates the lines that hit and acknowledges each
+// one (done_i), or asks for the lookup to be repeated (retry_i) if the
+// memories were being refilled. Then the front-end request is looked up again
+// and the walker stays busy until the back-end writes have completed.
+module iob_cache_maint #(
+   parameter LINE_W     = 16,  // line address width
+   parameter LINE_SHIFT = 5,   // log2 of the line size in bytes
+   parameter DATA_W     = 32
+) (
+   input clk_i,
+   input arst_i,
+
+   // command
+   input               start_i,
+   input  [DATA_W-1:0] addr_i,
+   input  [DATA_W-1:0] len_i,
+   output              busy_o,
+
+   // front-end
+   input  fe_req_reg_i,  // request waiting for its acknowledge
+   input  fe_ack_i,
+   output hold_o,        // cache memories taken over from the front-end
+
+   // cache memories
+   output              lookup_o,  // look up line_o
+   output              check_o,   // maintenance of line_o
+   output [LINE_W-1:0] line_o,
+   input               done_i,
+   input               retry_i,
+   input               idle_i     // back-end writes completed
+);
+
+   localparam IDLE = 3'd0, WAIT = 3'd1, LOOKUP = 3'd2, CHECK = 3'd3, RELOOKUP = 3'd4, FLUSH = 3'd5;
+
+   reg  [       2:0] state;
+   reg  [LINE_W-1:0] line;
+   reg  [  DATA_W:0] nlines;  // lines left
+
+   // first line of the range (the address may be narrower than the line address)
+   wire [DATA_W+LINE_W-1:0] addr_ext = {{LINE_W{1'b0}}, addr_i};
+
+   // lines touched by the range
+   wire [  DATA_W:0] range_lines = ({{(DATA_W+1-LINE_SHIFT){1'b0}}, addr_i[LINE_SHIFT-1:0]} + len_i + {(LINE_SHIFT){1'b1}}) >> LINE_SHIFT;
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         state  <= IDLE;
+         line   <= {LINE_W{1'b0}};
+         nlines <= {(DATA_W + 1) {1'b0}};
+      end else begin
+         case (state)
+            IDLE: begin
+               if (start_i & (|len_i)) begin
+                  state  <= WAIT;
+                  line   <= addr_ext[LINE_SHIFT+:LINE_W];
+                  nlines <= range_lines;
+               end
+            end
+            WAIT: begin
+               // between two front-end requests
+               if (~fe_req_reg_i | fe_ack_i) state <= LOOKUP;
+            end
+            LOOKUP: state <= CHECK;
+            CHECK: begin
+               if (done_i) begin
+                  line   <= line + 1'b1;
+                  nlines <= nlines - 1'b1;
+                  state  <= (nlines == 1) ? RELOOKUP : LOOKUP;
+               end else if (retry_i) begin
+                  state <= LOOKUP;
+               end
+            end
+            RELOOKUP: state <= FLUSH;
+            default: begin  // FLUSH
+               if (idle_i) state <= IDLE;
+            end
+         endcase
+      end
+   end
+
+   assign busy_o   = (state != IDLE);
+   assign hold_o   = (state == LOOKUP) | (state == CHECK) | (state == RELOOKUP);
+   assign lookup_o = (state == LOOKUP) | (state == CHECK);
+   assign check_o  = (state == CHECK);
+   assign line_o   = line;
+
+endmodule
@@ -16,120 +16,542 @@ module iob_cache_memory #(
    localparam NWAYS = 2 ** NWAYS_W;
    localparam OFFSET_PAD_W = 32 - WORD_OFFSET_W;
    localparam LINE_WSTRB_W = (2 ** WORD_OFFSET_W) * FE_NBYTES;
+   localparam NON_BLOCKING = (N_MSHR > 0) && (WRITE_POL == `IOB_CACHE_MEMORY_WRITE_THROUGH);
+   localparam USE_PREFETCH = (PREFETCH != `IOB_CACHE_MEMORY_PF_NONE) && (N_MSHR == 0) && (WRITE_POL == `IOB_CACHE_MEMORY_WRITE_THROUGH);
+   localparam USE_VICTIM = (N_VICTIM > 0) && !NON_BLOCKING;
+   // write-back without victim buffer: dirty lines are written back from a one-line eviction buffer
+   localparam USE_EVICT_BUF = (WRITE_POL == `IOB_CACHE_MEMORY_WRITE_BACK) && !USE_VICTIM;
+   // cache maintenance by address range (MAINT, blocking operation without victim buffer)
+   localparam USE_MAINT = (MAINT > 0) && !NON_BLOCKING && !USE_VICTIM;
+   // way lockdown (WAY_LOCK)
+   localparam USE_LOCK = (WAY_LOCK > 0) && (NWAYS > 1);
+   // scratchpad mode (SPM, blocking operation)
+   localparam USE_SPM = (SPM > 0) && (NWAYS > 1) && !NON_BLOCKING;
+   // runtime-selectable replacement policy and set-dueling (REP_DUEL)
+   localparam USE_DUEL = (REP_DUEL > 0) && (SET_INDEX_W > 0);
+   // width of the set-dueling policy selector (zero-padded to 16 bits on rep_psel_o)
+   localparam PSEL_W = 10;
+   // second front-end port with a banked data memory (NBANKS_W, blocking operation)
+   localparam USE_BANKS = (NBANKS_W > 0) && !NON_BLOCKING;
+   localparam BANK_W = (NBANKS_W < WORD_OFFSET_W) ? NBANKS_W : WORD_OFFSET_W;
+   // snoop (SNOOP): per-line invalidation with a lookup in the second tag memory read port
+   localparam USE_SNOOP = (SNOOP > 0) && !USE_BANKS;
+   // back-invalidation (BINV_W > 0): sets that may hold a line of a 2**BINV_W-byte block (log2)
+   localparam LINE_BYTES_W = FE_NBYTES_W + WORD_OFFSET_W;
+   localparam BINV_K = (BINV_W <= LINE_BYTES_W) ? 0 : ((BINV_W - LINE_BYTES_W) < SET_INDEX_W) ? (BINV_W - LINE_BYTES_W) : SET_INDEX_W;
+   localparam LINE_DATA_W = (2 ** WORD_OFFSET_W) * FE_DATA_W;
+   // write-through buffer entry: {word address, data, strobes} of a write-combining window
+   localparam WTBUF_ADDR_W = FE_ADDR_W - FE_NBYTES_W - WTBUF_COMB_W;
+   localparam WTBUF_DATA_W = FE_DATA_W * (2 ** WTBUF_COMB_W);
+   localparam WTBUF_NBYTES = FE_NBYTES * (2 ** WTBUF_COMB_W);
 
    wire hit;
 
+   // front-end port 0 request, or port 1 request when it is granted the
+   // lookup (NBANKS_W > 0)
+   wire                  fe_req;
+   wire [    ADDR_W-1:0] fe_addr;
+   wire                  fe_req_reg;
+   wire [ADDR_REG_W-1:0] fe_addr_reg;
+   wire [ FE_DATA_W-1:0] fe_wdata_reg;
+   wire [ FE_NBYTES-1:0] fe_wstrb_reg;
+   wire                  fe_ack;
+   wire                  fe_rvalid;
+   wire [ FE_DATA_W-1:0] fe_rdata;
+
+   // front-end request, or cache maintenance lookup (MAINT)
+   wire                  maint_hold;  // cache memories taken over by the maintenance walker
+   wire                  maint_lookup;  // maintenance line looked up
+   wire                  maint_check;  // maintenance line in the request register stage
+   wire [    ADDR_W-1:0] maint_line;
+   wire                  req_int = maint_lookup | fe_req;
+   wire [    ADDR_W-1:0] addr_int = maint_lookup ? maint_line : fe_addr;
+   wire                  req_reg_int = fe_req_reg & ~maint_hold;
+   wire [ADDR_REG_W-1:0] addr_reg_int = maint_lookup ? {maint_line, {WORD_OFFSET_W{1'b0}}} : fe_addr_reg;
+
    // cache-memory internal signals
    wire [NWAYS-1:0] way_hit, way_select;
 
-   wire [TAG_W-1:0]            tag = addr_reg_i[ADDR_REG_W-1 -: TAG_W]; // so the tag doesnt update during ack on a read-access, losing the current hit status (can take the 1 clock-cycle delay)
-   wire [SET_INDEX_W-1:0]         index = addr_i[ADDR_W-TAG_W-1 -: SET_INDEX_W]; // cant wait, doesnt update during a write-access
-   wire [SET_INDEX_W-1:0]         index_reg = addr_reg_i[ADDR_REG_W-TAG_W-1 -:SET_INDEX_W]; // cant wait, doesnt update during a write-access
-   wire [WORD_OFFSET_W-1:0]    offset = addr_reg_i[0 +: WORD_OFFSET_W]; // so the offset doesnt update during ack on a read-access (can take the 1 clock-cycle delay)
+   // port 1 request looked up in the data memory bank of its word (NBANKS_W > 0)
+   wire                     bank_go;
+   wire [  SET_INDEX_W-1:0] bank_index;
+   wire [WORD_OFFSET_W-1:0] bank_offset;
+   wire                     bank_look;  // looked up in the last clock cycle
+   wire [  NWAYS*TAG_W-1:0] line_tag1;  // second tag memory read port (also read by snoops)
+   // replacement policy update of a port 1 read hit in its bank
+   wire                     rep1_go;
+   wire [        NWAYS-1:0] rep1_way;
+   wire [  SET_INDEX_W-1:0] rep1_index;
+
+   wire [TAG_W-1:0]            tag = addr_reg_int[ADDR_REG_W-1 -: TAG_W]; // so the tag doesnt update during ack on a read-access, losing the current hit status (can take the 1 clock-cycle delay)
+   wire [SET_INDEX_W-1:0]         index = addr_int[ADDR_W-TAG_W-1 -: SET_INDEX_W]; // cant wait, doesnt update during a write-access
+   wire [SET_INDEX_W-1:0]         index_reg = addr_reg_int[ADDR_REG_W-TAG_W-1 -:SET_INDEX_W]; // cant wait, doesnt update during a write-access
+   wire [WORD_OFFSET_W-1:0]    offset = addr_reg_int[0 +: WORD_OFFSET_W]; // so the offset doesnt update during ack on a read-access (can take the 1 clock-cycle delay)
+   wire [ADDR_W-1:0]           line_reg = addr_reg_int[ADDR_REG_W-1 -: ADDR_W]; // line of the current access
+   wire [LINE2BE_W-1:0]        offset_beat = offset >> (WORD_OFFSET_W - LINE2BE_W); // back-end word of the access in the line
    wire [NWAYS*(2**WORD_OFFSET_W)*FE_DATA_W-1:0] line_rdata;
    wire [NWAYS*TAG_W-1:0] line_tag;
    reg [NWAYS*(2**SET_INDEX_W)-1:0] v_reg;
+   wire [NWAYS*(2**SET_INDEX_W)-1:0] v_set_mask, v_clr_mask;
    reg [NWAYS-1:0] v;
 
+   // back-invalidation of the block at binv_addr_i, evicted from an inclusive
+   // lower-level cache: all the ways of the sets that may hold one of its
+   // lines are invalidated, without tag lookup
+   wire [SET_INDEX_W-1:0] binv_index = binv_addr_i[LINE_BYTES_W+:SET_INDEX_W];
+   wire [(2**SET_INDEX_W)-1:0] binv_sets = ((BINV_W > 0) & binv_i) ? ({(2**BINV_K){1'b1}} << ((binv_index >> BINV_K) << BINV_K)) : {(2**SET_INDEX_W){1'b0}};
+   // snoop (SNOOP): snoop_i invalidates only the way holding the line at
+   // snoop_addr_i, found by a tag lookup in the next clock cycle
+   wire [SET_INDEX_W-1:0] snoop_addr_index = snoop_addr_i[LINE_BYTES_W+:SET_INDEX_W];
+   wire [      NWAYS-1:0] snoop_way;
+   wire [SET_INDEX_W-1:0] snoop_index;
+   wire                   snoop_stale;  // the request's line is snooped, but its valid bit not yet cleared
+
    reg [LINE_WSTRB_W-1:0] line_wstrb;
 
-   wire write_access = |wstrb_reg_i & req_reg_i;
-   wire read_access = ~|wstrb_reg_i & req_reg_i;
+   wire req_ok;  // the memories are not busy with a line refill
+   wire write_access = |fe_wstrb_reg & req_reg_int & req_ok;
+   wire read_access = ~|fe_wstrb_reg & req_reg_int & req_ok;
    //signal mantains the access 1 addition clock-cycle after ack is asserted
 
    // back-end write channel
    wire buffer_empty, buffer_full;
-   wire [FE_NBYTES+(FE_ADDR_W-FE_NBYTES_W)+(FE_DATA_W)-1:0] buffer_dout;
+   wire [WTBUF_ADDR_W+WTBUF_DATA_W+WTBUF_NBYTES-1:0] buffer_dout;
+   wire wtbuf_ready;  // a store can be accepted by the write-through buffer
+   wire wtbuf_idle;  // write-through buffer drained and all back-end writes completed
+   wire refill_ok;  // no pending store to the line to refill, back-end write channel idle and read channel ready
 
    // for write-back write-allocate only
    reg  [                                        NWAYS-1:0] dirty;
    reg  [                       NWAYS*(2**SET_INDEX_W)-1:0] dirty_reg;
+   wire                                                     dirty_clr;  // selected way flushed or evicted
+   wire                                                     dirty_copy;  // dirty line copied from the victim buffer
+
+   // line refill and tag/valid memories update
+   wire                   line_fill;  // data-memory written with back-end data
+   wire [      NWAYS-1:0] line_way;  // data-memory ways written
+   wire [SET_INDEX_W-1:0] line_index;  // data-memory set written during line refill
+   wire [     ADDR_W-1:0] fill_line;  // line being refilled
+   wire [      NWAYS-1:0] fill_way;
+   wire [     ADDR_W-1:0] done_line;  // line whose refill completed (non-blocking operation)
+   wire [      NWAYS-1:0] done_way;
+   wire                   tag_we;
+   wire [      NWAYS-1:0] tag_way;
+   wire [SET_INDEX_W-1:0] tag_index;
+   wire [      TAG_W-1:0] tag_din;
+   wire                   v_set;  // validates tag_way in tag_index set
+   wire                   v_clr;  // invalidates way_select in index_reg set
+   wire [  FE_DATA_W-1:0] hit_rdata;
+   wire [  FE_DATA_W-1:0] mem_rdata;  // word read from the data memory
+
+   // non-blocking operation (N_MSHR > 0)
+   wire                   lookup_ok;  // memories outputs belong to the current request
+   wire rd_hit_ack, rd_merge_ack, rd_alloc_ack, wr_ack;
+   wire mshr_match, mshr_match_issued, mshr_set_busy, mshr_full;
+   wire                   rsp_empty;
+   wire                   rsp_full;
+   wire                   rsp_rvalid;
+   wire [  FE_DATA_W-1:0] rsp_rdata;
+   wire                   fill_done;
+   wire                   fill_valid;
+
+   // early restart (CRIT_WORD_FIRST, blocking operation)
+   wire                   fill_ack;  // read served with the word being refilled
+   wire [  FE_DATA_W-1:0] fill_rdata;
+
+   // prefetching (PREFETCH, blocking write-through operation)
+   wire                   rd_miss;  // read miss, memories outputs belong to the current request
+   wire                   demand_req;  // line refill requested on a read miss
+   wire                   refill;  // back-end read channel refilling a cache line
+   wire pf_hit, pf_busy, pf_req;
+   wire                   pf_sel;  // back-end read channel requested or used by a prefetch
+   wire [     ADDR_W-1:0] pf_line;
+   wire                   pf_copy;  // prefetch buffer line copied into the cache
+   wire [LINE_DATA_W-1:0] pf_data;
+   wire                   line_copy;  // data-memory line written with the prefetch or victim buffer line
+   wire [LINE_DATA_W-1:0] line_copy_data;
+   wire                   copy_lookup_ok;
+
+   // victim buffer (N_VICTIM, blocking operation) and eviction buffer (write-back)
+   wire                   evict_ok;  // the line in way_select can be evicted (memories outputs are up to date)
+   wire [     ADDR_W-1:0] evict_line;
+   wire [LINE_DATA_W-1:0] evict_data;
+   wire                   evict_valid;
+   wire                   evict_dirty;
+   wire vb_hit, vb_hit_dirty;
+   wire                   vb_swap;  // line swapped with the victim buffer line
+   wire [LINE_DATA_W-1:0] vb_data;
+   wire                   evict_refill_ok;  // line not in the victim buffer; the evicted line can be stored
+
+   // cache maintenance (MAINT, blocking operation without victim buffer)
+   wire [            2:0] maint_cmd;  // clean (bit 0) and/or invalidate (bit 1), or preload (bit 2)
+   wire                   maint_inval_start;  // invalidating operation started
+   wire                   maint_hit;  // maintenance line in the cache, memories outputs up to date
+   wire                   maint_miss;  // line to preload not in the cache, memories outputs up to date
+
+   // way lockdown (WAY_LOCK): locked ways are not replaced, except by preloads
+   wire [FE_DATA_W+NWAYS-1:0] way_lock_ext = {{NWAYS{1'b0}}, way_lock_i};
+   wire                   maint_wb;  // dirty maintenance line copied to the eviction buffer
+   wire                   maint_done;  // maintenance line cleaned and/or invalidated
+
+   // scratchpad mode (SPM, blocking operation): the first ways hold the scratchpad window
+   wire [      NWAYS-1:0] spm_ways;  // ways taken from the cache
+   wire [      NWAYS-1:0] spm_enter;  // ways entering the scratchpad, invalidated
+   wire                   spm_req;  // scratchpad access, always hits in spm_way
+   wire [      NWAYS-1:0] spm_way;
 
 
    generate
       if (WRITE_POL == `IOB_CACHE_MEMORY_WRITE_THROUGH) begin : g_write_through
-         localparam FIFO_DATA_W = FE_ADDR_W - FE_NBYTES_W + FE_DATA_W + FE_NBYTES;
+         localparam FIFO_DATA_W = WTBUF_ADDR_W + WTBUF_DATA_W + WTBUF_NBYTES;
          localparam FIFO_ADDR_W = WTBUF_DEPTH_W;
 
-         wire                   mem_clk;
+         wire                   buffer_push;
+         wire                   buffer_pop;
+         wire [FIFO_DATA_W-1:0] buffer_din;
+         wire                   comb_empty;
+         wire                   pending_match;
 
-         wire                   mem_w_en;
-         wire [FIFO_ADDR_W-1:0] mem_w_addr;
-         wire [FIFO_DATA_W-1:0] mem_w_data;
+         if (READ_ONLY) begin : g_read_only
+            // no stores (instruction cache): no write-through buffer
+            assign wtbuf_ready   = 1'b1;
+            assign buffer_push   = 1'b0;
+            assign buffer_din    = {FIFO_DATA_W{1'b0}};
+            assign comb_empty    = 1'b1;
+            assign buffer_empty  = 1'b1;
+            assign buffer_full   = 1'b0;
+            assign buffer_dout   = {FIFO_DATA_W{1'b0}};
+            assign wtbuf_level_o = {(WTBUF_DEPTH_W + 1) {1'b0}};
+            assign pending_match = 1'b0;
+         end else begin : g_wtbuf
+            wire                   mem_clk;
 
-         wire                   mem_r_en;
-         wire [FIFO_ADDR_W-1:0] mem_r_addr;
-         wire [FIFO_DATA_W-1:0] mem_r_data;
+            wire                   mem_w_en;
+            wire [FIFO_ADDR_W-1:0] mem_w_addr;
+            wire [FIFO_DATA_W-1:0] mem_w_data;
 
-         // FIFO memory
-         iob_ram_t2p #(
-            .DATA_W(FIFO_DATA_W),
-            .ADDR_W(FIFO_ADDR_W)
-         ) iob_ram_t2p0 (
-             .clk_i(mem_clk),
+            wire                   mem_r_en;
+            wire [FIFO_ADDR_W-1:0] mem_r_addr;
+            wire [FIFO_DATA_W-1:0] mem_r_data;
 
-             .w_en_i  (mem_w_en),
-             .w_addr_i(mem_w_addr),
-             .w_data_i(mem_w_data),
+            // write combining
+            if (WTBUF_COMB_W > 0) begin : g_write_comb
+               iob_cache_write_comb #(
+                  .ADDR_W(FE_ADDR_W - FE_NBYTES_W),
+                  .DATA_W(FE_DATA_W),
+                  .COMB_W(WTBUF_COMB_W)
+               ) write_comb (
+                  .clk_i (clk_i),
+                  .arst_i(arst_i),
 
-             .r_en_i  (mem_r_en),
-             .r_addr_i(mem_r_addr),
-             .r_data_o(mem_r_data)
-         );
+                  .valid_i(write_access & fe_ack & ~spm_req),
+                  .addr_i (fe_addr_reg),
+                  .wdata_i(fe_wdata_reg),
+                  .wstrb_i(fe_wstrb_reg),
+                  .ready_o(wtbuf_ready),
+
+                  .full_i (buffer_full),
+                  .flush_i(buffer_empty),
+                  .push_o (buffer_push),
+                  .entry_o(buffer_din),
+                  .empty_o(comb_empty)
+               );
+            end else begin : g_no_write_comb
+               assign wtbuf_ready = ~buffer_full;
+               assign buffer_push = write_access & fe_ack & ~spm_req;
+               assign buffer_din  = {fe_addr_reg, fe_wdata_reg, fe_wstrb_reg};
+               assign comb_empty  = 1'b1;
+            end
 
-         iob_fifo_sync #(
-            .R_DATA_W(FIFO_DATA_W),
-            .W_DATA_W(FIFO_DATA_W),
-            .ADDR_W  (FIFO_ADDR_W)
-         ) write_throught_buffer (
-             .clk_i (clk_i),
-             .rst_i (1'b0),
-             .arst_i(arst_i),
-             .cke_i (1'b1),
+            // FIFO memory
+            iob_ram_t2p #(
+               .DATA_W(FIFO_DATA_W),
+               .ADDR_W(FIFO_ADDR_W)
+            ) iob_ram_t2p0 (
+                .clk_i(mem_clk),
 
-             .ext_mem_clk_o(mem_clk),
+                .w_en_i  (mem_w_en),
+                .w_addr_i(mem_w_addr),
+                .w_data_i(mem_w_data),
 
-             .ext_mem_w_en_o  (mem_w_en),
-             .ext_mem_w_addr_o(mem_w_addr),
-             .ext_mem_w_data_o(mem_w_data),
+                .r_en_i  (mem_r_en),
+                .r_addr_i(mem_r_addr),
+                .r_data_o(mem_r_data)
+            );
 
-             .ext_mem_r_en_o  (mem_r_en),
-             .ext_mem_r_addr_o(mem_r_addr),
-             .ext_mem_r_data_i(mem_r_data),
+            iob_fifo_sync #(
+               .R_DATA_W(FIFO_DATA_W),
+               .W_DATA_W(FIFO_DATA_W),
+               .ADDR_W  (FIFO_ADDR_W)
+            ) write_throught_buffer (
+                .clk_i (clk_i),
+                .rst_i (1'b0),
+                .arst_i(arst_i),
+                .cke_i (1'b1),
 
-             .level_o(),
+                .ext_mem_clk_o(mem_clk),
 
-             .r_data_o (buffer_dout),
-             .r_empty_o(buffer_empty),
-             .r_en_i   (write_ack_i),
+                .ext_mem_w_en_o  (mem_w_en),
+                .ext_mem_w_addr_o(mem_w_addr),
+                .ext_mem_w_data_o(mem_w_data),
 
-             .w_data_i({addr_reg_i, wdata_reg_i, wstrb_reg_i}),
-             .w_full_o(buffer_full),
-             .w_en_i  (write_access & ack_o)
-         );
+                .ext_mem_r_en_o  (mem_r_en),
+                .ext_mem_r_addr_o(mem_r_addr),
+                .ext_mem_r_data_i(mem_r_data),
+
+                .level_o(wtbuf_level_o),
+
+                .r_data_o (buffer_dout),
+                .r_empty_o(buffer_empty),
+                .r_en_i   (buffer_pop),
+
+                .w_data_i(buffer_din),
+                .w_full_o(buffer_full),
+                .w_en_i  (buffer_push)
+            );
+
+            // line addresses of the pending stores (buffer and write-combining entries)
+            iob_cache_wtbuf_match #(
+               .DEPTH_W(WTBUF_DEPTH_W),
+               .LINE_W (ADDR_W)
+            ) wtbuf_match (
+               .clk_i (clk_i),
+               .arst_i(arst_i),
+
+               .push_i     (buffer_push & ~buffer_full),
+               .push_line_i(buffer_din[FIFO_DATA_W-1-:ADDR_W]),
+               .pop_i      (buffer_pop & ~buffer_empty),
+
+               .line_i (replace_addr_o),
+               .match_o(pending_match)
+            );
+         end
+
+         // a line refill waits for the stores to the same line only; the
+         // back-end write channel is ready and no write starts while it is
+         // requested (posted AXI writes to the line are waited for by the back-end)
+         assign refill_ok = ~pending_match & ~(~comb_empty & (buffer_din[FIFO_DATA_W-1-:ADDR_W] == replace_addr_o)) & write_ack_i & replace_ready_i;
 
          // buffer status
+         assign wtbuf_idle     = buffer_empty & comb_empty & write_idle_i;
          assign wtbuf_full_o   = buffer_full;
-         assign wtbuf_empty_o  = buffer_empty & write_ack_i & ~write_req_o;
+         assign wtbuf_empty_o  = wtbuf_idle & ~write_req_o;
 
          // back-end write channel
-         assign write_req_o    = ~buffer_empty;
-         assign write_addr_o   = buffer_dout[FE_NBYTES+FE_DATA_W+:FE_ADDR_W-FE_NBYTES_W];
-         assign write_wdata_o  = buffer_dout[FE_NBYTES+:FE_DATA_W];
-         assign write_wstrb_o  = buffer_dout[0+:FE_NBYTES];
+         assign buffer_pop     = write_ack_i & ~replace_req_o;
+         assign write_req_o    = ~buffer_empty & ~replace_req_o;
+         assign write_addr_o   = buffer_dout[WTBUF_NBYTES+WTBUF_DATA_W+:WTBUF_ADDR_W];
+         assign write_wdata_o  = buffer_dout[WTBUF_NBYTES+:WTBUF_DATA_W];
+         assign write_wstrb_o  = buffer_dout[0+:WTBUF_NBYTES];
 
          // back-end read channel
-         assign replace_req_o  = (~hit & read_access & ~replace_i) & (buffer_empty & write_ack_i);
-         assign replace_addr_o = addr_i[ADDR_W-1:0];
+         if (NON_BLOCKING) begin : g_non_blocking
+            iob_cache_mshr #(
+               .N_MSHR       (N_MSHR),
+               .FE_DATA_W    (FE_DATA_W),
+               .BE_DATA_W    (BE_DATA_W),
+               .LINE_ADDR_W  (ADDR_W),
+               .SET_INDEX_W  (SET_INDEX_W),
+               .NWAYS        (NWAYS),
+               .WORD_OFFSET_W(WORD_OFFSET_W),
+               .LINE2BE_W    (LINE2BE_W),
+               .RD_TXN_W     (RD_TXN_W),
+               .RD_ID_W      (RD_ID_W)
+            ) mshr (
+               .clk_i       (clk_i),
+               .arst_i      (arst_i),
+               .invalidate_i(invalidate_i),
+
+               .line_addr_i   (line_reg),
+               .match_o       (mshr_match),
+               .match_issued_o(mshr_match_issued),
+               .set_busy_o    (mshr_set_busy),
+               .full_o        (mshr_full),
+               .alloc_i       (rd_alloc_ack),
+               .alloc_way_i   (way_select),
+
+               .rsp_push_i  ((rd_hit_ack & ~rsp_empty) | rd_merge_ack | rd_alloc_ack),
+               .rsp_wait_i  (~hit),
+               .rsp_data_i  (hit_rdata),
+               .rsp_offset_i(offset),
+               .rsp_empty_o (rsp_empty),
+               .rsp_full_o  (rsp_full),
+               .rvalid_o    (rsp_rvalid),
+               .rdata_o     (rsp_rdata),
+
+               .can_issue_i   (refill_ok),
+               .replace_req_o (replace_req_o),
+               .replace_addr_o(replace_addr_o),
+               .replace_word_o(replace_word_o),
+               .replace_id_o  (replace_id_o),
+               .replace_i     (replace_i),
+               .read_req_i    (read_req_i),
+               .read_addr_i   (read_addr_i),
+               .read_rdata_i  (read_rdata_i),
+               .read_id_i     (read_id_i),
+               .read_last_i   (read_last_i),
+
+               .fill_way_o  (fill_way),
+               .fill_line_o (fill_line),
+               .fill_done_o (fill_done),
+               .fill_valid_o(fill_valid),
+               .done_way_o  (done_way),
+               .done_line_o (done_line)
+            );
+            assign demand_req = replace_req_o;
+         end else begin : g_blocking
+            // a RAW stall (hit delayed by a write to the same way and offset) is not a miss;
+            // misses to a line in (or on its way to) the prefetch buffer do not refill it
+            assign demand_req     = rd_miss & ~pf_hit & ~pf_busy & ~replace_i & refill_ok & evict_refill_ok;
+            assign replace_req_o  = demand_req | (pf_req & ~replace_i & refill_ok);
+            assign replace_addr_o = pf_sel ? pf_line : fill_line;
+            assign replace_id_o   = {RD_ID_W{1'b0}};
+         end
       end else begin : g_write_back
          // if (WRITE_POL == WRITE_BACK)
          // back-end write channel
          assign write_wstrb_o  = {FE_NBYTES{1'bx}};
+         assign wtbuf_ready    = 1'b1;
+         assign wtbuf_level_o  = {(WTBUF_DEPTH_W + 1) {1'b0}};
+         assign wtbuf_idle     = write_idle_i;
+         assign refill_ok      = write_ack_i & replace_ready_i;
          // write_req_o, write_addr_o and write_wdata_o assigns are generated bellow (dependencies)
 
          // back-end read channel
-         assign replace_req_o  = (~|way_hit) & (write_ack_i) & req_reg_i & ~replace_i;
-         assign replace_addr_o = addr_i[ADDR_W-1:0];
+         assign replace_req_o  = (~|way_hit) & refill_ok & (req_reg_int | maint_miss) & req_ok & ~replace_i & lookup_ok & evict_refill_ok;
+         assign replace_addr_o = fill_line;
+         assign replace_id_o   = {RD_ID_W{1'b0}};
+         assign demand_req     = replace_req_o;
+      end
+   endgenerate
+
+   //////////////////////////////////////////////////////
+   // Line refill of the blocking cache and early restart
+   //////////////////////////////////////////////////////
+   generate
+      if (NON_BLOCKING) begin : g_mshr_refill
+         // refilled lines and read responses are handled by the MSHRs
+         assign req_ok     = 1'b1;
+         assign fill_ack   = 1'b0;
+         assign fill_rdata = {FE_DATA_W{1'b0}};
+      end else if (CRIT_WORD_FIRST) begin : g_early_restart
+         reg [     ADDR_W-1:0] fill_line_reg;
+         reg [      NWAYS-1:0] fill_way_reg;
+         reg [  LINE2BE_W-1:0] fill_word_reg;
+         reg                   refill_reg;
+
+         // the front-end moves on before the refill ends: the line, way and
+         // first word of the refill are kept until then
+         always @(posedge clk_i) begin
+            if (demand_req) begin
+               fill_line_reg <= addr_int[ADDR_W-1:0];
+               fill_way_reg  <= way_select;
+               fill_word_reg <= offset_beat;
+            end
+         end
+
+         always @(posedge clk_i, posedge arst_i) begin
+            if (arst_i) refill_reg <= 1'b0;
+            else refill_reg <= refill;
+         end
+
+         assign fill_line      = refill ? fill_line_reg : addr_int[ADDR_W-1:0];
+         assign fill_way       = fill_way_reg;
+         // prefetches start at the line base
+         assign replace_word_o = refill ? fill_word_reg : (pf_sel ? {LINE2BE_W{1'b0}} : offset_beat);
+
+         // reads to the line being refilled are acknowledged as soon as their word arrives
+         assign fill_ack = req_reg_int & ~(|fe_wstrb_reg) & refill & read_req_i &
+                           (line_reg == fill_line_reg) &
+                           ((LINE2BE_W == 0) | (offset_beat == read_addr_i));
+         assign fill_rdata = read_rdata_i >> (FE_DATA_W * (offset % (BE_DATA_W / FE_DATA_W)));
+
+         // other requests wait for the refill to end and for the data memory
+         // to be read again (unless they access the refilled set)
+         assign req_ok = ~refill & ~(refill_reg & (index_reg != fill_line_reg[ADDR_W-TAG_W-1-:SET_INDEX_W]));
+      end else begin : g_blocking_refill
+         assign fill_line      = addr_int[ADDR_W-1:0];
+         assign fill_way       = way_hit;
+         assign replace_word_o = pf_sel ? {LINE2BE_W{1'b0}} : offset_beat;
+         assign req_ok         = 1'b1;
+         assign fill_ack       = 1'b0;
+         assign fill_rdata     = {FE_DATA_W{1'b0}};
+      end
+   endgenerate
+
+   //////////////////////////////////////////////////////
+   // Prefetching
+   //////////////////////////////////////////////////////
+   // lines preloaded by a maintenance operation are refilled as read misses
+   assign rd_miss = (~(|way_hit) & read_access & lookup_ok) | maint_miss;
+
+   generate
+      if (USE_PREFETCH) begin : g_prefetch
+         wire              pf_req_int;
+         wire              pf_fill;
+         wire [ADDR_W-1:0] pf_req_line;
+         wire [ADDR_W-1:0] pf_fill_line;
+
+         iob_cache_prefetch #(
+            .PREFETCH     (PREFETCH),
+            .LINE_W       (ADDR_W),
+            .FE_DATA_W    (FE_DATA_W),
+            .BE_DATA_W    (BE_DATA_W),
+            .WORD_OFFSET_W(WORD_OFFSET_W),
+            .LINE2BE_W    (LINE2BE_W)
+         ) prefetch (
+            .clk_i       (clk_i),
+            .arst_i      (arst_i),
+            .en_i        (prefetch_en_i),
+            .invalidate_i(invalidate_i | maint_inval_start),
+
+            .miss_i        (demand_req | line_copy),
+            .miss_line_i   (line_reg),
+            .store_i       (write_access & fe_ack & ~spm_req),
+            .store_line_i  (line_reg),
+            .store_offset_i(offset),
+            .store_wdata_i (fe_wdata_reg),
+            .store_wstrb_i (fe_wstrb_reg),
+
+            .line_i     (line_reg),
+            .hit_o      (pf_hit),
+            .busy_o     (pf_busy),
+            .use_i      (pf_copy),
+            .line_data_o(pf_data),
+
+            .req_o       (pf_req_int),
+            .req_line_o  (pf_req_line),
+            .issue_i     (replace_req_o & ~demand_req),
+            .fill_o      (pf_fill),
+            .fill_line_o (pf_fill_line),
+            .replace_i   (replace_i),
+            .read_req_i  (read_req_i),
+            .read_addr_i (read_addr_i),
+            .read_rdata_i(read_rdata_i),
+
+            .useful_o (pf_useful_o),
+            .useless_o(pf_useless_o)
+         );
+
+         // read misses have priority over prefetches
+         assign pf_req    = pf_req_int & ~rd_miss;
+         assign pf_sel    = replace_i ? pf_fill : pf_req;
+         assign pf_line   = pf_fill ? pf_fill_line : pf_req_line;
+         assign refill    = replace_i & ~pf_fill;
+
+         // a read miss to the prefetched line copies it into the cache
+         assign pf_copy   = rd_miss & pf_hit & evict_ok;
+      end else begin : g_no_prefetch
+         assign pf_hit         = 1'b0;
+         assign pf_busy        = 1'b0;
+         assign pf_req         = 1'b0;
+         assign pf_sel         = 1'b0;
+         assign pf_line        = {ADDR_W{1'b0}};
+         assign refill         = replace_i;
+         assign pf_copy        = 1'b0;
+         assign pf_data        = {LINE_DATA_W{1'b0}};
+         assign pf_useful_o    = 1'b0;
+         assign pf_useless_o   = 1'b0;
       end
    endgenerate
 
@@ -141,53 +563,574 @@ module iob_cache_memory #(
    reg  [WORD_OFFSET_W-1:0] offset_prev;
    reg  [        NWAYS-1:0] way_hit_prev;
 
+   // store forwarding: the data memory bank written in the previous clock
+   // cycle (write_hit_prev) was read at the stored word's set, so a read of
+   // that same word takes the stored bytes from the write stage registers
+   // instead of stalling
+   reg  [  SET_INDEX_W-1:0] index_prev;
+   reg  [    FE_DATA_W-1:0] wdata_prev;
+   reg  [    FE_NBYTES-1:0] wstrb_prev;
+   wire                     fwd;
+   reg  [    FE_DATA_W-1:0] fwd_rdata;
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         index_prev <= {SET_INDEX_W{1'b0}};
+         wdata_prev <= {FE_DATA_W{1'b0}};
+         wstrb_prev <= {FE_NBYTES{1'b0}};
+      end else if (cke_i) begin
+         index_prev <= index_reg;
+         wdata_prev <= fe_wdata_reg;
+         wstrb_prev <= fe_wstrb_reg;
+      end
+   end
+
+   assign fwd = write_hit_prev & (way_hit_prev == way_hit) & (offset_prev == offset) &
+                (index_prev == index_reg) & read_access;
+
+   integer b;
+   always @* begin
+      for (b = 0; b < FE_NBYTES; b = b + 1)
+         fwd_rdata[8*b+:8] = wstrb_prev[b] ? wdata_prev[8*b+:8] : mem_rdata[8*b+:8];
+   end
+
+   assign hit_rdata = fwd ? fwd_rdata : mem_rdata;
+
    generate
       if (WRITE_POL == `IOB_CACHE_MEMORY_WRITE_THROUGH) begin : g_write_through_on_RAW
          always @(posedge clk_i) begin
-            write_hit_prev <= write_access & (|way_hit);
-            // previous write position
-            offset_prev    <= offset;
-            way_hit_prev   <= way_hit;
+            if (cke_i) begin
+               write_hit_prev <= write_access & (|way_hit);
+               // previous write position
+               offset_prev    <= offset;
+               way_hit_prev   <= way_hit;
+            end
          end
-         assign raw = write_hit_prev & (way_hit_prev == way_hit) & (offset_prev == offset);
+         assign raw = write_hit_prev & (way_hit_prev == way_hit) & (offset_prev == offset) & ~fwd;
       end else begin : g_write_back_on_RAW
          // if (WRITE_POL == WRITE_BACK)
          always @(posedge clk_i) begin
-            // all writes will have the data in cache in the end
-            write_hit_prev <= write_access;
-            // previous write position
-            offset_prev    <= offset;
-            way_hit_prev   <= way_hit;
+            if (cke_i) begin
+               // all writes will have the data in cache in the end
+               write_hit_prev <= write_access;
+               // previous write position
+               offset_prev    <= offset;
+               way_hit_prev   <= way_hit;
+            end
          end
-         assign raw = write_hit_prev & (way_hit_prev == way_hit) & (offset_prev == offset) & read_access;
+         assign raw = write_hit_prev & (way_hit_prev == way_hit) & (offset_prev == offset) & read_access & ~fwd;
          // without read_access it is an infinite replacement loop
       end
    endgenerate
 
+   //////////////////////////////////////////////////////
+   // Victim buffer and eviction buffer
+   //////////////////////////////////////////////////////
+   reg store_prev;
+
+   // a store hit is written in the data memory while the next request reads
+   // it: a line copied out of the cache is read again in the next clock cycle
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) store_prev <= 1'b0;
+      else store_prev <= write_access & (|way_hit);
+   end
+   // a port 1 lookup in the last clock cycle read its bank at another set
+   assign evict_ok = ~((store_prev | bank_look) & (USE_VICTIM | USE_EVICT_BUF));
+
+   generate
+      if (USE_VICTIM) begin : g_victim
+         wire              miss;  // line to swap in or refill (write misses allocate in write-back only)
+         wire              vb_hit_busy;
+         wire              vb_ready;
+         wire              vb_write_req;
+         wire [ADDR_W-1:0] vb_write_line;
+         wire [LINE_DATA_W-1:0] vb_write_data;
+
+         if (WRITE_POL == `IOB_CACHE_MEMORY_WRITE_THROUGH) begin : g_write_through_miss
+            assign miss = rd_miss;
+         end else begin : g_write_back_miss
+            assign miss = ~(|way_hit) & req_reg_int & req_ok & lookup_ok;
+         end
+
+         // misses to a line in the prefetch buffer copy it from there
+         assign vb_swap         = miss & vb_hit & ~vb_hit_busy & ~pf_hit & evict_ok;
+         assign evict_refill_ok = ~vb_hit & vb_ready & evict_ok;
+
+         iob_cache_victim #(
+            .N_VICTIM     (N_VICTIM),
+            .LINE_W       (ADDR_W),
+            .FE_DATA_W    (FE_DATA_W),
+            .WORD_OFFSET_W(WORD_OFFSET_W)
+         ) victim (
+            .clk_i       (clk_i),
+            .arst_i      (arst_i),
+            .invalidate_i(invalidate_i),
+
+            .line_i     (line_reg),
+            .hit_o      (vb_hit),
+            .hit_dirty_o(vb_hit_dirty),
+            .hit_busy_o (vb_hit_busy),
+            .hit_data_o (vb_data),
+            .ready_o    (vb_ready),
+
+            .evict_i      (demand_req | line_copy),
+            .evict_valid_i(evict_valid),
+            .evict_dirty_i(evict_dirty),
+            .evict_line_i (evict_line),
+            .evict_data_i (evict_data),
+
+            .store_i       (write_access & fe_ack & ~spm_req),
+            .store_offset_i(offset),
+            .store_wdata_i (fe_wdata_reg),
+            .store_wstrb_i (fe_wstrb_reg),
+
+            // dirty lines are written back unless a miss can proceed
+            .write_en_i  (~replace_i & ~(miss & evict_ok & (vb_hit ? ~vb_hit_busy : vb_ready))),
+            .write_req_o (vb_write_req),
+            .write_line_o(vb_write_line),
+            .write_data_o(vb_write_data),
+            .write_ack_i (write_ack_i)
+         );
+
+         if (WRITE_POL == `IOB_CACHE_MEMORY_WRITE_BACK) begin : g_write_back
+            assign write_req_o   = vb_write_req;
+            assign write_addr_o  = vb_write_line;
+            assign write_wdata_o = vb_write_data;
+         end
+      end else begin : g_no_victim
+         assign vb_hit       = 1'b0;
+         assign vb_hit_dirty = 1'b0;
+         assign vb_swap      = 1'b0;
+         assign vb_data      = {LINE_DATA_W{1'b0}};
+
+         if (USE_EVICT_BUF) begin : g_evict_buf
+            reg                   eb_write;
+            reg [     ADDR_W-1:0] eb_line;
+            reg [LINE_DATA_W-1:0] eb_data;
+
+            // the dirty line is copied out when its refill is requested (the
+            // back-end write channel is idle); its write-back starts in the
+            // next clock cycle and overlaps the refill, if the back-end allows.
+            // Dirty lines cleaned by a maintenance operation are copied out too.
+            always @(posedge clk_i, posedge arst_i) begin
+               if (arst_i) eb_write <= 1'b0;
+               else eb_write <= (demand_req & evict_dirty) | maint_wb;
+            end
+
+            always @(posedge clk_i) begin
+               if ((demand_req & evict_dirty) | maint_wb) begin
+                  eb_line <= evict_line;
+                  eb_data <= evict_data;
+               end
+            end
+
+            assign evict_refill_ok = evict_ok;
+
+            assign write_req_o     = eb_write;
+            assign write_addr_o    = eb_line;
+            assign write_wdata_o   = eb_data;
+         end else begin : g_no_evict_buf
+            assign evict_refill_ok = 1'b1;
+         end
+      end
+   endgenerate
+
+   //////////////////////////////////////////////////////
+   // Cache maintenance by address range
+   //////////////////////////////////////////////////////
+   generate
+      if (USE_MAINT) begin : g_maint
+         reg [2:0] maint_cmd_reg;
+
+         always @(posedge clk_i, posedge arst_i) begin
+            if (arst_i) maint_cmd_reg <= 3'd0;
+            else if (maint_start_i & ~maint_busy_o) maint_cmd_reg <= maint_cmd_i;
+         end
+
+         iob_cache_maint #(
+            .LINE_W    (ADDR_W),
+            .LINE_SHIFT(FE_NBYTES_W + WORD_OFFSET_W),
+            .DATA_W    (FE_DATA_W)
+         ) maint (
+            .clk_i (clk_i),
+            .arst_i(arst_i),
+
+            .start_i(maint_start_i),
+            .addr_i (maint_addr_i),
+            .len_i  (maint_len_i),
+            .busy_o (maint_busy_o),
+
+            .fe_req_reg_i(fe_req_reg),
+            .fe_ack_i    (fe_ack),
+            .hold_o      (maint_hold),
+
+            .lookup_o(maint_lookup),
+            .check_o (maint_check),
+            .line_o  (maint_line),
+            .done_i  (maint_done),
+            .retry_i (maint_check & ~lookup_ok),
+            .idle_i  (wtbuf_idle & ~write_req_o)
+         );
+
+         assign maint_cmd         = maint_cmd_reg;
+         assign maint_inval_start = maint_start_i & ~maint_busy_o & ~maint_cmd_i[2] & maint_cmd_i[1];
+
+         wire maint_clean = ~maint_cmd[2] & maint_cmd[0];
+
+         assign maint_hit         = maint_check & (|way_hit) & lookup_ok;
+         // a line to preload is refilled (into a locked way) and then hits
+         assign maint_miss        = maint_check & maint_cmd[2] & ~(|way_hit) & lookup_ok;
+         // a dirty line is cleaned when the back-end write channel is idle
+         assign maint_wb          = maint_hit & maint_clean & evict_dirty & write_ack_i;
+         assign maint_done        = maint_cmd[2] ? maint_hit :
+                                    maint_check & lookup_ok & ~(maint_hit & maint_clean & evict_dirty & ~write_ack_i);
+      end else begin : g_no_maint
+         assign maint_hold        = 1'b0;
+         assign maint_lookup      = 1'b0;
+         assign maint_check       = 1'b0;
+         assign maint_line        = {ADDR_W{1'b0}};
+         assign maint_busy_o      = 1'b0;
+         assign maint_cmd         = 3'd0;
+         assign maint_inval_start = 1'b0;
+         assign maint_hit         = 1'b0;
+         assign maint_miss        = 1'b0;
+         assign maint_wb          = 1'b0;
+         assign maint_done        = 1'b0;
+      end
+   endgenerate
+
+   //////////////////////////////////////////////////////
+   // Scratchpad mode
+   //////////////////////////////////////////////////////
+   generate
+      if (USE_SPM) begin : g_spm
+         reg  [NWAYS-1:0] spm_ways_reg;
+
+         // at least one way is left to the cache
+         wire [      7:0] spm_n = (spm_ways_i < NWAYS) ? spm_ways_i : NWAYS - 1;
+
+         always @(posedge clk_i, posedge arst_i) begin
+            if (arst_i) spm_ways_reg <= {NWAYS{1'b0}};
+            else spm_ways_reg <= spm_ways;
+         end
+
+         assign spm_ways  = ~({NWAYS{1'b1}} << spm_n);
+         assign spm_enter = spm_ways & ~spm_ways_reg;
+         // scratchpad writes update the data memory only (no write-through or dirty line)
+         assign spm_req   = req_reg_int & spm_reg_i;
+         assign spm_way   = {{(NWAYS - 1) {1'b0}}, 1'b1} << spm_way_reg_i;
+      end else begin : g_no_spm
+         assign spm_ways  = {NWAYS{1'b0}};
+         assign spm_enter = {NWAYS{1'b0}};
+         assign spm_req   = 1'b0;
+         assign spm_way   = {NWAYS{1'b0}};
+      end
+   endgenerate
+
+   // a line copy writes a whole line in one clock cycle; the memories are
+   // read again before it can hit
+   reg line_copy_reg;
+
+   // dirty lines move to the victim or eviction buffer when evicted or cleaned
+   assign dirty_clr  = demand_req | line_copy | (maint_done & maint_hit & ~maint_cmd[2]);
+   assign dirty_copy = vb_swap & vb_hit_dirty;
+
+   assign line_copy      = pf_copy | vb_swap;
+   assign line_copy_data = vb_swap ? vb_data : pf_data;
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) line_copy_reg <= 1'b0;
+      else line_copy_reg <= line_copy;
+   end
+   assign copy_lookup_ok = ~line_copy_reg;
+
    ///////////////////////////////////////////////////////////////
    // Hit signal: data available and in the memory's output
    ///////////////////////////////////////////////////////////////
-   assign hit = |way_hit & ~replace_i & (~raw);
+   assign hit = |way_hit & lookup_ok & (~raw);
 
    /////////////////////////////////
    // front-end ACK signal
    /////////////////////////////////
    generate
-      if (WRITE_POL == `IOB_CACHE_MEMORY_WRITE_THROUGH) begin : g_write_through_ACK
-         assign ack_o = (hit & read_access) | (~buffer_full & write_access);
-      end else begin : g_write_back_ACK  // if (WRITE_POL == WRITE_BACK)
-         assign ack_o = hit & req_reg_i;
+      if (NON_BLOCKING) begin : g_non_blocking_ACK
+         reg lookup_ok_reg;
+         // memories outputs are stale if they were used for a line refill or
+         // valid bits changed in the last clock cycle: the request is looked up again
+         always @(posedge clk_i, posedge arst_i) begin
+            if (arst_i) lookup_ok_reg <= 1'b0;
+            else lookup_ok_reg <= ~(line_fill | fill_done | rd_alloc_ack);
+         end
+         assign lookup_ok    = lookup_ok_reg;
+
+         // read hit: data is returned now or queued behind older misses
+         assign rd_hit_ack   = read_access & hit & ~rsp_full & ~fill_done;
+         // read miss to a line waiting for its refill: merged into the same MSHR
+         assign rd_merge_ack = read_access & ~(|way_hit) & lookup_ok & mshr_match & ~mshr_match_issued & ~rsp_full & ~fill_done;
+         // read miss: a new MSHR is allocated (one refill per set at a time)
+         assign rd_alloc_ack = read_access & ~(|way_hit) & lookup_ok & ~mshr_match & ~mshr_full & ~mshr_set_busy & ~rsp_full & ~fill_done;
+         // writes wait for the refill of their line (RAW order in memory)
+         assign wr_ack       = write_access & lookup_ok & ~mshr_match & wtbuf_ready & ~(line_fill | fill_done);
+
+         assign fe_ack       = rd_hit_ack | rd_merge_ack | rd_alloc_ack | wr_ack;
+         assign fe_rvalid    = (rd_hit_ack & rsp_empty) | rsp_rvalid;
+         assign fe_rdata     = rsp_rvalid ? rsp_rdata : hit_rdata;
+      end else begin : g_blocking_ACK
+         assign lookup_ok = ~refill & req_ok & copy_lookup_ok;
+         if (WRITE_POL == `IOB_CACHE_MEMORY_WRITE_THROUGH) begin : g_write_through_ACK
+            assign fe_ack = (hit & read_access) | ((wtbuf_ready | spm_req) & write_access) | fill_ack;
+         end else begin : g_write_back_ACK  // if (WRITE_POL == WRITE_BACK)
+            assign fe_ack = (hit & req_reg_int) | fill_ack;
+         end
+         assign fe_rvalid    = fe_ack & (read_access | fill_ack);
+         assign fe_rdata     = fill_ack ? fill_rdata : hit_rdata;
+         assign rd_hit_ack   = 1'b0;
+         assign rd_merge_ack = 1'b0;
+         assign rd_alloc_ack = 1'b0;
+         assign wr_ack       = 1'b0;
+      end
+   endgenerate
+
+   //////////////////////////////////////////////////////
+   // Second front-end port (NBANKS_W > 0)
+   //////////////////////////////////////////////////////
+   // The data memory words are interleaved in 2**BANK_W banks by word offset
+   // and the tag memory has a second read port. A port 1 request is looked up
+   // in its bank, if not used by the port 0 lookup or store, and acknowledged
+   // from there if it is a read hit. Port 1 stores and misses, and reads that
+   // could not be looked up in their bank, take the request register stage,
+   // shared with port 0 in round-robin. The replacement policy and the hit
+   // counter are updated by the bank read hits when the request register
+   // stage is empty, or later (one pending update, no bank lookups meanwhile).
+   generate
+      if (USE_BANKS) begin : g_banks
+         wire                     grant1;  // port 1 request in the lookup stage
+         reg                      own1;  // port 1 request in the request register stage
+         reg                      look1;  // looked up in its bank in the last clock cycle
+         reg  [        NWAYS-1:0] v1;
+         reg  [        NWAYS-1:0] way_hit1;
+         reg  [    FE_DATA_W-1:0] bank_rdata;
+         wire                     bank_ack;
+
+         wire [WORD_OFFSET_W-1:0] offset_lookup = grant1 ? addr1_i[0+:WORD_OFFSET_W] : offset_i;
+         wire [WORD_OFFSET_W-1:0] offset1 = addr1_reg_i[0+:WORD_OFFSET_W];
+         wire [        TAG_W-1:0] tag1 = addr1_reg_i[ADDR_REG_W-1-:TAG_W];
+         wire [  SET_INDEX_W-1:0] index1 = addr1_reg_i[ADDR_REG_W-TAG_W-1-:SET_INDEX_W];
+
+         // pending replacement policy update of a bank read hit
+         reg                      pend1;
+         reg  [        NWAYS-1:0] pend1_way;
+         reg  [  SET_INDEX_W-1:0] pend1_index;
+         // the replacement policy is free (request register stage empty)
+         wire                     rep1_free = ~req_reg_int & ~maint_hold;
+
+         // the request register stage can take a new request
+         wire                     stage_free = ~req_reg_int | fe_ack;
+         // port 1 request waiting for the request register stage
+         wire                     wait1 = req1_reg_i & ~ack1_o;
+
+         // round-robin: port 1 takes the free stage if port 0 used it last or has no request
+         assign grant1       = stage_free ? (wait1 & (~req_i | ~own1)) : own1;
+
+         assign fe_req       = grant1 ? req1_i : req_i;
+         assign fe_addr      = grant1 ? addr1_i[ADDR_REG_W-1:WORD_OFFSET_W] : addr_i;
+         assign fe_req_reg   = own1 ? req1_reg_i : req_reg_i;
+         assign fe_addr_reg  = own1 ? addr1_reg_i : addr_reg_i;
+         assign fe_wdata_reg = own1 ? wdata1_reg_i : wdata_reg_i;
+         assign fe_wstrb_reg = own1 ? wstrb1_reg_i : wstrb_reg_i;
+
+         assign bank_offset  = addr1_i[0+:WORD_OFFSET_W];
+         assign bank_index   = addr1_i[WORD_OFFSET_W+:SET_INDEX_W];
+         assign bank_go      = req1_i & ~grant1 & stage_free & ~maint_hold & ~line_fill & ~line_copy &
+                               ~(req_int & ((bank_offset % (2**BANK_W)) == (offset_lookup % (2**BANK_W)))) &
+                               ~(write_access & ((bank_offset % (2**BANK_W)) == (offset % (2**BANK_W)))) &
+                               ~pend1 & ~(look1 & ~rep1_free);
+
+         always @(posedge clk_i, posedge arst_i) begin
+            if (arst_i) begin
+               own1  <= 1'b0;
+               look1 <= 1'b0;
+            end else begin
+               own1  <= grant1;
+               look1 <= bank_go;
+            end
+         end
+         assign bank_look = look1;
+
+         // valid bits of the port 1 lookup
+         integer vw;
+         always @(posedge clk_i) begin
+            if (invalidate_i) v1 <= {NWAYS{1'b0}};
+            else if (bank_go)
+               for (vw = 0; vw < NWAYS; vw = vw + 1) v1[vw] <= v_reg[(2**SET_INDEX_W)*vw+bank_index];
+         end
+
+         // hit and data of the port 1 request looked up in its bank
+         integer hw;
+         always @* begin
+            bank_rdata = {FE_DATA_W{1'b0}};
+            for (hw = 0; hw < NWAYS; hw = hw + 1) begin
+               way_hit1[hw] = (tag1 == line_tag1[TAG_W*hw+:TAG_W]) & v1[hw];
+               if (way_hit1[hw]) bank_rdata = line_rdata[(hw*(2**WORD_OFFSET_W)+offset1)*FE_DATA_W+:FE_DATA_W];
+            end
+         end
+
+         // read hit in the bank
+         assign bank_ack  = look1 & req1_reg_i & ~(|wstrb1_reg_i) & (|way_hit1);
+
+         // its replacement policy update, applied now if the policy is free
+         always @(posedge clk_i, posedge arst_i) begin
+            if (arst_i) pend1 <= 1'b0;
+            else if (invalidate_i) pend1 <= 1'b0;
+            else pend1 <= (pend1 | bank_ack) & ~rep1_free;
+         end
+
+         always @(posedge clk_i) begin
+            if (bank_ack) begin
+               pend1_way   <= way_hit1;
+               pend1_index <= index1;
+            end
+         end
+
+         assign rep1_go    = (pend1 | bank_ack) & rep1_free;
+         assign rep1_way   = pend1 ? pend1_way : way_hit1;
+         assign rep1_index = pend1 ? pend1_index : index1;
+
+         assign ack_o     = fe_ack & ~own1;
+         assign rvalid_o  = fe_rvalid & ~own1;
+         assign rdata_o   = fe_rdata;
+         assign ack1_o    = own1 ? fe_ack : bank_ack;
+         assign rvalid1_o = own1 ? fe_rvalid : bank_ack;
+         assign rdata1_o  = own1 ? fe_rdata : bank_rdata;
+      end else begin : g_no_banks
+         assign fe_req       = req_i;
+         assign fe_addr      = addr_i;
+         assign fe_req_reg   = req_reg_i;
+         assign fe_addr_reg  = addr_reg_i;
+         assign fe_wdata_reg = wdata_reg_i;
+         assign fe_wstrb_reg = wstrb_reg_i;
+
+         assign bank_go      = 1'b0;
+         assign bank_offset  = {WORD_OFFSET_W{1'b0}};
+         assign bank_index   = {SET_INDEX_W{1'b0}};
+         assign bank_look    = 1'b0;
+         assign rep1_go      = 1'b0;
+         assign rep1_way     = {NWAYS{1'b0}};
+         assign rep1_index   = {SET_INDEX_W{1'b0}};
+
+         assign ack_o        = fe_ack;
+         assign rvalid_o     = fe_rvalid;
+         assign rdata_o      = fe_rdata;
+         assign ack1_o       = 1'b0;
+         assign rvalid1_o    = 1'b0;
+         assign rdata1_o     = {FE_DATA_W{1'b0}};
+      end
+   endgenerate
+
+   //////////////////////////////////////////////////////
+   // Snoop (SNOOP)
+   //////////////////////////////////////////////////////
+   // The tags of the set of the snooped line are read through the second tag
+   // memory port (clock cycle t of snoop_i) and compared in the next clock
+   // cycle (t+1), when the valid bit of the way holding the line is cleared.
+   // A way written in that set in either clock cycle no longer holds the tag
+   // read: its new line is refilled after the snoop. The valid-memory output
+   // is registered, so the lookups in clock cycles t and t+1 still read the
+   // old valid bit: their requests to the snooped line miss (snoop_stale in
+   // clock cycles t+1 and t+2) and are served by a line refill.
+   generate
+      if (USE_SNOOP) begin : g_snoop
+         reg                   snoop_look;
+         reg [SET_INDEX_W-1:0] snoop_set;
+         reg [      TAG_W-1:0] snoop_tag;
+         reg [      NWAYS-1:0] snoop_fill;
+         reg [      NWAYS-1:0] snoop_hit;
+         // snoop looked up in the previous clock cycle
+         reg                   snoop_look2;
+         reg [SET_INDEX_W-1:0] snoop_set2;
+         reg [      TAG_W-1:0] snoop_tag2;
+
+         always @(posedge clk_i, posedge arst_i) begin
+            if (arst_i) begin
+               snoop_look  <= 1'b0;
+               snoop_look2 <= 1'b0;
+            end else begin
+               snoop_look  <= snoop_i;
+               snoop_look2 <= snoop_look;
+            end
+         end
+
+         always @(posedge clk_i) begin
+            snoop_set  <= snoop_addr_index;
+            snoop_tag  <= snoop_addr_i[FE_ADDR_W-1-:TAG_W];
+            snoop_fill <= tag_way & {NWAYS{tag_we & (tag_index == snoop_addr_index)}};
+            snoop_set2 <= snoop_set;
+            snoop_tag2 <= snoop_tag;
+         end
+
+         // ways written in the snooped set in the lookup or in the clear clock cycle
+         wire [NWAYS-1:0] snoop_skip = snoop_fill | (tag_way & {NWAYS{tag_we & (tag_index == snoop_set)}});
+
+         integer sw;
+         always @* begin
+            for (sw = 0; sw < NWAYS; sw = sw + 1)
+               snoop_hit[sw] = snoop_look & ~snoop_skip[sw] & (line_tag1[TAG_W*sw+:TAG_W] == snoop_tag);
+         end
+
+         assign snoop_way   = snoop_hit;
+         assign snoop_index = snoop_set;
+         assign snoop_stale = (snoop_look & (index_reg == snoop_set) & (tag == snoop_tag)) |
+                              (snoop_look2 & (index_reg == snoop_set2) & (tag == snoop_tag2));
+      end else begin : g_no_snoop
+         assign snoop_way   = {NWAYS{1'b0}};
+         assign snoop_index = {SET_INDEX_W{1'b0}};
+         assign snoop_stale = 1'b0;
+      end
+   endgenerate
+
+   // line refill and tag/valid memories update
+   generate
+      if (NON_BLOCKING) begin : g_non_blocking_fill
+         // tag and valid bit are written when the refill completes, possibly
+         // while a beat of another refill is written in the data memory
+         assign line_fill  = read_req_i;
+         assign line_way   = line_fill ? fill_way : (way_hit & {NWAYS{wr_ack}});
+         assign line_index = fill_line[ADDR_W-TAG_W-1-:SET_INDEX_W];
+         assign tag_we     = fill_done;
+         assign tag_way    = done_way;
+         assign tag_index  = done_line[ADDR_W-TAG_W-1-:SET_INDEX_W];
+         assign tag_din    = done_line[ADDR_W-1-:TAG_W];
+         assign v_set      = fill_done & fill_valid;
+         // the victim line is invalidated as soon as its MSHR is allocated
+         assign v_clr      = rd_alloc_ack;
+      end else begin : g_blocking_fill
+         assign line_fill  = refill;
+         assign line_way   = line_fill ? fill_way : (line_copy ? way_select : way_hit);
+         assign line_index = fill_line[ADDR_W-TAG_W-1-:SET_INDEX_W];
+         assign tag_we     = demand_req | line_copy;
+         assign tag_way    = way_select;
+         assign tag_index  = index;
+         assign tag_din    = tag;
+         assign v_set      = demand_req | line_copy;
+         assign v_clr      = maint_done & maint_hit & (maint_cmd[2:1] == 2'b01);
       end
    endgenerate
 
    // cache-control hit-miss counters enables
    generate
-      if (USE_CTRL & USE_CTRL_CNT) begin : g_ctrl_cnt
+      if (USE_CTRL & USE_CTRL_CNT & NON_BLOCKING) begin : g_non_blocking_ctrl_cnt
+         assign write_hit_o  = wr_ack & hit;
+         assign write_miss_o = wr_ack & ~hit;
+         // the controller subtracts a read hit on each miss: it is added back when the refill ends
+         assign read_hit_o   = rd_hit_ack | rd_merge_ack | fill_done;
+         assign read_miss_o  = rd_alloc_ack;
+      end else if (USE_CTRL & USE_CTRL_CNT) begin : g_ctrl_cnt
          // cache-control hit-miss counters enables
-         assign write_hit_o  = ack_o & (hit & write_access);
-         assign write_miss_o = ack_o & (~hit & write_access);
-         assign read_hit_o   = ack_o & (hit & read_access);
-         assign read_miss_o  = replace_req_o;  //will also subtract read_hit_o
+         assign write_hit_o  = fe_ack & (hit & write_access);
+         assign write_miss_o = fe_ack & (~hit & write_access);
+         // port 1 bank read hits are counted when the request register stage is empty
+         assign read_hit_o   = (fe_ack & ((hit & read_access) | fill_ack)) | rep1_go;
+         assign read_miss_o  = (demand_req | line_copy) & ~maint_hold;  //will also subtract read_hit_o
       end else begin : g_no_ctrl_cnt
          assign write_hit_o  = 1'bx;
          assign write_miss_o = 1'bx;
@@ -196,6 +1139,39 @@ module iob_cache_memory #(
       end
    endgenerate
 
+   // line replaced in the cache (blocking operation), to back-invalidate it
+   // in the upper-level caches of an inclusive hierarchy
+   assign evict_o      = ~NON_BLOCKING & (demand_req | line_copy) & evict_valid;
+   assign evict_addr_o = {evict_line, {(BE_NBYTES_W + LINE2BE_W) {1'b0}}};
+
+   // cache-control stall and eviction counters enables
+   generate
+      if (USE_CTRL & USE_CTRL_CNT) begin : g_ctrl_stall_cnt
+         wire stall = req_reg_int & ~fe_ack;
+
+         // a store waits for a write-through buffer entry
+         assign stall_wtbuf_o = stall & write_access & ~wtbuf_ready;
+         // a hit waits for the store to the same bank in the previous clock cycle (not forwarded)
+         assign stall_raw_o   = stall & ~stall_wtbuf_o & (|way_hit) & lookup_ok & raw;
+         // a write-back miss waits for the dirty line write-back before its refill
+         if (WRITE_POL == `IOB_CACHE_MEMORY_WRITE_BACK) begin : g_write_back_stall
+            assign stall_flush_o = stall & ~(|way_hit) & req_ok & lookup_ok & ~replace_i & ~demand_req & ~line_copy;
+         end else begin : g_write_through_stall
+            assign stall_flush_o = 1'b0;
+         end
+         // other stalls: line refills, lookups after a refill and MSHR/response queue limits
+         assign stall_miss_o  = stall & ~stall_wtbuf_o & ~stall_raw_o & ~stall_flush_o;
+
+         assign dirty_evict_o = (demand_req | line_copy) & evict_dirty;
+      end else begin : g_no_ctrl_stall_cnt
+         assign stall_wtbuf_o = 1'bx;
+         assign stall_raw_o   = 1'bx;
+         assign stall_flush_o = 1'bx;
+         assign stall_miss_o  = 1'bx;
+         assign dirty_evict_o = 1'bx;
+      end
+   endgenerate
+
    /////////////////////////////////////////
    // Memories implementation configurations
    /////////////////////////////////////////
@@ -208,17 +1184,20 @@ module iob_cache_memory #(
                wire [  FE_NBYTES-1:0] we_gen;
                wire [SET_INDEX_W-1:0] addr_gen;
                wire [  FE_DATA_W-1:0] data_in_gen;
+               // word in the bank of the port 1 lookup (NBANKS_W > 0)
+               wire                   bank_sel = bank_go & (((j*(BE_DATA_W/FE_DATA_W)+i) % (2**BANK_W)) == (bank_offset % (2**BANK_W)));
 
-               assign we_gen = {FE_NBYTES{way_hit[k]}} & line_wstrb[(j*(BE_DATA_W/FE_DATA_W)+i)*FE_NBYTES +: FE_NBYTES];
-               assign addr_gen = (write_access & way_hit[k] & ((j*(BE_DATA_W/FE_DATA_W)+i) == {{OFFSET_PAD_W{1'b0}}, offset}))? index_reg[SET_INDEX_W-1:0] : index[SET_INDEX_W-1:0];
-               assign data_in_gen = (replace_i) ? read_rdata_i[i*FE_DATA_W+:FE_DATA_W] : wdata_reg_i;
+               assign we_gen = {FE_NBYTES{line_way[k]}} & line_wstrb[(j*(BE_DATA_W/FE_DATA_W)+i)*FE_NBYTES +: FE_NBYTES];
+               assign addr_gen = (line_fill | line_copy) ? line_index : (write_access & way_hit[k] & ((j*(BE_DATA_W/FE_DATA_W)+i) == {{OFFSET_PAD_W{1'b0}}, offset}))? index_reg[SET_INDEX_W-1:0] : bank_sel ? bank_index : index[SET_INDEX_W-1:0];
+               assign data_in_gen = (line_fill) ? read_rdata_i[i*FE_DATA_W+:FE_DATA_W] :
+                                    (line_copy) ? line_copy_data[(j*(BE_DATA_W/FE_DATA_W)+i)*FE_DATA_W+:FE_DATA_W] : fe_wdata_reg;
 
                iob_cache_gen_sp_ram #(
                   .DATA_W(FE_DATA_W),
                   .ADDR_W(SET_INDEX_W)
                ) cache_memory (
                    .clk_i(clk_i),
-                   .en_i(req_i),
+                   .en_i(req_int | line_fill | line_copy | bank_go),
                    .we_i(we_gen),
                    .addr_i(addr_gen),
                    .data_i(data_in_gen),
@@ -231,36 +1210,56 @@ module iob_cache_memory #(
       // Cache Line Write Strobe
       if (LINE2BE_W > 0) begin : g_line2be_w
          always @* begin
-            if (replace_i) begin
+            if (line_fill) begin
                // line-replacement: read_addr_i indexes the words in cache-line
                line_wstrb = {{(LINE_WSTRB_W-BE_NBYTES){1'b0}}, {BE_NBYTES{read_req_i}}} << (read_addr_i * BE_NBYTES);
+            end else if (line_copy) begin
+               line_wstrb = {LINE_WSTRB_W{1'b1}};
             end else begin
-               line_wstrb = {{(LINE_WSTRB_W-FE_NBYTES){1'b0}}, (wstrb_reg_i & {FE_NBYTES{write_access}})} << (offset * FE_NBYTES);
+               line_wstrb = {{(LINE_WSTRB_W-FE_NBYTES){1'b0}}, (fe_wstrb_reg & {FE_NBYTES{write_access}})} << (offset * FE_NBYTES);
             end
          end
       end else begin : g_no_line2be_w
          always @* begin
-            if (replace_i) begin
+            if (line_fill) begin
                // line-replacement: mem's word replaces entire line
                line_wstrb = {{(LINE_WSTRB_W - BE_NBYTES) {1'b0}}, {BE_NBYTES{read_req_i}}};
+            end else if (line_copy) begin
+               line_wstrb = {LINE_WSTRB_W{1'b1}};
             end else begin
-               line_wstrb = {{(LINE_WSTRB_W-FE_NBYTES){1'b0}}, (wstrb_reg_i & {FE_NBYTES{write_access}})} << (offset * FE_NBYTES);
+               line_wstrb = {{(LINE_WSTRB_W-FE_NBYTES){1'b0}}, (fe_wstrb_reg & {FE_NBYTES{write_access}})} << (offset * FE_NBYTES);
             end
          end
       end
 
+      // valid-memory
+      for (k = 0; k < NWAYS; k = k + 1) begin : g_v_mask_block
+         assign v_set_mask[(2**SET_INDEX_W)*k+:(2**SET_INDEX_W)] = {(2**SET_INDEX_W){v_set & tag_way[k]}} & (1 << tag_index);
+         assign v_clr_mask[(2**SET_INDEX_W)*k+:(2**SET_INDEX_W)] = ({(2**SET_INDEX_W){v_clr & way_select[k]}} & (1 << index_reg)) | {(2**SET_INDEX_W){spm_enter[k]}} | binv_sets | ({(2**SET_INDEX_W){snoop_way[k]}} & (1 << snoop_index));
+      end
+
+      always @(posedge clk_i, posedge arst_i) begin
+         if (arst_i) v_reg <= 0;
+         else if (invalidate_i) v_reg <= 0;
+         else if (v_set | v_clr | (|spm_enter) | (|binv_sets) | (|snoop_way)) v_reg <= (v_reg & ~v_clr_mask) | v_set_mask;
+         else v_reg <= v_reg;
+      end
+
       // Valid-Tag memories & replacement-policy
       if (NWAYS > 1) begin : g_nways
          // reason for the 2 generates for single vs multiple ways
          wire [NWAYS_W-1:0] way_hit_bin, way_select_bin;
-         // valid-memory
-         always @(posedge clk_i, posedge arst_i) begin
-            if (arst_i) v_reg <= 0;
-            else if (invalidate_i) v_reg <= 0;
-            else if (replace_req_o)
-               v_reg <= v_reg | (1 << (way_select_bin * (2 ** SET_INDEX_W) + index_reg));
-            else v_reg <= v_reg;
-         end
+         wire [  NWAYS-1:0] way_repl;
+         wire [NWAYS_W-1:0] way_repl_bin;
+
+         // maintenance operations act on the way that hits (preloads
+         // refill the locked ways)
+         wire [  NWAYS-1:0] way_lock = way_lock_ext[NWAYS-1:0];
+         wire [  NWAYS-1:0] lock_mask = ((maint_hold & maint_cmd[2]) ? ~way_lock : way_lock) | spm_ways;
+         // the scratchpad ways are never replaced; a mask locking all the ways is ignored
+         wire [  NWAYS-1:0] repl_lock = (&lock_mask) ? spm_ways : lock_mask;
+         assign way_select     = (maint_check & ~maint_cmd[2]) ? way_hit : way_repl;
+         assign way_select_bin = (maint_check & ~maint_cmd[2]) ? way_hit_bin : way_repl_bin;
 
          for (k = 0; k < NWAYS; k = k + 1) begin : g_tag_mem_block
             // valid-memory output stage register - 1 c.c. read-latency (cleaner simulation during rep.)
@@ -268,41 +1267,95 @@ module iob_cache_memory #(
                if (invalidate_i) v[k] <= 0;
                else v[k] <= v_reg[(2**SET_INDEX_W)*k+index];
 
-            // tag-memory
-            iob_ram_sp #(
-               .DATA_W(TAG_W),
-               .ADDR_W(SET_INDEX_W)
-            ) tag_memory (
-                .clk_i (clk_i),
-                .en_i  (req_i),
-                .we_i  (way_select[k] & replace_req_o),
-                .addr_i(index[SET_INDEX_W-1:0]),
-                .d_i   (tag),
-                .d_o   (line_tag[TAG_W*k+:TAG_W])
-            );
+            // tag-memory (with a second read port for port 1 lookups if NBANKS_W > 0, or snoops)
+            if (USE_BANKS | USE_SNOOP) begin : g_tag_dp
+               iob_cache_dp_ram #(
+                  .DATA_W(TAG_W),
+                  .ADDR_W(SET_INDEX_W)
+               ) tag_memory (
+                   .clk_i   (clk_i),
+                   .en_a_i  (req_int | tag_we),
+                   .we_a_i  (tag_way[k] & tag_we),
+                   .addr_a_i(tag_we ? tag_index : index),
+                   .d_a_i   (tag_din),
+                   .d_a_o   (line_tag[TAG_W*k+:TAG_W]),
+                   .en_b_i  (USE_SNOOP ? snoop_i : bank_go),
+                   .addr_b_i(USE_SNOOP ? snoop_addr_index : bank_index),
+                   .d_b_o   (line_tag1[TAG_W*k+:TAG_W])
+               );
+            end else begin : g_tag_sp
+               iob_ram_sp #(
+                  .DATA_W(TAG_W),
+                  .ADDR_W(SET_INDEX_W)
+               ) tag_memory (
+                   .clk_i (clk_i),
+                   .en_i  (req_int | tag_we),
+                   .we_i  (tag_way[k] & tag_we),
+                   .addr_i(tag_we ? tag_index : index),
+                   .d_i   (tag_din),
+                   .d_o   (line_tag[TAG_W*k+:TAG_W])
+               );
+
+               assign line_tag1[TAG_W*k+:TAG_W] = {TAG_W{1'b0}};
+            end
 
             // Way hit signal - hit or replacement
-            assign way_hit[k] = (tag == line_tag[TAG_W*k+:TAG_W]) & v[k];
+            assign way_hit[k] = spm_req ? spm_way[k] : (tag == line_tag[TAG_W*k+:TAG_W]) & v[k] & ~spm_ways[k] & ~snoop_stale;
          end
          // Read Data Multiplexer
          wire [NWAYS*(2**WORD_OFFSET_W)*FE_DATA_W-1:0] line_rdata_tmp = line_rdata >> (FE_DATA_W*({{OFFSET_PAD_W{1'b0}}, offset} + (2**WORD_OFFSET_W)*way_hit_bin));
-         assign rdata_o[FE_DATA_W-1:0] = line_rdata_tmp[FE_DATA_W-1:0];
-
-         // replacement-policy module
-         iob_cache_replacement_policy #(
-            .N_WAYS     (NWAYS),
-            .SET_INDEX_W(SET_INDEX_W),
-            .REP_POLICY (REP_POLICY)
-         ) replacement_policy_algorithm (
-             .clk_i           (clk_i),
-             .cke_i           (cke_i),
-             .reset_i         (arst_i | invalidate_i),
-             .write_en_i      (ack_o),
-             .way_hit_i       (way_hit),
-             .line_addr_i     (index_reg[SET_INDEX_W-1:0]),
-             .way_select_o    (way_select),
-             .way_select_bin_o(way_select_bin)
-         );
+         assign mem_rdata = line_rdata_tmp[FE_DATA_W-1:0];
+
+         // replacement-policy module (two policies selected at runtime with REP_DUEL)
+         if (USE_DUEL) begin : g_rep_duel
+            wire [PSEL_W-1:0] psel;
+
+            iob_cache_replacement_duel #(
+               .N_WAYS        (NWAYS),
+               .SET_INDEX_W   (SET_INDEX_W),
+               .REP_POLICY    (REP_POLICY),
+               .REP_POLICY_ALT(REP_POLICY_ALT),
+               .LOCK          (USE_LOCK | USE_SPM),
+               .PSEL_W        (PSEL_W)
+            ) replacement_policy_algorithm (
+                .clk_i           (clk_i),
+                .cke_i           (cke_i),
+                .reset_i         (arst_i | invalidate_i),
+                .write_en_i      (fe_ack | rep1_go),
+                .way_hit_i       (rep1_go ? rep1_way : (way_hit | (way_select & {NWAYS{rd_alloc_ack}}))),
+                .fill_i          (NON_BLOCKING ? rd_alloc_ack : (demand_req | line_copy)),
+                .fill_way_i      (way_select),
+                .line_addr_i     (rep1_go ? rep1_index : index_reg[SET_INDEX_W-1:0]),
+                .lock_i          (repl_lock),
+                .sel_i           (rep_sel_i),
+                .psel_o          (psel),
+                .way_select_o    (way_repl),
+                .way_select_bin_o(way_repl_bin)
+            );
+
+            assign rep_psel_o = {{(16 - PSEL_W) {1'b0}}, psel};
+         end else begin : g_rep_policy
+            iob_cache_replacement_policy #(
+               .N_WAYS     (NWAYS),
+               .SET_INDEX_W(SET_INDEX_W),
+               .REP_POLICY (REP_POLICY),
+               .LOCK       (USE_LOCK | USE_SPM)
+            ) replacement_policy_algorithm (
+                .clk_i           (clk_i),
+                .cke_i           (cke_i),
+                .reset_i         (arst_i | invalidate_i),
+                .write_en_i      (fe_ack | rep1_go),
+                .way_hit_i       (rep1_go ? rep1_way : (way_hit | (way_select & {NWAYS{rd_alloc_ack}}))),
+                .fill_i          (NON_BLOCKING ? rd_alloc_ack : (demand_req | line_copy)),
+                .fill_way_i      (way_select),
+                .line_addr_i     (rep1_go ? rep1_index : index_reg[SET_INDEX_W-1:0]),
+                .lock_i          (repl_lock),
+                .way_select_o    (way_repl),
+                .way_select_bin_o(way_repl_bin)
+            );
+
+            assign rep_psel_o = 16'd0;
+         end
 
          // onehot-to-binary for way-hit
          iob_cache_onehot_to_bin #(
@@ -312,13 +1365,19 @@ module iob_cache_memory #(
              .bin_o   (way_hit_bin)
          );
 
+         // line in the selected way (evicted to the victim or eviction buffer)
+         wire [TAG_W-1:0] evict_tag = line_tag >> (way_select_bin * TAG_W);
+         assign evict_line  = {evict_tag, index_reg};
+         assign evict_data  = line_rdata >> (way_select_bin * LINE_DATA_W);
+         assign evict_valid = v[way_select_bin];
+
          // dirty-memory
          if (WRITE_POL == `IOB_CACHE_MEMORY_WRITE_BACK) begin : g_write_back
             always @(posedge clk_i, posedge arst_i) begin
                if (arst_i) dirty_reg <= 0;
-               else if (write_req_o)
-                  dirty_reg <= dirty_reg & ~(1<<(way_select_bin*(2**SET_INDEX_W) + index_reg)); // updates position with 0
-               else if (write_access & hit)
+               else if (dirty_clr)
+                  dirty_reg <= (dirty_reg & ~(1<<(way_select_bin*(2**SET_INDEX_W) + index_reg))) | (dirty_copy<<(way_select_bin*(2**SET_INDEX_W) + index_reg)); // updates position with 0 (or with the dirty bit of the line copied in)
+               else if (write_access & hit & ~spm_req)
                   dirty_reg <= dirty_reg |  (1<<(way_hit_bin*(2**SET_INDEX_W) + index_reg)); // updates position with 1
                else dirty_reg <= dirty_reg;
             end
@@ -328,23 +1387,14 @@ module iob_cache_memory #(
                always @(posedge clk_i) dirty[k] <= dirty_reg[(2**SET_INDEX_W)*k+index];
             end
 
-            // flush line
-            assign write_req_o = req_reg_i & ~(|way_hit) & dirty[way_select_bin]; //flush if there is not a hit, and the way selected is dirty
-            wire [TAG_W-1:0] tag_flush = line_tag >> (way_select_bin * TAG_W);  //auxiliary wire
-            assign write_addr_o = {
-               tag_flush, index_reg
-            };  //the position of the current block in cache (not of the access)
-            assign write_wdata_o = line_rdata >> (way_select_bin * FE_DATA_W * (2 ** WORD_OFFSET_W));
-
+            // flush line: written back from the victim or eviction buffer
+            assign evict_dirty = v[way_select_bin] & dirty[way_select_bin];
+         end else begin : g_write_through
+            assign evict_dirty = 1'b0;
          end
       end else begin : g_one_way  // (NWAYS = 1)
-         // valid-memory
-         always @(posedge clk_i, posedge arst_i) begin
-            if (arst_i) v_reg <= 0;
-            else if (invalidate_i) v_reg <= 0;
-            else if (replace_req_o) v_reg <= v_reg | (1 << index);
-            else v_reg <= v_reg;
-         end
+         assign way_select = 1'b1;
+         assign rep_psel_o = 16'd0;
 
          // valid-memory output stage register - 1 c.c. read-latency (cleaner simulation during rep.)
          always @(posedge clk_i) begin
@@ -352,24 +1402,48 @@ module iob_cache_memory #(
             else v <= v_reg[index];
          end
 
-         // tag-memory
-         iob_ram_sp #(
-            .DATA_W(TAG_W),
-            .ADDR_W(SET_INDEX_W)
-         ) tag_memory (
-             .clk_i (clk_i),
-             .en_i  (req_i),
-             .we_i  (replace_req_o),
-             .addr_i(index),
-             .d_i   (tag),
-             .d_o   (line_tag)
-         );
+         // tag-memory (with a second read port for port 1 lookups if NBANKS_W > 0, or snoops)
+         if (USE_BANKS | USE_SNOOP) begin : g_tag_dp
+            iob_cache_dp_ram #(
+               .DATA_W(TAG_W),
+               .ADDR_W(SET_INDEX_W)
+            ) tag_memory (
+                .clk_i   (clk_i),
+                .en_a_i  (req_int | tag_we),
+                .we_a_i  (tag_we),
+                .addr_a_i(tag_we ? tag_index : index),
+                .d_a_i   (tag_din),
+                .d_a_o   (line_tag),
+                .en_b_i  (USE_SNOOP ? snoop_i : bank_go),
+                .addr_b_i(USE_SNOOP ? snoop_addr_index : bank_index),
+                .d_b_o   (line_tag1)
+            );
+         end else begin : g_tag_sp
+            iob_ram_sp #(
+               .DATA_W(TAG_W),
+               .ADDR_W(SET_INDEX_W)
+            ) tag_memory (
+                .clk_i (clk_i),
+                .en_i  (req_int | tag_we),
+                .we_i  (tag_we),
+                .addr_i(tag_we ? tag_index : index),
+                .d_i   (tag_din),
+                .d_o   (line_tag)
+            );
+
+            assign line_tag1 = {TAG_W{1'b0}};
+         end
 
          // Cache hit signal that indicates which way has had the hit (also during replacement)
-         assign way_hit                = (tag == line_tag) & v;
+         assign way_hit                = (tag == line_tag) & v & ~snoop_stale;
 
          // Read Data Multiplexer
-         assign rdata_o[FE_DATA_W-1:0] = line_rdata >> FE_DATA_W * offset;
+         assign mem_rdata = line_rdata >> FE_DATA_W * offset;
+
+         // line evicted to the victim or eviction buffer
+         assign evict_line  = {line_tag, index_reg};
+         assign evict_data  = line_rdata;
+         assign evict_valid = v;
 
          // dirty-memory
          if (WRITE_POL == `IOB_CACHE_MEMORY_WRITE_BACK) begin : g_write_back
@@ -377,9 +1451,9 @@ module iob_cache_memory #(
             always @(posedge clk_i, posedge arst_i) begin
                if (arst_i) begin
                   dirty_reg <= 0;
-               end else if (write_req_o) begin
-                  // updates postion with 0
-                  dirty_reg <= dirty_reg & ~(1 << (index_reg));
+               end else if (dirty_clr) begin
+                  // updates postion with 0 (or with the dirty bit of the line copied in)
+                  dirty_reg <= (dirty_reg & ~(1 << (index_reg))) | (dirty_copy << (index_reg));
                end else if (write_access & hit) begin
                   // updates position with 1 (needs to be index_reg otherwise updates the new index if the previous access was a write)
                   dirty_reg <= dirty_reg | (1 << (index_reg));
@@ -390,13 +1464,10 @@ module iob_cache_memory #(
 
             always @(posedge clk_i) dirty <= dirty_reg[index];
 
-            // flush line
-            // flush if there is not a hit, and is dirty
-            assign write_req_o = req_reg_i & ~(way_hit) & dirty;
-            assign write_addr_o = {
-               line_tag, index
-            };  // the position of the current block in cache (not of the access)
-            assign write_wdata_o = line_rdata;
+            // flush line: written back from the victim or eviction buffer
+            assign evict_dirty = v & dirty;
+         end else begin : g_write_through
+            assign evict_dirty = 1'b0;
          end
       end
    endgenerate
@@ -0,0 +1,257 @@
+// SPDX-FileCopyrightText: 2026 IObundle
+//
+// SPDX-License-Identifier: CERN-OHL-S-2.0
+
+`timescale 1ns / 1ps
+
+// Miss Status Holding Registers (MSHRs) and in-order read response queue of
+// the non-blocking cache. Each MSHR holds one outstanding line refill. Misses
+// are issued to the back-end in allocation order. If the back-end accepts
+// several outstanding refills (RD_TXN_W > 0), each refill is tagged with its
+// MSHR number and the refills may complete in any order; otherwise they are
+// issued one at a time. Read responses wait in the queue until the line they
+// need arrives, so that data is returned to the front-end in request order.
+module iob_cache_mshr #(
+   parameter N_MSHR        = 2,
+   parameter FE_DATA_W     = 32,
+   parameter BE_DATA_W     = 32,
+   parameter LINE_ADDR_W   = 16,
+   parameter SET_INDEX_W   = 7,
+   parameter NWAYS         = 2,
+   parameter WORD_OFFSET_W = 3,
+   parameter LINE2BE_W     = 3,
+   parameter RD_TXN_W      = 0,
+   parameter RD_ID_W       = 1,
+   parameter RSPQ_W        = $clog2(N_MSHR) + 2
+) (
+   input clk_i,
+   input arst_i,
+   input invalidate_i,
+
+   // lookup of the request being processed
+   input  [  LINE_ADDR_W-1:0] line_addr_i,
+   output                     match_o,         // line already has an MSHR
+   output                     match_issued_o,  // ... and its refill was already issued
+   output                     set_busy_o,      // set has an MSHR (refill in progress)
+   output                     full_o,
+   input                      alloc_i,
+   input  [        NWAYS-1:0] alloc_way_i,
+
+   // read response queue
+   input                      rsp_push_i,
+   input                      rsp_wait_i,      // response waits for a line refill
+   input  [    FE_DATA_W-1:0] rsp_data_i,
+   input  [WORD_OFFSET_W-1:0] rsp_offset_i,
+   output                     rsp_empty_o,
+   output                     rsp_full_o,
+   output                     rvalid_o,
+   output [    FE_DATA_W-1:0] rdata_o,
+
+   // back-end read channel
+   input                      can_issue_i,
+   output                     replace_req_o,
+   output [  LINE_ADDR_W-1:0] replace_addr_o,
+   output [    LINE2BE_W-1:0] replace_word_o,   // requested word (critical-word-first)
+   output [      RD_ID_W-1:0] replace_id_o,
+   input                      replace_i,
+   input                      read_req_i,
+   input  [    LINE2BE_W-1:0] read_addr_i,
+   input  [    BE_DATA_W-1:0] read_rdata_i,
+   input  [      RD_ID_W-1:0] read_id_i,
+   input                      read_last_i,
+
+   // line receiving the current refill beat
+   output [        NWAYS-1:0] fill_way_o,
+   output [  LINE_ADDR_W-1:0] fill_line_o,
+
+   // line whose refill completed
+   output                     fill_done_o,
+   output                     fill_valid_o,    // not invalidated during the refill
+   output [        NWAYS-1:0] done_way_o,
+   output [  LINE_ADDR_W-1:0] done_line_o
+);
+
+   localparam MSHR_W = (N_MSHR > 1) ? $clog2(N_MSHR) : 1;
+   localparam RSPQ_DEPTH = 2 ** RSPQ_W;
+   localparam BE_WORDS_W = $clog2(BE_DATA_W / FE_DATA_W);
+   localparam [LINE_ADDR_W-1:0] SET_MASK = (1 << SET_INDEX_W) - 1;
+
+   integer m, t;
+
+   //
+   // MSHR file
+   //
+   reg  [     N_MSHR-1:0] mshr_v;
+   reg  [     N_MSHR-1:0] mshr_issued;
+   reg  [     N_MSHR-1:0] mshr_inv;
+   reg  [  LINE_ADDR_W-1:0] mshr_line [N_MSHR-1:0];
+   reg  [        NWAYS-1:0] mshr_way  [N_MSHR-1:0];
+   reg  [    LINE2BE_W-1:0] mshr_word [N_MSHR-1:0];
+   reg  [     MSHR_W-1:0] alloc_id;
+   reg  [     MSHR_W-1:0] inflight_id;  // last refill issued
+   reg                    done_reg;
+   reg  [     MSHR_W-1:0] done_id;
+
+   reg                    match;
+   reg                    match_issued;
+   reg                    set_busy;
+   reg  [     MSHR_W-1:0] match_id;
+
+   always @* begin
+      match        = 1'b0;
+      match_issued = 1'b0;
+      set_busy     = 1'b0;
+      match_id     = {MSHR_W{1'b0}};
+      for (m = 0; m < N_MSHR; m = m + 1) begin
+         if (mshr_v[m] & (mshr_line[m] == line_addr_i)) begin
+            match        = 1'b1;
+            match_issued = mshr_issued[m];
+            match_id     = m;
+         end
+         if (mshr_v[m] & (((mshr_line[m] ^ line_addr_i) & SET_MASK) == {LINE_ADDR_W{1'b0}}))
+            set_busy = 1'b1;
+      end
+   end
+
+   assign match_o        = match;
+   assign match_issued_o = match_issued;
+   assign set_busy_o     = set_busy;
+   assign full_o         = &mshr_v;
+
+   // MSHRs complete out of order: the first free one is allocated
+   always @* begin
+      alloc_id = {MSHR_W{1'b0}};
+      for (m = N_MSHR - 1; m >= 0; m = m - 1) if (~mshr_v[m]) alloc_id = m;
+   end
+
+   //
+   // Issue queue: MSHRs waiting for their refill to be issued, in allocation order
+   //
+   reg  [MSHR_W-1:0] iq      [N_MSHR-1:0];
+   reg  [MSHR_W-1:0] iq_wptr, iq_rptr;
+   reg  [  MSHR_W:0] iq_level;
+   wire [MSHR_W-1:0] issue_id = iq[iq_rptr];
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         iq_wptr  <= {MSHR_W{1'b0}};
+         iq_rptr  <= {MSHR_W{1'b0}};
+         iq_level <= {(MSHR_W + 1) {1'b0}};
+      end else begin
+         if (alloc_i) iq_wptr <= (iq_wptr == N_MSHR - 1) ? {MSHR_W{1'b0}} : iq_wptr + 1'b1;
+         if (replace_req_o) iq_rptr <= (iq_rptr == N_MSHR - 1) ? {MSHR_W{1'b0}} : iq_rptr + 1'b1;
+         iq_level <= iq_level + alloc_i - replace_req_o;
+      end
+   end
+
+   always @(posedge clk_i) if (alloc_i) iq[iq_wptr] <= alloc_id;
+
+   // a single-transaction back-end holds the address until the refill ends;
+   // a multi-transaction back-end takes it when the request is accepted
+   assign replace_req_o  = (iq_level != 0) & ~replace_i & can_issue_i;
+   assign replace_addr_o = replace_i ? mshr_line[inflight_id] : mshr_line[issue_id];
+   assign replace_word_o = replace_i ? mshr_word[inflight_id] : mshr_word[issue_id];
+   assign replace_id_o   = issue_id;
+
+   // refill beats are tagged with the MSHR number, or belong to the refill
+   // in progress; the refill ends one clock cycle after its last beat, once
+   // the data memory has been written
+   wire [MSHR_W-1:0] fill_id = (RD_TXN_W > 0) ? read_id_i : inflight_id;
+   wire fill_beat = read_req_i;
+   assign fill_way_o   = mshr_way[fill_id];
+   assign fill_line_o  = mshr_line[fill_id];
+   assign fill_done_o  = done_reg;
+   assign fill_valid_o = ~mshr_inv[done_id];
+   assign done_way_o   = mshr_way[done_id];
+   assign done_line_o  = mshr_line[done_id];
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         mshr_v      <= {N_MSHR{1'b0}};
+         mshr_issued <= {N_MSHR{1'b0}};
+         mshr_inv    <= {N_MSHR{1'b0}};
+         inflight_id <= {MSHR_W{1'b0}};
+         done_reg    <= 1'b0;
+         done_id     <= {MSHR_W{1'b0}};
+      end else begin
+         done_reg <= read_req_i & read_last_i;
+         done_id  <= fill_id;
+         if (invalidate_i) mshr_inv <= mshr_v;
+         if (alloc_i) begin
+            mshr_v[alloc_id]      <= 1'b1;
+            mshr_issued[alloc_id] <= 1'b0;
+            mshr_inv[alloc_id]    <= 1'b0;
+         end
+         if (replace_req_o) begin
+            mshr_issued[issue_id] <= 1'b1;
+            inflight_id           <= issue_id;
+         end
+         if (fill_done_o) mshr_v[done_id] <= 1'b0;
+      end
+   end
+
+   always @(posedge clk_i) begin
+      if (alloc_i) begin
+         mshr_line[alloc_id] <= line_addr_i;
+         mshr_way[alloc_id]  <= alloc_way_i;
+         mshr_word[alloc_id] <= rsp_offset_i >> BE_WORDS_W;
+      end
+   end
+
+   //
+   // In-order read response queue
+   //
+   reg  [RSPQ_DEPTH-1:0] rsp_wait;
+   reg  [    MSHR_W-1:0] rsp_id     [RSPQ_DEPTH-1:0];
+   reg  [WORD_OFFSET_W-1:0] rsp_offset [RSPQ_DEPTH-1:0];
+   reg  [ FE_DATA_W-1:0] rsp_data   [RSPQ_DEPTH-1:0];
+   reg  [    RSPQ_W-1:0] rsp_wptr, rsp_rptr;
+   reg  [      RSPQ_W:0] rsp_level;
+
+   assign rsp_empty_o = (rsp_level == 0);
+   assign rsp_full_o  = (rsp_level == RSPQ_DEPTH);
+   assign rvalid_o    = ~rsp_empty_o & ~rsp_wait[rsp_rptr];
+   assign rdata_o     = rsp_data[rsp_rptr];
+
+   // word of the refill beat requested by each waiting response
+   wire [RSPQ_DEPTH-1:0] beat_match;
+   genvar q;
+   generate
+      for (q = 0; q < RSPQ_DEPTH; q = q + 1) begin : g_beat_match
+         if (LINE2BE_W > 0) begin : g_line2be_w
+            assign beat_match[q] = ((rsp_offset[q] >> BE_WORDS_W) == read_addr_i);
+         end else begin : g_no_line2be_w
+            assign beat_match[q] = 1'b1;
+         end
+      end
+   endgenerate
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         rsp_wptr  <= {RSPQ_W{1'b0}};
+         rsp_rptr  <= {RSPQ_W{1'b0}};
+         rsp_level <= {(RSPQ_W + 1) {1'b0}};
+      end else begin
+         rsp_wptr  <= rsp_wptr + rsp_push_i;
+         rsp_rptr  <= rsp_rptr + rvalid_o;
+         rsp_level <= rsp_level + rsp_push_i - rvalid_o;
+      end
+   end
+
+   always @(posedge clk_i) begin
+      // capture the requested words while the line is refilled
+      for (t = 0; t < RSPQ_DEPTH; t = t + 1) begin
+         if (fill_beat & rsp_wait[t] & (rsp_id[t] == fill_id) & beat_match[t]) begin
+            rsp_data[t] <= read_rdata_i >> (FE_DATA_W * (rsp_offset[t] % (2 ** BE_WORDS_W)));
+            rsp_wait[t] <= 1'b0;
+         end
+      end
+      if (rsp_push_i) begin
+         rsp_wait[rsp_wptr]   <= rsp_wait_i;
+         rsp_id[rsp_wptr]     <= alloc_i ? alloc_id : match_id;
+         rsp_offset[rsp_wptr] <= rsp_offset_i;
+         rsp_data[rsp_wptr]   <= rsp_data_i;
+      end
+   end
+
+endmodule
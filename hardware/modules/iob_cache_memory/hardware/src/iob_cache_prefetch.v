@@ -0,0 +1,170 @@
+// SPDX-FileCopyrightText: 2026 IObundle
+//
+// SPDX-License-Identifier: CERN-OHL-S-2.0
+
+`timescale 1ns / 1ps
+
+`include "iob_cache_memory_conf.vh"
+
+// Prefetch engine. Each read miss (line refill or prefetch buffer hit) trains
+// the engine, which requests the next line (PREFETCH == NEXT_LINE) or, once
+// the distance between the last misses repeats, the line one stride ahead
+// (PREFETCH == STRIDE). The prefetched line is refilled through the back-end
+// read channel into a one-line prefetch buffer, from where it is copied into
+// the cache on the next miss to that line. Stores to the prefetched line
+// also update the prefetch buffer, even if the line is still being refilled.
+module iob_cache_prefetch #(
+   parameter PREFETCH      = 1,
+   parameter LINE_W        = 16,
+   parameter FE_DATA_W     = 32,
+   parameter BE_DATA_W     = 32,
+   parameter WORD_OFFSET_W = 3,
+   parameter LINE2BE_W     = 3,
+   parameter LINE_DATA_W   = FE_DATA_W * (2 ** WORD_OFFSET_W)
+) (
+   input clk_i,
+   input arst_i,
+
+   input en_i,
+   input invalidate_i,
+
+   // read misses (training) and stores
+   input                     miss_i,
+   input [       LINE_W-1:0] miss_line_i,
+   input                     store_i,
+   input [       LINE_W-1:0] store_line_i,
+   input [WORD_OFFSET_W-1:0] store_offset_i,
+   input [    FE_DATA_W-1:0] store_wdata_i,
+   input [  FE_DATA_W/8-1:0] store_wstrb_i,
+
+   // prefetch buffer lookup
+   input  [     LINE_W-1:0] line_i,
+   output                   hit_o,        // line_i is in the prefetch buffer
+   output                   busy_o,       // line_i is being prefetched
+   input                    use_i,        // prefetch buffer line copied into the cache
+   output [LINE_DATA_W-1:0] line_data_o,
+
+   // back-end read channel
+   output                     req_o,
+   output     [   LINE_W-1:0] req_line_o,
+   input                      issue_i,
+   output reg                 fill_o,        // back-end read channel refilling the prefetch buffer
+   output reg [   LINE_W-1:0] fill_line_o,
+   input                      replace_i,
+   input                      read_req_i,
+   input      [LINE2BE_W-1:0] read_addr_i,
+   input      [BE_DATA_W-1:0] read_rdata_i,
+
+   // prefetch counters enables
+   output useful_o,
+   output useless_o
+);
+
+   localparam LINE_NBYTES = LINE_DATA_W / 8;
+   localparam BE_NBYTES = BE_DATA_W / 8;
+
+   reg                    req_v;
+   reg  [     LINE_W-1:0] req_line;
+   reg                    buf_v;
+   reg  [     LINE_W-1:0] buf_line;
+   reg  [LINE_DATA_W-1:0] buf_data;
+   reg  [LINE_NBYTES-1:0] buf_wmask;  // bytes written by stores during the refill
+   reg                    fill_stale;
+   reg                    replace_reg;
+   reg                    train_v;
+   reg  [     LINE_W-1:0] train_line;
+   reg  [     LINE_W-1:0] stride;
+
+   wire [     LINE_W-1:0] miss_stride = miss_line_i - train_line;
+   wire                   fill_end = fill_o & replace_reg & ~replace_i;
+   // invalidations discard the prefetched line
+   wire                   buf_kill = buf_v & invalidate_i;
+   wire                   fill_kill = invalidate_i;
+   // stores to the prefetched line (or to the line being prefetched) are
+   // written in the prefetch buffer
+   wire                   store_buf = store_i & (issue_i ? (store_line_i == req_line) :
+                                                 ((buf_v & (store_line_i == buf_line)) | (fill_o & (store_line_i == fill_line_o))));
+   wire [LINE_NBYTES-1:0] store_mask = {{(LINE_NBYTES-FE_DATA_W/8){1'b0}}, store_wstrb_i} << (store_offset_i * (FE_DATA_W / 8));
+   wire [LINE_NBYTES-1:0] fill_mask = {{(LINE_NBYTES-BE_NBYTES){1'b0}}, {BE_NBYTES{fill_o & read_req_i}}} << (read_addr_i * BE_NBYTES);
+   // lines already prefetched are not requested again
+   wire                   req_dup = (buf_v & (req_line == buf_line)) | (fill_o & (req_line == fill_line_o));
+
+   assign hit_o       = buf_v & (line_i == buf_line);
+   assign busy_o      = fill_o & (line_i == fill_line_o);
+   assign line_data_o = buf_data;
+
+   assign req_o       = en_i & req_v & ~req_dup & ~fill_o;
+   assign req_line_o  = req_line;
+
+   assign useful_o    = use_i;
+   // prefetched lines discarded before being used
+   assign useless_o   = (buf_v & ~use_i & (issue_i | buf_kill)) | (fill_end & (fill_stale | fill_kill));
+
+   // training
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         req_v      <= 1'b0;
+         req_line   <= {LINE_W{1'b0}};
+         train_v    <= 1'b0;
+         train_line <= {LINE_W{1'b0}};
+         stride     <= {LINE_W{1'b0}};
+      end else if (invalidate_i) begin
+         req_v   <= 1'b0;
+         train_v <= 1'b0;
+      end else if (miss_i & en_i) begin
+         if (PREFETCH == `IOB_CACHE_MEMORY_PF_NEXT_LINE) begin
+            req_v    <= 1'b1;
+            req_line <= miss_line_i + 1'b1;
+         end else begin  // PREFETCH == PF_STRIDE
+            // a stride is followed once it is seen twice in a row
+            req_v      <= train_v & (miss_stride == stride) & (|stride);
+            req_line   <= miss_line_i + miss_stride;
+            train_v    <= 1'b1;
+            train_line <= miss_line_i;
+            stride     <= train_v ? miss_stride : {LINE_W{1'b0}};
+         end
+      end else if (issue_i | req_dup) begin
+         req_v <= 1'b0;
+      end
+   end
+
+   // prefetch buffer
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         replace_reg <= 1'b0;
+         fill_o      <= 1'b0;
+         fill_line_o <= {LINE_W{1'b0}};
+         fill_stale  <= 1'b0;
+         buf_v       <= 1'b0;
+         buf_line    <= {LINE_W{1'b0}};
+      end else begin
+         replace_reg <= replace_i;
+         if (issue_i) begin
+            fill_o      <= 1'b1;
+            fill_line_o <= req_line;
+            fill_stale  <= invalidate_i;
+            buf_v       <= 1'b0;
+         end else if (fill_end) begin
+            fill_o   <= 1'b0;
+            buf_v    <= ~(fill_stale | fill_kill);
+            buf_line <= fill_line_o;
+         end else begin
+            if (fill_kill) fill_stale <= 1'b1;
+            if (use_i | buf_kill) buf_v <= 1'b0;
+         end
+      end
+   end
+
+   // the refill does not overwrite the bytes already written by stores
+   integer b;
+   always @(posedge clk_i) begin
+      if (issue_i) buf_wmask <= {LINE_NBYTES{1'b0}};
+      if (store_buf) buf_wmask <= (issue_i ? {LINE_NBYTES{1'b0}} : buf_wmask) | store_mask;
+
+      for (b = 0; b < LINE_NBYTES; b = b + 1) begin
+         if (store_buf & store_mask[b]) buf_data[b*8+:8] <= store_wdata_i[(b%(FE_DATA_W/8))*8+:8];
+         else if (fill_mask[b] & ~buf_wmask[b]) buf_data[b*8+:8] <= read_rdata_i[(b%BE_NBYTES)*8+:8];
+      end
+   end
+
+endmodule
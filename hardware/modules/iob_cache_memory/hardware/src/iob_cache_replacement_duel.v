@@ -0,0 +1,104 @@
+// SPDX-FileCopyrightText: 2026 IObundle
+//
+// SPDX-License-Identifier: CERN-OHL-S-2.0
+
+`timescale 1ns / 1ps
+
+`include "iob_cache_memory_conf.vh"
+
+// Two replacement policies kept up to date side by side, one of them selected
+// at runtime (sel_i): REP_POLICY (0), REP_POLICY_ALT (1) or set-dueling (2).
+// In set-dueling, the sets whose DUEL_W index LSBs are all 0 always use
+// REP_POLICY and those with all 1 always use REP_POLICY_ALT. Their misses move
+// a saturating counter (psel_o) up or down, and its MSB selects the policy of
+// the other sets: the policy with fewer leader set misses.
+module iob_cache_replacement_duel #(
+   parameter N_WAYS         = 8,
+   parameter SET_INDEX_W    = 0,
+   parameter NWAYS_W        = $clog2(N_WAYS),
+   parameter REP_POLICY     = `IOB_CACHE_MEMORY_LRU,
+   parameter REP_POLICY_ALT = `IOB_CACHE_MEMORY_SRRIP,
+   parameter LOCK           = 0,
+   parameter PSEL_W         = 10,
+   parameter DUEL_W         = (SET_INDEX_W > 5) ? 5 : SET_INDEX_W  // 1 leader set per policy every 2**DUEL_W sets
+) (
+   input                    clk_i,
+   input                    cke_i,
+   input                    reset_i,
+   input                    write_en_i,
+   input  [     N_WAYS-1:0] way_hit_i,
+   input                    fill_i,
+   input  [     N_WAYS-1:0] fill_way_i,
+   input  [SET_INDEX_W-1:0] line_addr_i,
+   input  [     N_WAYS-1:0] lock_i,
+   input  [            1:0] sel_i,
+   output [     PSEL_W-1:0] psel_o,
+   output [     N_WAYS-1:0] way_select_o,
+   output [    NWAYS_W-1:0] way_select_bin_o
+);
+
+   wire [N_WAYS-1:0] main_select, alt_select;
+   wire [NWAYS_W-1:0] main_select_bin, alt_select_bin;
+
+   iob_cache_replacement_policy #(
+      .N_WAYS     (N_WAYS),
+      .SET_INDEX_W(SET_INDEX_W),
+      .REP_POLICY (REP_POLICY),
+      .LOCK       (LOCK)
+   ) main_policy (
+      .clk_i           (clk_i),
+      .cke_i           (cke_i),
+      .reset_i         (reset_i),
+      .write_en_i      (write_en_i),
+      .way_hit_i       (way_hit_i),
+      .fill_i          (fill_i),
+      .fill_way_i      (fill_way_i),
+      .line_addr_i     (line_addr_i),
+      .lock_i          (lock_i),
+      .way_select_o    (main_select),
+      .way_select_bin_o(main_select_bin)
+   );
+
+   iob_cache_replacement_policy #(
+      .N_WAYS     (N_WAYS),
+      .SET_INDEX_W(SET_INDEX_W),
+      .REP_POLICY (REP_POLICY_ALT),
+      .LOCK       (LOCK)
+   ) alt_policy (
+      .clk_i           (clk_i),
+      .cke_i           (cke_i),
+      .reset_i         (reset_i),
+      .write_en_i      (write_en_i),
+      .way_hit_i       (way_hit_i),
+      .fill_i          (fill_i),
+      .fill_way_i      (fill_way_i),
+      .line_addr_i     (line_addr_i),
+      .lock_i          (lock_i),
+      .way_select_o    (alt_select),
+      .way_select_bin_o(alt_select_bin)
+   );
+
+   // leader sets
+   wire         [DUEL_W-1:0] duel_bits = line_addr_i[DUEL_W-1:0];
+   wire                      main_leader = ~(|duel_bits);
+   wire                      alt_leader = &duel_bits;
+
+   // policy selector: misses in the main policy leaders count up
+   reg          [PSEL_W-1:0] psel;
+   always @(posedge clk_i, posedge reset_i) begin
+      if (reset_i) psel <= {1'b0, {(PSEL_W - 1) {1'b1}}};
+      else if (cke_i & fill_i) begin
+         if (main_leader & ~(&psel)) psel <= psel + 1'b1;
+         else if (alt_leader & (|psel)) psel <= psel - 1'b1;
+      end
+   end
+   assign psel_o = psel;
+
+   wire use_alt = (sel_i == 2'd0) ? 1'b0 :
+                  (sel_i == 2'd1) ? 1'b1 :
+                  main_leader ? 1'b0 : alt_leader ? 1'b1 : psel[PSEL_W-1];
+
+   assign way_select_o     = use_alt ? alt_select : main_select;
+   assign way_select_bin_o = use_alt ? alt_select_bin : main_select_bin;
+
+endmodule
@@ -10,20 +10,26 @@ module iob_cache_replacement_policy #(
    parameter N_WAYS      = 8,
    parameter SET_INDEX_W = 0,
    parameter NWAYS_W     = $clog2(N_WAYS),
-   parameter REP_POLICY  = `IOB_CACHE_MEMORY_PLRU_TREE
+   parameter REP_POLICY  = `IOB_CACHE_MEMORY_PLRU_TREE,
+   parameter LOCK        = 0  // locked ways (lock_i) are never selected
 ) (
    input                    clk_i,
    input                    cke_i,
    input                    reset_i,
    input                    write_en_i,
    input  [     N_WAYS-1:0] way_hit_i,
+   input                    fill_i,       // fill_way_i replaced in line_addr_i set
+   input  [     N_WAYS-1:0] fill_way_i,   // way_select_o, unless another policy selected it
    input  [SET_INDEX_W-1:0] line_addr_i,
+   input  [     N_WAYS-1:0] lock_i,
    output [     N_WAYS-1:0] way_select_o,
    output [    NWAYS_W-1:0] way_select_bin_o
 );
 
    genvar i, j;
 
+   wire [N_WAYS-1:0] lock = LOCK ? lock_i : {N_WAYS{1'b0}};
+
    generate
       if (REP_POLICY == `IOB_CACHE_MEMORY_LRU) begin : g_LRU
          wire [N_WAYS*NWAYS_W-1:0] mru_out, mru_in;
@@ -45,9 +51,32 @@ module iob_cache_replacement_policy #(
             // LRU - Encoder
             assign mru [i*NWAYS_W +: NWAYS_W] = (|mru_out)? mru_out [i*NWAYS_W +: NWAYS_W] : i; // verifies if the mru line has been initialized (if any bit in mru_output is HIGH), otherwise applies the priority values
             assign mru_cnt [i*NWAYS_W +: NWAYS_W] = (way_hit_i[i])? {NWAYS_W{1'b1}} : (mru[i*NWAYS_W +: NWAYS_W] > mru_index) ? mru[i*NWAYS_W +: NWAYS_W] - 1 : mru[i*NWAYS_W +: NWAYS_W]; // the MRU way gets updated to the the highest value; the remaining, if their value was bigger than the MRU index previous value (mru_index), they get decremented
+         end
 
-            // LRU - Decoder (checks every index in search for the lowest (0)
-            assign way_select_o [i] = ~(|mru[i*NWAYS_W+:NWAYS_W]); // selects the way that has the lowest priority (mru = 0)
+         if (LOCK) begin : g_lock
+            // LRU - Decoder: unlocked way with the lowest priority
+            reg     [NWAYS_W-1:0] lru_bin;
+            reg     [NWAYS_W-1:0] lru_mru;
+            reg                   lru_found;
+            integer               k;
+            always @* begin
+               lru_bin   = {NWAYS_W{1'b0}};
+               lru_mru   = {NWAYS_W{1'b1}};
+               lru_found = 1'b0;
+               for (k = 0; k < N_WAYS; k = k + 1) begin
+                  if (~lock[k] & (~lru_found | (mru[k*NWAYS_W+:NWAYS_W] < lru_mru))) begin
+                     lru_bin   = k[NWAYS_W-1:0];
+                     lru_mru   = mru[k*NWAYS_W+:NWAYS_W];
+                     lru_found = 1'b1;
+                  end
+               end
+            end
+            assign way_select_o = {{(N_WAYS - 1) {1'b0}}, 1'b1} << lru_bin;
+         end else begin : g_no_lock
+            for (i = 0; i < N_WAYS; i = i + 1) begin : g_decoder
+               // LRU - Decoder (checks every index in search for the lowest (0)
+               assign way_select_o [i] = ~(|mru[i*NWAYS_W+:NWAYS_W]); // selects the way that has the lowest priority (mru = 0)
+            end
          end
 
          assign mru_in = (|way_hit_i)? mru_cnt : mru_out; // If an hit occured, then it updates, to avoid updating during a (write) miss (mru_cnt would decrement every way besides the lowest)
@@ -75,15 +104,21 @@ module iob_cache_replacement_policy #(
          );
       end else if (REP_POLICY == `IOB_CACHE_MEMORY_PLRU_MRU) begin : g_PLRU_MRU
          wire [N_WAYS -1:0] mru_in, mru_out;
+         wire [N_WAYS -1:0] mru_lock, mru_sel;
 
          // pseudo LRU MRU based Encoder (More Recenty-Used bits):
-         assign mru_in = (&(mru_out | way_hit_i))? way_hit_i : mru_out | way_hit_i; // When the cache access results in a hi, it will update the MRU signal, if all ways were used, it resets and only updated the Most Recent
+         assign mru_in = (&(mru_out | way_hit_i | lock))? way_hit_i : mru_out | way_hit_i; // When the cache access results in a hi, it will update the MRU signal, if all (unlocked) ways were used, it resets and only updated the Most Recent
+
+         // locked ways are treated as recently used; if all the unlocked ways
+         // were used, the first unlocked way is selected
+         assign mru_lock = mru_out | lock;
+         assign mru_sel  = (&mru_lock) ? lock : mru_lock;
 
          // pseudo LRU MRU based Decoder:
          for (i = 1; i < N_WAYS; i = i + 1) begin : g_way_select_block
-            assign way_select_o[i] = ~mru_out[i] & (&mru_out[i-1:0]);  // verifies priority (lower index)
+            assign way_select_o[i] = ~mru_sel[i] & (&mru_sel[i-1:0]);  // verifies priority (lower index)
          end
-         assign way_select_o[0] = ~mru_out[0];
+         assign way_select_o[0] = ~mru_sel[0];
 
          // Most Recently Used (MRU) memory
          iob_regarray_sp #(
@@ -106,6 +141,124 @@ module iob_cache_replacement_policy #(
              .onehot_i(way_select_o[N_WAYS-1:1]),
              .bin_o   (way_select_bin_o)
          );
+      end else if ((REP_POLICY == `IOB_CACHE_MEMORY_RANDOM) || (REP_POLICY == `IOB_CACHE_MEMORY_FIFO)) begin : g_RANDOM_FIFO
+         wire [NWAYS_W-1:0] start_bin;  // candidate way
+
+         if (REP_POLICY == `IOB_CACHE_MEMORY_RANDOM) begin : g_RANDOM
+            // 16-bit Galois LFSR (x^16+x^14+x^13+x^11+1), advanced on each
+            // replacement so that the sequence of candidate ways is repeatable
+            reg [15:0] lfsr;
+            always @(posedge clk_i, posedge reset_i) begin
+               if (reset_i) lfsr <= 16'd1;
+               else if (cke_i & fill_i) lfsr <= {1'b0, lfsr[15:1]} ^ (lfsr[0] ? 16'hB400 : 16'h0000);
+            end
+            assign start_bin = lfsr[NWAYS_W-1:0];
+         end else begin : g_FIFO
+            // round-robin: each set replaces its ways in order
+            wire [NWAYS_W-1:0] fifo_in, fifo_out;
+            wire [NWAYS_W-1:0] fill_bin;
+
+            iob_cache_onehot_to_bin #(NWAYS_W) fill_binary (
+                .onehot_i(fill_way_i[N_WAYS-1:1]),
+                .bin_o   (fill_bin)
+            );
+
+            assign fifo_in   = fill_bin + 1'b1;
+            assign start_bin = fifo_out;
+
+            // FIFO pointer memory
+            iob_regarray_sp #(
+               .ADDR_W(SET_INDEX_W),
+               .DATA_W(NWAYS_W)
+            ) fifo_memory (
+                .clk_i (clk_i),
+                .cke_i (cke_i),
+                .arst_i(reset_i),
+
+                .rst_i (1'b0),
+                .we_i  (fill_i),
+                .addr_i(line_addr_i),
+                .d_i   (fifo_in),
+                .d_o   (fifo_out)
+            );
+         end
+
+         // first unlocked way from the candidate way on
+         reg     [NWAYS_W-1:0] sel_bin;
+         reg                   sel_found;
+         integer               k;
+         always @* begin
+            sel_bin   = start_bin;
+            sel_found = 1'b0;
+            for (k = 0; k < N_WAYS; k = k + 1) begin
+               if (~sel_found & ~lock[(start_bin+k)%N_WAYS]) begin
+                  sel_bin   = start_bin + k[NWAYS_W-1:0];
+                  sel_found = 1'b1;
+               end
+            end
+         end
+
+         assign way_select_bin_o = sel_bin;
+         assign way_select_o     = {{(N_WAYS - 1) {1'b0}}, 1'b1} << sel_bin;
+      end else if (REP_POLICY == `IOB_CACHE_MEMORY_SRRIP) begin : g_SRRIP
+         // Static Re-Reference Interval Prediction: a 2-bit re-reference
+         // prediction value (RRPV) per way. Replaced lines are predicted a long
+         // re-reference interval (2) and hits a near one (0), so lines used
+         // once (scans) are replaced before the reused ones. The unlocked way
+         // with the highest RRPV is replaced, after aging the set so that its
+         // RRPV is distant (3).
+         wire [2*N_WAYS-1:0] rrpv_in, rrpv_out;
+         reg                 replay;  // next hit is the replay of the miss that refilled the line
+
+         always @(posedge clk_i, posedge reset_i) begin
+            if (reset_i) replay <= 1'b0;
+            else if (cke_i & fill_i) replay <= ~write_en_i;
+            else if (cke_i & write_en_i) replay <= 1'b0;
+         end
+
+         reg     [NWAYS_W-1:0] rrpv_bin;
+         reg     [        1:0] rrpv_max;
+         reg                   rrpv_found;
+         integer               k;
+         always @* begin
+            rrpv_bin   = {NWAYS_W{1'b0}};
+            rrpv_max   = 2'd0;
+            rrpv_found = 1'b0;
+            for (k = 0; k < N_WAYS; k = k + 1) begin
+               if (~lock[k] & (~rrpv_found | (rrpv_out[2*k+:2] > rrpv_max))) begin
+                  rrpv_bin   = k[NWAYS_W-1:0];
+                  rrpv_max   = rrpv_out[2*k+:2];
+                  rrpv_found = 1'b1;
+               end
+            end
+         end
+
+         for (i = 0; i < N_WAYS; i = i + 1) begin : g_rrpv
+            wire [1:0] rrpv = rrpv_out[2*i+:2];
+            // aged by the distance of the highest RRPV to 3 (locked ways saturate)
+            wire [1:0] rrpv_aged = (rrpv > rrpv_max) ? 2'd3 : rrpv + (2'd3 - rrpv_max);
+            assign rrpv_in[2*i+:2] = fill_i ? (fill_way_i[i] ? 2'd2 : rrpv_aged) :
+                                     (way_hit_i[i] & ~replay) ? 2'd0 : rrpv;
+         end
+
+         assign way_select_bin_o = rrpv_bin;
+         assign way_select_o     = {{(N_WAYS - 1) {1'b0}}, 1'b1} << rrpv_bin;
+
+         // RRPV memory
+         iob_regarray_sp #(
+            .ADDR_W(SET_INDEX_W),
+            .DATA_W(2 * N_WAYS)
+         ) rrpv_memory (
+             .clk_i (clk_i),
+             .cke_i (cke_i),
+             .arst_i(reset_i),
+
+             .rst_i (1'b0),
+             .we_i  (write_en_i | fill_i),
+             .addr_i(line_addr_i),
+             .d_i   (rrpv_in),
+             .d_o   (rrpv_out)
+         );
       end else begin : g_PLRU_TREE
          // (REP_POLICY == PLRU_TREE)
          /*
@@ -135,10 +288,20 @@ module iob_cache_replacement_policy #(
 
          wire [N_WAYS -1:1] tree_in, tree_out;
          wire [NWAYS_W:0] node_id[NWAYS_W:1];
-         assign node_id[1] = tree_out[1] ? 3 : 2;  // next node id @ level2 to traverse
+
+         // subtrees with all their ways locked are not traversed
+         wire [2*N_WAYS-1:1] node_lock;  // all ways under the node locked
+         wire [  N_WAYS-1:1] tree_dir;  // traverse direction
+         assign node_lock[2*N_WAYS-1:N_WAYS] = lock;
+         for (i = 1; i < N_WAYS; i = i + 1) begin : g_node_lock
+            assign node_lock[i] = node_lock[2*i] & node_lock[2*i+1];
+            assign tree_dir[i]  = node_lock[2*i] | (tree_out[i] & ~node_lock[2*i+1]);
+         end
+
+         assign node_id[1] = tree_dir[1] ? 3 : 2;  // next node id @ level2 to traverse
          for (i = 2; i <= NWAYS_W; i = i + 1) begin : g_traverse_tree_level
             // next node id @ level3, level4, ..., to traverse
-            assign node_id[i] = tree_out[node_id[i-1]] ? ((node_id[i-1]<<1)+1) : (node_id[i-1]<<1);
+            assign node_id[i] = tree_dir[node_id[i-1]] ? ((node_id[i-1]<<1)+1) : (node_id[i-1]<<1);
          end
 
          for (i = 1; i <= NWAYS_W; i = i + 1) begin : tree_level
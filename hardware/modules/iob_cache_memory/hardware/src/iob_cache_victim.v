@@ -0,0 +1,149 @@
+// SPDX-FileCopyrightText: 2026 IObundle
+//
+// SPDX-License-Identifier: CERN-OHL-S-2.0
+
+`timescale 1ns / 1ps
+
+// Victim buffer. Small fully-associative buffer with the last N_VICTIM lines
+// evicted from the cache, looked up in parallel with the tag memories. A miss
+// that hits the victim buffer swaps the line back into the cache: the line it
+// evicts takes its place in the buffer. Other evicted lines replace the oldest
+// entry. Stores to a line in the buffer (write-through write misses) update
+// it. Dirty lines (write-back) are written back from the buffer, one at a
+// time, when the back-end write channel is free; their entries are not
+// reused, nor swapped while being written, before the write completes.
+module iob_cache_victim #(
+   parameter N_VICTIM      = 2,
+   parameter LINE_W        = 16,
+   parameter FE_DATA_W     = 32,
+   parameter WORD_OFFSET_W = 3,
+   parameter LINE_DATA_W   = FE_DATA_W * (2 ** WORD_OFFSET_W)
+) (
+   input clk_i,
+   input arst_i,
+   input invalidate_i,
+
+   // lookup
+   input  [     LINE_W-1:0] line_i,
+   output                   hit_o,
+   output                   hit_dirty_o,
+   output                   hit_busy_o,   // line_i is being written back
+   output [LINE_DATA_W-1:0] hit_data_o,
+   output                   ready_o,      // the oldest entry can be replaced
+
+   // line evicted from the cache (stored in the entry hit by line_i, if any)
+   input                   evict_i,
+   input                   evict_valid_i,
+   input                   evict_dirty_i,
+   input [     LINE_W-1:0] evict_line_i,
+   input [LINE_DATA_W-1:0] evict_data_i,
+
+   // stores to line_i
+   input                     store_i,
+   input [WORD_OFFSET_W-1:0] store_offset_i,
+   input [    FE_DATA_W-1:0] store_wdata_i,
+   input [  FE_DATA_W/8-1:0] store_wstrb_i,
+
+   // dirty lines write-back
+   input                    write_en_i,
+   output                   write_req_o,
+   output [     LINE_W-1:0] write_line_o,
+   output [LINE_DATA_W-1:0] write_data_o,
+   input                    write_ack_i
+);
+
+   localparam VB_W = (N_VICTIM > 1) ? $clog2(N_VICTIM) : 1;
+   localparam LINE_NBYTES = LINE_DATA_W / 8;
+
+   integer e, b;
+
+   reg  [   N_VICTIM-1:0] vb_v;
+   reg  [   N_VICTIM-1:0] vb_dirty;
+   reg  [     LINE_W-1:0] vb_line    [N_VICTIM-1:0];
+   reg  [LINE_DATA_W-1:0] vb_data    [N_VICTIM-1:0];
+   reg  [       VB_W-1:0] vb_wptr;  // oldest entry
+   reg                    wb_busy;  // write-back in progress
+   reg  [       VB_W-1:0] wb_id;
+
+   reg                    hit;
+   reg  [       VB_W-1:0] hit_id;
+   reg                    wb_pending;
+   reg  [       VB_W-1:0] wb_sel;
+
+   wire [       VB_W-1:0] evict_id = hit ? hit_id : vb_wptr;
+   wire [       VB_W-1:0] write_id = wb_busy ? wb_id : wb_sel;
+   wire [LINE_NBYTES-1:0] store_mask = {{(LINE_NBYTES-FE_DATA_W/8){1'b0}}, store_wstrb_i} << (store_offset_i * (FE_DATA_W / 8));
+
+   always @* begin
+      hit    = 1'b0;
+      hit_id = {VB_W{1'b0}};
+      for (e = 0; e < N_VICTIM; e = e + 1) begin
+         if (vb_v[e] & (vb_line[e] == line_i)) begin
+            hit    = 1'b1;
+            hit_id = e;
+         end
+      end
+   end
+
+   // the first dirty entry is written back
+   always @* begin
+      wb_pending = 1'b0;
+      wb_sel     = {VB_W{1'b0}};
+      for (e = N_VICTIM - 1; e >= 0; e = e - 1) begin
+         if (vb_v[e] & vb_dirty[e]) begin
+            wb_pending = 1'b1;
+            wb_sel     = e;
+         end
+      end
+   end
+
+   assign hit_o        = hit;
+   assign hit_dirty_o  = vb_dirty[hit_id];
+   assign hit_busy_o   = hit & wb_busy & (wb_id == hit_id);
+   assign hit_data_o   = vb_data[hit_id];
+   assign ready_o      = ~(vb_v[vb_wptr] & vb_dirty[vb_wptr]) & ~(wb_busy & (wb_id == vb_wptr));
+
+   // the write-back line and data are held until the write completes
+   assign write_req_o  = wb_pending & ~wb_busy & write_en_i;
+   assign write_line_o = vb_line[write_id];
+   assign write_data_o = vb_data[write_id];
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         vb_v     <= {N_VICTIM{1'b0}};
+         vb_dirty <= {N_VICTIM{1'b0}};
+         vb_wptr  <= {VB_W{1'b0}};
+         wb_busy  <= 1'b0;
+         wb_id    <= {VB_W{1'b0}};
+      end else begin
+         if (write_req_o) begin
+            wb_busy          <= 1'b1;
+            wb_id            <= wb_sel;
+            vb_dirty[wb_sel] <= 1'b0;
+         end else if (write_ack_i) begin
+            wb_busy <= 1'b0;
+         end
+
+         if (invalidate_i) begin
+            vb_v     <= {N_VICTIM{1'b0}};
+            vb_dirty <= {N_VICTIM{1'b0}};
+         end else if (evict_i & (hit | evict_valid_i)) begin
+            // a swapped line frees its entry if the evicted line is not valid
+            vb_v[evict_id]     <= evict_valid_i;
+            vb_dirty[evict_id] <= evict_valid_i & evict_dirty_i;
+            if (~hit) vb_wptr <= (vb_wptr == N_VICTIM - 1) ? {VB_W{1'b0}} : vb_wptr + 1'b1;
+         end
+      end
+   end
+
+   always @(posedge clk_i) begin
+      if (evict_i & (hit | evict_valid_i)) begin
+         vb_line[evict_id] <= evict_line_i;
+         vb_data[evict_id] <= evict_data_i;
+      end else if (store_i & hit) begin
+         for (b = 0; b < LINE_NBYTES; b = b + 1)
+            if (store_mask[b]) vb_data[hit_id][b*8+:8] <= store_wdata_i[(b%(FE_DATA_W/8))*8+:8];
+      end
+   end
+
+endmodule
@@ -0,0 +1,85 @@
+// SPDX-FileCopyrightText: 2026 IObundle
+//
+// SPDX-License-Identifier: CERN-OHL-S-2.0
+
+`timescale 1ns / 1ps
+
+// Write-combining stage of the write-through buffer. Stores are merged into an
+// open entry that covers an aligned window of 2**COMB_W words, ORing their
+// byte strobes. The entry is pushed into the write-through buffer when a store
+// to another window arrives, or when the buffer has drained (flush_i), so
+// stores keep being combined while older entries are written to memory.
+module iob_cache_write_comb #(
+   parameter ADDR_W    = 22,  // word address width
+   parameter DATA_W    = 32,
+   parameter COMB_W    = 1,
+   //derived parameters
+   parameter NBYTES    = DATA_W / 8,
+   parameter ENTRY_W   = (ADDR_W - COMB_W) + DATA_W * (2 ** COMB_W) + NBYTES * (2 ** COMB_W)
+) (
+   input clk_i,
+   input arst_i,
+
+   // stores from the front-end
+   input                  valid_i,
+   input  [   ADDR_W-1:0] addr_i,
+   input  [   DATA_W-1:0] wdata_i,
+   input  [   NBYTES-1:0] wstrb_i,
+   output                 ready_o,  // store can be accepted in this cycle
+
+   // write-through buffer
+   input                  full_i,
+   input                  flush_i,  // buffer is empty: push the open entry
+   output                 push_o,
+   output [  ENTRY_W-1:0] entry_o,  // {addr, wdata, wstrb}
+   output                 empty_o
+);
+
+   localparam WORDS = 2 ** COMB_W;
+
+   reg                          comb_v;
+   reg  [    ADDR_W-COMB_W-1:0] comb_addr;
+   reg  [     DATA_W*WORDS-1:0] comb_data;
+   reg  [     NBYTES*WORDS-1:0] comb_strb;
+
+   // store placed in the window
+   wire [       COMB_W-1:0] word = addr_i[COMB_W-1:0];
+   wire [NBYTES*WORDS-1:0] wstrb_win = {{(NBYTES * (WORDS - 1)) {1'b0}}, wstrb_i} << (word * NBYTES);
+   wire [DATA_W*WORDS-1:0] wdata_win = {WORDS{wdata_i}};
+
+   wire match = comb_v & (comb_addr == addr_i[ADDR_W-1:COMB_W]);
+
+   assign ready_o = ~comb_v | match | ~full_i;
+   assign push_o  = comb_v & ~full_i & (valid_i ? ~match : flush_i);
+   assign entry_o = {comb_addr, comb_data, comb_strb};
+   assign empty_o = ~comb_v;
+
+   integer b;
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         comb_v <= 1'b0;
+      end else if (valid_i) begin
+         comb_v <= 1'b1;
+      end else if (push_o) begin
+         comb_v <= 1'b0;
+      end
+   end
+
+   always @(posedge clk_i) begin
+      if (valid_i) begin
+         if (match) begin
+            // merge: the newest bytes overwrite the older ones
+            for (b = 0; b < NBYTES * WORDS; b = b + 1) begin
+               if (wstrb_win[b]) comb_data[b*8+:8] <= wdata_win[b*8+:8];
+            end
+            comb_strb <= comb_strb | wstrb_win;
+         end else begin
+            comb_addr <= addr_i[ADDR_W-1:COMB_W];
+            comb_data <= wdata_win;
+            comb_strb <= wstrb_win;
+         end
+      end
+   end
+
+endmodule
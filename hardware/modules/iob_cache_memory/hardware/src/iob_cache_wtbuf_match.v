@@ -0,0 +1,65 @@
+// SPDX-FileCopyrightText: 2026 IObundle
+//
+// SPDX-License-Identifier: CERN-OHL-S-2.0
+
+`timescale 1ns / 1ps
+
+// Line addresses of the stores pending in the write-through buffer. Follows
+// the pushes and pops of the buffer and compares all pending entries with a
+// line address, so that a line refill only waits for the stores to that line
+// instead of waiting for the whole buffer to drain.
+module iob_cache_wtbuf_match #(
+   parameter DEPTH_W = 4,
+   parameter LINE_W  = 16
+) (
+   input clk_i,
+   input arst_i,
+
+   // write-through buffer
+   input              push_i,
+   input [LINE_W-1:0] push_line_i,
+   input              pop_i,
+
+   // lookup
+   input  [LINE_W-1:0] line_i,
+   output              match_o
+);
+
+   localparam DEPTH = 2 ** DEPTH_W;
+
+   reg  [ DEPTH-1:0] entry_v;
+   reg  [LINE_W-1:0] entry_line[DEPTH-1:0];
+   reg  [DEPTH_W-1:0] wptr, rptr;
+   wire [ DEPTH-1:0] entry_match;
+
+   genvar e;
+   generate
+      for (e = 0; e < DEPTH; e = e + 1) begin : g_entry_match
+         assign entry_match[e] = entry_v[e] & (entry_line[e] == line_i);
+      end
+   endgenerate
+
+   assign match_o = |entry_match;
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         entry_v <= {DEPTH{1'b0}};
+         wptr    <= {DEPTH_W{1'b0}};
+         rptr    <= {DEPTH_W{1'b0}};
+      end else begin
+         if (pop_i) begin
+            entry_v[rptr] <= 1'b0;
+            rptr          <= rptr + 1'b1;
+         end
+         if (push_i) begin
+            entry_v[wptr] <= 1'b1;
+            wptr          <= wptr + 1'b1;
+         end
+      end
+   end
+
+   always @(posedge clk_i) begin
+      if (push_i) entry_line[wptr] <= push_line_i;
+   end
+
+endmodule
@@ -68,19 +68,43 @@ def setup(py_params: dict):
         },
         {
             "name": "WTBUF_DEPTH_W",
-            "descr": "Write-through buffer depth (log2). A shallow buffer will fill up more frequently and cause write stalls; however, on a Read After Write (RAW) event, a shallow buffer will empty faster, decreasing the duration of the read stall. A deep buffer is unlkely to get full and cause write stalls; on the other hand, on a RAW event, it will take a long time to empty and cause long read stalls.",
+            "descr": "Write-through buffer depth (log2). A shallow buffer will fill up more frequently and cause write stalls. A deep buffer is unlikely to get full and cause write stalls. The addresses of the pending stores are compared with the line to refill on a read miss, so the refill only waits for the stores to the same line (Read After Write, RAW) and not for the whole buffer to drain.",
             "type": "P",
             "val": "4",
             "min": "",
             "max": "",
         },
+        {
+            "name": "WTBUF_COMB_W",
+            "descr": "Write-through buffer write-combining window (log2 of front-end words). Set to 0 to disable write combining.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "WORD_OFFSET_W",
+        },
         {
             "name": "REP_POLICY",
-            "descr": "Line replacement policy: set to 0 for Least Recently Used (LRU); set to 1 for Pseudo LRU based on Most Recently Used (PLRU_MRU); set to 2 for tree-based Pseudo LRU (PLRU_TREE).",
+            "descr": "Line replacement policy: set to 0 for Least Recently Used (LRU); set to 1 for Pseudo LRU based on Most Recently Used (PLRU_MRU); set to 2 for tree-based Pseudo LRU (PLRU_TREE); set to 3 for LFSR-based pseudo-random (RANDOM); set to 4 for First-In-First-Out (FIFO); set to 5 for Static Re-Reference Interval Prediction (SRRIP).",
             "type": "P",
             "val": "0",
             "min": "0",
-            "max": "3",
+            "max": "5",
+        },
+        {
+            "name": "REP_DUEL",
+            "descr": "Second replacement policy (1) or not (0). Both REP_POLICY and REP_POLICY_ALT are kept up to date and rep_sel_i selects REP_POLICY (0), REP_POLICY_ALT (1) or the policy chosen by set-dueling (2).",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "REP_POLICY_ALT",
+            "descr": "Second line replacement policy (REP_DUEL=1), with the same encoding as REP_POLICY.",
+            "type": "P",
+            "val": "5",
+            "min": "0",
+            "max": "5",
         },
         {
             "name": "WRITE_POL",
@@ -106,7 +130,110 @@ def setup(py_params: dict):
             "min": "0",
             "max": "1",
         },
+        {
+            "name": "N_MSHR",
+            "descr": "Number of Miss Status Holding Registers. Set to 0 for a blocking cache; otherwise read misses do not block the front-end (write-through only).",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "16",
+        },
+        {
+            "name": "CRIT_WORD_FIRST",
+            "descr": "Critical-word-first line refill and early restart (1) or not (0).",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "PREFETCH",
+            "descr": "Prefetcher: none (0), next-line (1) or stride (2). Blocking write-through cache only.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "2",
+        },
+        {
+            "name": "RD_TXN_W",
+            "descr": "Outstanding back-end line refills (log2). Set to 0 to issue one refill at a time. Non-blocking cache only: refills are tagged with their MSHR number.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "4",
+        },
+        {
+            "name": "N_VICTIM",
+            "descr": "Number of victim buffer lines. Set to 0 for no victim buffer. Blocking cache only: misses to the last evicted lines swap them back into the cache; dirty lines are written back from the victim buffer.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "16",
+        },
+        {
+            "name": "MAINT",
+            "descr": "Address-range clean and invalidate operations (1) or not (0). Blocking cache without victim buffer only.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "WAY_LOCK",
+            "descr": "Way lockdown (1) or not (0): the replacement policy does not select the ways locked by way_lock_i.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "SPM",
+            "descr": "Scratchpad mode (1) or not (0): the first spm_ways_i ways are not used by the cache and the scratchpad accesses (spm_reg_i) hit in way spm_way_reg_i. Blocking cache only.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "NBANKS_W",
+            "descr": "Second front-end port (fe1_io) with the data memory interleaved in 2**NBANKS_W banks by word offset (NBANKS_W > 0), or single front-end port (0). The number of banks is limited to the number of words per line. Blocking cache only.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "WORD_OFFSET_W",
+        },
+        {
+            "name": "READ_ONLY",
+            "descr": "Read-only cache (1), such as an instruction cache, or not (0). A read-only write-through cache has no write-through buffer: the front-end must not issue stores.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "BINV_W",
+            "descr": "Back-invalidation block size (log2 of bytes), usually the line size of the lower-level cache of an inclusive hierarchy. binv_i invalidates all the ways of the sets that may hold a line of the block at binv_addr_i. Set to 0 for no back-invalidation.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "FE_ADDR_W",
+        },
+        {
+            "name": "SNOOP",
+            "descr": "Snoop (1) or not (0): snoop_i invalidates only the way holding the line at snoop_addr_i, looked up through a second read port of the tag memory; requests to the snooped line miss until its valid bit is cleared. Independent of the back-invalidation (BINV_W). Requires NBANKS_W=0.",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "1",
+        },
         # Derived parameters
+        {
+            "name": "RD_ID_W",
+            "type": "D",
+            "val": "(RD_TXN_W > 0) ? RD_TXN_W : 1",
+            "min": "1",
+            "max": "4",
+        },
         {
             "name": "FE_NBYTES",
             "type": "D",
@@ -174,12 +301,31 @@ def setup(py_params: dict):
             "signals": [
                 {"name": "req_i", "width": 1},
                 {"name": "addr_i", "width": "ADDR_W"},
+                {"name": "offset_i", "width": "WORD_OFFSET_W"},
                 {"name": "rdata_o", "width": "FE_DATA_W"},
                 {"name": "ack_o", "width": 1},
+                {"name": "rvalid_o", "width": 1},
                 {"name": "req_reg_i", "width": 1},
                 {"name": "addr_reg_i", "width": "ADDR_REG_W"},
                 {"name": "wdata_reg_i", "width": "FE_DATA_W"},
                 {"name": "wstrb_reg_i", "width": "FE_NBYTES"},
+                {"name": "spm_reg_i", "width": 1},
+                {"name": "spm_way_reg_i", "width": 8},
+            ],
+        },
+        {
+            "name": "fe1_io",
+            "descr": "Second cache memory front-end interface (NBANKS_W > 0)",
+            "signals": [
+                {"name": "req1_i", "width": 1},
+                {"name": "addr1_i", "width": "ADDR_REG_W"},
+                {"name": "rdata1_o", "width": "FE_DATA_W"},
+                {"name": "ack1_o", "width": 1},
+                {"name": "rvalid1_o", "width": 1},
+                {"name": "req1_reg_i", "width": 1},
+                {"name": "addr1_reg_i", "width": "ADDR_REG_W"},
+                {"name": "wdata1_reg_i", "width": "FE_DATA_W"},
+                {"name": "wstrb1_reg_i", "width": "FE_NBYTES"},
             ],
         },
         {
@@ -189,14 +335,15 @@ def setup(py_params: dict):
                 {"name": "write_req_o", "width": 1},
                 {
                     "name": "write_addr_o",
-                    "width": "FE_ADDR_W - (FE_NBYTES_W + WRITE_POL*WORD_OFFSET_W)",
+                    "width": "FE_ADDR_W - (FE_NBYTES_W + WRITE_POL*WORD_OFFSET_W + (1-WRITE_POL)*WTBUF_COMB_W)",
                 },
                 {
                     "name": "write_wdata_o",
-                    "width": "FE_DATA_W + WRITE_POL*(FE_DATA_W*(2**WORD_OFFSET_W)-FE_DATA_W)",
+                    "width": "FE_DATA_W*(2**(WRITE_POL*WORD_OFFSET_W + (1-WRITE_POL)*WTBUF_COMB_W))",
                 },
-                {"name": "write_wstrb_o", "width": "FE_NBYTES"},
+                {"name": "write_wstrb_o", "width": "FE_NBYTES*(2**((1-WRITE_POL)*WTBUF_COMB_W))"},
                 {"name": "write_ack_i", "width": 1},
+                {"name": "write_idle_i", "width": 1},
             ],
         },
         {
@@ -204,14 +351,37 @@ def setup(py_params: dict):
             "descr": "Back-end read channel",
             "signals": [
                 {"name": "replace_req_o", "width": 1},
+                {"name": "replace_ready_i", "width": 1},
                 {"name": "replace_i", "width": 1},
                 {
                     "name": "replace_addr_o",
                     "width": "FE_ADDR_W-(BE_NBYTES_W+LINE2BE_W)",
                 },
+                {"name": "replace_word_o", "width": "LINE2BE_W"},
+                {"name": "replace_id_o", "width": "RD_ID_W"},
                 {"name": "read_req_i", "width": 1},
                 {"name": "read_addr_i", "width": "LINE2BE_W"},
                 {"name": "read_rdata_i", "width": "BE_DATA_W"},
+                {"name": "read_id_i", "width": "RD_ID_W"},
+                {"name": "read_last_i", "width": 1},
+            ],
+        },
+        {
+            "name": "incl_io",
+            "descr": "Inclusive hierarchy: lines replaced in the cache and back-invalidation from the lower-level cache",
+            "signals": [
+                {"name": "evict_o", "width": 1},
+                {"name": "evict_addr_o", "width": "FE_ADDR_W"},
+                {"name": "binv_i", "width": 1},
+                {"name": "binv_addr_i", "width": "FE_ADDR_W"},
+            ],
+        },
+        {
+            "name": "snoop_io",
+            "descr": "Snoop channel: lines written by external writers (SNOOP > 0)",
+            "signals": [
+                {"name": "snoop_i", "width": 1},
+                {"name": "snoop_addr_i", "width": "FE_ADDR_W"},
             ],
         },
         {
@@ -225,6 +395,24 @@ def setup(py_params: dict):
                 {"name": "write_miss_o", "width": 1},
                 {"name": "read_hit_o", "width": 1},
                 {"name": "read_miss_o", "width": 1},
+                {"name": "prefetch_en_i", "width": 1},
+                {"name": "pf_useful_o", "width": 1},
+                {"name": "pf_useless_o", "width": 1},
+                {"name": "stall_miss_o", "width": 1},
+                {"name": "stall_raw_o", "width": 1},
+                {"name": "stall_wtbuf_o", "width": 1},
+                {"name": "stall_flush_o", "width": 1},
+                {"name": "dirty_evict_o", "width": 1},
+                {"name": "wtbuf_level_o", "width": "WTBUF_DEPTH_W+1"},
+                {"name": "maint_start_i", "width": 1},
+                {"name": "maint_cmd_i", "width": 3},
+                {"name": "maint_addr_i", "width": "FE_DATA_W"},
+                {"name": "maint_len_i", "width": "FE_DATA_W"},
+                {"name": "maint_busy_o", "width": 1},
+                {"name": "way_lock_i", "width": "FE_DATA_W"},
+                {"name": "spm_ways_i", "width": 8},
+                {"name": "rep_sel_i", "width": 2},
+                {"name": "rep_psel_o", "width": 16},
             ],
         },
     ]
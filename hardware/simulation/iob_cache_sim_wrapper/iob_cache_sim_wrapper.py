@@ -5,10 +5,26 @@
 
 def setup(py_params_dict):
     params = {
-        # Confs passed by issuer (iob_cache)
+        # Confs passed by issuer (iob_cache or iob_cache_hierarchy)
         "cache_confs": [],
+        # Core of the unit under test (issuer)
+        "uut": "iob_cache",
         "fe_if": "iob",
         "be_if": "axi",
+        # Log the front-end and back-end transactions to cosim.log
+        "cosim": 0,
+        # Throughput stream on the front-end port before the testbench
+        "tput": 0,
+        # Second front-end port of the cache (driven by the bank stream)
+        "nbanks_w": 0,
+        # Instruction cache front-end port (driven by the ifetch stream)
+        "harvard": 0,
+        # Inclusion port of the cache (not driven by the testbench)
+        "binv_w": 0,
+        # Additional front-end ports of the cache (driven by the ports stream)
+        "fe_ports": 1,
+        # Snoop channel of the cache (driven by the snoop stream)
+        "snoop": 0,
     }
 
     # Update params with values from py_params_dict
@@ -17,6 +33,7 @@ def setup(py_params_dict):
             params[param] = py_params_dict[param]
 
     assert params["be_if"] in ["axi", "iob"], "Invalid BE_IF"
+    assert params["uut"] in ["iob_cache", "iob_cache_hierarchy"], "Invalid UUT"
 
     attributes_dict = {
         "name": "iob_uut",
@@ -81,6 +98,16 @@ def setup(py_params_dict):
                 {"name": "wtb_empty_o_int", "width": 1},
             ],
         },
+        {
+            "name": "tb_fe",
+            "descr": "Testbench or wrapper stream requests",
+            "signals": {
+                "type": "iob",
+                "prefix": "tb_",
+                "ADDR_W": "ADDR_W",
+                "DATA_W": "DATA_W",
+            },
+        },
         {
             "name": "cache_fe",
             "descr": "Testbench cache front-end bus",
@@ -91,6 +118,66 @@ def setup(py_params_dict):
             },
         },
     ]
+    if params["nbanks_w"]:
+        attributes_dict["wires"].append(
+            {
+                "name": "cache_fe1",
+                "descr": "Second cache front-end bus (bank stream)",
+                "signals": {
+                    "type": "iob",
+                    "prefix": "internal1_",
+                    "ADDR_W": "FE_ADDR_W",
+                },
+            }
+        )
+    if params["harvard"]:
+        attributes_dict["wires"].append(
+            {
+                "name": "cache_ife",
+                "descr": "Instruction cache front-end bus (ifetch stream)",
+                "signals": {
+                    "type": "iob",
+                    "prefix": "internal_i_",
+                    "ADDR_W": "FE_ADDR_W",
+                },
+            }
+        )
+    for p in range(1, params["fe_ports"]):
+        attributes_dict["wires"].append(
+            {
+                "name": f"cache_fe_p{p}",
+                "descr": f"Cache front-end port {p} bus (ports stream)",
+                "signals": {
+                    "type": "iob",
+                    "prefix": f"internal_p{p}_",
+                    "ADDR_W": "ADDR_W",
+                },
+            }
+        )
+    if params["snoop"]:
+        attributes_dict["wires"].append(
+            {
+                "name": "snoop",
+                "descr": "Cache snoop channel (snoop stream)",
+                "signals": [
+                    {"name": "snoop_int", "width": 1},
+                    {"name": "snoop_addr_int", "width": "FE_ADDR_W"},
+                ],
+            }
+        )
+    if params["binv_w"]:
+        attributes_dict["wires"].append(
+            {
+                "name": "incl",
+                "descr": "Cache inclusion port (no lower-level cache)",
+                "signals": [
+                    {"name": "evict_int", "width": 1},
+                    {"name": "evict_addr_int", "width": "FE_ADDR_W"},
+                    {"name": "binv_int", "width": 1},
+                    {"name": "binv_addr_int", "width": "FE_ADDR_W"},
+                ],
+            }
+        )
     if params["be_if"] == "axi":
         attributes_dict["wires"] += [
             {
@@ -151,20 +238,24 @@ def setup(py_params_dict):
     # Blocks
     #
     converter_connect = {
-        "s_s": "cache_s",
+        "s_s": "tb_fe",
         "m_m": "cache_fe",
     }
     if params["fe_if"] != "iob":
         converter_connect["clk_en_rst_s"] = "clk_en_rst_s"
     attributes_dict["subblocks"] = [
         {
-            "core_name": "iob_cache",
+            "core_name": params["uut"],
             "instance_name": "cache",
-            "instance_description": f"Unit Under Test (UUT) Cache instance with '{params['be_if']}' back end interface.",
-            "parameters": {
-                "USE_CTRL": "USE_CTRL",
-                "USE_CTRL_CNT": "USE_CTRL_CNT",
-            },
+            "instance_description": f"Unit Under Test (UUT) {'Cache' if params['uut'] == 'iob_cache' else 'Cache hierarchy'} instance with '{params['be_if']}' back end interface.",
+            "parameters": (
+                {
+                    "USE_CTRL": "USE_CTRL",
+                    "USE_CTRL_CNT": "USE_CTRL_CNT",
+                }
+                if params["uut"] == "iob_cache"
+                else {}
+            ),
             "connect": {
                 "clk_en_rst_s": "clk_en_rst_s",
                 f"{params['fe_if']}_s": "cache_fe",
@@ -185,6 +276,16 @@ def setup(py_params_dict):
             "connect": converter_connect,
         },
     ]
+    if params["nbanks_w"]:
+        attributes_dict["subblocks"][0]["connect"]["iob1_s"] = "cache_fe1"
+    if params["harvard"]:
+        attributes_dict["subblocks"][0]["connect"]["iob_i_s"] = "cache_ife"
+    if params["binv_w"]:
+        attributes_dict["subblocks"][0]["connect"]["incl_io"] = "incl"
+    for p in range(1, params["fe_ports"]):
+        attributes_dict["subblocks"][0]["connect"][f"iob_p{p}_s"] = f"cache_fe_p{p}"
+    if params["snoop"]:
+        attributes_dict["subblocks"][0]["connect"]["snoop_io"] = "snoop"
     if params["be_if"] == "axi":
         attributes_dict["subblocks"] += [
             {
@@ -247,6 +348,796 @@ def setup(py_params_dict):
    assign wtb_empty_i_int = 1'b1;
 """
     ]
+    # Wrapper streams: right after reset, the testbench is held off while they
+    # run one after the other on the front-end port. Each stream stores its
+    # results in its words of the mailbox, checked by the testbench.
+    streams = []
+    if params["tput"]:
+        streams.append(
+            (
+                "tput",
+                """
+   // Throughput stream (tput): a warm-up pass stores and then loads the TPUT_W
+   // words of a cache way, then a back-to-back stream of 8 accesses per word
+   // runs on the cached words: a store of the word, a load of it in the next
+   // clock cycle and 6 loads of other words. The accesses of the stream, the
+   // clock cycles from its first request to its last load data and the load
+   // data errors are stored in the mailbox (checked by throughput_test in
+   // iob_core_tb.c).
+   localparam [31:0] TPUT_W = 2 ** (SET_INDEX_W + WORD_OFFSET_W);
+   localparam [31:0] TPUT_N = 8 * TPUT_W;
+   localparam [31:0] TPUT_DATA = 32'h7E570000;
+   localparam [2:0] TPUT_IDLE = 3'd0, TPUT_STORE = 3'd1, TPUT_LOAD = 3'd2, TPUT_STREAM = 3'd3, TPUT_DRAIN = 3'd4, TPUT_REPORT = 3'd5, TPUT_DONE = 3'd6;
+
+   // value of word w before (stored = 0) and after (stored = 1) the stream stores it
+   function [DATA_W-1:0] tput_word(input [31:0] w, input stored);
+      tput_word = stored ? ~(TPUT_DATA ^ w) : (TPUT_DATA ^ w);
+   endfunction
+
+   // word loaded at position j of the stream accesses to word g: the word
+   // stored in the previous clock cycle, then 6 words spread over the way
+   function [31:0] tput_load(input [31:0] g, input [2:0] j);
+      tput_load = (j == 3'd1) ? g : ((5 * g + 97 * {29'd0, j}) & (TPUT_W - 1));
+   endfunction
+
+   reg  [         2:0] tput_state;
+   reg  [        31:0] tput_k;  // accesses accepted in the current phase
+   reg  [        31:0] tput_r;  // loads returned in the current phase
+   reg  [        31:0] tput_rg;  // group of the next stream load returned
+   reg  [         2:0] tput_rj;  // position of the next stream load returned
+   reg  [        31:0] tput_cycles;
+   reg  [        31:0] tput_errors;
+   wire                tput_busy = (tput_state != TPUT_DONE);
+
+   wire [        31:0] tput_g = tput_k >> 3;
+   wire [         2:0] tput_j = tput_k[2:0];
+   reg                 tput_valid;
+   reg                 tput_store;
+   reg  [        31:0] tput_waddr;
+   reg  [  DATA_W-1:0] tput_wdata;
+   always @* begin
+      tput_valid = 1'b0;
+      tput_store = 1'b0;
+      tput_waddr = tput_k;
+      tput_wdata = tput_word(tput_k, 1'b0);
+      case (tput_state)
+         TPUT_STORE: begin
+            tput_valid = (tput_k < TPUT_W);
+            tput_store = 1'b1;
+         end
+         TPUT_LOAD: tput_valid = (tput_k < TPUT_W);
+         TPUT_STREAM: begin
+            tput_valid = 1'b1;
+            tput_store = (tput_j == 3'd0);
+            tput_waddr = tput_store ? tput_g : tput_load(tput_g, tput_j);
+            tput_wdata = tput_word(tput_g, 1'b1);
+         end
+         TPUT_REPORT: begin
+            tput_valid = 1'b1;
+            tput_store = 1'b1;
+            tput_waddr = MBOX + tput_k;
+            tput_wdata = (tput_k == 0) ? TPUT_N : (tput_k == 1) ? tput_cycles : tput_errors;
+         end
+         default: ;
+      endcase
+   end
+   wire [31:0] tput_baddr = tput_waddr * MBOX_NBYTES;
+   wire [ADDR_W-1:0] tput_addr = tput_baddr[ADDR_W-1:0];
+
+   // a stream load returns word tput_load(tput_rg, tput_rj), stored by the stream if not above tput_rg
+   wire [31:0] tput_rw = tput_load(tput_rg, tput_rj);
+   wire [DATA_W-1:0] tput_exp = (tput_state == TPUT_LOAD) ? tput_word(tput_r, 1'b0) : tput_word(tput_rw, tput_rw <= tput_rg);
+
+   wire tput_accept = tput_valid & tb_iob_ready;
+   wire tput_ret = tput_busy & tb_iob_rvalid;
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         tput_state  <= TPUT_IDLE;
+         tput_k      <= 32'd0;
+         tput_r      <= 32'd0;
+         tput_rg     <= 32'd0;
+         tput_rj     <= 3'd1;
+         tput_cycles <= 32'd0;
+         tput_errors <= 32'd0;
+      end else begin
+         if (tput_accept) tput_k <= tput_k + 32'd1;
+         if (tput_ret) begin
+            tput_r <= tput_r + 32'd1;
+            if (tb_iob_rdata != tput_exp) tput_errors <= tput_errors + 32'd1;
+            if (tput_state != TPUT_LOAD) begin
+               tput_rj <= (tput_rj == 3'd7) ? 3'd1 : tput_rj + 3'd1;
+               if (tput_rj == 3'd7) tput_rg <= tput_rg + 32'd1;
+            end
+         end
+         case (tput_state)
+            TPUT_IDLE: if (tput_go) tput_state <= TPUT_STORE;
+            TPUT_STORE:
+            if (tput_k == TPUT_W) begin
+               tput_state <= TPUT_LOAD;
+               tput_k     <= 32'd0;
+            end
+            TPUT_LOAD:
+            if ((tput_k == TPUT_W) && (tput_r == TPUT_W)) begin
+               tput_state <= TPUT_STREAM;
+               tput_k     <= 32'd0;
+               tput_r     <= 32'd0;
+            end
+            TPUT_STREAM: begin
+               tput_cycles <= tput_cycles + 32'd1;
+               if (tput_accept && (tput_k == TPUT_N - 1)) tput_state <= TPUT_DRAIN;
+            end
+            TPUT_DRAIN: begin
+               tput_cycles <= tput_cycles + 32'd1;
+               if (tput_ret && (tput_r == 7 * TPUT_W - 1)) begin
+                  tput_state <= TPUT_REPORT;
+                  tput_k     <= 32'd0;
+               end
+            end
+            TPUT_REPORT: if (tput_accept && (tput_k == 2)) tput_state <= TPUT_DONE;
+            default: ;
+         endcase
+      end
+   end
+""",
+            )
+        )
+    if params["nbanks_w"]:
+        streams.append(
+            (
+                "bank",
+                """
+   // Banked second port stream (bank, NBANKS_W > 0): the BK_W words of a
+   // region are stored and loaded on port 0 to bring them into the cache. Then
+   // ports 0 and 1 load a pair of words in the same clock cycle, BK_W times
+   // from different banks (port 1 loads the word next to the word of port 0)
+   // and BK_W times from the same bank (the same word), each pair after the
+   // replacement policy update of the previous one. Different banks are looked
+   // up at once, so both loads hit and return their data in the same clock
+   // cycle; the same bank is looked up by one port after the other. The port 1
+   // loads, the clock cycles in which both ports returned data and the load
+   // data errors are stored in the mailbox (checked by bank_test in
+   // iob_core_tb.c).
+   localparam [31:0] BK_W = 4 * (2 ** WORD_OFFSET_W);
+   localparam [31:0] BK_BASE = MBOX / 4;
+   localparam [31:0] BK_DATA = 32'hBA4C0000;
+   localparam [2:0] BK_IDLE = 3'd0, BK_STORE = 3'd1, BK_LOAD = 3'd2, BK_PAIR = 3'd3, BK_GAP = 3'd4, BK_REPORT = 3'd5, BK_DONE = 3'd6;
+   // idle clock cycles after a pair, for the replacement policy update of a bank hit
+   localparam [31:0] BK_GAP_N = 2;
+
+   function [DATA_W-1:0] bank_word(input [31:0] w);
+      bank_word = BK_DATA ^ w;
+   endfunction
+
+   reg  [         2:0] bank_state;
+   reg  [        31:0] bank_k;  // port 0 accesses accepted in the current phase, or pairs issued
+   reg  [        31:0] bank_r;  // port 0 loads returned in the current phase
+   reg  [        31:0] bank_r1;  // port 1 loads returned
+   reg  [        31:0] bank_gap;
+   reg                 bank_sent;  // port 0 load of the current pair accepted
+   reg                 bank_sent1;  // port 1 load of the current pair accepted
+   reg                 bank_ret;  // port 0 load of the current pair returned
+   reg                 bank_ret1;  // port 1 load of the current pair returned
+   reg  [        31:0] bank_dual;
+   reg  [        31:0] bank_errors;
+   wire                bank_busy = (bank_state != BK_DONE);
+
+   // word loaded by port 1 with the word w of port 0: the next one (another bank) in the first BK_W pairs
+   wire [        31:0] bank_w = bank_k & (BK_W - 1);
+   wire [        31:0] bank_w1 = (bank_k < BK_W) ? (bank_w ^ 32'd1) : bank_w;
+
+   reg                 bank_valid;
+   reg                 bank_store;
+   reg  [        31:0] bank_waddr;
+   reg  [  DATA_W-1:0] bank_wdata;
+   always @* begin
+      bank_valid = 1'b0;
+      bank_store = 1'b0;
+      bank_waddr = BK_BASE + bank_k;
+      bank_wdata = bank_word(bank_waddr);
+      case (bank_state)
+         BK_STORE: begin
+            bank_valid = (bank_k < BK_W);
+            bank_store = 1'b1;
+         end
+         BK_LOAD: bank_valid = (bank_k < BK_W);
+         BK_PAIR: begin
+            bank_valid = ~bank_sent;
+            bank_waddr = BK_BASE + bank_w;
+         end
+         BK_REPORT: begin
+            bank_valid = 1'b1;
+            bank_store = 1'b1;
+            bank_waddr = MBOX + 4 + bank_k;
+            bank_wdata = (bank_k == 0) ? bank_r1 : (bank_k == 1) ? bank_dual : bank_errors;
+         end
+         default: ;
+      endcase
+   end
+   wire [31:0] bank_baddr = bank_waddr * MBOX_NBYTES;
+   wire [ADDR_W-1:0] bank_addr = bank_baddr[ADDR_W-1:0];
+
+   // port 1 load of the current pair
+   wire [31:0] bank_baddr1 = (BK_BASE + bank_w1) * MBOX_NBYTES;
+   assign internal1_iob_valid = (bank_state == BK_PAIR) & ~bank_sent1;
+   assign internal1_iob_addr  = bank_baddr1[FE_ADDR_W-1:0];
+   assign internal1_iob_wdata = {DATA_W{1'b0}};
+   assign internal1_iob_wstrb = {(DATA_W / 8) {1'b0}};
+
+   wire bank_accept = bank_valid & tb_iob_ready;
+   wire bank_accept1 = internal1_iob_valid & internal1_iob_ready;
+   wire bank_rvalid = ((bank_state == BK_LOAD) | (bank_state == BK_PAIR)) & tb_iob_rvalid;
+   wire bank_rvalid1 = (bank_state == BK_PAIR) & internal1_iob_rvalid;
+   wire [DATA_W-1:0] bank_exp = bank_word(BK_BASE + ((bank_state == BK_LOAD) ? bank_r : bank_w));
+   wire bank_err = bank_rvalid & (tb_iob_rdata != bank_exp);
+   wire bank_err1 = bank_rvalid1 & (internal1_iob_rdata != bank_word(BK_BASE + bank_w1));
+   // both loads of the pair returned, in this or an earlier clock cycle
+   wire bank_pair_done = (bank_ret | bank_rvalid) & (bank_ret1 | bank_rvalid1);
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         bank_state  <= BK_IDLE;
+         bank_k      <= 32'd0;
+         bank_r      <= 32'd0;
+         bank_r1     <= 32'd0;
+         bank_gap    <= 32'd0;
+         bank_sent   <= 1'b0;
+         bank_sent1  <= 1'b0;
+         bank_ret    <= 1'b0;
+         bank_ret1   <= 1'b0;
+         bank_dual   <= 32'd0;
+         bank_errors <= 32'd0;
+      end else begin
+         if (bank_accept & (bank_state != BK_PAIR)) bank_k <= bank_k + 32'd1;
+         if (bank_rvalid) bank_r <= bank_r + 32'd1;
+         if (bank_rvalid1) bank_r1 <= bank_r1 + 32'd1;
+         if (bank_rvalid & bank_rvalid1) bank_dual <= bank_dual + 32'd1;
+         bank_errors <= bank_errors + {31'd0, bank_err} + {31'd0, bank_err1};
+         case (bank_state)
+            BK_IDLE: if (bank_go) bank_state <= BK_STORE;
+            BK_STORE:
+            if (bank_k == BK_W) begin
+               bank_state <= BK_LOAD;
+               bank_k     <= 32'd0;
+            end
+            BK_LOAD:
+            if ((bank_k == BK_W) && (bank_r == BK_W)) begin
+               bank_state <= BK_GAP;
+               bank_k     <= 32'd0;
+            end
+            BK_PAIR: begin
+               if (bank_accept) bank_sent <= 1'b1;
+               if (bank_accept1) bank_sent1 <= 1'b1;
+               if (bank_rvalid) bank_ret <= 1'b1;
+               if (bank_rvalid1) bank_ret1 <= 1'b1;
+               if (bank_pair_done) begin
+                  bank_state <= BK_GAP;
+                  bank_k     <= bank_k + 32'd1;
+               end
+            end
+            BK_GAP: begin
+               bank_gap <= bank_gap + 32'd1;
+               if (bank_gap == BK_GAP_N - 1) begin
+                  bank_gap   <= 32'd0;
+                  bank_sent  <= 1'b0;
+                  bank_sent1 <= 1'b0;
+                  bank_ret   <= 1'b0;
+                  bank_ret1  <= 1'b0;
+                  if (bank_k == 2 * BK_W) begin
+                     bank_state <= BK_REPORT;
+                     bank_k     <= 32'd0;
+                  end else bank_state <= BK_PAIR;
+               end
+            end
+            BK_REPORT: if (bank_accept && (bank_k == 2)) bank_state <= BK_DONE;
+            default: ;
+         endcase
+      end
+   end
+""",
+            )
+        )
+    if params["harvard"]:
+        streams.append(
+            (
+                "ifetch",
+                """
+   // Instruction fetch stream (ifetch, HARVARD=1): the words of two regions of
+   // IF_W words are stored through the data cache, which writes them through
+   // to memory. Then the data cache loads the words of one region while the
+   // instruction cache fetches the words of the other: both caches miss on
+   // each line at about the same time, so their line refills compete for the
+   // shared back-end read channel. The data loads and instruction fetches
+   // returned and their data errors are stored in the mailbox (checked by
+   // ifetch_test in iob_core_tb.c). A write-back data cache keeps the stored
+   // words, so the stream only runs if WRITE_POL=0.
+   localparam [31:0] IF_W = 16 * (2 ** WORD_OFFSET_W);
+   localparam [31:0] IF_IBASE = MBOX / 2;
+   localparam [31:0] IF_DBASE = IF_IBASE + IF_W;
+   localparam [31:0] IF_DATA = 32'h1FE70000;
+   localparam [2:0] IF_IDLE = 3'd0, IF_STORE = 3'd1, IF_FLUSH = 3'd2, IF_FETCH = 3'd3, IF_REPORT = 3'd4, IF_DONE = 3'd5;
+   // clock cycles for the last store to reach the write-through buffer
+   localparam [31:0] IF_FLUSH_WAIT = 4;
+
+   function [DATA_W-1:0] ifetch_word(input [31:0] w);
+      ifetch_word = IF_DATA ^ w;
+   endfunction
+
+   reg  [         2:0] ifetch_state;
+   reg  [        31:0] ifetch_k;  // data cache accesses accepted in the current phase
+   reg  [        31:0] ifetch_r;  // data cache loads returned
+   reg  [        31:0] ifetch_ik;  // instruction fetches accepted
+   reg  [        31:0] ifetch_ir;  // instruction fetches returned
+   reg  [        31:0] ifetch_errors;
+   wire                ifetch_busy = (ifetch_state != IF_DONE);
+
+   reg                 ifetch_valid;
+   reg                 ifetch_store;
+   reg  [        31:0] ifetch_waddr;
+   reg  [  DATA_W-1:0] ifetch_wdata;
+   always @* begin
+      ifetch_valid = 1'b0;
+      ifetch_store = 1'b0;
+      ifetch_waddr = IF_IBASE + ifetch_k;
+      ifetch_wdata = ifetch_word(ifetch_waddr);
+      case (ifetch_state)
+         IF_STORE: begin
+            ifetch_valid = (ifetch_k < 2 * IF_W);
+            ifetch_store = 1'b1;
+         end
+         IF_FETCH: begin
+            ifetch_valid = (ifetch_k < IF_W);
+            ifetch_waddr = IF_DBASE + ifetch_k;
+         end
+         IF_REPORT: begin
+            ifetch_valid = 1'b1;
+            ifetch_store = 1'b1;
+            ifetch_waddr = MBOX + 8 + ifetch_k;
+            ifetch_wdata = (ifetch_k == 0) ? ifetch_r : (ifetch_k == 1) ? ifetch_ir : ifetch_errors;
+         end
+         default: ;
+      endcase
+   end
+   wire [31:0] ifetch_baddr = ifetch_waddr * MBOX_NBYTES;
+   wire [ADDR_W-1:0] ifetch_addr = ifetch_baddr[ADDR_W-1:0];
+
+   // instruction fetches of the words of the first region, in order
+   wire [31:0] ifetch_ibaddr = (IF_IBASE + ifetch_ik) * MBOX_NBYTES;
+   assign internal_i_iob_valid = (ifetch_state == IF_FETCH) & (ifetch_ik < IF_W);
+   assign internal_i_iob_addr  = ifetch_ibaddr[FE_ADDR_W-1:0];
+   assign internal_i_iob_wdata = {DATA_W{1'b0}};
+   assign internal_i_iob_wstrb = {(DATA_W / 8) {1'b0}};
+
+   wire ifetch_accept = ifetch_valid & tb_iob_ready;
+   wire ifetch_ret = (ifetch_state == IF_FETCH) & tb_iob_rvalid;
+   wire ifetch_iaccept = internal_i_iob_valid & internal_i_iob_ready;
+   wire ifetch_iret = (ifetch_state == IF_FETCH) & internal_i_iob_rvalid;
+   wire ifetch_err = ifetch_ret & (tb_iob_rdata != ifetch_word(IF_DBASE + ifetch_r));
+   wire ifetch_ierr = ifetch_iret & (internal_i_iob_rdata != ifetch_word(IF_IBASE + ifetch_ir));
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         ifetch_state  <= IF_IDLE;
+         ifetch_k      <= 32'd0;
+         ifetch_r      <= 32'd0;
+         ifetch_ik     <= 32'd0;
+         ifetch_ir     <= 32'd0;
+         ifetch_errors <= 32'd0;
+      end else begin
+         if (ifetch_accept) ifetch_k <= ifetch_k + 32'd1;
+         if (ifetch_ret) ifetch_r <= ifetch_r + 32'd1;
+         if (ifetch_iaccept) ifetch_ik <= ifetch_ik + 32'd1;
+         if (ifetch_iret) ifetch_ir <= ifetch_ir + 32'd1;
+         ifetch_errors <= ifetch_errors + {31'd0, ifetch_err} + {31'd0, ifetch_ierr};
+         case (ifetch_state)
+            IF_IDLE: if (ifetch_go) ifetch_state <= (WRITE_POL == 0) ? IF_STORE : IF_DONE;
+            IF_STORE:
+            if (ifetch_k == 2 * IF_W) begin
+               ifetch_state <= IF_FLUSH;
+               ifetch_k     <= 32'd0;
+            end
+            // wait for the stored words to be written to memory
+            IF_FLUSH: begin
+               ifetch_k <= ifetch_k + 32'd1;
+               if ((ifetch_k >= IF_FLUSH_WAIT) && wtb_empty_o_int) begin
+                  ifetch_state <= IF_FETCH;
+                  ifetch_k     <= 32'd0;
+               end
+            end
+            IF_FETCH:
+            if ((ifetch_r == IF_W) && (ifetch_ir == IF_W)) begin
+               ifetch_state <= IF_REPORT;
+               ifetch_k     <= 32'd0;
+            end
+            IF_REPORT: if (ifetch_accept && (ifetch_k == 2)) ifetch_state <= IF_DONE;
+            default: ;
+         endcase
+      end
+   end
+""",
+            )
+        )
+    if params["fe_ports"] > 1:
+        # port signals, from the last port to the main port
+        ports = [f"internal_p{p}_iob" for p in range(params["fe_ports"] - 1, 0, -1)]
+        streams.append(
+            (
+                "ports",
+                """
+   // Multi-port stream (ports, FE_PORTS > 1): the words of a region are
+   // stored on the main port. Then all the ports load PT_J words each at the
+   // same time, port p the words p, p + PT_N, p + 2 * PT_N, ..., so
+   // their reads hit and miss in the same lines and are interleaved by the
+   // front-end arbiter, which must route the data of each read to its own
+   // port. With round-robin arbitration (FE_ARB=1), a port must not be granted
+   // twice in a row while another port waits. The loads returned, the unfair
+   // grants and the load data errors are stored in the mailbox (checked by
+   // ports_test in iob_core_tb.c).
+   localparam [31:0] PT_N = FE_PORTS;
+   localparam [31:0] PT_J = 4 * (2 ** WORD_OFFSET_W);
+   localparam [31:0] PT_W = PT_N * PT_J;
+   localparam [31:0] PT_BASE = MBOX / 8;
+   localparam [31:0] PT_DATA = 32'h90470000;
+   localparam [2:0] PT_IDLE = 3'd0, PT_STORE = 3'd1, PT_LOAD = 3'd2, PT_REPORT = 3'd3, PT_DONE = 3'd4;
+
+   function [DATA_W-1:0] ports_word(input [31:0] w);
+      ports_word = PT_DATA ^ w;
+   endfunction
+
+   reg  [               2:0] ports_state;
+   reg  [              31:0] ports_k;  // main port stores or mailbox words accepted
+   reg  [              31:0] ports_loads;
+   reg  [              31:0] ports_unfair;
+   reg  [              31:0] ports_errors;
+   reg  [      FE_PORTS-1:0] ports_last;  // port of the last load accepted
+   wire                      ports_busy = (ports_state != PT_DONE);
+
+   // loads of each port (main port first): requests, address, ready, read data
+   wire [      FE_PORTS-1:0] ports_lv;
+   wire [   32*FE_PORTS-1:0] ports_baddr;
+   wire [      FE_PORTS-1:0] ports_err;
+   wire [      FE_PORTS-1:0] ports_fin;  // all the loads of the port returned
+   wire [      FE_PORTS-1:0] ports_rdy = {"""
+                + ", ".join([f"{p}_ready" for p in ports] + ["tb_iob_ready"])
+                + """};
+   wire [      FE_PORTS-1:0] ports_rv = {"""
+                + ", ".join([f"{p}_rvalid" for p in ports] + ["tb_iob_rvalid"])
+                + """};
+   wire [FE_PORTS*DATA_W-1:0] ports_rd = {"""
+                + ", ".join([f"{p}_rdata" for p in ports] + ["tb_iob_rdata"])
+                + """};
+   wire [      FE_PORTS-1:0] ports_acc = ports_lv & ports_rdy;
+
+   genvar ports_p;
+   generate
+      for (ports_p = 0; ports_p < FE_PORTS; ports_p = ports_p + 1) begin : g_ports
+         reg  [31:0] n;  // loads accepted
+         reg  [31:0] m;  // loads returned
+         wire [31:0] w = PT_BASE + n * PT_N + ports_p;
+         assign ports_lv[ports_p] = (ports_state == PT_LOAD) & (n < PT_J);
+         assign ports_baddr[32*ports_p+:32] = w * MBOX_NBYTES;
+         assign ports_err[ports_p] = ports_rv[ports_p] & (ports_rd[DATA_W*ports_p+:DATA_W] != ports_word(PT_BASE + m * PT_N + ports_p));
+         assign ports_fin[ports_p] = (m == PT_J);
+         always @(posedge clk_i, posedge arst_i) begin
+            if (arst_i) begin
+               n <= 32'd0;
+               m <= 32'd0;
+            end else begin
+               if (ports_acc[ports_p]) n <= n + 32'd1;
+               if ((ports_state == PT_LOAD) & ports_rv[ports_p]) m <= m + 32'd1;
+            end
+         end
+      end
+   endgenerate
+
+   // loads returned and their data errors in this clock cycle
+   integer ports_i;
+   reg [31:0] ports_nret;
+   reg [31:0] ports_nerr;
+   always @* begin
+      ports_nret = 32'd0;
+      ports_nerr = 32'd0;
+      for (ports_i = 0; ports_i < FE_PORTS; ports_i = ports_i + 1) begin
+         ports_nret = ports_nret + {31'd0, ports_rv[ports_i]};
+         ports_nerr = ports_nerr + {31'd0, ports_err[ports_i]};
+      end
+   end
+
+   reg                 ports_valid;
+   reg                 ports_store;
+   reg  [        31:0] ports_waddr;
+   reg  [  DATA_W-1:0] ports_wdata;
+   always @* begin
+      ports_valid = 1'b0;
+      ports_store = 1'b0;
+      ports_waddr = PT_BASE + ports_k;
+      ports_wdata = ports_word(ports_waddr);
+      case (ports_state)
+         PT_STORE: begin
+            ports_valid = (ports_k < PT_W);
+            ports_store = 1'b1;
+         end
+         PT_LOAD: begin
+            ports_valid = ports_lv[0];
+            ports_waddr = ports_baddr[0+:32] / MBOX_NBYTES;
+         end
+         PT_REPORT: begin
+            ports_valid = 1'b1;
+            ports_store = 1'b1;
+            ports_waddr = MBOX + 12 + ports_k;
+            ports_wdata = (ports_k == 0) ? ports_loads : (ports_k == 1) ? ports_unfair : ports_errors;
+         end
+         default: ;
+      endcase
+   end
+   wire [31:0] ports_wbaddr = ports_waddr * MBOX_NBYTES;
+   wire [ADDR_W-1:0] ports_addr = ports_wbaddr[ADDR_W-1:0];
+
+   wire ports_accept = ports_valid & tb_iob_ready;
+   wire ports_load = (ports_state == PT_LOAD);
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         ports_state  <= PT_IDLE;
+         ports_k      <= 32'd0;
+         ports_loads  <= 32'd0;
+         ports_unfair <= 32'd0;
+         ports_errors <= 32'd0;
+         ports_last   <= {FE_PORTS{1'b0}};
+      end else begin
+         if (ports_accept & ~ports_load) ports_k <= ports_k + 32'd1;
+         if (ports_load) begin
+            ports_loads  <= ports_loads + ports_nret;
+            ports_errors <= ports_errors + ports_nerr;
+            // one load accepted per clock cycle
+            if (|ports_acc) begin
+               if ((ports_acc == ports_last) && (|(ports_lv & ~ports_acc))) ports_unfair <= ports_unfair + 32'd1;
+               ports_last <= ports_acc;
+            end
+         end
+         case (ports_state)
+            PT_IDLE: if (ports_go) ports_state <= PT_STORE;
+            PT_STORE:
+            if (ports_k == PT_W) begin
+               ports_state <= PT_LOAD;
+               ports_k     <= 32'd0;
+            end
+            PT_LOAD: if (&ports_fin) ports_state <= PT_REPORT;
+            PT_REPORT: if (ports_accept && (ports_k == 2)) ports_state <= PT_DONE;
+            default: ;
+         endcase
+      end
+   end
+"""
+                + "".join(
+                    f"""
+   assign internal_p{p}_iob_valid = ports_lv[{p}];
+   assign internal_p{p}_iob_addr  = ports_baddr[32*{p}+:ADDR_W];
+   assign internal_p{p}_iob_wdata = {{DATA_W{{1'b0}}}};
+   assign internal_p{p}_iob_wstrb = {{(DATA_W / 8) {{1'b0}}}};
+"""
+                    for p in range(1, params["fe_ports"])
+                ),
+            )
+        )
+    if params["snoop"]:
+        streams.append(
+            (
+                "snoop",
+                """
+   // Snoop stream (snoop, SNOOP=1): two lines, A and B, are stored and then
+   // loaded to bring them into the cache. Line A is snooped, and in the next
+   // clock cycle a word of line A is loaded, which must miss, then a word of
+   // line B and another word of line A, which must hit. A load hits if its
+   // data is returned in the clock cycle after it is accepted. The loads that
+   // missed and hit as expected and the load data errors are stored in the
+   // mailbox (checked by snoop_test in iob_core_tb.c).
+   localparam [31:0] SN_L = 2 ** WORD_OFFSET_W;  // words per line
+   localparam [31:0] SN_BASE = MBOX / 16;
+   localparam [31:0] SN_DATA = 32'h5E0F0000;
+   localparam [2:0] SN_IDLE = 3'd0, SN_STORE = 3'd1, SN_LOAD = 3'd2, SN_SNOOP = 3'd3, SN_CHECK = 3'd4, SN_REPORT = 3'd5, SN_DONE = 3'd6;
+
+   function [DATA_W-1:0] snoop_word(input [31:0] w);
+      snoop_word = SN_DATA ^ w;
+   endfunction
+
+   // word of check load j: line A (miss), line B (hit), line A (hit)
+   function [31:0] snoop_check(input [1:0] j);
+      snoop_check = (j == 2'd0) ? 32'd0 : (j == 2'd1) ? SN_L : 32'd1;
+   endfunction
+
+   reg  [         2:0] snoop_state;
+   reg  [        31:0] snoop_k;  // accesses accepted in the current phase
+   reg  [        31:0] snoop_r;  // loads returned in the current phase
+   reg  [         1:0] snoop_j;  // check load
+   reg                 snoop_sent;  // check load accepted
+   reg  [        31:0] snoop_lat;  // clock cycles since the check load was accepted
+   reg  [        31:0] snoop_misses;
+   reg  [        31:0] snoop_hits;
+   reg  [        31:0] snoop_errors;
+   wire                snoop_busy = (snoop_state != SN_DONE);
+
+   reg                 snoop_valid;
+   reg                 snoop_store;
+   reg  [        31:0] snoop_waddr;
+   reg  [  DATA_W-1:0] snoop_wdata;
+   always @* begin
+      snoop_valid = 1'b0;
+      snoop_store = 1'b0;
+      snoop_waddr = SN_BASE + snoop_k;
+      snoop_wdata = snoop_word(snoop_waddr);
+      case (snoop_state)
+         SN_STORE: begin
+            snoop_valid = (snoop_k < 2 * SN_L);
+            snoop_store = 1'b1;
+         end
+         SN_LOAD: snoop_valid = (snoop_k < 2 * SN_L);
+         SN_CHECK: begin
+            snoop_valid = ~snoop_sent;
+            snoop_waddr = SN_BASE + snoop_check(snoop_j);
+         end
+         SN_REPORT: begin
+            snoop_valid = 1'b1;
+            snoop_store = 1'b1;
+            snoop_waddr = MBOX + 16 + snoop_k;
+            snoop_wdata = (snoop_k == 0) ? snoop_misses : (snoop_k == 1) ? snoop_hits : snoop_errors;
+         end
+         default: ;
+      endcase
+   end
+   wire [31:0] snoop_baddr = snoop_waddr * MBOX_NBYTES;
+   wire [ADDR_W-1:0] snoop_addr = snoop_baddr[ADDR_W-1:0];
+
+   // snoop of line A
+   wire [31:0] snoop_line = SN_BASE * MBOX_NBYTES;
+   assign snoop_int      = (snoop_state == SN_SNOOP);
+   assign snoop_addr_int = snoop_line[FE_ADDR_W-1:0];
+
+   wire snoop_accept = snoop_valid & tb_iob_ready;
+   wire snoop_ret = ((snoop_state == SN_LOAD) | (snoop_state == SN_CHECK)) & tb_iob_rvalid;
+   wire [DATA_W-1:0] snoop_exp = snoop_word(SN_BASE + ((snoop_state == SN_LOAD) ? snoop_r : snoop_check(snoop_j)));
+   // the check load hit if returned in the clock cycle after it was accepted
+   wire snoop_hit = (snoop_lat == 32'd1);
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         snoop_state  <= SN_IDLE;
+         snoop_k      <= 32'd0;
+         snoop_r      <= 32'd0;
+         snoop_j      <= 2'd0;
+         snoop_sent   <= 1'b0;
+         snoop_lat    <= 32'd0;
+         snoop_misses <= 32'd0;
+         snoop_hits   <= 32'd0;
+         snoop_errors <= 32'd0;
+      end else begin
+         if (snoop_accept) snoop_k <= snoop_k + 32'd1;
+         if (snoop_ret) begin
+            snoop_r <= snoop_r + 32'd1;
+            if (tb_iob_rdata != snoop_exp) snoop_errors <= snoop_errors + 32'd1;
+         end
+         case (snoop_state)
+            SN_IDLE: if (snoop_go) snoop_state <= SN_STORE;
+            SN_STORE:
+            if (snoop_k == 2 * SN_L) begin
+               snoop_state <= SN_LOAD;
+               snoop_k     <= 32'd0;
+            end
+            SN_LOAD:
+            if ((snoop_k == 2 * SN_L) && (snoop_r == 2 * SN_L)) snoop_state <= SN_SNOOP;
+            SN_SNOOP: snoop_state <= SN_CHECK;
+            SN_CHECK: begin
+               if (snoop_accept) snoop_sent <= 1'b1;
+               snoop_lat <= snoop_accept ? 32'd1 : snoop_lat + 32'd1;
+               if (snoop_ret) begin
+                  if ((snoop_j == 2'd0) && !snoop_hit) snoop_misses <= snoop_misses + 32'd1;
+                  if ((snoop_j != 2'd0) && snoop_hit) snoop_hits <= snoop_hits + 32'd1;
+                  snoop_sent <= 1'b0;
+                  snoop_j    <= snoop_j + 2'd1;
+                  if (snoop_j == 2'd2) begin
+                     snoop_state <= SN_REPORT;
+                     snoop_k     <= 32'd0;
+                  end
+               end
+            end
+            SN_REPORT: if (snoop_accept && (snoop_k == 2)) snoop_state <= SN_DONE;
+            default: ;
+         endcase
+      end
+   end
+""",
+            )
+        )
+    if streams:
+        attributes_dict["snippets"].append(
+            """
+   // mailbox (word address): 4 words per wrapper stream
+   localparam [31:0] MBOX_NBYTES = DATA_W / 8;
+   localparam [31:0] MBOX = (2 ** (FE_ADDR_W - 1)) / MBOX_NBYTES;
+"""
+        )
+        # each stream starts when the previous one is done, and the first
+        # busy stream drives the front-end port
+        go = "1'b1"
+        for st, code in streams:
+            attributes_dict["snippets"].append(f"\n   wire {st}_go = {go};" + code)
+            go = f"~{st}_busy"
+        mux = {
+            "valid": "iob_valid_i",
+            "addr": "iob_addr_i",
+            "wdata": "iob_wdata_i",
+            "wstrb": "iob_wstrb_i",
+        }
+        for st, _ in reversed(streams):
+            mux["valid"] = f"{st}_busy ? {st}_valid : {mux['valid']}"
+            mux["addr"] = f"{st}_busy ? {st}_addr : {mux['addr']}"
+            mux["wdata"] = f"{st}_busy ? {st}_wdata : {mux['wdata']}"
+            mux["wstrb"] = (
+                f"{st}_busy ? {{(DATA_W / 8) {{{st}_store}}}} : {mux['wstrb']}"
+            )
+        attributes_dict["snippets"].append(
+            f"""
+   // the testbench is held off while a wrapper stream is busy
+   wire stream_busy = {" | ".join(f"{st}_busy" for st, _ in streams)};
+   assign tb_iob_valid = {mux["valid"]};
+   assign tb_iob_addr  = {mux["addr"]};
+   assign tb_iob_wdata = {mux["wdata"]};
+   assign tb_iob_wstrb = {mux["wstrb"]};
+   assign iob_ready_o  = ~stream_busy & tb_iob_ready;
+   assign iob_rvalid_o = ~stream_busy & tb_iob_rvalid;
+   assign iob_rdata_o  = tb_iob_rdata;
+"""
+        )
+    else:
+        attributes_dict["snippets"].append(
+            """
+   assign tb_iob_valid = iob_valid_i;
+   assign tb_iob_addr  = iob_addr_i;
+   assign tb_iob_wdata = iob_wdata_i;
+   assign tb_iob_wstrb = iob_wstrb_i;
+   assign iob_ready_o  = tb_iob_ready;
+   assign iob_rvalid_o = tb_iob_rvalid;
+   assign iob_rdata_o  = tb_iob_rdata;
+"""
+        )
+    if params["binv_w"]:
+        attributes_dict["snippets"].append(
+            """
+   // No back-invalidation
+   assign binv_int      = 1'b0;
+   assign binv_addr_int = {FE_ADDR_W{1'b0}};
+"""
+        )
+    if params["cosim"]:
+        if params["be_if"] == "axi":
+            be_log = """
+         if (be_axi_arvalid & be_axi_arready) $fwrite(cosim_fd, "%0d br %h %0d\\n", cosim_cycle, be_axi_araddr, be_axi_arlen + 1);
+         if (be_axi_awvalid & be_axi_awready) $fwrite(cosim_fd, "%0d bw %h %0d\\n", cosim_cycle, be_axi_awaddr, be_axi_awlen + 1);"""
+        else:
+            be_log = """
+         if (be_iob_valid & be_iob_ready) $fwrite(cosim_fd, "%0d %s %h 1\\n", cosim_cycle, (|be_iob_wstrb) ? "bw" : "br", be_iob_addr);"""
+        attributes_dict["snippets"].append(
+            """
+   // Co-simulation monitor: log the front-end and back-end transactions (format in iob_cache_model/cosim.py)
+   integer cosim_fd;
+   reg [63:0] cosim_cycle;
+   reg [31:0] cosim_wait;
+   wire cosim_ctrl = (ADDR_W > FE_ADDR_W) && tb_iob_addr[ADDR_W-1];
+   initial cosim_fd = $fopen("cosim.log", "w");
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         cosim_cycle <= 64'd0;
+         cosim_wait  <= 32'd0;
+      end else begin
+         cosim_cycle <= cosim_cycle + 64'd1;
+         cosim_wait  <= (tb_iob_valid & ~tb_iob_ready) ? cosim_wait + 32'd1 : 32'd0;
+         if (tb_iob_valid & tb_iob_ready) begin
+            if (cosim_ctrl) $fwrite(cosim_fd, "%0d %s %h\\n", cosim_cycle, (|tb_iob_wstrb) ? "cw" : "cr", tb_iob_addr);
+            else if (|tb_iob_wstrb) $fwrite(cosim_fd, "%0d w %h %h %h %0d\\n", cosim_cycle, tb_iob_addr, tb_iob_wstrb, tb_iob_wdata, cosim_wait);
+            else $fwrite(cosim_fd, "%0d r %h %0d\\n", cosim_cycle, tb_iob_addr, cosim_wait);
+         end
+         if (tb_iob_rvalid) $fwrite(cosim_fd, "%0d d %h\\n", cosim_cycle, tb_iob_rdata);"""
+            + be_log
+            + """
+      end
+   end
+"""
+        )
     if params["be_if"] == "iob":
         comb_code = """
    be_iob_ready = 1'b1;
@@ -0,0 +1,104 @@
+// SPDX-FileCopyrightText: 2026 IObundle
+//
+// SPDX-License-Identifier: CERN-OHL-S-2.0
+
+`timescale 1ns / 1ps
+
+// Shares the cache front-end between N_PORTS IOb managers. One valid request
+// is granted per clock cycle, by fixed priority (port 0 first) or round-robin
+// (ARB_RR=1: the port after the last one accepted first). The read data are
+// returned in order by the front-end, so the ports of the accepted reads are
+// queued (up to 2**RD_PEND_W reads in flight) to route each rvalid back.
+// Only port 0 reaches the cache controller: the controller address bit
+// (USE_CTRL=1) of the other ports is ignored.
+module iob_cache_fe_arb #(
+   parameter N_PORTS   = 2,
+   parameter ADDR_W    = 24,
+   parameter DATA_W    = 32,
+   parameter USE_CTRL  = 0,
+   parameter ARB_RR    = 1,
+   parameter RD_PEND_W = 3,
+   parameter PORT_W    = (N_PORTS > 1) ? $clog2(N_PORTS) : 1
+) (
+   input clk_i,
+   input cke_i,
+   input arst_i,
+
+   // ports
+   input  [         N_PORTS-1:0] s_valid_i,
+   input  [  N_PORTS*ADDR_W-1:0] s_addr_i,
+   input  [  N_PORTS*DATA_W-1:0] s_wdata_i,
+   input  [N_PORTS*DATA_W/8-1:0] s_wstrb_i,
+   output [         N_PORTS-1:0] s_rvalid_o,
+   output [          DATA_W-1:0] s_rdata_o,
+   output [         N_PORTS-1:0] s_ready_o,
+
+   // cache front-end
+   output                m_valid_o,
+   output [  ADDR_W-1:0] m_addr_o,
+   output [  DATA_W-1:0] m_wdata_o,
+   output [DATA_W/8-1:0] m_wstrb_o,
+   input                 m_rvalid_i,
+   input  [  DATA_W-1:0] m_rdata_i,
+   input                 m_ready_i
+);
+
+   reg [PORT_W-1:0] grant;
+   reg [PORT_W-1:0] rr_ptr;  // port with the highest priority (round-robin)
+
+   // the valid port closest to the highest priority one
+   integer p, idx;
+   always @* begin
+      grant = {PORT_W{1'b0}};
+      for (p = N_PORTS - 1; p >= 0; p = p - 1) begin
+         idx = ARB_RR ? rr_ptr + p : p;
+         if (idx >= N_PORTS) idx = idx - N_PORTS;
+         if (s_valid_i[idx]) grant = idx;
+      end
+   end
+
+   // ports of the reads in flight
+   reg  [   PORT_W-1:0] rd_port    [(2**RD_PEND_W)-1:0];
+   reg  [RD_PEND_W-1:0] rd_wptr;
+   reg  [RD_PEND_W-1:0] rd_rptr;
+   reg  [  RD_PEND_W:0] rd_level;
+   wire                 rd_full = rd_level[RD_PEND_W];
+
+   wire [ DATA_W/8-1:0] grant_wstrb = s_wstrb_i[grant*(DATA_W/8)+:(DATA_W/8)];
+   wire [   ADDR_W-1:0] grant_addr = s_addr_i[grant*ADDR_W+:ADDR_W];
+
+   assign m_valid_o = s_valid_i[grant] & ~rd_full;
+   assign m_addr_o  = (USE_CTRL && (grant != 0)) ? {1'b0, grant_addr[ADDR_W-2:0]} : grant_addr;
+   assign m_wdata_o = s_wdata_i[grant*DATA_W+:DATA_W];
+   assign m_wstrb_o = grant_wstrb;
+   assign s_ready_o = {{(N_PORTS - 1) {1'b0}}, m_ready_i & ~rd_full} << grant;
+
+   wire              accept = m_valid_o & m_ready_i;
+   wire              rd_push = accept & ~(|grant_wstrb);
+
+   // a read returned in the clock cycle it is accepted is not queued
+   wire              rd_bypass = ~(|rd_level) & rd_push & m_rvalid_i;
+   wire [PORT_W-1:0] rd_head = (|rd_level) ? rd_port[rd_rptr] : grant;
+
+   always @(posedge clk_i, posedge arst_i) begin
+      if (arst_i) begin
+         rr_ptr   <= {PORT_W{1'b0}};
+         rd_wptr  <= {RD_PEND_W{1'b0}};
+         rd_rptr  <= {RD_PEND_W{1'b0}};
+         rd_level <= {(RD_PEND_W + 1) {1'b0}};
+      end else if (cke_i) begin
+         if (accept) rr_ptr <= (grant == N_PORTS - 1) ? {PORT_W{1'b0}} : grant + 1'b1;
+         if (rd_push & ~rd_bypass) rd_wptr <= rd_wptr + 1'b1;
+         if (m_rvalid_i & ~rd_bypass) rd_rptr <= rd_rptr + 1'b1;
+         rd_level <= rd_level + {{RD_PEND_W{1'b0}}, rd_push & ~rd_bypass} - {{RD_PEND_W{1'b0}}, m_rvalid_i & ~rd_bypass};
+      end
+   end
+
+   always @(posedge clk_i) begin
+      if (cke_i & rd_push & ~rd_bypass) rd_port[rd_wptr] <= grant;
+   end
+
+   assign s_rvalid_o = {{(N_PORTS - 1) {1'b0}}, m_rvalid_i} << rd_head;
+   assign s_rdata_o  = m_rdata_i;
+
+endmodule
@@ -20,10 +20,50 @@ def setup(py_params: dict):
     WRITE_POL = py_params.get("write_pol", 0)
     # Number of cache ways (log2)
     NWAYS_W = py_params.get("nways_w", 1)
+    # Number of miss status holding registers (0 for a blocking cache)
+    N_MSHR = py_params.get("n_mshr", 0)
+    # Critical-word-first line refill and early restart
+    CRIT_WORD_FIRST = int(py_params.get("crit_word_first", 0))
+    # Write-through buffer write-combining window (log2 of words; 0 disables write combining)
+    WTBUF_COMB_W = int(py_params.get("wtbuf_comb_w", 0))
+    # Outstanding AXI read bursts (log2; 0 issues one line refill at a time)
+    RD_TXN_W = int(py_params.get("rd_txn_w", 0))
+    # Posted AXI writes (log2 of the writes in flight; 0 waits for each write response)
+    WR_TXN_W = int(py_params.get("wr_txn_w", 0))
+    # Number of victim buffer lines (0 for no victim buffer)
+    N_VICTIM = int(py_params.get("n_victim", 0))
+    # Prefetcher: "none", "next_line" or "stride" (stride detector on the read miss addresses)
+    PREFETCH = py_params.get("prefetch", "none")
+    # Number of bins of the controller's miss latency histograms (0 for no histograms)
+    LAT_HIST = int(py_params.get("lat_hist", 0))
+    # Address-range clean and invalidate operations started by the cache controller
+    MAINT = int(py_params.get("maint", 0))
+    # Way lockdown: ways locked by the cache controller are not replaced
+    WAY_LOCK = int(py_params.get("way_lock", 0))
+    # Scratchpad mode: ways turned into a directly addressed scratchpad by the cache controller
+    SPM = int(py_params.get("spm", 0))
+    # Line replacement policy (REP_POLICY): 0 LRU, 1 PLRU_MRU, 2 PLRU_TREE, 3 RANDOM, 4 FIFO or 5 SRRIP
+    REP_POLICY = int(py_params.get("rep_policy", 0))
+    # Second replacement policy, selected at runtime by the cache controller or by set-dueling
+    REP_DUEL = int(py_params.get("rep_duel", 0))
+    # Second (IOb) front-end port served by a data memory split in 2**nbanks_w banks (0 for a single front-end port)
+    NBANKS_W = int(py_params.get("nbanks_w", 0))
+    # Split instruction/data (Harvard) cache: a read-only instruction cache shares the AXI back-end with the (data) cache
+    HARVARD = int(py_params.get("harvard", 0))
+    # Inclusive cache hierarchy: back-invalidation block size (log2 of bytes), usually the lower-level line size (0 for no inclusion port)
+    BINV_W = int(py_params.get("binv_w", 0))
+    # Number of front-end ports sharing the cache through an arbiter (1 for a single front-end port)
+    FE_PORTS = int(py_params.get("fe_ports", 1))
+    # Snoop channel: external writers invalidate the cache lines by address
+    SNOOP = int(py_params.get("snoop", 0))
     # Use cache controller
     USE_CTRL = int(py_params.get("use_ctrl", 0))
     # Use dedicated controller port
     USE_DEDICATED_CTRL_PORT = int(py_params.get("use_dedicated_ctrl_port", 0))
+    # Co-simulation: log the transactions of the simulation wrapper to cosim.log (checked by iob_cache_model.cosim)
+    COSIM = int(py_params.get("cosim", 0))
+    # Throughput stream: the simulation wrapper measures the hit throughput before the testbench runs (checked by iob_core_tb.c)
+    TPUT = int(py_params.get("tput", 0))
     # Name of generated cache's verilog. We may use multiple names to generate caches with different configurations.
     be_if = "axi" if BE_IF == "AXI4" else "iob"
     NAME = py_params.get("name", f"iob_cache_{be_if}")
@@ -43,6 +83,63 @@ def setup(py_params: dict):
             "ERROR: USE_DEDICATED_CTRL_PORT requires use_ctrl=1 (controller must be enabled)"
         )
         exit(1)
+    if int(N_MSHR) and int(WRITE_POL):
+        print("ERROR: non-blocking operation (n_mshr>0) requires write_pol=0")
+        exit(1)
+    if WTBUF_COMB_W and int(WRITE_POL):
+        print("ERROR: write combining (wtbuf_comb_w>0) requires write_pol=0")
+        exit(1)
+    if PREFETCH not in ["none", "next_line", "stride"]:
+        print("ERROR: prefetch must be none, next_line or stride")
+        exit(1)
+    if PREFETCH != "none" and (int(WRITE_POL) or int(N_MSHR)):
+        print("ERROR: prefetching requires write_pol=0 and n_mshr=0")
+        exit(1)
+    if RD_TXN_W and (BE_IF != "AXI4" or not int(N_MSHR)):
+        print("ERROR: multiple outstanding reads (rd_txn_w>0) require be_if=AXI4 and n_mshr>0")
+        exit(1)
+    if WR_TXN_W and (BE_IF != "AXI4" or int(WRITE_POL)):
+        print("ERROR: posted writes (wr_txn_w>0) require be_if=AXI4 and write_pol=0")
+        exit(1)
+    if N_VICTIM and int(N_MSHR):
+        print("ERROR: the victim buffer (n_victim>0) requires n_mshr=0")
+        exit(1)
+    if not 0 <= LAT_HIST <= 16:
+        print("ERROR: lat_hist must be between 0 and 16")
+        exit(1)
+    if MAINT and (not USE_CTRL or int(N_MSHR) or N_VICTIM):
+        print("ERROR: maintenance operations (maint=1) require use_ctrl=1, n_mshr=0 and n_victim=0")
+        exit(1)
+    if WAY_LOCK and (not USE_CTRL or not int(NWAYS_W)):
+        print("ERROR: way lockdown (way_lock=1) requires use_ctrl=1 and nways_w>0")
+        exit(1)
+    if SPM and (not USE_CTRL or not int(NWAYS_W) or int(N_MSHR)):
+        print("ERROR: scratchpad mode (spm=1) requires use_ctrl=1, nways_w>0 and n_mshr=0")
+        exit(1)
+    if not 0 <= REP_POLICY <= 5:
+        print("ERROR: rep_policy must be between 0 and 5")
+        exit(1)
+    if REP_DUEL and not int(NWAYS_W):
+        print("ERROR: runtime-selectable replacement policy (rep_duel=1) requires nways_w>0")
+        exit(1)
+    if NBANKS_W and (int(N_MSHR) or SPM):
+        print("ERROR: the second front-end port (nbanks_w>0) requires n_mshr=0 and spm=0")
+        exit(1)
+    if HARVARD and (BE_IF != "AXI4" or int(N_MSHR)):
+        print("ERROR: the split instruction/data cache (harvard=1) requires be_if=AXI4 and n_mshr=0")
+        exit(1)
+    if BINV_W and int(N_MSHR):
+        print("ERROR: the inclusion port (binv_w>0) requires n_mshr=0")
+        exit(1)
+    if not 1 <= FE_PORTS <= 8:
+        print("ERROR: fe_ports must be between 1 and 8")
+        exit(1)
+    if SNOOP and (int(N_MSHR) or int(WRITE_POL) or NBANKS_W or N_VICTIM or PREFETCH != "none"):
+        print("ERROR: the snoop channel (snoop=1) requires n_mshr=0, write_pol=0, nbanks_w=0, n_victim=0 and prefetch=none")
+        exit(1)
+    if int(N_MSHR) > 2**RD_TXN_W > 1:
+        print("ERROR: n_mshr must not exceed the number of outstanding reads (2**rd_txn_w)")
+        exit(1)
 
     IF_DISPLAY_NAME = {
         "iob": "IOb",
@@ -88,6 +185,30 @@ def setup(py_params: dict):
             "min": "?",
             "max": "?",
         },
+        {
+            "name": "RANDOM",
+            "descr": "Index of RANDOM Policy. Pseudo-random replacement from a 16-bit LFSR shared by all the sets and advanced on each line replacement - no bits per cache line",
+            "type": "M",
+            "val": "3",
+            "min": "?",
+            "max": "?",
+        },
+        {
+            "name": "FIFO",
+            "descr": "Index of FIFO Policy. First-In-First-Out (round-robin) replacement: the ways of each set are replaced in order, regardless of the hits - log2(N) bits per cache line",
+            "type": "M",
+            "val": "4",
+            "min": "?",
+            "max": "?",
+        },
+        {
+            "name": "SRRIP",
+            "descr": "Index of SRRIP Policy. Static Re-Reference Interval Prediction: new lines are inserted with a long predicted re-reference interval and promoted when they hit, so that scans do not evict the lines being reused - 2*N bits per cache line",
+            "type": "M",
+            "val": "5",
+            "min": "?",
+            "max": "?",
+        },
         # Write Policy
         {
             "name": "WRITE_THROUGH",
@@ -105,6 +226,31 @@ def setup(py_params: dict):
             "min": "?",
             "max": "?",
         },
+        # Prefetcher
+        {
+            "name": "PF_NONE",
+            "descr": "Index of no prefetching. Lines are only refilled on demand",
+            "type": "M",
+            "val": "0",
+            "min": "?",
+            "max": "?",
+        },
+        {
+            "name": "PF_NEXT_LINE",
+            "descr": "Index of next-line prefetcher. Each read miss prefetches the following line",
+            "type": "M",
+            "val": "1",
+            "min": "?",
+            "max": "?",
+        },
+        {
+            "name": "PF_STRIDE",
+            "descr": "Index of stride prefetcher. When the distance between consecutive read miss lines repeats, the line one stride ahead is prefetched",
+            "type": "M",
+            "val": "2",
+            "min": "?",
+            "max": "?",
+        },
     ]
     attributes_dict["confs"] = config_macros + [
         # Currently, Py2hwsw does not have a way of adding `includes. So we need to repeat this macro manually here
@@ -112,7 +258,7 @@ def setup(py_params: dict):
             "name": "ADDR_W_CSRS",
             "descr": "Address width of CSRs",
             "type": "M",
-            "val": "6",
+            "val": "7",
             "min": "?",
             "max": "?",
         },
@@ -179,23 +325,47 @@ def setup(py_params: dict):
         },
         {
             "name": "WTBUF_DEPTH_W",
-            "descr": "Write-through buffer depth (log2). A shallow buffer will fill up more frequently and cause write stalls; however, on a Read After Write (RAW) event, a shallow buffer will empty faster, decreasing the duration of the read stall. A deep buffer is unlkely to get full and cause write stalls; on the other hand, on a RAW event, it will take a long time to empty and cause long read stalls.",
+            "descr": "Write-through buffer depth (log2). A shallow buffer will fill up more frequently and cause write stalls. A deep buffer is unlikely to get full and cause write stalls. The addresses of the pending stores are compared with the line to refill on a read miss, so the refill only waits for the stores to the same line (Read After Write, RAW) and not for the whole buffer to drain.",
             "type": "P",
             "val": "4",
             "min": "",
             "max": "",
         },
+        {
+            "name": "WTBUF_COMB_W",
+            "descr": "Write-through buffer write-combining window (log2 of the number of front-end words, up to WORD_OFFSET_W). Set to 0 to disable write combining. Otherwise, stores to the same aligned window are merged (their byte strobes are ORed) into a single write-through buffer entry while older entries are being written, and each entry is written to memory in a single transaction: one back-end word, or a multi-beat burst if the window is wider than the back-end data width.",
+            "type": "P",
+            "val": WTBUF_COMB_W,
+            "min": "0",
+            "max": "WORD_OFFSET_W",
+        },
         {
             "name": "REP_POLICY",
-            "descr": "Line replacement policy: set to 0 for Least Recently Used (LRU); set to 1 for Pseudo LRU based on Most Recently Used (PLRU_MRU); set to 2 for tree-based Pseudo LRU (PLRU_TREE).",
+            "descr": "Line replacement policy: set to 0 for Least Recently Used (LRU); set to 1 for Pseudo LRU based on Most Recently Used (PLRU_MRU); set to 2 for tree-based Pseudo LRU (PLRU_TREE); set to 3 for LFSR-based pseudo-random (RANDOM); set to 4 for First-In-First-Out (FIFO); set to 5 for Static Re-Reference Interval Prediction (SRRIP).",
             "type": "P",
-            "val": "0",
+            "val": REP_POLICY,
+            "min": "0",
+            "max": "5",
+        },
+        {
+            "name": "REP_DUEL",
+            "descr": "Runtime-selectable replacement policy (1) or not (0). If enabled, both REP_POLICY and REP_POLICY_ALT are implemented and kept up to date, and the REP_SEL register of the cache controller selects REP_POLICY (0), REP_POLICY_ALT (1) or set-dueling (2, the reset value and the selection without controller). In set-dueling, 1 set in 32 (or in 2**SET_INDEX_W) always uses each policy, a 10-bit saturating counter (REP_PSEL) counts up on the misses of the REP_POLICY leader sets and down on those of the REP_POLICY_ALT leader sets, and the other sets use REP_POLICY_ALT when its MSB is set.",
+            "type": "P",
+            "val": REP_DUEL,
             "min": "0",
-            "max": "3",
+            "max": "1",
+        },
+        {
+            "name": "REP_POLICY_ALT",
+            "descr": "Second line replacement policy (REP_DUEL=1), with the same encoding as REP_POLICY. The default, SRRIP, is not thrashed by the scans that thrash LRU.",
+            "type": "P",
+            "val": "5",
+            "min": "0",
+            "max": "5",
         },
         {
             "name": "WRITE_POL",
-            "descr": "Write policy: set to 0 for write-through or set to 1 for write-back.",
+            "descr": "Write policy: set to 0 for write-through or set to 1 for write-back. In write-back, a dirty line is copied to an eviction buffer when it is replaced, so that the line refill does not wait for its write-back.",
             "type": "P",
             "val": WRITE_POL,
             "min": "0",
@@ -217,7 +387,166 @@ def setup(py_params: dict):
             "min": "0",
             "max": "1",
         },
+        {
+            "name": "N_MSHR",
+            "descr": "Number of Miss Status Holding Registers (MSHRs). Set to 0 for a blocking cache. A value greater than 0 makes the cache non-blocking (write-through only): read misses are recorded in MSHRs and the front-end keeps accepting requests (hit-under-miss), including further misses to other lines (miss-under-miss), while line refills proceed in the background. Read data is still returned in request order.",
+            "type": "P",
+            "val": N_MSHR,
+            "min": "0",
+            "max": "16",
+        },
+        {
+            "name": "CRIT_WORD_FIRST",
+            "descr": "Critical-word-first line refill (1) or not (0). If enabled, a line refill starts with the back-end word holding the requested data (AXI4 WRAP burst or rotated IOb word order) and the requested data is returned as soon as it arrives (early restart), while the rest of the line is still being refilled. AXI4 WRAP bursts are limited to 16 beats: longer refills start at the line base, keeping only the early restart.",
+            "type": "P",
+            "val": CRIT_WORD_FIRST,
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "PREFETCH",
+            "descr": "Prefetcher: set to 0 for none (PF_NONE), 1 for next-line (PF_NEXT_LINE) or 2 for stride (PF_STRIDE). Read misses train the prefetcher, which refills the predicted line through the back-end read channel into a one-line prefetch buffer while the cache keeps serving hits. A later miss to that line copies it into the cache without accessing the back-end; stores to the prefetched line also update the prefetch buffer. Blocking write-through cache only. If the cache controller is present, prefetching can be disabled and useful/useless prefetches are counted.",
+            "type": "P",
+            "val": {"none": 0, "next_line": 1, "stride": 2}[PREFETCH],
+            "min": "0",
+            "max": "2",
+        },
+        {
+            "name": "RD_TXN_W",
+            "descr": "Outstanding back-end line refills (log2). Set to 0 to issue one line refill at a time. A value greater than 0 requires the non-blocking cache (N_MSHR > 0) and the AXI4 back-end: each MSHR issues its refill as soon as it is allocated, tagged with its own AXI ID (the MSHR number in the low RD_TXN_W bits of AXI_ID), and the refill bursts may be returned out of order or interleaved.",
+            "type": "P",
+            "val": RD_TXN_W,
+            "min": "0",
+            "max": "4",
+        },
+        {
+            "name": "WR_TXN_W",
+            "descr": "Posted back-end writes (log2 of the writes in flight). Set to 0 to wait for the write response of each write-through buffer entry before sending the next one. A value greater than 0 requires the AXI4 back-end and the write-through policy: up to 2**WR_TXN_W writes are sent without waiting for their B responses, which retire them in order; writes are sent again after a slave error. Line refills only wait for the posted writes to the same line, and the write-through buffer is reported empty when all writes have completed.",
+            "type": "P",
+            "val": WR_TXN_W,
+            "min": "0",
+            "max": "4",
+        },
+        {
+            "name": "N_VICTIM",
+            "descr": "Number of victim buffer lines. Set to 0 for no victim buffer. Otherwise, the last N_VICTIM lines evicted from the cache are kept in a fully-associative buffer, looked up in parallel with the tag memories: a miss to one of them swaps it back into the cache without accessing the back-end. In write-back operation, dirty lines are written back from the victim buffer when the back-end write channel is free, instead of before the line refill. Blocking cache only.",
+            "type": "P",
+            "val": N_VICTIM,
+            "min": "0",
+            "max": "16",
+        },
+        {
+            "name": "LAT_HIST_BINS",
+            "descr": "Number of bins of the latency histograms of the cache controller. Set to 0 for no histograms. Otherwise, the controller (USE_CTRL=1, USE_CTRL_CNT=1) measures the clock cycles from each line refill request to its last word, and from each back-end write request to its acknowledge, one refill and one write at a time. The bins are log2-spaced: bin 0 counts latencies below 2 cycles, bin b latencies from 2**b to 2**(b+1)-1 cycles, and the last bin also counts all longer latencies.",
+            "type": "P",
+            "val": LAT_HIST,
+            "min": "0",
+            "max": "16",
+        },
+        {
+            "name": "MAINT",
+            "descr": "Address-range cache maintenance (1) or not (0). If enabled, the cache controller (USE_CTRL=1) can clean (write back the dirty lines), invalidate, or clean and invalidate the lines of an address range: the range is given by MAINT_ADDR and MAINT_LEN, and writing the operation to MAINT_CMD starts it. The lines of the range are looked up one by one, between two front-end requests, and only the lines present in the cache are written back or invalidated. MAINT_BUSY reads 1 until all the lines and their back-end writes are done. Single lines can also be cleaned and/or invalidated by writing their address to LINE_CLEAN, LINE_INVAL or LINE_CLEAN_INVAL. Blocking cache without victim buffer only.",
+            "type": "P",
+            "val": MAINT,
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "WAY_LOCK",
+            "descr": "Way lockdown (1) or not (0). If enabled, the cache controller (USE_CTRL=1) has a LOCK_MASK register: the replacement policy never selects a locked way, so the lines in locked ways stay in the cache until they are invalidated. Locked ways still hit and are written. With MAINT=1, the preload operation (MAINT_CMD=4) refills the lines of an address range that are not in the cache into the locked ways. A mask locking all the ways is ignored.",
+            "type": "P",
+            "val": WAY_LOCK,
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "SPM",
+            "descr": "Scratchpad mode (1) or not (0). If enabled, the cache controller (USE_CTRL=1) can turn the first SPM_WAYS ways into a scratchpad memory mapped at SPM_BASE: the way w holds the way-sized block of addresses starting at SPM_BASE plus w times the way size (2**(FE_NBYTES_W+WORD_OFFSET_W+SET_INDEX_W) bytes). The front-end accesses inside this window always hit and never reach the back-end; the other accesses are cached in the remaining ways. The ways entering the scratchpad are invalidated, without writing back their dirty lines. SPM_BASE must be aligned to the way size and at least one way is left to the cache. Blocking cache only.",
+            "type": "P",
+            "val": SPM,
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "NBANKS_W",
+            "descr": "Second front-end port (1) or not (0). If NBANKS_W > 0, the cache has a second IOb front-end port, without access to the cache controller, and its data memory is interleaved in 2**NBANKS_W banks by word offset (at most one bank per word of the line). The tag memory gets a second read port. A read of the second port is looked up in its bank in the same clock cycle as a request of the first port to another bank, and served from there if it hits. The stores and misses of the second port, and its reads to the bank of the first port request, share the request pipeline with the first port in round-robin. The hits served from the banks update the replacement policy and the read hit counter when the request pipeline is empty; until then, the second port reads share the request pipeline. Blocking cache only, without scratchpad mode.",
+            "type": "P",
+            "val": NBANKS_W,
+            "min": "0",
+            "max": "WORD_OFFSET_W",
+        },
+        {
+            "name": "HARVARD",
+            "descr": "Split instruction/data cache (1) or not (0). If HARVARD=1, a read-only instruction cache with its own front-end port (iob_i_s) shares the AXI back-end with the cache, which becomes the data cache. The instruction cache has no write-through buffer nor dirty bits, and uses the line size, replacement policy and critical-word-first setting of the data cache. Its line refills and those of the data cache are arbitrated by the back-end (ARB_PRIO). Both caches are invalidated together. Blocking operation only.",
+            "type": "P",
+            "val": HARVARD,
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "ARB_PRIO",
+            "descr": "Back-end read channel priority (HARVARD=1) when both caches request a line refill in the same clock cycle: data cache first (0) or instruction cache first (1).",
+            "type": "P",
+            "val": "0",
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "BINV_W",
+            "descr": "Inclusive cache hierarchy (BINV_W > 0): log2 of the size in bytes of the blocks back-invalidated through the inclusion port (incl_io), usually the line size of the lower-level cache. A back-invalidation (binv_i) invalidates, without write-back and without tag lookup, all the ways of the sets that may hold a line of the block at binv_addr_i. The port also signals the valid lines replaced in the cache (evict_o, evict_addr_o), to back-invalidate them in the upper-level caches. Blocking cache only.",
+            "type": "P",
+            "val": BINV_W,
+            "min": "0",
+            "max": "FE_ADDR_W",
+        },
+        {
+            "name": "FE_PORTS",
+            "descr": "Number of front-end ports. If FE_PORTS > 1, the IOb ports iob_p1_s to iob_p<FE_PORTS-1>_s share the front-end with the main port through an arbiter (FE_ARB), which grants one request per clock cycle and routes the read data back in order. Only the main port reaches the cache controller.",
+            "type": "P",
+            "val": FE_PORTS,
+            "min": "1",
+            "max": "8",
+        },
+        {
+            "name": "FE_ARB",
+            "descr": "Front-end port arbitration (FE_PORTS > 1): fixed priority, main port first (0), or round-robin (1).",
+            "type": "P",
+            "val": "1",
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "SNOOP",
+            "descr": "Snoop channel (1) or not (0). If enabled, external writers to the memory invalidate the cache lines by address through the snoop port (snoop_io), one per clock cycle, instead of invalidating the whole cache: snoop_i looks up the line at snoop_addr_i in a second read port of the tag memory and invalidates the way holding it in the next clock cycle. Until its valid bit is cleared, a request to the snooped line misses and is served by a line refill. Snoops and back-invalidations (BINV_W > 0) may be used together. Blocking write-through cache without second front-end port (NBANKS_W = 0), victim buffer or prefetcher only (their lines are not snooped).",
+            "type": "P",
+            "val": SNOOP,
+            "min": "0",
+            "max": "1",
+        },
+        {
+            "name": "I_NWAYS_W",
+            "descr": "Number of instruction cache ways (log2), if HARVARD=1.",
+            "type": "P",
+            "val": "NWAYS_W",
+            "min": "0",
+            "max": "8",
+        },
+        {
+            "name": "I_SET_INDEX_W",
+            "descr": "Width of the instruction cache's set index field, if HARVARD=1.",
+            "type": "P",
+            "val": "SET_INDEX_W",
+            "min": "",
+            "max": "",
+        },
         # Derived parameters
+        {
+            "name": "RD_ID_W",
+            "type": "D",
+            "val": "(RD_TXN_W > 0) ? RD_TXN_W : 1",
+            "min": "1",
+            "max": "4",
+        },
         {
             "name": "FE_NBYTES",
             "type": "D",
@@ -283,7 +612,7 @@ def setup(py_params: dict):
                 "name": "AXI_ID_W",
                 "descr": "AXI ID width",
                 "type": "P",
-                "val": "1",
+                "val": str(max(1, RD_TXN_W)),
                 "min": "0",
                 "max": "32",
             },
@@ -361,6 +690,93 @@ def setup(py_params: dict):
                 },
             }
         )
+    if NBANKS_W:
+        attributes_dict["ports"].append(
+            {
+                "name": "iob1_s",
+                "descr": "Second front-end interface (NBANKS_W > 0), without access to the cache controller.",
+                "signals": {
+                    "type": "iob",
+                    "prefix": "fe1_",
+                    "ADDR_W": "FE_ADDR_W",
+                    "DATA_W": "DATA_W",
+                },
+            }
+        )
+    if HARVARD:
+        attributes_dict["ports"].append(
+            {
+                "name": "iob_i_s",
+                "descr": "Instruction cache front-end interface (HARVARD=1). Read-only: the write strobes are ignored.",
+                "signals": {
+                    "type": "iob",
+                    "prefix": "ife_",
+                    "ADDR_W": "FE_ADDR_W",
+                    "DATA_W": "DATA_W",
+                },
+            }
+        )
+    for p in range(1, FE_PORTS):
+        attributes_dict["ports"].append(
+            {
+                "name": f"iob_p{p}_s",
+                "descr": f"Front-end port {p} (FE_PORTS > 1), without access to the cache controller.",
+                "signals": {
+                    "type": "iob",
+                    "prefix": f"fe_p{p}_",
+                    "ADDR_W": "ADDR_W",
+                    "DATA_W": "DATA_W",
+                },
+            }
+        )
+    if SNOOP:
+        attributes_dict["ports"].append(
+            {
+                "name": "snoop_io",
+                "descr": "Snoop channel (SNOOP=1)",
+                "signals": [
+                    {
+                        "name": "snoop_i",
+                        "descr": "Invalidates the cache line at 'snoop_addr_i', written by an external writer.",
+                        "width": 1,
+                    },
+                    {
+                        "name": "snoop_addr_i",
+                        "descr": "Byte address written by the external writer.",
+                        "width": "FE_ADDR_W",
+                    },
+                ],
+            }
+        )
+    if BINV_W:
+        attributes_dict["ports"].append(
+            {
+                "name": "incl_io",
+                "descr": "Inclusion port of an inclusive cache hierarchy (BINV_W > 0)",
+                "signals": [
+                    {
+                        "name": "evict_o",
+                        "descr": "A valid line is replaced in the cache. Drives 'binv_i' of the upper-level cache, if there is one.",
+                        "width": 1,
+                    },
+                    {
+                        "name": "evict_addr_o",
+                        "descr": "Byte address of the replaced line.",
+                        "width": "FE_ADDR_W",
+                    },
+                    {
+                        "name": "binv_i",
+                        "descr": "Back-invalidates the lines of the 2**BINV_W-byte block at 'binv_addr_i', replaced in the lower-level cache. It should be tied low if there is no lower-level inclusive cache.",
+                        "width": 1,
+                    },
+                    {
+                        "name": "binv_addr_i",
+                        "descr": "Byte address of the back-invalidated block.",
+                        "width": "FE_ADDR_W",
+                    },
+                ],
+            }
+        )
     attributes_dict["ports"] += [
         {
             "name": "ie_io",
@@ -456,10 +872,28 @@ def setup(py_params: dict):
                 {"name": "data_addr", "width": "FE_ADDR_W - FE_NBYTES_W"},
                 {"name": "data_rdata", "width": "FE_DATA_W"},
                 {"name": "data_ack", "width": 1},
+                {"name": "data_rvalid", "width": 1},
                 {"name": "data_req_reg", "width": 1},
                 {"name": "data_addr_reg", "width": "FE_ADDR_W - FE_NBYTES_W"},
                 {"name": "data_wdata_reg", "width": "FE_DATA_W"},
                 {"name": "data_wstrb_reg", "width": "FE_NBYTES"},
+                {"name": "data_spm_reg", "width": 1},
+                {"name": "data_spm_way_reg", "width": 8},
+            ],
+        },
+        {
+            "name": "fe1_cache_mem",
+            "descr": "Second cache memory front-end interface",
+            "signals": [
+                {"name": "data1_req", "width": 1},
+                {"name": "data1_addr", "width": "FE_ADDR_W - FE_NBYTES_W"},
+                {"name": "data1_rdata", "width": "FE_DATA_W"},
+                {"name": "data1_ack", "width": 1},
+                {"name": "data1_rvalid", "width": 1},
+                {"name": "data1_req_reg", "width": 1},
+                {"name": "data1_addr_reg", "width": "FE_ADDR_W - FE_NBYTES_W"},
+                {"name": "data1_wdata_reg", "width": "FE_DATA_W"},
+                {"name": "data1_wstrb_reg", "width": "FE_NBYTES"},
             ],
         },
         {
@@ -468,6 +902,7 @@ def setup(py_params: dict):
             "signals": [
                 {"name": "ctrl_req", "width": 1},
                 {"name": "ctrl_addr", "width": f"`{NAME.upper()}_ADDR_W_CSRS"},
+                {"name": "ctrl_wdata", "width": "FE_DATA_W"},
                 {"name": "ctrl_wstrb", "width": "FE_DATA_W/8"},
                 {"name": "ctrl_rdata", "width": "FE_DATA_W"},
                 {"name": "ctrl_ack", "width": 1},
@@ -483,12 +918,31 @@ def setup(py_params: dict):
                     "name": "cache_mem_data_addr",
                     "width": "FE_ADDR_W-(BE_NBYTES_W+LINE2BE_W)",
                 },
+                {"name": "cache_mem_data_offset", "width": "WORD_OFFSET_W"},
                 {"name": "data_rdata"},
                 {"name": "data_ack"},
+                {"name": "data_rvalid"},
                 {"name": "data_req_reg"},
                 {"name": "data_addr_reg"},
                 {"name": "data_wdata_reg"},
                 {"name": "data_wstrb_reg"},
+                {"name": "data_spm_reg"},
+                {"name": "data_spm_way_reg"},
+            ],
+        },
+        {
+            "name": "cache_mem_fe1",
+            "descr": "Second cache memory front-end interface",
+            "signals": [
+                {"name": "data1_req"},
+                {"name": "data1_addr"},
+                {"name": "data1_rdata"},
+                {"name": "data1_ack"},
+                {"name": "data1_rvalid"},
+                {"name": "data1_req_reg"},
+                {"name": "data1_addr_reg"},
+                {"name": "data1_wdata_reg"},
+                {"name": "data1_wstrb_reg"},
             ],
         },
         {
@@ -498,14 +952,15 @@ def setup(py_params: dict):
                 {"name": "write_req", "width": 1},
                 {
                     "name": "write_addr",
-                    "width": "FE_ADDR_W - (FE_NBYTES_W + WRITE_POL*WORD_OFFSET_W)",
+                    "width": "FE_ADDR_W - (FE_NBYTES_W + WRITE_POL*WORD_OFFSET_W + (1-WRITE_POL)*WTBUF_COMB_W)",
                 },
                 {
                     "name": "write_wdata",
-                    "width": "FE_DATA_W + WRITE_POL*(FE_DATA_W*(2**WORD_OFFSET_W)-FE_DATA_W)",
+                    "width": "FE_DATA_W*(2**(WRITE_POL*WORD_OFFSET_W + (1-WRITE_POL)*WTBUF_COMB_W))",
                 },
-                {"name": "write_wstrb", "width": "FE_NBYTES"},
+                {"name": "write_wstrb", "width": "FE_NBYTES*(2**((1-WRITE_POL)*WTBUF_COMB_W))"},
                 {"name": "write_ack", "width": 1},
+                {"name": "write_idle", "width": 1},
             ],
         },
         {
@@ -513,11 +968,16 @@ def setup(py_params: dict):
             "descr": "Back-end read channel",
             "signals": [
                 {"name": "replace_req", "width": 1},
+                {"name": "replace_ready", "width": 1},
                 {"name": "replace", "width": 1},
                 {"name": "replace_addr", "width": "FE_ADDR_W-(BE_NBYTES_W+LINE2BE_W)"},
+                {"name": "replace_word", "width": "LINE2BE_W"},
+                {"name": "replace_id", "width": "RD_ID_W"},
                 {"name": "read_req", "width": 1},
                 {"name": "read_addr", "width": "LINE2BE_W"},
                 {"name": "read_rdata", "width": "BE_DATA_W"},
+                {"name": "read_id", "width": "RD_ID_W"},
+                {"name": "read_last", "width": 1},
             ],
         },
         {
@@ -531,6 +991,32 @@ def setup(py_params: dict):
                 {"name": "write_miss", "width": 1},
                 {"name": "read_hit", "width": 1},
                 {"name": "read_miss", "width": 1},
+                {"name": "prefetch_en", "width": 1},
+                {"name": "pf_useful", "width": 1},
+                {"name": "pf_useless", "width": 1},
+                {"name": "stall_miss", "width": 1},
+                {"name": "stall_raw", "width": 1},
+                {"name": "stall_wtbuf", "width": 1},
+                {"name": "stall_flush", "width": 1},
+                {"name": "dirty_evict", "width": 1},
+                {"name": "wtbuf_level", "width": "WTBUF_DEPTH_W+1"},
+                {"name": "maint_start", "width": 1},
+                {"name": "maint_cmd", "width": 3},
+                {"name": "maint_addr", "width": "FE_DATA_W"},
+                {"name": "maint_len", "width": "FE_DATA_W"},
+                {"name": "maint_busy", "width": 1},
+                {"name": "way_lock", "width": "FE_DATA_W"},
+                {"name": "spm_ways", "width": 8},
+                {"name": "rep_sel", "width": 2},
+                {"name": "rep_psel", "width": 16},
+            ],
+        },
+        {
+            "name": "fe_spm",
+            "descr": "Scratchpad window",
+            "signals": [
+                {"name": "spm_base", "width": "FE_DATA_W"},
+                {"name": "spm_ways"},
             ],
         },
         # Internal signals
@@ -539,11 +1025,81 @@ def setup(py_params: dict):
             "descr": "Internal signals for control interface.",
             "signals": [
                 {"name": "ctrl_invalidate", "width": 1},
+                {"name": "be_read_beat", "width": 1},
+                {"name": "be_write_beat", "width": 1},
             ],
         },
     ]
+    if not SNOOP:
+        attributes_dict["wires"].append(
+            {
+                "name": "snoop_io",
+                "descr": "Cache memory snoop channel (unused)",
+                "signals": [
+                    {"name": "snoop", "width": 1},
+                    {"name": "snoop_addr", "width": "FE_ADDR_W"},
+                ],
+            }
+        )
+    if NBANKS_W:
+        attributes_dict["wires"].append(
+            {
+                "name": "fe1_ctrl",
+                "descr": "Control interface of the second front-end port (unused).",
+                "signals": [
+                    {"name": "ctrl1_req", "width": 1},
+                    {"name": "ctrl1_addr", "width": f"`{NAME.upper()}_ADDR_W_CSRS"},
+                    {"name": "ctrl1_wdata", "width": "FE_DATA_W"},
+                    {"name": "ctrl1_wstrb", "width": "FE_DATA_W/8"},
+                    {"name": "ctrl1_rdata", "width": "FE_DATA_W"},
+                    {"name": "ctrl1_ack", "width": 1},
+                ],
+            }
+        )
+    if FE_PORTS > 1:
+        attributes_dict["wires"].append(
+            {
+                "name": "arb_iob",
+                "descr": "Front-end port arbiter to front-end bus",
+                "signals": {
+                    "type": "iob",
+                    "prefix": "arb_",
+                    "ADDR_W": "ADDR_W",
+                    "DATA_W": "DATA_W",
+                },
+            }
+        )
+    if not BINV_W:
+        attributes_dict["wires"].append(
+            {
+                "name": "incl_io",
+                "descr": "Cache memory inclusion port (unused)",
+                "signals": [
+                    {"name": "evict", "width": 1},
+                    {"name": "evict_addr", "width": "FE_ADDR_W"},
+                    {"name": "binv", "width": 1},
+                    {"name": "binv_addr", "width": "FE_ADDR_W"},
+                ],
+            }
+        )
     if BE_IF == "AXI4":
         attributes_dict["wires"] += [
+            {
+                "name": "ibe_read_if",
+                "descr": "Back-end read channel of the instruction cache (HARVARD=1)",
+                "signals": [
+                    {"name": "icache_replace_req", "width": 1},
+                    {"name": "icache_replace_ready", "width": 1},
+                    {"name": "icache_replace", "width": 1},
+                    {
+                        "name": "icache_replace_addr",
+                        "width": "FE_ADDR_W-(BE_NBYTES_W+LINE2BE_W)",
+                    },
+                    {"name": "icache_replace_word", "width": "LINE2BE_W"},
+                    {"name": "icache_read_req", "width": 1},
+                    {"name": "icache_read_last", "width": 1},
+                ],
+            },
             {
                 "name": "clk_rst_s",
                 "descr": "",
@@ -553,19 +1109,163 @@ def setup(py_params: dict):
                 ],
             },
         ]
-    #
-    # Subblocks
-    #
-    converter_connect = {
-        "s_s": f"{FE_IF.lower()}_s",
-        "m_m": "internal_iob",
-    }
-    if FE_IF.lower() != "iob":
-        converter_connect["clk_en_rst_s"] = "clk_en_rst_s"
-    attributes_dict["subblocks"] = [
-        {
-            "core_name": "iob_universal_converter",
-            "instance_name": "iob_universal_converter",
+    if HARVARD:
+        attributes_dict["wires"] += [
+            {
+                "name": "ife_cache_mem",
+                "descr": "Instruction cache front-end to cache memory interface (HARVARD=1)",
+                "signals": [
+                    {"name": "icache_data_req", "width": 1},
+                    {"name": "icache_data_addr", "width": "FE_ADDR_W - FE_NBYTES_W"},
+                    {"name": "icache_data_rdata", "width": "FE_DATA_W"},
+                    {"name": "icache_data_ack", "width": 1},
+                    {"name": "icache_data_rvalid", "width": 1},
+                    {"name": "icache_data_req_reg", "width": 1},
+                    {"name": "icache_data_addr_reg", "width": "FE_ADDR_W - FE_NBYTES_W"},
+                    {"name": "icache_data_wdata_reg", "width": "FE_DATA_W"},
+                    {"name": "icache_data_wstrb_reg", "width": "FE_NBYTES"},
+                ],
+            },
+            {
+                "name": "ife_ctrl",
+                "descr": "Control interface of the instruction cache front-end (unused)",
+                "signals": [
+                    {"name": "icache_ctrl_req", "width": 1},
+                    {"name": "icache_ctrl_addr", "width": f"`{NAME.upper()}_ADDR_W_CSRS"},
+                    {"name": "icache_ctrl_wdata", "width": "FE_DATA_W"},
+                    {"name": "icache_ctrl_wstrb", "width": "FE_DATA_W/8"},
+                    {"name": "icache_ctrl_rdata", "width": "FE_DATA_W"},
+                    {"name": "icache_ctrl_ack", "width": 1},
+                ],
+            },
+            {
+                "name": "icache_mem_fe",
+                "descr": "Instruction cache memory front-end interface. Read-only: no write data nor strobes.",
+                "signals": [
+                    {"name": "icache_data_req"},
+                    {
+                        "name": "icache_mem_data_addr",
+                        "width": "FE_ADDR_W-(BE_NBYTES_W+LINE2BE_W)",
+                    },
+                    {"name": "icache_mem_data_offset", "width": "WORD_OFFSET_W"},
+                    {"name": "icache_data_rdata"},
+                    {"name": "icache_data_ack"},
+                    {"name": "icache_data_rvalid"},
+                    {"name": "icache_data_req_reg"},
+                    {"name": "icache_data_addr_reg"},
+                    {"name": "icache_wdata_reg", "width": "FE_DATA_W"},
+                    {"name": "icache_wstrb_reg", "width": "FE_NBYTES"},
+                    {"name": "icache_spm_reg", "width": 1},
+                    {"name": "icache_spm_way_reg", "width": 8},
+                ],
+            },
+            {
+                "name": "icache_mem_fe1",
+                "descr": "Second instruction cache memory front-end interface (unused)",
+                "signals": [
+                    {"name": "icache_data1_req", "width": 1},
+                    {"name": "icache_data1_addr", "width": "FE_ADDR_W - FE_NBYTES_W"},
+                    {"name": "icache_data1_rdata", "width": "FE_DATA_W"},
+                    {"name": "icache_data1_ack", "width": 1},
+                    {"name": "icache_data1_rvalid", "width": 1},
+                    {"name": "icache_data1_req_reg", "width": 1},
+                    {"name": "icache_data1_addr_reg", "width": "FE_ADDR_W - FE_NBYTES_W"},
+                    {"name": "icache_data1_wdata_reg", "width": "FE_DATA_W"},
+                    {"name": "icache_data1_wstrb_reg", "width": "FE_NBYTES"},
+                ],
+            },
+            {
+                "name": "icache_be_write",
+                "descr": "Back-end write channel of the instruction cache (unused)",
+                "signals": [
+                    {"name": "icache_write_req", "width": 1},
+                    {"name": "icache_write_addr", "width": "FE_ADDR_W - FE_NBYTES_W"},
+                    {"name": "icache_write_wdata", "width": "FE_DATA_W"},
+                    {"name": "icache_write_wstrb", "width": "FE_NBYTES"},
+                    {"name": "icache_write_ack", "width": 1},
+                    {"name": "icache_write_idle", "width": 1},
+                ],
+            },
+            {
+                "name": "icache_be_read",
+                "descr": "Back-end read channel of the instruction cache memory",
+                "signals": [
+                    {"name": "icache_replace_req"},
+                    {"name": "icache_replace_ready"},
+                    {"name": "icache_replace"},
+                    {"name": "icache_replace_addr"},
+                    {"name": "icache_replace_word"},
+                    {"name": "icache_replace_id", "width": 1},
+                    {"name": "icache_read_req"},
+                    {"name": "read_addr"},
+                    {"name": "read_rdata"},
+                    {"name": "icache_read_id", "width": 1},
+                    {"name": "icache_read_last"},
+                ],
+            },
+            {
+                "name": "icache_incl",
+                "descr": "Instruction cache memory inclusion port (unused)",
+                "signals": [
+                    {"name": "icache_evict", "width": 1},
+                    {"name": "icache_evict_addr", "width": "FE_ADDR_W"},
+                    {"name": "icache_binv", "width": 1},
+                    {"name": "icache_binv_addr", "width": "FE_ADDR_W"},
+                ],
+            },
+            {
+                "name": "icache_snoop",
+                "descr": "Instruction cache memory snoop channel (unused)",
+                "signals": [
+                    {"name": "icache_snoop", "width": 1},
+                    {"name": "icache_snoop_addr", "width": "FE_ADDR_W"},
+                ],
+            },
+            {
+                "name": "icache_mem_ctrl",
+                "descr": "Instruction cache memory control interface: invalidated together with the data cache",
+                "signals": [
+                    {"name": "invalidate_o"},
+                    {"name": "icache_wtbuf_full", "width": 1},
+                    {"name": "icache_wtbuf_empty", "width": 1},
+                    {"name": "icache_write_hit", "width": 1},
+                    {"name": "icache_write_miss", "width": 1},
+                    {"name": "icache_read_hit", "width": 1},
+                    {"name": "icache_read_miss", "width": 1},
+                    {"name": "icache_prefetch_en", "width": 1},
+                    {"name": "icache_pf_useful", "width": 1},
+                    {"name": "icache_pf_useless", "width": 1},
+                    {"name": "icache_stall_miss", "width": 1},
+                    {"name": "icache_stall_raw", "width": 1},
+                    {"name": "icache_stall_wtbuf", "width": 1},
+                    {"name": "icache_stall_flush", "width": 1},
+                    {"name": "icache_dirty_evict", "width": 1},
+                    {"name": "icache_wtbuf_level", "width": "WTBUF_DEPTH_W+1"},
+                    {"name": "icache_maint_start", "width": 1},
+                    {"name": "icache_maint_cmd", "width": 3},
+                    {"name": "icache_maint_addr", "width": "FE_DATA_W"},
+                    {"name": "icache_maint_len", "width": "FE_DATA_W"},
+                    {"name": "icache_maint_busy", "width": 1},
+                    {"name": "icache_way_lock", "width": "FE_DATA_W"},
+                    {"name": "icache_spm_ways", "width": 8},
+                    {"name": "icache_rep_sel", "width": 2},
+                    {"name": "icache_rep_psel", "width": 16},
+                ],
+            },
+        ]
+    #
+    # Subblocks
+    #
+    converter_connect = {
+        "s_s": f"{FE_IF.lower()}_s",
+        "m_m": "internal_iob",
+    }
+    if FE_IF.lower() != "iob":
+        converter_connect["clk_en_rst_s"] = "clk_en_rst_s"
+    attributes_dict["subblocks"] = [
+        {
+            "core_name": "iob_universal_converter",
+            "instance_name": "iob_universal_converter",
             "instance_description": "Convert front-end interface into internal IOb port",
             "subordinate_if": FE_IF.lower(),
             "manager_if": "iob",
@@ -588,14 +1288,42 @@ def setup(py_params: dict):
                 "DATA_W": "DATA_W",
                 "USE_CTRL": "0" if USE_DEDICATED_CTRL_PORT else "USE_CTRL",
                 "ADDR_W_CSRS": f"`{NAME.upper()}_ADDR_W_CSRS",
+                "SPM": "SPM",
+                "SPM_SHIFT": "FE_NBYTES_W + WORD_OFFSET_W + SET_INDEX_W",
             },
             "connect": {
                 "clk_en_rst_s": "clk_en_rst_s",
-                "iob_s": "internal_iob",
+                "iob_s": "arb_iob" if FE_PORTS > 1 else "internal_iob",
                 "cache_mem_io": "fe_cache_mem",
                 "ctrl_io": "fe_ctrl",
+                "spm_io": "fe_spm",
             },
         },
+    ]
+    if NBANKS_W:
+        attributes_dict["subblocks"].append(
+            {
+                "core_name": "iob_cache_front_end",
+                "instance_name": "front_end_1",
+                "instance_description": "Second front-end port, served by the data memory banks",
+                # no scratchpad window on the second port
+                "name": "iob_cache_front_end_nospm",
+                "spm_io": False,
+                "parameters": {
+                    "ADDR_W": "FE_ADDR_W",
+                    "DATA_W": "DATA_W",
+                    "USE_CTRL": "0",
+                    "ADDR_W_CSRS": f"`{NAME.upper()}_ADDR_W_CSRS",
+                },
+                "connect": {
+                    "clk_en_rst_s": "clk_en_rst_s",
+                    "iob_s": "iob1_s",
+                    "cache_mem_io": "fe1_cache_mem",
+                    "ctrl_io": "fe1_ctrl",
+                },
+            }
+        )
+    attributes_dict["subblocks"] += [
         {
             "core_name": "iob_cache_memory",
             "instance_name": "cache_memory",
@@ -609,20 +1337,88 @@ def setup(py_params: dict):
                 "SET_INDEX_W": "SET_INDEX_W",
                 "WORD_OFFSET_W": "WORD_OFFSET_W",
                 "WTBUF_DEPTH_W": "WTBUF_DEPTH_W",
+                "WTBUF_COMB_W": "WTBUF_COMB_W",
                 "REP_POLICY": "REP_POLICY",
+                "REP_DUEL": "REP_DUEL",
+                "REP_POLICY_ALT": "REP_POLICY_ALT",
                 "WRITE_POL": "WRITE_POL",
                 "USE_CTRL": "USE_CTRL",
                 "USE_CTRL_CNT": "USE_CTRL_CNT",
+                "N_MSHR": "N_MSHR",
+                "CRIT_WORD_FIRST": "CRIT_WORD_FIRST",
+                "PREFETCH": "PREFETCH",
+                "RD_TXN_W": "RD_TXN_W",
+                "N_VICTIM": "N_VICTIM",
+                "MAINT": "MAINT",
+                "WAY_LOCK": "WAY_LOCK",
+                "SPM": "SPM",
+                "NBANKS_W": "NBANKS_W",
+                "BINV_W": "BINV_W",
+                "SNOOP": "SNOOP",
             },
             "connect": {
                 "clk_en_rst_s": "clk_en_rst_s",
                 "fe_io": "cache_mem_fe",
+                "fe1_io": "cache_mem_fe1",
                 "be_write_io": "be_write_if",
                 "be_read_io": "be_read_if",
+                "incl_io": "incl_io",
+                "snoop_io": "snoop_io",
                 "ctrl_io": "cache_mem_ctrl",
             },
         },
     ]
+    if HARVARD:
+        attributes_dict["subblocks"] += [
+            {
+                "core_name": "iob_cache_front_end",
+                "instance_name": "icache_front_end",
+                "instance_description": "Instruction cache front-end (HARVARD=1), without access to the cache controller",
+                "name": "iob_cache_front_end_nospm",
+                "spm_io": False,
+                "parameters": {
+                    "ADDR_W": "FE_ADDR_W",
+                    "DATA_W": "DATA_W",
+                    "USE_CTRL": "0",
+                    "ADDR_W_CSRS": f"`{NAME.upper()}_ADDR_W_CSRS",
+                },
+                "connect": {
+                    "clk_en_rst_s": "clk_en_rst_s",
+                    "iob_s": "iob_i_s",
+                    "cache_mem_io": "ife_cache_mem",
+                    "ctrl_io": "ife_ctrl",
+                },
+            },
+            {
+                "core_name": "iob_cache_memory",
+                "instance_name": "icache_memory",
+                "instance_description": "Read-only instruction cache memory (HARVARD=1). Its line refills share the back-end read channel with the data cache.",
+                "config_macros": config_macros,
+                "parameters": {
+                    "FE_ADDR_W": "FE_ADDR_W",
+                    "FE_DATA_W": "FE_DATA_W",
+                    "BE_DATA_W": "BE_DATA_W",
+                    "NWAYS_W": "I_NWAYS_W",
+                    "SET_INDEX_W": "I_SET_INDEX_W",
+                    "WORD_OFFSET_W": "WORD_OFFSET_W",
+                    "WTBUF_DEPTH_W": "WTBUF_DEPTH_W",
+                    "REP_POLICY": "REP_POLICY",
+                    "WRITE_POL": "0",  # write-through, without stores
+                    "CRIT_WORD_FIRST": "CRIT_WORD_FIRST",
+                    "READ_ONLY": "1",
+                },
+                "connect": {
+                    "clk_en_rst_s": "clk_en_rst_s",
+                    "fe_io": "icache_mem_fe",
+                    "fe1_io": "icache_mem_fe1",
+                    "be_write_io": "icache_be_write",
+                    "be_read_io": "icache_be_read",
+                    "incl_io": "icache_incl",
+                    "snoop_io": "icache_snoop",
+                    "ctrl_io": "icache_mem_ctrl",
+                },
+            },
+        ]
     if BE_IF == "AXI4":
         attributes_dict["subblocks"] += [
             {
@@ -636,16 +1432,23 @@ def setup(py_params: dict):
                     "BE_DATA_W": "BE_DATA_W",
                     "WORD_OFFSET_W": "WORD_OFFSET_W",
                     "WRITE_POL": "WRITE_POL",
+                    "WTBUF_COMB_W": "WTBUF_COMB_W",
+                    "CRIT_WORD_FIRST": "CRIT_WORD_FIRST",
+                    "RD_TXN_W": "RD_TXN_W",
+                    "WR_TXN_W": "WR_TXN_W",
                     "AXI_ADDR_W": "AXI_ADDR_W",
                     "AXI_DATA_W": "AXI_DATA_W",
                     "AXI_ID_W": "AXI_ID_W",
                     "AXI_LEN_W": "AXI_LEN_W",
                     "AXI_ID": "AXI_ID",
+                    "HARVARD": "HARVARD",
+                    "ARB_PRIO": "ARB_PRIO",
                 },
                 "connect": {
                     "clk_rst_s": "clk_rst_s",
                     "write_io": "be_write_if",
                     "read_io": "be_read_if",
+                    "read1_io": "ibe_read_if",
                     "axi_m": "axi_m",
                 },
             },
@@ -663,6 +1466,8 @@ def setup(py_params: dict):
                     "BE_DATA_W": "BE_DATA_W",
                     "WORD_OFFSET_W": "WORD_OFFSET_W",
                     "WRITE_POL": "WRITE_POL",
+                    "WTBUF_COMB_W": "WTBUF_COMB_W",
+                    "CRIT_WORD_FIRST": "CRIT_WORD_FIRST",
                 },
                 "connect": {
                     "clk_en_rst_s": "clk_en_rst_s",
@@ -775,7 +1580,7 @@ def setup(py_params: dict):
                         },
                         {
                             "name": "RST_CNTRS",
-                            "descr": "Reset read/write hit/miss counters by writing any value to this register.",
+                            "descr": "Reset all counters (hit/miss, prefetch, cycle, stall, back-end, eviction and write-through buffer occupancy) by writing any value to this register. The latency histograms are cleared by LAT_HIST_CLR.",
                             "type": "NOAUTO",
                             "mode": "W",
                             "n_bits": 1,
@@ -793,6 +1598,276 @@ def setup(py_params: dict):
                             "addr": 29,
                             "log2n_items": 0,
                         },
+                        {
+                            "name": "PF_EN",
+                            "descr": "Prefetcher enabled (1) or disabled (0). Only meaningful if the cache has a prefetcher (PREFETCH > 0).",
+                            "type": "NOAUTO",
+                            "mode": "RW",
+                            "n_bits": 1,
+                            "rst_val": 1,
+                            "addr": 32,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "PF_USEFUL",
+                            "descr": "Useful prefetch counter: prefetched lines used by a read miss. Reset by RST_CNTRS.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 36,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "PF_USELESS",
+                            "descr": "Useless prefetch counter: prefetched lines discarded before being used. Reset by RST_CNTRS.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 40,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "CYCLE_CNT",
+                            "descr": "Cycle counter: clock cycles since reset or RST_CNTRS.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 44,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "STALL_MISS",
+                            "descr": "Miss stall counter: clock cycles a front-end request waited for a line refill (or another stall not counted below). Reset by RST_CNTRS.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 48,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "STALL_RAW",
+                            "descr": "RAW stall counter: clock cycles a front-end read hit waited for a store to the same word in the previous clock cycle. Reset by RST_CNTRS.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 52,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "STALL_WTB",
+                            "descr": "Write-through buffer stall counter: clock cycles a front-end store waited for the write-through buffer to have room. Reset by RST_CNTRS.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 56,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "STALL_FLUSH",
+                            "descr": "Write-back flush stall counter: clock cycles a front-end miss waited for a dirty line write-back before its refill (write-back only). Reset by RST_CNTRS.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 60,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "BE_READ_BEATS",
+                            "descr": "Back-end read beat counter: back-end data words received. Reset by RST_CNTRS.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 64,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "BE_WRITE_BEATS",
+                            "descr": "Back-end write beat counter: back-end data words sent. Reset by RST_CNTRS.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 68,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "DIRTY_EVICT",
+                            "descr": "Dirty eviction counter: dirty lines evicted from the cache (write-back only). Reset by RST_CNTRS.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 72,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "WTB_LEVEL_SUM",
+                            "descr": "Write-through buffer occupancy integral: sum of the buffer level in every clock cycle. Divided by CYCLE_CNT, it gives the average buffer depth. Reset by RST_CNTRS.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 76,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "LAT_HIST_SEL",
+                            "descr": "Latency histogram bin read by LAT_HIST_BIN: bits 3-0 select the bin, bit 7 the back-end write (1) or line refill (0) histogram. Only meaningful if the cache has latency histograms (LAT_HIST_BINS > 0).",
+                            "type": "NOAUTO",
+                            "mode": "W",
+                            "n_bits": 8,
+                            "rst_val": 0,
+                            "addr": 80,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "LAT_HIST_BIN",
+                            "descr": "Latency histogram bin selected by LAT_HIST_SEL: number of line refills or back-end writes with a latency in the bin.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 84,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "LAT_HIST_CLR",
+                            "descr": "Clear both latency histograms by writing any value to this register.",
+                            "type": "NOAUTO",
+                            "mode": "W",
+                            "n_bits": 1,
+                            "rst_val": 0,
+                            "addr": 88,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "MAINT_ADDR",
+                            "descr": "Start byte address of the address range of the maintenance operations. Only meaningful if the cache supports them (MAINT=1).",
+                            "type": "NOAUTO",
+                            "mode": "W",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 92,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "MAINT_LEN",
+                            "descr": "Length in bytes of the address range of the maintenance operations.",
+                            "type": "NOAUTO",
+                            "mode": "W",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 96,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "MAINT_CMD",
+                            "descr": "Maintenance operation on the lines of the address range, started by writing it to this register: clean (1), invalidate (2), clean and invalidate (3) or preload into the locked ways (4, only meaningful if WAY_LOCK=1). Ignored while MAINT_BUSY is 1.",
+                            "type": "NOAUTO",
+                            "mode": "W",
+                            "n_bits": 3,
+                            "rst_val": 0,
+                            "addr": 100,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "MAINT_BUSY",
+                            "descr": "Maintenance operation in progress (1) or done (0): the lines of the range are clean and/or invalid and their back-end writes have completed.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 1,
+                            "rst_val": 0,
+                            "addr": 101,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "LINE_CLEAN",
+                            "descr": "Clean (write back, if dirty) the cache line holding the byte address written to this register. Only the line is looked up and the other lines stay valid. MAINT_ADDR and MAINT_LEN are overwritten with the address and a one-byte length; the write is ignored while MAINT_BUSY is 1.",
+                            "type": "NOAUTO",
+                            "mode": "W",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 104,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "LINE_INVAL",
+                            "descr": "Invalidate the cache line holding the byte address written to this register, discarding its data if dirty. Only the line is looked up and the other lines stay valid. MAINT_ADDR and MAINT_LEN are overwritten with the address and a one-byte length; the write is ignored while MAINT_BUSY is 1.",
+                            "type": "NOAUTO",
+                            "mode": "W",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 108,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "LINE_CLEAN_INVAL",
+                            "descr": "Clean and invalidate the cache line holding the byte address written to this register. Only the line is looked up and the other lines stay valid. MAINT_ADDR and MAINT_LEN are overwritten with the address and a one-byte length; the write is ignored while MAINT_BUSY is 1.",
+                            "type": "NOAUTO",
+                            "mode": "W",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 112,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "LOCK_MASK",
+                            "descr": "Way lockdown mask: bit w set locks way w, which is not selected for replacement. Only meaningful if the cache supports way lockdown (WAY_LOCK=1).",
+                            "type": "NOAUTO",
+                            "mode": "RW",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 116,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "SPM_BASE",
+                            "descr": "Base byte address of the scratchpad window, aligned to the way size. Only meaningful if the cache supports scratchpad mode (SPM=1).",
+                            "type": "NOAUTO",
+                            "mode": "RW",
+                            "n_bits": 32,
+                            "rst_val": 0,
+                            "addr": 120,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "SPM_WAYS",
+                            "descr": "Number of ways in scratchpad mode (0 disables the scratchpad), at most the number of ways minus one. Ways 0 to SPM_WAYS-1 are taken from the cache and invalidated when they enter the scratchpad; write back their dirty lines first.",
+                            "type": "NOAUTO",
+                            "mode": "RW",
+                            "n_bits": 8,
+                            "rst_val": 0,
+                            "addr": 124,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "REP_SEL",
+                            "descr": "Replacement policy in use: REP_POLICY (0), REP_POLICY_ALT (1) or set-dueling between them (2). Only meaningful if the cache implements both (REP_DUEL=1).",
+                            "type": "NOAUTO",
+                            "mode": "RW",
+                            "n_bits": 2,
+                            "rst_val": 2,
+                            "addr": 125,
+                            "log2n_items": 0,
+                        },
+                        {
+                            "name": "REP_PSEL",
+                            "descr": "Set-dueling policy selector: saturating counter of the misses of the REP_POLICY leader sets minus those of the REP_POLICY_ALT leader sets. The other sets use REP_POLICY_ALT from 512 on.",
+                            "type": "NOAUTO",
+                            "mode": "R",
+                            "n_bits": 16,
+                            "rst_val": 0,
+                            "addr": 126,
+                            "log2n_items": 0,
+                        },
                     ],
                 },
             ],
@@ -818,6 +1893,13 @@ def setup(py_params: dict):
             ],
             "fe_if": FE_IF.lower(),
             "be_if": be_if,
+            "cosim": COSIM,
+            "tput": TPUT,
+            "nbanks_w": NBANKS_W,
+            "harvard": HARVARD,
+            "binv_w": BINV_W,
+            "fe_ports": FE_PORTS,
+            "snoop": SNOOP,
         },
     ]
     #
@@ -840,9 +1922,25 @@ def setup(py_params: dict):
    invalidate_o = ctrl_invalidate | invalidate_i;
    wtb_empty_o  = wtbuf_empty & wtb_empty_i;
    cache_mem_data_addr = data_addr[FE_ADDR_W-FE_NBYTES_W-1:BE_NBYTES_W+LINE2BE_W-FE_NBYTES_W];
-
+   cache_mem_data_offset = data_addr[WORD_OFFSET_W-1:0];
 """
     }
+    if HARVARD:
+        attributes_dict["comb"]["code"] += """
+   icache_mem_data_addr = icache_data_addr[FE_ADDR_W-FE_NBYTES_W-1:BE_NBYTES_W+LINE2BE_W-FE_NBYTES_W];
+   icache_mem_data_offset = icache_data_addr[WORD_OFFSET_W-1:0];
+"""
+    # Back-end beats counted by the cache controller
+    if BE_IF == "AXI4":
+        attributes_dict["comb"]["code"] += """
+   be_read_beat  = axi_rvalid_i & axi_rready_o;
+   be_write_beat = axi_wvalid_o & axi_wready_i;
+"""
+    else:
+        attributes_dict["comb"]["code"] += """
+   be_read_beat  = be_iob_rvalid_i;
+   be_write_beat = be_iob_valid_o & be_iob_ready_i & (|be_iob_wstrb_o);
+"""
     #
     # Snippets
     #
@@ -853,8 +1951,11 @@ def setup(py_params: dict):
    generate
       if (USE_CTRL) begin : g_ctrl
          iob_cache_control #(
-            .DATA_W      (FE_DATA_W),
-            .USE_CTRL_CNT(USE_CTRL_CNT)
+            .DATA_W       (FE_DATA_W),
+            .USE_CTRL_CNT (USE_CTRL_CNT),
+            .WTBUF_DEPTH_W(WTBUF_DEPTH_W),
+            .RD_ID_W      (RD_ID_W),
+            .LAT_HIST_BINS(LAT_HIST_BINS)
          ) cache_control (
             .clk_i  (clk_i),
             .cke_i  (cke_i),
@@ -864,6 +1965,7 @@ def setup(py_params: dict):
             .valid_i(csrs_iob_valid_i),
             .addr_i (csrs_iob_addr_i),
             .wstrb_i (csrs_iob_wstrb_i),
+            .wdata_i (csrs_iob_wdata_i),
 
             // write data
             .wtbuf_full_i (wtbuf_full),
@@ -872,10 +1974,37 @@ def setup(py_params: dict):
             .write_miss_i (write_miss),
             .read_hit_i   (read_hit),
             .read_miss_i  (read_miss),
+            .pf_useful_i  (pf_useful),
+            .pf_useless_i (pf_useless),
+            .stall_miss_i (stall_miss),
+            .stall_raw_i  (stall_raw),
+            .stall_wtbuf_i(stall_wtbuf),
+            .stall_flush_i(stall_flush),
+            .be_read_beat_i (be_read_beat),
+            .be_write_beat_i(be_write_beat),
+            .dirty_evict_i(dirty_evict),
+            .wtbuf_level_i(wtbuf_level),
+            .replace_req_i(replace_req),
+            .replace_id_i (replace_id),
+            .read_last_i  (read_last),
+            .read_id_i    (read_id),
+            .write_req_i  (write_req),
+            .write_ack_i  (write_ack),
+            .maint_busy_i (maint_busy),
+            .rep_psel_i   (rep_psel),
 
             .rdata_o     (csrs_iob_rdata_o),
             .ready_o     (csrs_iob_ready_o),
-            .invalidate_o(ctrl_invalidate)
+            .invalidate_o(ctrl_invalidate),
+            .prefetch_en_o(prefetch_en),
+            .maint_start_o(maint_start),
+            .maint_cmd_o  (maint_cmd),
+            .maint_addr_o (maint_addr),
+            .maint_len_o  (maint_len),
+            .way_lock_o   (way_lock),
+            .spm_base_o   (spm_base),
+            .spm_ways_o   (spm_ways),
+            .rep_sel_o    (rep_sel)
          );
          assign csrs_iob_rvalid_o = csrs_iob_valid_i & ~csrs_iob_wstrb_i & csrs_iob_ready_o;
       end else begin : g_no_ctrl
@@ -884,6 +2013,15 @@ def setup(py_params: dict):
          assign csrs_iob_ready_o = 1'b0;
          assign csrs_iob_rvalid_o = 1'b0;
          assign ctrl_invalidate = 1'b0;
+         assign prefetch_en     = 1'b1;
+         assign maint_start     = 1'b0;
+         assign maint_cmd       = 3'd0;
+         assign maint_addr      = {FE_DATA_W{1'b0}};
+         assign maint_len       = {FE_DATA_W{1'b0}};
+         assign way_lock        = {FE_DATA_W{1'b0}};
+         assign spm_base        = {FE_DATA_W{1'b0}};
+         assign spm_ways        = 8'd0;
+         assign rep_sel         = 2'd2;
       end
    endgenerate
    // Front-end interface controller bus unused when there is dedicated controller port
@@ -896,8 +2034,11 @@ def setup(py_params: dict):
    generate
       if (USE_CTRL) begin : g_ctrl
          iob_cache_control #(
-            .DATA_W      (FE_DATA_W),
-            .USE_CTRL_CNT(USE_CTRL_CNT)
+            .DATA_W       (FE_DATA_W),
+            .USE_CTRL_CNT (USE_CTRL_CNT),
+            .WTBUF_DEPTH_W(WTBUF_DEPTH_W),
+            .RD_ID_W      (RD_ID_W),
+            .LAT_HIST_BINS(LAT_HIST_BINS)
          ) cache_control (
             .clk_i  (clk_i),
             .cke_i  (cke_i),
@@ -907,6 +2048,7 @@ def setup(py_params: dict):
             .valid_i(ctrl_req),
             .addr_i (ctrl_addr),
             .wstrb_i (ctrl_wstrb),
+            .wdata_i (ctrl_wdata),
 
             // write data
             .wtbuf_full_i (wtbuf_full),
@@ -915,20 +2057,177 @@ def setup(py_params: dict):
             .write_miss_i (write_miss),
             .read_hit_i   (read_hit),
             .read_miss_i  (read_miss),
+            .pf_useful_i  (pf_useful),
+            .pf_useless_i (pf_useless),
+            .stall_miss_i (stall_miss),
+            .stall_raw_i  (stall_raw),
+            .stall_wtbuf_i(stall_wtbuf),
+            .stall_flush_i(stall_flush),
+            .be_read_beat_i (be_read_beat),
+            .be_write_beat_i(be_write_beat),
+            .dirty_evict_i(dirty_evict),
+            .wtbuf_level_i(wtbuf_level),
+            .replace_req_i(replace_req),
+            .replace_id_i (replace_id),
+            .read_last_i  (read_last),
+            .read_id_i    (read_id),
+            .write_req_i  (write_req),
+            .write_ack_i  (write_ack),
+            .maint_busy_i (maint_busy),
+            .rep_psel_i   (rep_psel),
 
             .rdata_o     (ctrl_rdata),
             .ready_o     (ctrl_ack),
-            .invalidate_o(ctrl_invalidate)
+            .invalidate_o(ctrl_invalidate),
+            .prefetch_en_o(prefetch_en),
+            .maint_start_o(maint_start),
+            .maint_cmd_o  (maint_cmd),
+            .maint_addr_o (maint_addr),
+            .maint_len_o  (maint_len),
+            .way_lock_o   (way_lock),
+            .spm_base_o   (spm_base),
+            .spm_ways_o   (spm_ways),
+            .rep_sel_o    (rep_sel)
          );
       end else begin : g_no_ctrl
          // Front-end interface controller bus unused when there is no controller
          assign ctrl_rdata      = {FE_DATA_W{1'b0}};
          assign ctrl_ack        = 1'b0;
          assign ctrl_invalidate = 1'b0;
+         assign prefetch_en     = 1'b1;
+         assign maint_start     = 1'b0;
+         assign maint_cmd       = 3'd0;
+         assign maint_addr      = {FE_DATA_W{1'b0}};
+         assign maint_len       = {FE_DATA_W{1'b0}};
+         assign way_lock        = {FE_DATA_W{1'b0}};
+         assign spm_base        = {FE_DATA_W{1'b0}};
+         assign spm_ways        = 8'd0;
+         assign rep_sel         = 2'd2;
       end
    endgenerate
 """
 
+    if NBANKS_W:
+        verilog_code += """
+   // the second front-end port has no access to the cache controller
+   assign ctrl1_rdata = {FE_DATA_W{1'b0}};
+   assign ctrl1_ack   = 1'b0;
+"""
+    else:
+        verilog_code += """
+   // no second front-end port
+   assign data1_req       = 1'b0;
+   assign data1_addr      = {(FE_ADDR_W - FE_NBYTES_W) {1'b0}};
+   assign data1_req_reg   = 1'b0;
+   assign data1_addr_reg  = {(FE_ADDR_W - FE_NBYTES_W) {1'b0}};
+   assign data1_wdata_reg = {FE_DATA_W{1'b0}};
+   assign data1_wstrb_reg = {FE_NBYTES{1'b0}};
+"""
+
+    if not BINV_W:
+        verilog_code += """
+   // not part of an inclusive hierarchy
+   assign binv      = 1'b0;
+   assign binv_addr = {FE_ADDR_W{1'b0}};
+"""
+
+    if not SNOOP:
+        verilog_code += """
+   // no external writer
+   assign snoop      = 1'b0;
+   assign snoop_addr = {FE_ADDR_W{1'b0}};
+"""
+
+    if FE_PORTS > 1:
+        # port signals, from the last port to the main port
+        fe_ports = [f"fe_p{p}_iob" for p in range(FE_PORTS - 1, 0, -1)]
+        verilog_code += (
+            """
+   // Front-end port arbiter: the main port (0) and ports 1 to FE_PORTS-1 share the front-end
+   iob_cache_fe_arb #(
+      .N_PORTS (FE_PORTS),
+      .ADDR_W  (ADDR_W),
+      .DATA_W  (DATA_W),
+      .USE_CTRL("""
+            + ("0" if USE_DEDICATED_CTRL_PORT else "USE_CTRL")
+            + """),
+      .ARB_RR  (FE_ARB)
+   ) fe_arb (
+      .clk_i     (clk_i),
+      .cke_i     (cke_i),
+      .arst_i    (arst_i),
+      .s_valid_i ({"""
+            + ", ".join([f"{p}_valid_i" for p in fe_ports] + ["iob_valid"])
+            + """}),
+      .s_addr_i  ({"""
+            + ", ".join([f"{p}_addr_i" for p in fe_ports] + ["iob_addr"])
+            + """}),
+      .s_wdata_i ({"""
+            + ", ".join([f"{p}_wdata_i" for p in fe_ports] + ["iob_wdata"])
+            + """}),
+      .s_wstrb_i ({"""
+            + ", ".join([f"{p}_wstrb_i" for p in fe_ports] + ["iob_wstrb"])
+            + """}),
+      .s_rvalid_o({"""
+            + ", ".join([f"{p}_rvalid_o" for p in fe_ports] + ["iob_rvalid"])
+            + """}),
+      .s_rdata_o (iob_rdata),
+      .s_ready_o ({"""
+            + ", ".join([f"{p}_ready_o" for p in fe_ports] + ["iob_ready"])
+            + """}),
+      .m_valid_o (arb_iob_valid),
+      .m_addr_o  (arb_iob_addr),
+      .m_wdata_o (arb_iob_wdata),
+      .m_wstrb_o (arb_iob_wstrb),
+      .m_rvalid_i(arb_iob_rvalid),
+      .m_rdata_i (arb_iob_rdata),
+      .m_ready_i (arb_iob_ready)
+   );
+"""
+        )
+        for p in range(1, FE_PORTS):
+            verilog_code += f"\n   assign fe_p{p}_iob_rdata_o = iob_rdata;"
+        verilog_code += "\n"
+
+    if HARVARD:
+        verilog_code += """
+   // Instruction cache (HARVARD): read-only, without stores nor access to the cache controller
+   assign icache_ctrl_rdata      = {FE_DATA_W{1'b0}};
+   assign icache_ctrl_ack        = 1'b0;
+   assign icache_wdata_reg       = {FE_DATA_W{1'b0}};
+   assign icache_wstrb_reg       = {FE_NBYTES{1'b0}};
+   assign icache_spm_reg         = 1'b0;
+   assign icache_spm_way_reg     = 8'd0;
+   assign icache_data1_req       = 1'b0;
+   assign icache_data1_addr      = {(FE_ADDR_W - FE_NBYTES_W) {1'b0}};
+   assign icache_data1_req_reg   = 1'b0;
+   assign icache_data1_addr_reg  = {(FE_ADDR_W - FE_NBYTES_W) {1'b0}};
+   assign icache_data1_wdata_reg = {FE_DATA_W{1'b0}};
+   assign icache_data1_wstrb_reg = {FE_NBYTES{1'b0}};
+   assign icache_write_ack       = 1'b1;
+   assign icache_write_idle      = 1'b1;
+   assign icache_read_id         = 1'b0;
+   assign icache_binv            = 1'b0;
+   assign icache_binv_addr       = {FE_ADDR_W{1'b0}};
+   assign icache_snoop           = 1'b0;
+   assign icache_snoop_addr      = {FE_ADDR_W{1'b0}};
+   assign icache_prefetch_en     = 1'b0;
+   assign icache_maint_start     = 1'b0;
+   assign icache_maint_cmd       = 3'd0;
+   assign icache_maint_addr      = {FE_DATA_W{1'b0}};
+   assign icache_maint_len       = {FE_DATA_W{1'b0}};
+   assign icache_way_lock        = {FE_DATA_W{1'b0}};
+   assign icache_spm_ways        = 8'd0;
+   assign icache_rep_sel         = 2'd0;
+"""
+    elif BE_IF == "AXI4":
+        verilog_code += """
+   // no instruction cache
+   assign icache_replace_req  = 1'b0;
+   assign icache_replace_addr = {(FE_ADDR_W - (BE_NBYTES_W + LINE2BE_W)) {1'b0}};
+   assign icache_replace_word = {LINE2BE_W{1'b0}};
+"""
+
     attributes_dict["snippets"] = [{"verilog_code": verilog_code}]
 
     return attributes_dict
@@ -0,0 +1,15 @@
+# SPDX-FileCopyrightText: 2026 IObundle
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+"""Cycle-approximate behavioural model of IOb-cache.
+
+The model is configured with the same python parameters (py_params) and
+Verilog parameters (confs) as iob_cache.py and replays address traces to
+report hits, misses and stall cycles, for fast design-space exploration.
+"""
+
+from .model import CacheModel, CacheStats, get_confs
+from .trace import load_trace
+
+__all__ = ["CacheModel", "CacheStats", "get_confs", "load_trace"]
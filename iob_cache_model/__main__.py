@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: 2026 IObundle
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+"""Replay address traces through the IOb-cache model.
+
+Example:
+    python3 -m iob_cache_model trace.din --py_params 'nways_w=2:write_pol=1' --conf SET_INDEX_W=5
+"""
+
+import argparse
+import time
+
+from .model import (
+    DEFAULT_READ_LAT,
+    DEFAULT_WRITE_LAT,
+    CacheModel,
+    parse_confs,
+    parse_py_params,
+)
+from .trace import load_trace
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m iob_cache_model",
+        description="Replay address traces through a cycle-approximate model of IOb-cache.",
+    )
+    parser.add_argument("traces", nargs="+", help="trace files (.bin, .npz, or text)")
+    parser.add_argument(
+        "--py_params", default="", help="cache python parameters (name=value:...)"
+    )
+    parser.add_argument(
+        "--conf",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="override a cache Verilog parameter (may be repeated)",
+    )
+    parser.add_argument("--read_lat", type=int, default=DEFAULT_READ_LAT)
+    parser.add_argument("--write_lat", type=int, default=DEFAULT_WRITE_LAT)
+    args = parser.parse_args()
+
+    py_params = parse_py_params(args.py_params)
+    confs = parse_confs(args.conf)
+    for path in args.traces:
+        addr, we = load_trace(path)
+        model = CacheModel(py_params, confs, args.read_lat, args.write_lat)
+        t0 = time.perf_counter()
+        stats = model.run(addr, we)
+        elapsed = time.perf_counter() - t0
+        print(f"{path}: {stats.accesses} accesses in {elapsed:.2f} s")
+        for name, val in stats.as_dict().items():
+            print(f"  {name:14} {val:.4f}" if isinstance(val, float) else f"  {name:14} {val}")
+
+
+if __name__ == "__main__":
+    main()
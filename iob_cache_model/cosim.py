@@ -0,0 +1,326 @@
+# SPDX-FileCopyrightText: 2026 IObundle
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+"""Co-simulation checks of the RTL against the cache model.
+
+With the cosim python parameter, the simulation wrapper (iob_uut) logs every
+front-end and back-end transaction of the cache to cosim.log, one per line,
+"<cycle> <event> <fields>" (addresses, data and strobes in hexadecimal):
+
+    r <addr> <wait>                     front-end read accepted
+    w <addr> <wstrb> <wdata> <wait>     front-end write accepted
+    cr <addr> / cw <addr>               controller read / write accepted
+    d <rdata>                           front-end read data (in request order)
+    br <addr> <beats>                   back-end read request
+    bw <addr> <beats>                   back-end write request
+
+wait is the number of cycles the request waited for ready. The check replays
+the logged requests through CacheModel, at the cycles they were issued, and
+reports:
+
+* data errors: front-end read data that differs from the last data written to
+  the same bytes;
+* transaction errors: back-end line refills and writes that differ from the
+  model, in line address and order;
+* performance errors: front-end wait cycles (read latencies beyond one cycle
+  and write stalls) that exceed the model estimate by more than the tolerance,
+  or that exceed a baseline saved from a previous run of the same stream.
+
+Control accesses are not modelled: a co-simulation stream should not
+invalidate the cache.
+"""
+
+import argparse
+import json
+import sys
+from collections import deque
+
+import numpy as np
+
+from .model import CacheModel, parse_confs, parse_py_params
+
+# read and write latencies of the simulation wrapper memories
+COSIM_READ_LAT = 1
+COSIM_WRITE_LAT = 1
+
+# relative excess of wait cycles over the model estimate reported as an error
+DEFAULT_TOLERANCE = 0.2
+
+# summary counters compared against a baseline: none may increase
+BASELINE_KEYS = ["wait_cycles", "cycles", "refills", "be_writes"]
+
+
+def _hex(text):
+    """Parse a logged hexadecimal value; undefined (x/z) values are None."""
+    try:
+        return int(text, 16)
+    except ValueError:
+        return None
+
+
+def parse_log(path):
+    """Parse a co-simulation log into a dict of front-end arrays and back-end lists.
+
+    The front-end arrays (one entry per data request, in order) are addr, we,
+    issue (cycle the request was presented), accept and wait. reads holds
+    (request index, data cycle, rdata) for each data read. be_reads and be_writes hold
+    (cycle, addr, beats) for each back-end request.
+    """
+    addr, we, issue, accept, wait = [], [], [], [], []
+    writes = {}  # request index -> (wstrb, wdata)
+    pending = deque()  # read requests waiting for data: request index or None (controller)
+    reads = []
+    be_reads, be_writes = [], []
+    with open(path) as f:
+        for n, text in enumerate(f, 1):
+            fields = text.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            cycle, event = int(fields[0]), fields[1]
+            if event in ("r", "w"):
+                stall = int(fields[-1])
+                if event == "w":
+                    writes[len(addr)] = (_hex(fields[3]), _hex(fields[4]))
+                else:
+                    pending.append(len(addr))
+                addr.append(int(fields[2], 16))
+                we.append(event == "w")
+                issue.append(cycle - stall)
+                accept.append(cycle)
+                wait.append(stall)
+            elif event == "cr":
+                pending.append(None)
+            elif event == "d":
+                if not pending:
+                    raise ValueError(f"{path}:{n}: read data without a read request")
+                i = pending.popleft()
+                if i is not None:
+                    reads.append((i, cycle, _hex(fields[2])))
+            elif event in ("br", "bw"):
+                txn = (cycle, int(fields[2], 16), int(fields[3]))
+                (be_reads if event == "br" else be_writes).append(txn)
+            elif event != "cw":
+                raise ValueError(f"{path}:{n}: unknown event '{event}'")
+    return {
+        "addr": np.array(addr, dtype=np.uint64),
+        "we": np.array(we, dtype=bool),
+        "issue": np.array(issue, dtype=np.int64),
+        "accept": np.array(accept, dtype=np.int64),
+        "wait": np.array(wait, dtype=np.int64),
+        "writes": writes,
+        "reads": reads,
+        "unanswered": len(pending),
+        "be_reads": be_reads,
+        "be_writes": be_writes,
+    }
+
+
+def check_data(log, nbytes):
+    """Check the read data against the data written before each read; return the errors."""
+    errors = []
+    memory = {}  # byte address -> value
+    expected = {}  # read request index -> (value, mask) when accepted
+    addr = log["addr"].tolist()
+    for i, (a, w) in enumerate(zip(addr, log["we"].tolist())):
+        a -= a % nbytes
+        if w:
+            wstrb, wdata = log["writes"][i]
+            for b in range(nbytes):
+                if wstrb is None or wdata is None:
+                    # undefined write: the bytes are no longer known
+                    memory.pop(a + b, None)
+                elif wstrb >> b & 1:
+                    memory[a + b] = wdata >> (8 * b) & 0xFF
+        else:
+            value = mask = 0
+            for b in range(nbytes):
+                if a + b in memory:
+                    value |= memory[a + b] << (8 * b)
+                    mask |= 0xFF << (8 * b)
+            expected[i] = (value, mask)
+    for i, cycle, rdata in log["reads"]:
+        value, mask = expected[i]
+        if mask and (rdata is None or rdata & mask != value):
+            got = "x" if rdata is None else f"{rdata & mask:x}"
+            errors.append(
+                f"cycle {cycle}: read @{addr[i]:x} returned {got}, expected {value:x} (mask {mask:x})"
+            )
+    if log["unanswered"]:
+        errors.append(f"{log['unanswered']} reads did not return data")
+    return errors
+
+
+def _lines(txns, line_shift, addr_mask, beats):
+    """Group back-end requests into transactions of beats words (IOb back-end requests are single beats) and return their (cycle, line) list.
+
+    The IOb write-back channel rewrites the first word of a line in the cycle
+    after its last one: that beat is part of the line write.
+    """
+    lines = []
+    count = 0
+    last = None
+    for cycle, addr, n in txns:
+        line = (addr & addr_mask) >> line_shift
+        if count and line == lines[-1][1] and (count < beats or cycle == last + 1):
+            count += n
+        else:
+            lines.append((cycle, line))
+            count = n
+        last = cycle
+    return lines
+
+
+def check_transactions(log, model, be_log):
+    """Compare the back-end transactions with the model; return the errors and the RTL refill and write counts."""
+    errors = []
+    line_shift = model.fe_nbytes_w + model.word_offset_w
+    write_beats = model.line_beats if model.write_back else model.wtbuf_beats
+    rtl = {
+        "refill": _lines(log["be_reads"], line_shift, model.addr_mask, model.line_beats),
+        "write": _lines(log["be_writes"], line_shift, model.addr_mask, write_beats),
+    }
+    for kind, op in (("refill", "r"), ("write", "w")):
+        expected = [(c, line) for c, o, line in be_log if o == op]
+        got = rtl[kind]
+        for i, (e, g) in enumerate(zip(expected, got)):
+            if e[1] != g[1]:
+                errors.append(
+                    f"back-end {kind} {i} (cycle {g[0]}): line {g[1]:x}, model line {e[1]:x} (cycle ~{e[0]})"
+                )
+                break
+        if len(expected) != len(got):
+            errors.append(f"{len(got)} back-end {kind}s, model {len(expected)}")
+    return errors, len(rtl["refill"]), len(rtl["write"])
+
+
+def rtl_summary(log, refills, be_writes):
+    """Return the RTL counters comparable with the model ones."""
+    we = log["we"]
+    start = int(log["issue"][0]) if len(we) else 0
+    data_cycles = [cycle for _, cycle, _ in log["reads"]]
+    last = max(data_cycles + [int(log["accept"][-1]) + 1 if len(we) else start])
+    read_latency = sum(cycle - int(log["issue"][i]) for i, cycle, _ in log["reads"])
+    reads = int(np.count_nonzero(~we))
+    write_stall = int(log["wait"][we].sum())
+    return {
+        "reads": reads,
+        "writes": int(np.count_nonzero(we)),
+        "read_latency": read_latency,
+        "read_stall": int(log["wait"][~we].sum()),
+        "write_stall": write_stall,
+        "wait_cycles": read_latency - reads + write_stall,
+        "refills": refills,
+        "be_writes": be_writes,
+        "cycles": last - start,
+    }
+
+
+def model_summary(stats):
+    """Return the model counters in the form of rtl_summary()."""
+    return {
+        "reads": stats.reads,
+        "writes": stats.writes,
+        "read_latency": stats.read_latency,
+        "read_stall": stats.read_stall,
+        "write_stall": stats.write_stall,
+        "wait_cycles": stats.read_latency - stats.reads + stats.write_stall,
+        "refills": stats.be_refills,
+        "be_writes": stats.be_writes,
+        "cycles": stats.cycles,
+    }
+
+
+def cosim_check(
+    path,
+    py_params=None,
+    confs=None,
+    read_lat=COSIM_READ_LAT,
+    write_lat=COSIM_WRITE_LAT,
+    tolerance=DEFAULT_TOLERANCE,
+    baseline=None,
+):
+    """Check a co-simulation log; return the list of errors and the RTL and model summaries."""
+    log = parse_log(path)
+    model = CacheModel(py_params, confs, read_lat, write_lat)
+    model.be_log = []
+    start = log["issue"][0] if len(log["issue"]) else 0
+    stats = model.run(log["addr"], log["we"], log["issue"] - start)
+
+    errors = check_data(log, 1 << model.fe_nbytes_w)
+    txn_errors, refills, be_writes = check_transactions(log, model, model.be_log)
+    errors += txn_errors
+    rtl = rtl_summary(log, refills, be_writes)
+    ref = model_summary(stats)
+    if rtl["wait_cycles"] > ref["wait_cycles"] * (1 + tolerance):
+        errors.append(
+            f"performance: {rtl['wait_cycles']} wait cycles, model {ref['wait_cycles']} (tolerance {tolerance:.0%})"
+        )
+    if baseline is not None:
+        if (baseline["reads"], baseline["writes"]) != (rtl["reads"], rtl["writes"]):
+            errors.append("baseline: recorded with a different request stream")
+        else:
+            for key in BASELINE_KEYS:
+                if rtl[key] > baseline[key]:
+                    errors.append(f"baseline: {key} {rtl[key]}, baseline {baseline[key]}")
+    return errors, rtl, ref
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m iob_cache_model.cosim",
+        description="Check an IOb-cache co-simulation log against the cache model.",
+    )
+    parser.add_argument("log", help="co-simulation log (cosim.log)")
+    parser.add_argument(
+        "--py_params", default="", help="cache python parameters (name=value:...)"
+    )
+    parser.add_argument(
+        "--conf",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="override a cache Verilog parameter (may be repeated)",
+    )
+    parser.add_argument("--read_lat", type=int, default=COSIM_READ_LAT)
+    parser.add_argument("--write_lat", type=int, default=COSIM_WRITE_LAT)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="relative excess of wait cycles over the model reported as an error",
+    )
+    parser.add_argument("--baseline", help="fail if the RTL is slower than this baseline")
+    parser.add_argument("--save_baseline", help="save the RTL counters as a baseline")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    errors, rtl, ref = cosim_check(
+        args.log,
+        parse_py_params(args.py_params),
+        parse_confs(args.conf),
+        args.read_lat,
+        args.write_lat,
+        args.tolerance,
+        baseline,
+    )
+    print(f"{'':14} {'RTL':>10} {'model':>10}")
+    for key in rtl:
+        print(f"{key:14} {rtl[key]:10} {ref[key]:10}")
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(rtl, f, indent=2)
+    for error in errors[:20]:
+        print(f"ERROR: {error}")
+    if len(errors) > 20:
+        print(f"... {len(errors) - 20} more errors")
+    print("COSIM FAILED" if errors else "COSIM PASSED")
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,931 @@
+# SPDX-FileCopyrightText: 2026 IObundle
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+"""Cycle-approximate model of IOb-cache.
+
+The cache state (tags, valid and dirty bits and replacement policy state) is
+kept in NumPy arrays indexed by set and way, and updated as in the Verilog
+sources: the replacement policy is only updated by hits (a miss is replayed
+after the line refill and then hits), the victim way is chosen by the policy
+alone, and write misses do not allocate in write-through operation.
+
+Timing is approximate. The front-end accepts one request per cycle and stalls
+on blocking misses and on a full write-through buffer. The back-end memory
+answers a line refill read_lat cycles after the request, one back-end word
+per cycle, and acknowledges a write write_lat cycles after its last beat. The
+read and write channels are independent with the AXI4 back-end, and shared
+(one transaction at a time) with the IOb back-end.
+"""
+
+import bisect
+import functools
+import heapq
+import importlib.util
+import os
+from collections import deque
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+# Replacement policies (REP_POLICY)
+LRU = 0
+PLRU_MRU = 1
+PLRU_TREE = 2
+RANDOM = 3
+FIFO = 4
+SRRIP = 5
+
+# RANDOM policy: 16-bit Galois LFSR taps (x^16+x^14+x^13+x^11+1)
+LFSR_TAPS = 0xB400
+
+# Prefetchers (PREFETCH)
+PF_NONE = 0
+PF_NEXT_LINE = 1
+PF_STRIDE = 2
+
+# Requests looked up at once by CacheModel.run()
+BATCH = 4096
+# Requests of a batch: hits, write-through stores, and misses or requests to
+# lines being refilled (replayed one by one)
+HIT = 0
+STORE = 1
+SLOW = 2
+# Batches with more than 1/MISS_SHARE slow requests are replayed one by one
+MISS_SHARE = 8
+
+# Back-end memory latencies (cycles)
+DEFAULT_READ_LAT = 4
+DEFAULT_WRITE_LAT = 2
+
+# Back-end read channel cycles of a line refill besides the memory latency and
+# the data beats (request handshake and end of the refill)
+REFILL_CYCLES = 2
+# Cycles to copy a line from the prefetch or victim buffer into the cache
+COPY_CYCLES = 2
+
+
+@functools.lru_cache(maxsize=None)
+def _cache_core():
+    path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "iob_cache.py"
+    )
+    spec = importlib.util.spec_from_file_location("iob_cache", path)
+    core = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(core)
+    return core
+
+
+def parse_py_params(text):
+    """Parse python parameters in the py2hwsw format: "name=value:name=value"."""
+    py_params = {}
+    for item in filter(None, text.split(":")):
+        name, _, val = item.partition("=")
+        py_params[name] = val
+    return py_params
+
+
+def parse_confs(items):
+    """Parse Verilog parameter overrides: ["NAME=value", ...]."""
+    confs = {}
+    for item in items:
+        name, _, val = item.partition("=")
+        confs[name.upper()] = int(val, 0)
+    return confs
+
+
+def get_confs(py_params=None, confs=None):
+    """Return the Verilog parameters of the cache described by py_params.
+
+    The parameters are the "P" confs of iob_cache.py, as integers. The values
+    in confs override them (for parameters without a python parameter, like
+    SET_INDEX_W or WORD_OFFSET_W).
+    """
+    attributes = _cache_core().setup(dict(py_params or {}))
+    # parameters defaulting to other parameters (like BE_ADDR_W) are skipped
+    values = {
+        conf["name"]: int(conf["val"])
+        for conf in attributes["confs"]
+        if conf["type"] == "P" and str(conf["val"]).strip().isdigit()
+    }
+    for name, val in (confs or {}).items():
+        if name not in values:
+            raise ValueError(f"unknown cache parameter {name}")
+        values[name] = int(val)
+    return values
+
+
+def _last(keys, size):
+    """Index of the last occurrence of each value (0 to size-1) of keys, -1 if absent."""
+    last = np.full(size, -1, dtype=np.int64)
+    np.maximum.at(last, keys, np.arange(len(keys)))
+    return last
+
+
+class _Positions:
+    """Positions of the values of a list."""
+
+    def __init__(self, keys):
+        self.pos = {}
+        for i, key in enumerate(keys):
+            self.pos.setdefault(key, []).append(i)
+
+    def between(self, key, start, end):
+        """Positions of key from start to end (excluded), in increasing order."""
+        pos = self.pos.get(key, ())
+        return pos[bisect.bisect_left(pos, start) : bisect.bisect_left(pos, end)]
+
+
+@dataclass
+class CacheStats:
+    """Counters of a trace replay. Stalls are front-end cycles lost."""
+
+    reads: int = 0
+    writes: int = 0
+    read_hits: int = 0
+    read_misses: int = 0
+    write_hits: int = 0
+    write_misses: int = 0
+    # read misses merged into an MSHR refilling the same line (non-blocking)
+    mshr_merges: int = 0
+    # misses served by the victim buffer
+    victim_hits: int = 0
+    # prefetched lines used and discarded before being used
+    pf_useful: int = 0
+    pf_useless: int = 0
+    # back-end transactions: line refills (including prefetches), writes and
+    # dirty line write-backs
+    be_refills: int = 0
+    be_writes: int = 0
+    writebacks: int = 0
+    read_stall: int = 0
+    write_stall: int = 0
+    # sum of the read latencies (request to read data)
+    read_latency: int = 0
+    cycles: int = 0
+
+    @property
+    def accesses(self):
+        return self.reads + self.writes
+
+    @property
+    def hits(self):
+        return self.read_hits + self.write_hits
+
+    @property
+    def misses(self):
+        return self.read_misses + self.write_misses
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.accesses if self.accesses else 0.0
+
+    @property
+    def stall_cycles(self):
+        return self.read_stall + self.write_stall
+
+    def as_dict(self):
+        values = {f.name: getattr(self, f.name) for f in fields(self)}
+        values["hit_rate"] = self.hit_rate
+        return values
+
+
+class CacheModel:
+    """Behavioural model of an IOb-cache configuration.
+
+    py_params and confs are those of get_confs(). The model keeps its state
+    across run() calls (warm cache); reset() empties it.
+    """
+
+    def __init__(
+        self,
+        py_params=None,
+        confs=None,
+        read_lat=DEFAULT_READ_LAT,
+        write_lat=DEFAULT_WRITE_LAT,
+    ):
+        py_params = dict(py_params or {})
+        c = get_confs(py_params, confs)
+        self.confs = c
+        self.read_lat = int(read_lat)
+        self.write_lat = int(write_lat)
+
+        self.addr_mask = (1 << c["FE_ADDR_W"]) - 1
+        self.fe_nbytes_w = (c["FE_DATA_W"] // 8).bit_length() - 1
+        self.word_offset_w = c["WORD_OFFSET_W"]
+        self.set_index_w = c["SET_INDEX_W"]
+        self.n_sets = 1 << c["SET_INDEX_W"]
+        self.n_ways = 1 << c["NWAYS_W"]
+        self.rep_policy = c["REP_POLICY"]
+        self.write_back = bool(c["WRITE_POL"])
+        self.wtbuf_depth = 1 << c["WTBUF_DEPTH_W"]
+        self.comb_w = c["WTBUF_COMB_W"]
+        self.n_mshr = c["N_MSHR"]
+        self.crit_word_first = bool(c["CRIT_WORD_FIRST"])
+        self.prefetch = c["PREFETCH"]
+        self.n_victim = c["N_VICTIM"] if not self.n_mshr else 0
+        self.rd_slots = 1 << c["RD_TXN_W"]
+        self.wr_slots = 1 << c["WR_TXN_W"]
+        self.posted = c["WR_TXN_W"] > 0
+        # reads and writes share the IOb back-end port
+        self.shared_port = py_params.get("be_if", "AXI4") != "AXI4"
+
+        be_ratio = c["BE_DATA_W"] // c["FE_DATA_W"]
+        self.line_beats = max((1 << self.word_offset_w) // be_ratio, 1)
+        self.wtbuf_beats = max((1 << self.comb_w) // be_ratio, 1)
+        self.refill_cycles = self.read_lat + self.line_beats + REFILL_CYCLES
+
+        # when set to a list, the back-end transactions are appended to it as
+        # (issue cycle, "r" or "w", line address) tuples
+        self.be_log = None
+        self.reset()
+
+    def reset(self):
+        """Invalidate the cache and clear the counters and back-end state."""
+        shape = (self.n_sets, self.n_ways)
+        # the tags of the invalid ways are -1
+        self.tags = np.full(shape, -1, dtype=np.int64)
+        self.valid = np.zeros(shape, dtype=bool)
+        self.dirty = np.zeros(shape, dtype=bool)
+        if self.rep_policy == LRU:
+            # way priorities, the lowest is replaced (initially way 0)
+            self.rep = np.tile(np.arange(self.n_ways, dtype=np.int16), (self.n_sets, 1))
+        elif self.rep_policy == FIFO:
+            # next way to replace in each set
+            self.rep = np.zeros(self.n_sets, dtype=np.int16)
+        elif self.rep_policy == SRRIP:
+            # re-reference prediction values, the highest is replaced
+            self.rep = np.zeros(shape, dtype=np.int8)
+        else:
+            # PLRU_MRU: MRU bits; PLRU_TREE: tree nodes 1 to n_ways-1
+            self.rep = np.zeros(shape, dtype=bool)
+        # RANDOM: LFSR advanced on each replacement
+        self.lfsr = 1
+        # SRRIP: the next hit is the replay of the miss that refilled the line
+        self.replay = False
+        # line address -> way (-1 if evicted) of the lines filled or evicted
+        # by the request being replayed
+        self.changed = {}
+
+        # victim buffer: line address (-1 if empty) and cycle its write-back
+        # completes (dirty lines are written back as soon as they are evicted)
+        self.vb_line = np.full(max(self.n_victim, 1), -1, dtype=np.int64)
+        self.vb_wdone = np.zeros(max(self.n_victim, 1), dtype=np.int64)
+        self.vb_wptr = 0
+
+        # prefetcher: prefetched line, cycle its refill ends, training state
+        self.pf_line = -1
+        self.pf_done = 0
+        self.pf_used = True
+        self.train_line = -1
+        self.stride = 0
+
+        self.time = 0  # cycle the next request is presented
+        self.r_free = 0  # cycle the back-end read channel is free
+        self.w_free = 0  # cycle the back-end write channel is free
+        self.rd_ends = deque()  # refills in flight (end cycles)
+        self.wr_dones = deque()  # posted writes in flight (completion cycles)
+        # write-through buffer entries: [start, busy_end, done, line, window]
+        self.wtbuf = deque()
+        self.eb_done = 0  # write-back eviction buffer free
+        self.mshrs = []  # non-blocking refills: [end, line]
+        self.fills = deque()  # non-blocking line fills: [start, end]
+        self.inflight = {}  # line -> refill end, for lines being refilled
+        self.rdone = 0  # last read data returned (in request order)
+        self.stats = CacheStats()
+
+    #
+    # Trace replay
+    #
+    def decode(self, addr):
+        """Split byte addresses into line addresses, set indexes, tags and write-through buffer windows."""
+        addr = np.asarray(addr, dtype=np.uint64) & np.uint64(self.addr_mask)
+        word = addr >> np.uint64(self.fe_nbytes_w)
+        line = word >> np.uint64(self.word_offset_w)
+        sets = line & np.uint64(self.n_sets - 1)
+        tags = line >> np.uint64(self.set_index_w)
+        window = word >> np.uint64(self.comb_w)
+        return (
+            line.astype(np.int64),
+            sets.astype(np.int64),
+            tags.astype(np.int64),
+            window.astype(np.int64),
+        )
+
+    def lookup(self, sets, tags):
+        """Return the ways holding the lines of the set indexes and tags (-1 for misses)."""
+        way = np.full(len(sets), -1, dtype=np.int64)
+        flat = self.tags.ravel()
+        base = sets * self.n_ways
+        for w in reversed(range(self.n_ways)):
+            way[flat[base + w] == tags] = w
+        return way
+
+    def run(self, addr, we, issue=None):
+        """Replay the requests (byte addresses and write flags) and return the counters.
+
+        By default each request is presented as soon as the previous one is
+        accepted; issue optionally gives the cycle each request is presented,
+        and the cycles it then waits for the previous ones count as stalls.
+
+        The requests are replayed in batches of BATCH, looked up at once. The
+        hits only advance the time, and update the replacement policy and the
+        counters in bulk; the misses are replayed one by one, and the lookups
+        of the next requests to the lines they bring in or evict are redone.
+        Batches with many misses are replayed one by one.
+        """
+        line, sets, tags, window = self.decode(addr)
+        we = np.asarray(we, dtype=bool)
+        if issue is not None:
+            issue = np.asarray(issue, dtype=np.int64)
+        for start in range(0, len(line), BATCH):
+            batch = slice(start, start + BATCH)
+            self._run_batch(
+                line[batch],
+                sets[batch],
+                tags[batch],
+                window[batch],
+                we[batch],
+                None if issue is None else issue[batch].tolist(),
+            )
+        self.stats.cycles = max(self.time, self.rdone)
+        return self.stats
+
+    def _run_batch(self, line, sets, tags, window, we, issue):
+        n = len(line)
+        way = self.lookup(sets, tags)
+        kind = self._classify(line, way, we)
+        # Python scalars are much faster than NumPy ones one by one
+        line_l, sets_l, tags_l, window_l, way_l, kind_l, we_l = (
+            a.tolist() for a in (line, sets, tags, window, way, kind, we)
+        )
+        if np.count_nonzero(kind == SLOW) * MISS_SHARE > n:
+            self._replay(line_l, sets_l, tags_l, window_l, way_l, we_l, issue)
+            return
+        by_line = by_set = None  # built on the first miss
+        slow = np.flatnonzero(kind == SLOW).tolist()  # sorted: a heap
+        stores = np.flatnonzero(kind == STORE).tolist()
+        # each set is up to date (replacement policy and dirty bits) with the
+        # hits before flushed[s]
+        flushed = {}
+        pos = 0
+        while True:
+            end = n
+            while slow:
+                j = heapq.heappop(slow)
+                if j >= pos and kind_l[j] == SLOW:
+                    end = j
+                    break
+            if issue is None:
+                for j in stores[bisect.bisect_left(stores, pos) : bisect.bisect_left(stores, end)]:
+                    if pos < j:
+                        self._hits(pos, j, we_l)
+                    self._store(line_l[j], window_l[j])
+                    pos = j + 1
+                if pos < end:
+                    self._hits(pos, end, we_l)
+            else:
+                for j in range(pos, end):
+                    self._wait(issue[j], we_l[j])
+                    if kind_l[j] == STORE:
+                        self._store(line_l[j], window_l[j])
+                    else:
+                        self._hits(j, j + 1, we_l)
+            if end == n:
+                break
+
+            # miss (or request to a line being refilled)
+            ln, s, w = line_l[end], sets_l[end], we_l[end]
+            if by_set is None:
+                by_line, by_set = _Positions(line_l), _Positions(sets_l)
+            self._flush(s, by_set.between(s, flushed.get(s, 0), end), way_l, kind_l, we_l)
+            flushed[s] = end
+            if issue is not None:
+                self._wait(issue[end], w)
+            if self.fills and self.time >= self.fills[0][0]:
+                self._fill_stall()
+            self.changed = {}
+            self._access(ln, s, tags_l[end], window_l[end], w, way_l[end])
+            # redo the lookups of the next requests to the lines brought in or
+            # evicted, and to the line of the miss (that may be refilling)
+            self.changed.setdefault(ln, way_l[end])
+            for changed, changed_way in self.changed.items():
+                for j in by_line.between(changed, end + 1, n):
+                    way_l[j] = way[j] = changed_way
+                    kind_l[j] = kind[j] = self._kind(changed, changed_way, we_l[j])
+                    if kind_l[j] == SLOW:
+                        heapq.heappush(slow, j)
+                    elif kind_l[j] == STORE:
+                        i = bisect.bisect_left(stores, j)
+                        if stores[i : i + 1] != [j]:
+                            stores.insert(i, j)
+            pos = end + 1
+
+        # update the sets with the hits after their last miss, and count the hits
+        cut = np.zeros(self.n_sets, dtype=np.int64)
+        cut[list(flushed)] = list(flushed.values())
+        hits = (np.arange(n) >= cut[sets]) & (kind != SLOW) & (way >= 0)
+        if self.write_back:
+            dirty = hits & we
+            self.dirty[sets[dirty], way[dirty]] = True
+        self._touch_many(sets[hits], way[hits])
+        stats = self.stats
+        read_hits = int(np.count_nonzero((kind == HIT) & ~we))
+        write_hits = int(np.count_nonzero((kind != SLOW) & we & (way >= 0)))
+        stores = int(np.count_nonzero(kind == STORE))
+        stats.reads += read_hits
+        stats.read_hits += read_hits
+        stats.read_latency += read_hits
+        stats.writes += int(np.count_nonzero((kind == HIT) & we)) + stores
+        stats.write_hits += write_hits
+        stats.write_misses += int(np.count_nonzero((kind != SLOW) & we & (way < 0)))
+
+    def _replay(self, line, sets, tags, window, way, we, issue):
+        """Replay the requests of a batch (looked up in way) one by one."""
+        stats = self.stats
+        fills = self.fills
+        inflight = self.inflight
+        write_through = not self.write_back
+        # lines brought in or evicted during the batch, and way of the last
+        # hit of each set since its last miss (_touch would not change it)
+        self.changed = moved = {}
+        last = {}
+        for j, ln in enumerate(line):
+            s, w = sets[j], we[j]
+            if issue is not None:
+                self._wait(issue[j], w)
+            if fills and self.time >= fills[0][0]:
+                self._fill_stall()
+            hit = moved.get(ln, way[j])
+            if (hit < 0 and not (w and write_through)) or ln in inflight:
+                last.pop(s, None)
+                self._access(ln, s, tags[j], window[j], w, hit)
+                continue
+            if hit >= 0 and last.get(s) != hit:
+                self._touch(s, hit)
+                last[s] = hit
+            t = self.time
+            if w:
+                stats.writes += 1
+                if hit < 0:
+                    stats.write_misses += 1
+                else:
+                    stats.write_hits += 1
+                if write_through:
+                    ready = self._wtbuf_push(t, ln, window[j])
+                    stats.write_stall += ready - t
+                    self.time = ready + 1
+                    continue
+                self.dirty[s, hit] = True
+            else:
+                stats.reads += 1
+                stats.read_hits += 1
+                self.rdone = max(self.rdone, t + 1)
+                stats.read_latency += self.rdone - t
+            self.time = t + 1
+
+    def _classify(self, line, way, we):
+        """Sort requests (looked up in way) into HIT, STORE and SLOW ones."""
+        store = we & (not self.write_back)
+        kind = np.where(store, STORE, HIT).astype(np.int8)
+        slow = (way < 0) & ~store
+        if self.inflight:
+            slow |= np.isin(line, list(self.inflight))
+        kind[slow] = SLOW
+        return kind
+
+    def _kind(self, line, way, we):
+        """_classify() of a single request."""
+        if line in self.inflight:
+            return SLOW
+        if we and not self.write_back:
+            return STORE
+        return HIT if way >= 0 else SLOW
+
+    def _flush(self, s, requests, way, kind, we):
+        """Update set s with the hits among requests of a batch."""
+        hits = [j for j in requests if kind[j] != SLOW and way[j] >= 0]
+        if not hits:
+            return
+        if self.write_back:
+            for j in hits:
+                if we[j]:
+                    self.dirty[s, way[j]] = True
+        self._touch_set(s, [way[j] for j in hits])
+
+    def _wait(self, t_issue, w):
+        """Timed replay: wait for the cycle a request is presented, or count its wait for the previous ones as a stall."""
+        if self.time < t_issue:
+            self.time = t_issue
+            return
+        backlog = self.time - t_issue
+        if w:
+            self.stats.write_stall += backlog
+        else:
+            self.stats.read_stall += backlog
+            self.stats.read_latency += backlog
+
+    def _hits(self, start, end, we):
+        """Advance the time over the hits start to end of a batch (in request order, one per cycle)."""
+        fills = self.fills
+        while start < end:
+            if fills and self.time >= fills[0][0]:
+                self._fill_stall()
+            count = end - start
+            if fills:
+                count = min(count, fills[0][0] - self.time)
+            # read data is returned in request order: the reads wait for the
+            # misses before them
+            t = self.time
+            for j in range(start, start + count):
+                if t + 1 >= self.rdone:
+                    break
+                if not we[j]:
+                    self.stats.read_latency += self.rdone - t - 1
+                t += 1
+            self.time += count
+            start += count
+
+    def _store(self, line, window):
+        """Write-through store: push it into the write-through buffer."""
+        if self.fills and self.time >= self.fills[0][0]:
+            self._fill_stall()
+        t = self.time
+        ready = self._wtbuf_push(t, line, window)
+        self.stats.write_stall += ready - t
+        self.time = ready + 1
+
+    def _access(self, line, s, tag, window, we, way):
+        t = self.time
+        stats = self.stats
+        if way >= 0 and line in self.inflight:
+            if self.inflight[line] > t:
+                way = -1
+            else:
+                del self.inflight[line]
+
+        if we:
+            stats.writes += 1
+            if way >= 0:
+                stats.write_hits += 1
+                ready = t
+            else:
+                stats.write_misses += 1
+                ready, _, way = self._miss(t, line, s, tag, True) if self.write_back else (t, t, -1)
+            if way >= 0:
+                self._touch(s, way)
+                self.dirty[s, way] |= self.write_back
+            if not self.write_back:
+                # non-blocking cache: stores wait for the refill of their line
+                ready = self._wtbuf_push(max(t, self.inflight.get(line, 0)), line, window)
+            stats.write_stall += max(ready - t, 0)
+        else:
+            stats.reads += 1
+            if way >= 0:
+                stats.read_hits += 1
+                ready = t
+                data = t + 1
+            elif self.n_mshr:
+                ready, data = self._mshr_miss(t, line, s, tag)
+                way = -1
+            else:
+                stats.read_misses += 1
+                ready, data, way = self._miss(t, line, s, tag, False)
+            if way >= 0:
+                self._touch(s, way)
+            # read data is returned in request order
+            self.rdone = max(self.rdone, data)
+            stats.read_latency += self.rdone - t
+            stats.read_stall += max(ready - t, 0)
+        self.time = max(ready, t) + 1
+
+    #
+    # Replacement policy
+    #
+    def _touch(self, s, way):
+        """Update the replacement policy state of set s on a hit to way."""
+        if self.rep_policy == SRRIP and self.replay:
+            self.replay = False
+            return
+        self._touch_set(s, [way])
+
+    def _touch_set(self, s, ways):
+        """Update the replacement policy state of set s on hits to ways, in order."""
+        if self.n_ways == 1 or self.rep_policy in (RANDOM, FIFO):
+            return
+        if self.rep_policy == SRRIP:
+            # near re-reference
+            self.rep[s, ways] = 0
+            return
+        rep = self.rep[s].tolist()
+        for way in ways:
+            if self.rep_policy == LRU:
+                # the hit way becomes the most recent (highest value), the
+                # more recent ways age by one
+                prio = rep[way]
+                rep = [p - 1 if p > prio else p for p in rep]
+                rep[way] = self.n_ways - 1
+            elif self.rep_policy == PLRU_MRU:
+                rep[way] = True
+                if all(rep):
+                    rep = [False] * self.n_ways
+                    rep[way] = True
+            else:
+                # each node on the path points to the other subtree
+                node = way + self.n_ways
+                while node > 1:
+                    rep[node >> 1] = not node & 1
+                    node >>= 1
+        self.rep[s] = rep
+
+    def _touch_many(self, sets, ways):
+        """Update the replacement policy state on hits to ways of sets, in order (like _touch on each hit)."""
+        if self.n_ways == 1 or self.rep_policy in (RANDOM, FIFO) or not len(sets):
+            return
+        if self.rep_policy == SRRIP:
+            self.rep[sets, ways] = 0
+        elif self.rep_policy == LRU:
+            # the ways hit become the most recent, in the order of their last
+            # hit, above the other ways
+            last = _last(sets * self.n_ways + ways, self.rep.size).reshape(self.rep.shape)
+            rows = np.flatnonzero(last.max(axis=1) >= 0)
+            last = last[rows]
+            prio = np.where(last >= 0, self.n_ways + last, self.rep[rows])
+            self.rep[rows] = prio.argsort(axis=1).argsort(axis=1)
+        elif self.rep_policy == PLRU_MRU:
+            rows = np.unique(sets)
+            full = (1 << self.n_ways) - 1
+            bits = 1 << np.arange(self.n_ways)
+            mru = dict(zip(rows.tolist(), (self.rep[rows] @ bits).tolist()))
+            for s, way in zip(sets.tolist(), ways.tolist()):
+                mru[s] |= 1 << way
+                if mru[s] == full:
+                    mru[s] = 1 << way
+            self.rep[rows] = (np.array([mru[s] for s in rows.tolist()])[:, None] & bits) != 0
+        else:
+            # each node is set by the last hit below it
+            node = ways + self.n_ways
+            while node[0] > 1:
+                parent = node >> 1
+                last = _last(sets * self.n_ways + parent, self.rep.size)
+                last = last[last >= 0]
+                self.rep[sets[last], parent[last]] = (node[last] & 1) == 0
+                node = parent
+
+    def _victim(self, s):
+        """Way replaced by a miss in set s."""
+        if self.n_ways == 1:
+            return 0
+        if self.rep_policy == RANDOM:
+            return self.lfsr & (self.n_ways - 1)
+        rep = self.rep[s]
+        if self.rep_policy == FIFO:
+            return int(rep)
+        if self.rep_policy == SRRIP:
+            # lowest way with the most distant re-reference
+            return int(rep.argmax())
+        if self.rep_policy == LRU:
+            return int(rep.argmin())
+        if self.rep_policy == PLRU_MRU:
+            # lowest way not recently used
+            return int(rep.argmin())
+        node = 1
+        while node < self.n_ways:
+            node = 2 * node + int(rep[node])
+        return node - self.n_ways
+
+    def _insert(self, s, way):
+        """Update the replacement policy state of set s when way is replaced."""
+        if self.n_ways == 1:
+            return
+        if self.rep_policy == RANDOM:
+            self.lfsr = (self.lfsr >> 1) ^ (LFSR_TAPS if self.lfsr & 1 else 0)
+        elif self.rep_policy == FIFO:
+            self.rep[s] = (way + 1) % self.n_ways
+        elif self.rep_policy == SRRIP:
+            # age the set until the replaced way is distant (3), then predict
+            # a long re-reference for the new line
+            rep = self.rep[s]
+            rep += 3 - rep.max()
+            rep[way] = 2
+            self.replay = True
+
+    #
+    # Back-end
+    #
+    def _read_channel(self, earliest, line, prefetch=False):
+        """Reserve the back-end read channel for a refill of line requested at cycle earliest and return the cycle it ends.
+
+        With the write-through buffer, a miss refill waits for the pending
+        writes to the same line. With the IOb back-end, refills wait for the
+        write in progress and delay the queued writes.
+        """
+        if not prefetch:
+            for entry in self.wtbuf:
+                if entry[3] == line:
+                    earliest = max(earliest, entry[2])
+        while len(self.rd_ends) >= self.rd_slots:
+            earliest = max(earliest, self.rd_ends.popleft())
+        issue = max(earliest, self.r_free if self.rd_slots == 1 else 0)
+        if self.shared_port:
+            issue = max(issue, self.r_free)
+            for entry in self.wtbuf:
+                if entry[0] < issue < entry[1]:
+                    issue = entry[1]
+            for entry in self.wtbuf:
+                if entry[0] >= issue:
+                    entry[0] += self.refill_cycles
+                    entry[1] += self.refill_cycles
+                    entry[2] += self.refill_cycles
+            if self.w_free > issue:
+                self.w_free += self.refill_cycles
+        end = max(issue + self.read_lat, self.r_free) + self.line_beats + REFILL_CYCLES
+        self.r_free = end
+        self.rd_ends.append(end)
+        self.stats.be_refills += 1
+        if self.be_log is not None:
+            self.be_log.append((issue, "r", line))
+        return end
+
+    def _write_channel(self, earliest, beats, line):
+        """Reserve the back-end write channel for a write of beats words to line and return its start, busy end and completion cycles."""
+        start = max(earliest, self.w_free)
+        if self.shared_port:
+            start = max(start, self.r_free)
+        if self.posted:
+            while self.wr_dones and self.wr_dones[0] <= start:
+                self.wr_dones.popleft()
+            if len(self.wr_dones) >= self.wr_slots:
+                start = max(start, self.wr_dones.popleft())
+        busy_end = start + beats
+        done = busy_end + self.write_lat
+        if self.posted:
+            self.wr_dones.append(done)
+            self.w_free = busy_end
+        else:
+            self.w_free = done
+            busy_end = done
+        if self.shared_port and self.write_back:
+            # write-through buffer writes are delayed by the refills instead
+            self.r_free = max(self.r_free, busy_end)
+        self.stats.be_writes += 1
+        if self.be_log is not None:
+            self.be_log.append((start, "w", line))
+        return start, busy_end, done
+
+    def _wtbuf_push(self, t, line, window):
+        """Push a store into the write-through buffer and return the cycle it is accepted."""
+        wtbuf = self.wtbuf
+        while wtbuf and wtbuf[0][2] <= t:
+            wtbuf.popleft()
+        # stores are merged in the last entry if it is not being written
+        if self.comb_w and wtbuf and wtbuf[-1][0] > t and wtbuf[-1][4] == window:
+            return t
+        # the buffer holds the entries not yet sent to the back-end
+        queued = 0
+        for entry in reversed(wtbuf):
+            if entry[0] <= t:
+                break
+            queued += 1
+            start = entry[0]
+        if queued >= self.wtbuf_depth:
+            t = start
+        start, busy_end, done = self._write_channel(t + 1, self.wtbuf_beats, line)
+        wtbuf.append([start, busy_end, done, line, window])
+        return t
+
+    #
+    # Misses
+    #
+    def _miss(self, t, line, s, tag, we):
+        """Blocking miss: bring the line into the cache and return the cycle the request is replayed, the cycle its read data arrives and the way of the line."""
+        stats = self.stats
+        way = self._victim(s)
+        self._insert(s, way)
+        ev_valid = bool(self.valid[s, way])
+        ev_line = (int(self.tags[s, way]) << self.set_index_w) | s
+        ev_dirty = ev_valid and bool(self.dirty[s, way])
+
+        vb = self._vb_lookup(line) if self.n_victim else -1
+        if vb >= 0:
+            # swap with the victim buffer line, once written back
+            stats.victim_hits += 1
+            start = max(t + 1, int(self.vb_wdone[vb]))
+            self._vb_insert(start, vb, ev_valid, ev_line, ev_dirty)
+            self._fill(s, way, tag, False)
+            return start + COPY_CYCLES, start + COPY_CYCLES + 1, way
+
+        if self.prefetch and not we and line == self.pf_line and not self.pf_used:
+            # prefetch buffer hit
+            stats.pf_useful += 1
+            self.pf_used = True
+            start = max(t + 1, self.pf_done)
+            self._evict(start, ev_valid, ev_line, ev_dirty)
+            self._fill(s, way, tag, False)
+            self._train(start, line)
+            return start + COPY_CYCLES, start + COPY_CYCLES + 1, way
+
+        earliest = t + 1
+        if ev_dirty and not self.n_victim:
+            # the eviction buffer holds one line until it is written back
+            earliest = max(earliest, self.eb_done)
+        if self.n_victim and ev_valid:
+            # the oldest victim buffer line is replaced once written back
+            earliest = max(earliest, int(self.vb_wdone[self.vb_wptr]))
+        end = self._read_channel(earliest, line)
+        self._evict(end - self.refill_cycles, ev_valid, ev_line, ev_dirty)
+        self._fill(s, way, tag, False)
+        if self.prefetch and not we:
+            self._train(end, line)
+        if self.crit_word_first:
+            # early restart: the requested word is the first to arrive
+            return end, end - REFILL_CYCLES - self.line_beats + 2, way
+        return end, end + 1, way
+
+    def _fill(self, s, way, tag, dirty):
+        if self.valid[s, way]:
+            self.changed[(int(self.tags[s, way]) << self.set_index_w) | s] = -1
+        self.changed[(tag << self.set_index_w) | s] = way
+        self.tags[s, way] = tag
+        self.valid[s, way] = True
+        self.dirty[s, way] = dirty
+
+    def _evict(self, t, valid, line, dirty):
+        """Write back or keep in the victim buffer the line replaced at cycle t."""
+        if self.n_victim:
+            if valid:
+                vb = self.vb_wptr
+                self.vb_wptr = (vb + 1) % self.n_victim
+                self._vb_insert(t, vb, valid, line, dirty)
+        elif dirty:
+            self.stats.writebacks += 1
+            # the IOb back-end writes the evicted line after the refill
+            earliest = t + self.refill_cycles if self.shared_port else t
+            self.eb_done = self._write_channel(earliest, self.line_beats, line)[2]
+
+    def _vb_lookup(self, line):
+        row = np.flatnonzero(self.vb_line[: self.n_victim] == line)
+        return int(row[0]) if row.size else -1
+
+    def _vb_insert(self, t, vb, valid, line, dirty):
+        self.vb_line[vb] = line if valid else -1
+        self.vb_wdone[vb] = t
+        if valid and dirty:
+            # dirty lines are written back from the victim buffer, and are
+            # clean once written
+            self.stats.writebacks += 1
+            self.vb_wdone[vb] = self._write_channel(t, self.line_beats, line)[2]
+
+    def _train(self, t, line):
+        """Train the prefetcher with a read miss and issue the prefetch at cycle t."""
+        if self.prefetch == PF_NEXT_LINE:
+            req = line + 1
+        else:
+            stride = line - self.train_line if self.train_line >= 0 else 0
+            req = line + stride if stride and stride == self.stride else -1
+            self.stride = stride
+            self.train_line = line
+        if req < 0 or req == self.pf_line:
+            return
+        if not self.pf_used:
+            self.stats.pf_useless += 1
+        self.pf_line = req
+        self.pf_used = False
+        self.pf_done = self._read_channel(max(t, self.pf_done), req, prefetch=True)
+
+    def _fill_stall(self):
+        """Non-blocking cache: requests wait while a refilled line is written in the cache."""
+        t = self.time
+        while self.fills and self.fills[0][0] <= t:
+            t = max(t, self.fills.popleft()[1] + 1)
+        self.stats.read_stall += t - self.time
+        self.time = t
+
+    def _mshr_miss(self, t, line, s, tag):
+        """Non-blocking read miss: return the cycle the request is accepted and the cycle its data arrives."""
+        end = self.inflight.get(line, 0)
+        if end > t:
+            # counted as a hit, like in the cache controller
+            self.stats.read_hits += 1
+            self.stats.mshr_merges += 1
+            return t, end + 1
+        self.stats.read_misses += 1
+        mshrs = self.mshrs
+        mshrs[:] = [m for m in mshrs if m[0] > t]
+        if len(mshrs) >= self.n_mshr:
+            # wait for an MSHR to be free
+            t = min(m[0] for m in mshrs)
+        # one refill per set at a time
+        for m in mshrs:
+            if (m[1] ^ line) & (self.n_sets - 1) == 0:
+                t = max(t, m[0])
+        mshrs[:] = [m for m in mshrs if m[0] > t]
+        end = self._read_channel(t + 1, line)
+        mshrs.append([end, line])
+        self.inflight[line] = end
+        self.fills.append([end - REFILL_CYCLES - self.line_beats + 1, end])
+        way = self._victim(s)
+        self._insert(s, way)
+        self._fill(s, way, tag, False)
+        self._touch(s, way)
+        return t, end + 1
@@ -0,0 +1,339 @@
+# SPDX-FileCopyrightText: 2026 IObundle
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+"""Design-space sweeps of IOb-cache over address traces.
+
+The sweep evaluates every combination of the swept parameters and reports the
+miss ratio and the estimated back-end traffic of each configuration. Traces are
+streamed in chunks, so they do not need to fit in memory.
+
+Configurations are grouped so that each trace pass evaluates as many of them
+as possible:
+
+* The back-end data width does not change the hits and misses, only the
+  traffic estimate, so all widths share one pass.
+* Write-back (write-allocate) LRU caches are stack algorithms: a single
+  stack-distance pass (Mattson et al.) per set count and line size gives the
+  misses and dirty write-backs of every number of ways at once.
+* The other configurations (write-through caches, which do not allocate on
+  write misses, and pseudo-LRU policies) are replayed through CacheModel.
+
+The passes run in parallel in a process pool.
+
+Back-end traffic is counted in bus bytes: each line refill and write-back
+transfers a line, and each write-through store one back-end word.
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .model import LRU, CacheModel, get_confs, parse_py_params
+from .trace import CHUNK_SIZE, iter_trace
+
+# swept parameters (iob_cache.py py_params and confs) and their defaults
+SWEEP_PARAMS = {
+    "be_data_w": [32],
+    "nways_w": [1],
+    "rep_policy": [LRU],
+    "write_pol": [0],
+    "set_index_w": [7],
+    "word_offset_w": [3],
+}
+
+COLUMNS = list(SWEEP_PARAMS) + [
+    "size_bytes",
+    "accesses",
+    "misses",
+    "miss_ratio",
+    "be_read_bytes",
+    "be_write_bytes",
+    "be_bytes",
+]
+
+
+def parse_values(text):
+    """Parse a list of values: "1,2,4" or an inclusive range "0:8"."""
+    values = []
+    for item in text.split(","):
+        if ":" in item:
+            lo, hi = item.split(":")
+            values += range(int(lo), int(hi) + 1)
+        else:
+            values.append(int(item))
+    return values
+
+
+def model_params(config, py_params=None):
+    """Return the CacheModel py_params and confs of a sweep configuration."""
+    py_params = dict(py_params or {})
+    py_params.update(
+        be_data_w=str(config["be_data_w"]),
+        nways_w=config["nways_w"],
+        write_pol=config["write_pol"],
+    )
+    confs = {
+        "REP_POLICY": config["rep_policy"],
+        "SET_INDEX_W": config["set_index_w"],
+        "WORD_OFFSET_W": config["word_offset_w"],
+    }
+    return py_params, confs
+
+
+def sweep_configs(grid, py_params=None):
+    """Yield the configurations of the grid (swept parameter -> values) that the cache supports."""
+    grid = {**SWEEP_PARAMS, **grid}
+    fe_data_w = get_confs(py_params)["FE_DATA_W"]
+    for values in itertools.product(*grid.values()):
+        config = dict(zip(grid, values))
+        if config["be_data_w"] > fe_data_w << config["word_offset_w"]:
+            # the line must hold at least one back-end word
+            continue
+        yield config
+
+
+class StackDistance:
+    """Single-pass LRU stack-distance analysis of the caches with a given number of sets and line size.
+
+    A request at stack distance d (the number of other lines of its set used
+    since its previous use) hits in the LRU caches with more than d ways. A
+    line is dirty in the write-allocate caches with more than "clean" ways,
+    where clean is 0 after a write and grows to the stack distance of each
+    read. A line at distance d (at its next request or at the end of the trace)
+    was evicted dirty from the caches with clean < ways <= d.
+    """
+
+    def __init__(self, set_index_w, word_offset_w, fe_data_w, max_ways):
+        self.set_mask = (1 << set_index_w) - 1
+        self.line_shift = (fe_data_w // 8).bit_length() - 1 + word_offset_w
+        self.max_ways = max_ways
+        # per set: lines from the most to the least recently used
+        self.stacks = [[] for _ in range(1 << set_index_w)]
+        # lines dirty in some cache (clean < max_ways)
+        self.clean = {}
+        # distance histograms (max_ways: not in any cache) and write-back
+        # counts per number of ways (difference array)
+        self.read_hist = np.zeros(max_ways + 1, dtype=np.int64)
+        self.write_hist = np.zeros(max_ways + 1, dtype=np.int64)
+        self.wb_diff = np.zeros(max_ways + 2, dtype=np.int64)
+
+    def run(self, addr, we):
+        addr = np.asarray(addr, dtype=np.uint64)
+        line = (addr >> np.uint64(self.line_shift)).astype(np.int64)
+        we = np.asarray(we, dtype=bool)
+        if not len(line):
+            return
+        # consecutive requests to the same line hit in every cache: each run is
+        # looked up once, with the writes of the whole run
+        first = np.ones(len(line), dtype=bool)
+        first[1:] = line[1:] != line[:-1]
+        starts = np.flatnonzero(first)
+        run_we = np.logical_or.reduceat(we, starts)
+        self.read_hist[0] += np.count_nonzero(~first & ~we)
+        self.write_hist[0] += np.count_nonzero(~first & we)
+
+        max_ways = self.max_ways
+        stacks = self.stacks
+        set_mask = self.set_mask
+        clean = self.clean
+        dist = []
+        wb_lo = []
+        wb_hi = []
+        for ln, w in zip(line[starts].tolist(), run_we.tolist()):
+            stack = stacks[ln & set_mask]
+            if ln in stack:
+                d = stack.index(ln)
+                del stack[d]
+            else:
+                d = max_ways
+                if len(stack) == max_ways:
+                    stack.pop()
+            stack.insert(0, ln)
+            dist.append(d)
+            c = clean.pop(ln, max_ways)
+            if c < d:
+                wb_lo.append(c + 1)
+                wb_hi.append(d + 1)
+            if w:
+                clean[ln] = 0
+            elif c < max_ways and d < max_ways:
+                clean[ln] = max(c, d)
+
+        dist = np.array(dist, dtype=np.int64)
+        first_we = we[starts]
+        self.read_hist += np.bincount(dist[~first_we], minlength=max_ways + 1)
+        self.write_hist += np.bincount(dist[first_we], minlength=max_ways + 1)
+        self.wb_diff += np.bincount(wb_lo, minlength=max_ways + 2)
+        self.wb_diff -= np.bincount(wb_hi, minlength=max_ways + 2)
+
+    def results(self, ways):
+        """Return the read misses, write misses and dirty write-backs of the cache with the given number of ways."""
+        read_misses = int(self.read_hist[ways:].sum())
+        write_misses = int(self.write_hist[ways:].sum())
+        writebacks = int(self.wb_diff[: ways + 1].sum())
+        # dirty lines evicted since their last request
+        depth = {ln: d for stack in self.stacks for d, ln in enumerate(stack)}
+        for ln, c in self.clean.items():
+            if c < ways <= depth.get(ln, self.max_ways):
+                writebacks += 1
+        return read_misses, write_misses, writebacks
+
+
+def _row(config, fe_data_w, reads, writes, read_misses, write_misses, writebacks):
+    line_bytes = (fe_data_w // 8) << config["word_offset_w"]
+    size = line_bytes << (config["set_index_w"] + config["nways_w"])
+    misses = read_misses + write_misses
+    accesses = reads + writes
+    if config["write_pol"]:
+        read_bytes = misses * line_bytes
+        write_bytes = writebacks * line_bytes
+    else:
+        read_bytes = read_misses * line_bytes
+        write_bytes = writes * config["be_data_w"] // 8
+    return {
+        **config,
+        "size_bytes": size,
+        "accesses": accesses,
+        "misses": misses,
+        "miss_ratio": misses / accesses if accesses else 0.0,
+        "be_read_bytes": read_bytes,
+        "be_write_bytes": write_bytes,
+        "be_bytes": read_bytes + write_bytes,
+    }
+
+
+def _stack_pass(trace, chunk_size, configs, fe_data_w):
+    """Evaluate write-back LRU configurations with the same sets and line size in one stack-distance pass."""
+    max_ways = 1 << max(c["nways_w"] for c in configs)
+    sd = StackDistance(
+        configs[0]["set_index_w"], configs[0]["word_offset_w"], fe_data_w, max_ways
+    )
+    reads = writes = 0
+    for addr, we in iter_trace(trace, chunk_size):
+        sd.run(addr, we)
+        writes += int(np.count_nonzero(we))
+        reads += len(we) - int(np.count_nonzero(we))
+    return [
+        _row(c, fe_data_w, reads, writes, *sd.results(1 << c["nways_w"]))
+        for c in configs
+    ]
+
+
+def _model_pass(trace, chunk_size, configs, py_params, fe_data_w):
+    """Evaluate configurations that only differ in the back-end data width by replaying the trace through CacheModel."""
+    model = CacheModel(*model_params(configs[0], py_params))
+    for addr, we in iter_trace(trace, chunk_size):
+        stats = model.run(addr, we)
+    stats = model.stats
+    return [
+        _row(
+            c,
+            fe_data_w,
+            stats.reads,
+            stats.writes,
+            stats.read_misses,
+            stats.write_misses,
+            stats.writebacks,
+        )
+        for c in configs
+    ]
+
+
+def sweep(trace, grid, py_params=None, jobs=None, chunk_size=CHUNK_SIZE):
+    """Sweep the configurations of the grid over a trace file and return a result row per configuration."""
+    confs = get_confs(py_params)
+    fe_data_w = confs["FE_DATA_W"]
+    # stack-distance passes are exact for plain write-back LRU caches
+    plain = not (confs["N_VICTIM"] or confs["PREFETCH"] or confs["N_MSHR"])
+    stack_groups = defaultdict(list)
+    model_groups = defaultdict(list)
+    for config in sweep_configs(grid, py_params):
+        # the replacement policy of a direct-mapped cache does not matter
+        policy = config["rep_policy"] if config["nways_w"] else LRU
+        if plain and config["write_pol"] and policy == LRU:
+            stack_groups[(config["set_index_w"], config["word_offset_w"])].append(config)
+        else:
+            key = (policy,) + tuple(
+                config[p] for p in ("write_pol", "nways_w", "set_index_w", "word_offset_w")
+            )
+            model_groups[key].append(config)
+
+    tasks = [
+        (_stack_pass, trace, chunk_size, g, fe_data_w) for g in stack_groups.values()
+    ]
+    tasks += [
+        (_model_pass, trace, chunk_size, g, py_params, fe_data_w)
+        for g in model_groups.values()
+    ]
+    if jobs == 1:
+        results = [task[0](*task[1:]) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(*task) for task in tasks]
+            results = [f.result() for f in futures]
+    rows = [row for rows in results for row in rows]
+    rows.sort(key=lambda row: [row[p] for p in SWEEP_PARAMS])
+    return rows
+
+
+def format_table(rows):
+    """Format result rows as an aligned text table."""
+    cells = [COLUMNS] + [
+        [f"{row[c]:.6f}" if isinstance(row[c], float) else str(row[c]) for c in COLUMNS]
+        for row in rows
+    ]
+    widths = [max(len(line[i]) for line in cells) for i in range(len(COLUMNS))]
+    return "\n".join(
+        " ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in cells
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m iob_cache_model.sweep",
+        description="Sweep IOb-cache configurations over an address trace and report "
+        "their miss ratio and back-end traffic.",
+    )
+    parser.add_argument(
+        "trace", help="trace file (.bin, .npz, or text, optionally .gz/.bz2/.xz)"
+    )
+    for name, default in SWEEP_PARAMS.items():
+        parser.add_argument(
+            f"--{name}",
+            type=parse_values,
+            default=default,
+            help=f"values to sweep, e.g. 1,2,4 or 0:8 (default: {','.join(map(str, default))})",
+        )
+    parser.add_argument(
+        "--py_params", default="", help="other cache python parameters (name=value:...)"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=os.cpu_count(), help="number of worker processes"
+    )
+    parser.add_argument(
+        "--chunk", type=int, default=CHUNK_SIZE, help="requests per trace chunk"
+    )
+    parser.add_argument("--csv", help="also write the results to a CSV file")
+    args = parser.parse_args()
+
+    grid = {name: getattr(args, name) for name in SWEEP_PARAMS}
+    rows = sweep(args.trace, grid, parse_py_params(args.py_params), args.jobs, args.chunk)
+    print(format_table(rows))
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    if not rows:
+        print("No valid configuration in the sweep", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
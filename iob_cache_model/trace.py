@@ -0,0 +1,107 @@
+# SPDX-FileCopyrightText: 2026 IObundle
+#
+# SPDX-License-Identifier: GPL-3.0-only
+
+"""Address trace readers.
+
+A trace is a pair of NumPy arrays: the byte addresses and the write flags of
+the front-end requests, in request order. Text traces have one request per
+line, "<op> <address>", where op is r/R or 0 (read), 2 (instruction fetch,
+read) or w/W or 1 (write), and the address is in hexadecimal (Dinero din
+format). Lines starting with # are comments. Text traces may be compressed
+(.gz, .bz2 or .xz). NumPy traces (.npz) hold the "addr" and "we" arrays.
+Binary traces (.bin) are raw TRACE_DTYPE records, which are memory-mapped,
+so that traces larger than the memory can be streamed quickly.
+"""
+
+import bz2
+import gzip
+import lzma
+
+import numpy as np
+
+READ_OPS = {"r", "R", "0", "2"}
+WRITE_OPS = {"w", "W", "1"}
+
+# binary trace record: little-endian byte address and write flag
+TRACE_DTYPE = np.dtype([("addr", "<u8"), ("we", "u1")])
+
+# requests per chunk when streaming a trace
+CHUNK_SIZE = 1 << 20
+
+OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+
+def iter_trace(path, chunk_size=CHUNK_SIZE):
+    """Stream a trace file as (addr, we) chunks of up to chunk_size requests."""
+    if path.endswith(".bin"):
+        records = np.memmap(path, dtype=TRACE_DTYPE, mode="r")
+        for i in range(0, len(records), chunk_size):
+            chunk = records[i : i + chunk_size]
+            yield chunk["addr"].astype(np.uint64), chunk["we"].astype(bool)
+        return
+
+    if path.endswith(".npz"):
+        with np.load(path) as npz:
+            addr = np.asarray(npz["addr"], dtype=np.uint64)
+            we = np.asarray(npz["we"], dtype=bool)
+        if addr.shape != we.shape:
+            raise ValueError(f"{path}: addr and we arrays differ in length")
+        for i in range(0, len(addr), chunk_size):
+            yield addr[i : i + chunk_size], we[i : i + chunk_size]
+        return
+
+    opener = OPENERS.get(path[path.rfind(".") :], open)
+    addr = []
+    we = []
+    with opener(path, "rt") as f:
+        for n, text in enumerate(f, 1):
+            fields = text.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            op = fields[0]
+            if op in READ_OPS:
+                we.append(False)
+            elif op in WRITE_OPS:
+                we.append(True)
+            else:
+                raise ValueError(f"{path}:{n}: unknown operation '{op}'")
+            addr.append(int(fields[1], 16))
+            if len(addr) == chunk_size:
+                yield np.array(addr, dtype=np.uint64), np.array(we, dtype=bool)
+                addr = []
+                we = []
+    if addr:
+        yield np.array(addr, dtype=np.uint64), np.array(we, dtype=bool)
+
+
+def load_trace(path):
+    """Read a whole trace file into (addr, we) arrays."""
+    chunks = list(iter_trace(path))
+    if not chunks:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=bool)
+    return np.concatenate([c[0] for c in chunks]), np.concatenate([c[1] for c in chunks])
+
+
+def _records(addr, we):
+    records = np.empty(len(addr), dtype=TRACE_DTYPE)
+    records["addr"] = addr
+    records["we"] = we
+    return records
+
+
+def save_trace(path, addr, we):
+    """Write (addr, we) arrays to a .npz or .bin trace, which load much faster than text."""
+    addr = np.asarray(addr, dtype=np.uint64)
+    we = np.asarray(we, dtype=bool)
+    if path.endswith(".bin"):
+        _records(addr, we).tofile(path)
+    else:
+        np.savez_compressed(path, addr=addr, we=we)
+
+
+def convert_trace(src, dst, chunk_size=CHUNK_SIZE):
+    """Convert a trace of any format to a binary (.bin) trace, chunk by chunk."""
+    with open(dst, "wb") as f:
+        for addr, we in iter_trace(src, chunk_size):
+            _records(addr, we).tofile(f)
@@ -15,6 +15,32 @@ void IOB_CACHE_SET_RST_CNTRS(uint8_t value) { return; }
 
 void IOB_CACHE_SET_INVALIDATE(uint8_t value) { return; }
 
+void IOB_CACHE_SET_PF_EN(uint8_t value) { return; }
+
+void IOB_CACHE_SET_LAT_HIST_SEL(uint8_t value) { return; }
+
+void IOB_CACHE_SET_LAT_HIST_CLR(uint8_t value) { return; }
+
+void IOB_CACHE_SET_MAINT_ADDR(uint32_t value) { return; }
+
+void IOB_CACHE_SET_MAINT_LEN(uint32_t value) { return; }
+
+void IOB_CACHE_SET_MAINT_CMD(uint8_t value) { return; }
+
+void IOB_CACHE_SET_LINE_CLEAN(uint32_t value) { return; }
+
+void IOB_CACHE_SET_LINE_INVAL(uint32_t value) { return; }
+
+void IOB_CACHE_SET_LINE_CLEAN_INVAL(uint32_t value) { return; }
+
+void IOB_CACHE_SET_LOCK_MASK(uint32_t value) { return; }
+
+void IOB_CACHE_SET_SPM_BASE(uint32_t value) { return; }
+
+void IOB_CACHE_SET_SPM_WAYS(uint8_t value) { return; }
+
+void IOB_CACHE_SET_REP_SEL(uint8_t value) { return; }
+
 // Core Getters
 uint8_t IOB_CACHE_GET_WTB_EMPTY() { return 1; }
 
@@ -32,4 +58,42 @@ uint32_t IOB_CACHE_GET_WRITE_HIT() { return 0; }
 
 uint32_t IOB_CACHE_GET_WRITE_MISS() { return 0; }
 
+uint8_t IOB_CACHE_GET_PF_EN() { return 0; }
+
+uint32_t IOB_CACHE_GET_PF_USEFUL() { return 0; }
+
+uint32_t IOB_CACHE_GET_PF_USELESS() { return 0; }
+
+uint32_t IOB_CACHE_GET_CYCLE_CNT() { return 0; }
+
+uint32_t IOB_CACHE_GET_STALL_MISS() { return 0; }
+
+uint32_t IOB_CACHE_GET_STALL_RAW() { return 0; }
+
+uint32_t IOB_CACHE_GET_STALL_WTB() { return 0; }
+
+uint32_t IOB_CACHE_GET_STALL_FLUSH() { return 0; }
+
+uint32_t IOB_CACHE_GET_BE_READ_BEATS() { return 0; }
+
+uint32_t IOB_CACHE_GET_BE_WRITE_BEATS() { return 0; }
+
+uint32_t IOB_CACHE_GET_DIRTY_EVICT() { return 0; }
+
+uint32_t IOB_CACHE_GET_WTB_LEVEL_SUM() { return 0; }
+
+uint32_t IOB_CACHE_GET_LAT_HIST_BIN() { return 0; }
+
+uint8_t IOB_CACHE_GET_MAINT_BUSY() { return 0; }
+
+uint32_t IOB_CACHE_GET_LOCK_MASK() { return 0; }
+
+uint32_t IOB_CACHE_GET_SPM_BASE() { return 0; }
+
+uint8_t IOB_CACHE_GET_SPM_WAYS() { return 0; }
+
+uint8_t IOB_CACHE_GET_REP_SEL() { return 2; }
+
+uint16_t IOB_CACHE_GET_REP_PSEL() { return 0; }
+
 uint16_t IOB_CACHE_GET_VERSION() { return 0x0010; }
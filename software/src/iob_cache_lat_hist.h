@@ -0,0 +1,47 @@
+/*
+ * SPDX-FileCopyrightText: 2026 IObundle
+ *
+ * SPDX-License-Identifier: GPL-3.0-only
+ */
+
+/* Latency histograms of the cache controller (LAT_HIST_BINS > 0) */
+#ifndef H_IOB_CACHE_LAT_HIST_H
+#define H_IOB_CACHE_LAT_HIST_H
+
+#include "iob_cache_csrs.h"
+
+#include <stdint.h>
+#include <stdio.h>
+
+// LAT_HIST_SEL bit selecting the back-end write histogram
+#define IOB_CACHE_LAT_HIST_WRITE (0x80)
+
+// read bin of the line refill (write = 0) or back-end write (write = 1)
+// histogram
+static inline uint32_t iob_cache_lat_hist_bin(int write, uint32_t bin) {
+  iob_cache_csrs_set_LAT_HIST_SEL((write ? IOB_CACHE_LAT_HIST_WRITE : 0) |
+                                  bin);
+  return iob_cache_csrs_get_LAT_HIST_BIN();
+}
+
+static inline void iob_cache_lat_hist_clear() {
+  iob_cache_csrs_set_LAT_HIST_CLR(1);
+}
+
+// print the nbins bins of both histograms; bin b counts latencies from 2**b
+// to 2**(b+1)-1 clock cycles (bin 0 from 0, last bin to infinity)
+static inline void iob_cache_lat_hist_dump(uint32_t nbins) {
+  uint32_t b;
+  printf("\tLatency Histograms (cycles: refills writes):\n");
+  for (b = 0; b < nbins; b++) {
+    if (b + 1 < nbins) {
+      printf("\t\t%u-%u:", b ? 1u << b : 0, (2u << b) - 1);
+    } else {
+      printf("\t\t%u+:", b ? 1u << b : 0);
+    }
+    printf(" %u %u\n", iob_cache_lat_hist_bin(0, b),
+           iob_cache_lat_hist_bin(1, b));
+  }
+}
+
+#endif // H_IOB_CACHE_LAT_HIST_H
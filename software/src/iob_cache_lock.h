@@ -0,0 +1,34 @@
+/*
+ * SPDX-FileCopyrightText: 2026 IObundle
+ *
+ * SPDX-License-Identifier: GPL-3.0-only
+ */
+
+/* Way lockdown of the cache controller (WAY_LOCK = 1) */
+#ifndef H_IOB_CACHE_LOCK_H
+#define H_IOB_CACHE_LOCK_H
+
+#include "iob_cache_csrs.h"
+#include "iob_cache_maint.h"
+
+#include <stdint.h>
+
+// lock the ways set in mask (bit w locks way w); locked ways are not replaced
+static inline void iob_cache_lock_ways(uint32_t mask) {
+  iob_cache_csrs_set_LOCK_MASK(mask);
+}
+
+static inline uint32_t iob_cache_locked_ways() {
+  return iob_cache_csrs_get_LOCK_MASK();
+}
+
+// lock the ways set in mask and refill the lines of len bytes from addr that
+// are not in the cache into them (MAINT = 1); lines already in the cache are
+// not moved, so the range may be invalidated first
+static inline void iob_cache_lock_preload(uint32_t mask, uint32_t addr,
+                                          uint32_t len) {
+  iob_cache_lock_ways(mask);
+  iob_cache_maint(IOB_CACHE_MAINT_PRELOAD, addr, len);
+}
+
+#endif // H_IOB_CACHE_LOCK_H
@@ -0,0 +1,60 @@
+/*
+ * SPDX-FileCopyrightText: 2026 IObundle
+ *
+ * SPDX-License-Identifier: GPL-3.0-only
+ */
+
+/* Address-range and single-line maintenance operations of the cache controller
+ * (MAINT = 1) */
+#ifndef H_IOB_CACHE_MAINT_H
+#define H_IOB_CACHE_MAINT_H
+
+#include "iob_cache_csrs.h"
+
+#include <stdint.h>
+
+// MAINT_CMD operations
+#define IOB_CACHE_MAINT_CLEAN (1)
+#define IOB_CACHE_MAINT_INVAL (2)
+#define IOB_CACHE_MAINT_CLEAN_INVAL (3)
+#define IOB_CACHE_MAINT_PRELOAD (4)
+
+// start an operation on the lines of len bytes from addr
+static inline void iob_cache_maint_start(uint8_t cmd, uint32_t addr,
+                                         uint32_t len) {
+  iob_cache_csrs_set_MAINT_ADDR(addr);
+  iob_cache_csrs_set_MAINT_LEN(len);
+  iob_cache_csrs_set_MAINT_CMD(cmd);
+}
+
+// wait for the operation and its back-end writes to complete
+static inline void iob_cache_maint_wait() {
+  while (iob_cache_csrs_get_MAINT_BUSY())
+    ;
+}
+
+static inline void iob_cache_maint(uint8_t cmd, uint32_t addr, uint32_t len) {
+  iob_cache_maint_start(cmd, addr, len);
+  iob_cache_maint_wait();
+}
+
+// single-line operations on the line holding addr
+static inline void iob_cache_line_clean(uint32_t addr) {
+  iob_cache_maint_wait();
+  iob_cache_csrs_set_LINE_CLEAN(addr);
+  iob_cache_maint_wait();
+}
+
+static inline void iob_cache_line_inval(uint32_t addr) {
+  iob_cache_maint_wait();
+  iob_cache_csrs_set_LINE_INVAL(addr);
+  iob_cache_maint_wait();
+}
+
+static inline void iob_cache_line_clean_inval(uint32_t addr) {
+  iob_cache_maint_wait();
+  iob_cache_csrs_set_LINE_CLEAN_INVAL(addr);
+  iob_cache_maint_wait();
+}
+
+#endif // H_IOB_CACHE_MAINT_H
@@ -0,0 +1,33 @@
+/*
+ * SPDX-FileCopyrightText: 2026 IObundle
+ *
+ * SPDX-License-Identifier: GPL-3.0-only
+ */
+
+/* Runtime-selectable replacement policy (REP_DUEL = 1) */
+#ifndef H_IOB_CACHE_REP_H
+#define H_IOB_CACHE_REP_H
+
+#include "iob_cache_csrs.h"
+
+#include <stdint.h>
+
+// REP_SEL values
+#define IOB_CACHE_REP_MAIN 0 // REP_POLICY
+#define IOB_CACHE_REP_ALT 1  // REP_POLICY_ALT
+#define IOB_CACHE_REP_DUEL 2 // set-dueling (reset value)
+
+static inline void iob_cache_rep_select(uint8_t sel) {
+  iob_cache_csrs_set_REP_SEL(sel);
+}
+
+static inline uint8_t iob_cache_rep_selected() {
+  return iob_cache_csrs_get_REP_SEL();
+}
+
+// set-dueling selector: the follower sets use REP_POLICY_ALT from 512 on
+static inline uint16_t iob_cache_rep_psel() {
+  return iob_cache_csrs_get_REP_PSEL();
+}
+
+#endif // H_IOB_CACHE_REP_H
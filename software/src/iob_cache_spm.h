@@ -0,0 +1,35 @@
+/*
+ * SPDX-FileCopyrightText: 2026 IObundle
+ *
+ * SPDX-License-Identifier: GPL-3.0-only
+ */
+
+/* Scratchpad mode of the cache controller (SPM = 1) */
+#ifndef H_IOB_CACHE_SPM_H
+#define H_IOB_CACHE_SPM_H
+
+#include "iob_cache_csrs.h"
+#include "iob_cache_csrs_conf.h"
+
+#include <stdint.h>
+
+// bytes held by one way (scratchpad window granule)
+#define IOB_CACHE_SPM_WAY_SIZE                                                 \
+  ((1 << (IOB_CACHE_CSRS_SET_INDEX_W + IOB_CACHE_CSRS_WORD_OFFSET_W)) *        \
+   (IOB_CACHE_CSRS_FE_DATA_W / 8))
+
+// map nways ways to the scratchpad window at base (aligned to the way size);
+// the lines cached in them are discarded, so dirty lines must be cleaned first
+static inline void iob_cache_spm_enable(uint32_t base, uint32_t nways) {
+  iob_cache_csrs_set_SPM_BASE(base);
+  iob_cache_csrs_set_SPM_WAYS(nways);
+}
+
+// give the scratchpad ways back to the cache (their data is lost)
+static inline void iob_cache_spm_disable() { iob_cache_csrs_set_SPM_WAYS(0); }
+
+static inline uint32_t iob_cache_spm_size() {
+  return iob_cache_csrs_get_SPM_WAYS() * IOB_CACHE_SPM_WAY_SIZE;
+}
+
+#endif // H_IOB_CACHE_SPM_H
@@ -6,9 +6,15 @@
 
 #include "iob_cache_csrs.h"
 #include "iob_cache_csrs_conf.h"
+#include "iob_cache_lat_hist.h"
+#include "iob_cache_lock.h"
+#include "iob_cache_maint.h"
+#include "iob_cache_rep.h"
+#include "iob_cache_spm.h"
 
 #include <stdint.h>
 #include <stdio.h>
+#include <stdlib.h>
 
 #define USE_CTRL (1)
 #define DATA_W (IOB_CACHE_CSRS_FE_DATA_W)
@@ -16,6 +22,17 @@
 #define CACHE_DATA_ADDR_W (IOB_CACHE_CSRS_FE_ADDR_W)
 // address control after data addressing
 #define CACHE_CTRL_BASE (1 << (CACHE_DATA_ADDR_W))
+// results of wrapper stream n (4 words each), stored in the upper half of the
+// data address space before the testbench starts
+#define WRAPPER_MBOX(n) ((1 << (CACHE_DATA_ADDR_W - 1)) + (n) * 4 * (DATA_W / 8))
+// clock cycles from the last request of the throughput stream to its data
+#define THROUGHPUT_FILL (1)
+// port 0 words loaded by the bank stream, in pairs from different banks
+#define BANK_WORDS (4 << IOB_CACHE_CSRS_WORD_OFFSET_W)
+// words loaded by each cache in the instruction fetch stream
+#define IFETCH_WORDS (16 << IOB_CACHE_CSRS_WORD_OFFSET_W)
+// words loaded by each port in the multi-port stream
+#define PORTS_WORDS (4 << IOB_CACHE_CSRS_WORD_OFFSET_W)
 
 static inline void use_ctrl() { iob_cache_csrs_init_baseaddr(CACHE_CTRL_BASE); }
 
@@ -130,6 +147,248 @@ int lru_test(uint32_t nways_w, uint32_t set_index_w, uint32_t word_offset_w) {
   return 0;
 }
 
+// runtime-selectable replacement policy: conflict misses in one set with each
+// selection, ending with set-dueling
+int rep_test(uint32_t nways_w, uint32_t set_index_w, uint32_t word_offset_w) {
+  uint32_t i = 0;
+  uint32_t sel = 0;
+  uint32_t failed = 0;
+  uint32_t rdata = 0;
+  uint32_t nways = (1 << nways_w);
+  uint32_t addr_step = ((1 << (set_index_w + word_offset_w)) * (DATA_W / 8));
+  uint8_t sels[3] = {IOB_CACHE_REP_ALT, IOB_CACHE_REP_MAIN, IOB_CACHE_REP_DUEL};
+
+  printf("REP Test\n");
+  for (sel = 0; sel < 3; sel++) {
+    use_ctrl();
+    iob_cache_rep_select(sels[sel]);
+    if (iob_cache_rep_selected() != sels[sel]) {
+      failed++;
+      printf("REP TEST ERROR: policy %d not selected\n", sels[sel]);
+    }
+    for (i = 0; i < 2 * nways; i++) {
+      iob_write(i * addr_step, DATA_W, 0xEE00 + sel * 0x100 + i);
+    }
+    for (i = 0; i < 2 * nways; i++) {
+      rdata = iob_read(i * addr_step, DATA_W);
+      if (rdata != 0xEE00 + sel * 0x100 + i) {
+        failed++;
+        printf("REP TEST ERROR at address %d: got 0x%x, expected 0x%x\n",
+               i * addr_step, rdata, 0xEE00 + sel * 0x100 + i);
+      }
+    }
+  }
+  printf("\tPolicy selector: %d\n", iob_cache_rep_psel());
+  return failed;
+}
+
+// xorshift32 pseudo-random generator
+static uint32_t cosim_state = 1;
+
+static uint32_t cosim_rand() {
+  cosim_state ^= cosim_state << 13;
+  cosim_state ^= cosim_state >> 17;
+  cosim_state ^= cosim_state << 5;
+  return cosim_state;
+}
+
+// random stream of n accesses, checked against a shadow memory: sequential
+// runs, reuse of recent addresses and random addresses, 30% writes
+int cosim_random_test(uint32_t n, uint32_t seed) {
+  uint32_t failed = 0;
+  uint32_t words = 1 << (IOB_CACHE_CSRS_NWAYS_W + IOB_CACHE_CSRS_SET_INDEX_W +
+                         IOB_CACHE_CSRS_WORD_OFFSET_W + 2);
+  uint32_t *shadow = NULL;
+  uint32_t *valid = NULL;
+  uint32_t word = 0;
+  uint32_t rdata = 0;
+  uint32_t i;
+
+  // span 4x the cache capacity, within the front-end address space
+  if (words > (1 << 16)) {
+    words = 1 << 16;
+  }
+  if (words > (1 << (CACHE_DATA_ADDR_W - FE_NBYTES_W))) {
+    words = 1 << (CACHE_DATA_ADDR_W - FE_NBYTES_W);
+  }
+  shadow = (uint32_t *)malloc(words * sizeof(uint32_t));
+  valid = (uint32_t *)calloc(words, sizeof(uint32_t));
+  if (shadow == NULL || valid == NULL) {
+    printf("COSIM TEST ERROR: out of memory\n");
+    return 1;
+  }
+
+  cosim_state = seed ? seed : 1;
+  for (i = 0; i < n; i++) {
+    uint32_t r = cosim_rand();
+    if ((r & 3) == 0) {
+      word = cosim_rand() % words; // random
+    } else if ((r & 3) == 1) {
+      word = (word + (cosim_rand() & 15)) % words; // reuse
+    } else {
+      word = (word + 1) % words; // sequential
+    }
+    if ((cosim_rand() % 10) < 3) {
+      shadow[word] = cosim_rand();
+      valid[word] = 1;
+      iob_write(word << FE_NBYTES_W, DATA_W, shadow[word]);
+    } else {
+      rdata = iob_read(word << FE_NBYTES_W, DATA_W);
+      if (valid[word] && rdata != shadow[word]) {
+        failed++;
+        printf("COSIM TEST ERROR at address %x: got 0x%x, expected 0x%x\n",
+               word << FE_NBYTES_W, rdata, shadow[word]);
+      }
+    }
+  }
+  free(shadow);
+  free(valid);
+  return failed;
+}
+
+// replay a dinero trace ("<label> <hex address>"; label 1 is a write)
+int cosim_trace_test(const char *path) {
+  FILE *fp = fopen(path, "r");
+  char line[128];
+  uint32_t label = 0;
+  uint32_t addr = 0;
+  uint32_t mask = (1 << CACHE_DATA_ADDR_W) - (1 << FE_NBYTES_W);
+
+  if (fp == NULL) {
+    printf("COSIM TEST ERROR: cannot open trace %s\n", path);
+    return 1;
+  }
+  while (fgets(line, sizeof(line), fp) != NULL) {
+    if (sscanf(line, "%u %x", &label, &addr) != 2) {
+      continue;
+    }
+    if (label == 1) {
+      iob_write(addr & mask, DATA_W, addr);
+    } else {
+      iob_read(addr & mask, DATA_W);
+    }
+  }
+  fclose(fp);
+  return 0;
+}
+
+// co-simulation streams: COSIM_N random accesses (seed COSIM_SEED) and the
+// COSIM_TRACE trace, if set; run only in the co-simulation configuration
+// (COSIM=1)
+int cosim_test() {
+  char *cosim = getenv("COSIM");
+  char *n = getenv("COSIM_N");
+  char *seed = getenv("COSIM_SEED");
+  char *trace = getenv("COSIM_TRACE");
+  int failed = 0;
+
+  if (cosim == NULL || strtoul(cosim, NULL, 0) == 0) {
+    return 0;
+  }
+
+  use_data();
+  printf("COSIM Test\n");
+  failed += cosim_random_test(n ? strtoul(n, NULL, 0) : 1000,
+                              seed ? strtoul(seed, NULL, 0) : 1);
+  if (trace != NULL && trace[0] != '\0') {
+    failed += cosim_trace_test(trace);
+  }
+  return failed;
+}
+
+// address-range maintenance: the lines cleaned and invalidated are read back
+// from the back-end memory
+int maint_test(uint32_t n) {
+  uint32_t i = 0;
+  uint32_t failed = 0;
+  uint32_t rdata = 0;
+  uint32_t base = 0x100;
+
+  printf("MAINT Test\n");
+  for (i = 0; i < n; i++) {
+    iob_write(base + i * 4, DATA_W, 0xC0DE0000 + i);
+  }
+  use_ctrl();
+  iob_cache_maint(IOB_CACHE_MAINT_CLEAN_INVAL, base, n * 4);
+  for (i = 0; i < n; i++) {
+    rdata = iob_read(base + i * 4, DATA_W);
+    if (rdata != 0xC0DE0000 + i) {
+      failed++;
+      printf("MAINT TEST ERROR at address %d: got 0x%x, expected 0x%x\n",
+             base + i * 4, rdata, 0xC0DE0000 + i);
+    }
+  }
+
+  // single line
+  iob_write(base, DATA_W, 0xFACE);
+  iob_cache_line_clean(base);
+  iob_cache_line_inval(base);
+  rdata = iob_read(base, DATA_W);
+  if (rdata != 0xFACE) {
+    failed++;
+    printf("MAINT TEST ERROR at address %d: got 0x%x, expected 0x%x\n", base,
+           rdata, 0xFACE);
+  }
+  return failed;
+}
+
+// way lockdown: lines preloaded into a locked way survive traffic to their set
+int lock_test(uint32_t set_index_w, uint32_t word_offset_w) {
+  uint32_t i = 0;
+  uint32_t failed = 0;
+  uint32_t rdata = 0;
+  uint32_t line = (1 << word_offset_w) * (DATA_W / 8);
+  uint32_t addr_step = (1 << set_index_w) * line;
+  uint32_t base = 0x200;
+
+  printf("LOCK Test\n");
+  for (i = 0; i < 4; i++) {
+    iob_write(base + i * line, DATA_W, 0x10C0 + i);
+  }
+  use_ctrl();
+  iob_cache_maint(IOB_CACHE_MAINT_CLEAN_INVAL, base, 4 * line);
+  iob_cache_lock_preload(1, base, 4 * line);
+  // read misses to the first set replace its unlocked ways only
+  for (i = 1; i <= 4; i++) {
+    rdata = iob_read(base + i * addr_step, DATA_W);
+  }
+  for (i = 0; i < 4; i++) {
+    rdata = iob_read(base + i * line, DATA_W);
+    if (rdata != 0x10C0 + i) {
+      failed++;
+      printf("LOCK TEST ERROR at address %d: got 0x%x, expected 0x%x\n",
+             base + i * line, rdata, 0x10C0 + i);
+    }
+  }
+  iob_cache_lock_ways(0);
+  return failed;
+}
+
+// scratchpad mode: one way mapped at a window that always hits
+int spm_test(uint32_t n) {
+  uint32_t i = 0;
+  uint32_t failed = 0;
+  uint32_t rdata = 0;
+  uint32_t base = IOB_CACHE_SPM_WAY_SIZE;
+
+  printf("SPM Test\n");
+  use_ctrl();
+  iob_cache_spm_enable(base, 1);
+  for (i = 0; i < n; i++) {
+    iob_write(base + i * 4, DATA_W, 0x5C0 + i);
+  }
+  for (i = 0; i < n; i++) {
+    rdata = iob_read(base + i * 4, DATA_W);
+    if (rdata != 0x5C0 + i) {
+      failed++;
+      printf("SPM TEST ERROR at address %d: got 0x%x, expected 0x%x\n",
+             base + i * 4, rdata, 0x5C0 + i);
+    }
+  }
+  iob_cache_spm_disable();
+  return failed;
+}
+
 void print_counters() {
   use_ctrl();
   printf("\tCache Counters:\n");
@@ -139,6 +398,20 @@ void print_counters() {
   printf("\tRead Miss:%d\n", iob_cache_csrs_get_READ_MISS());
   printf("\tWrite Hit:%d\n", iob_cache_csrs_get_WRITE_HIT());
   printf("\tWrite Miss:%d\n", iob_cache_csrs_get_WRITE_MISS());
+  printf("\tUseful Prefetches:%d\n", iob_cache_csrs_get_PF_USEFUL());
+  printf("\tUseless Prefetches:%d\n", iob_cache_csrs_get_PF_USELESS());
+  printf("\tCycles:%d\n", iob_cache_csrs_get_CYCLE_CNT());
+  printf("\tMiss Stalls:%d\n", iob_cache_csrs_get_STALL_MISS());
+  printf("\tRAW Stalls:%d\n", iob_cache_csrs_get_STALL_RAW());
+  printf("\tWrite Buffer Stalls:%d\n", iob_cache_csrs_get_STALL_WTB());
+  printf("\tWrite-back Stalls:%d\n", iob_cache_csrs_get_STALL_FLUSH());
+  printf("\tBack-end Read Beats:%d\n", iob_cache_csrs_get_BE_READ_BEATS());
+  printf("\tBack-end Write Beats:%d\n", iob_cache_csrs_get_BE_WRITE_BEATS());
+  printf("\tDirty Evictions:%d\n", iob_cache_csrs_get_DIRTY_EVICT());
+  printf("\tWrite Buffer Level Sum:%d\n", iob_cache_csrs_get_WTB_LEVEL_SUM());
+  if (IOB_CACHE_CSRS_LAT_HIST_BINS > 0) {
+    iob_cache_lat_hist_dump(IOB_CACHE_CSRS_LAT_HIST_BINS);
+  }
 }
 
 void wtb_status() {
@@ -153,6 +426,192 @@ void reset_counters() {
   iob_cache_csrs_set_RST_CNTRS(1);
 }
 
+// throughput stream of the simulation wrapper (TPUT=1): every access of the
+// stream hits, so the cache must accept one per clock cycle; the last load
+// data arrives THROUGHPUT_FILL clock cycles after the last request
+int throughput_test() {
+  char *tput = getenv("TPUT");
+  uint32_t failed = 0;
+  uint32_t mbox = WRAPPER_MBOX(0);
+  uint32_t expected = 8 << (IOB_CACHE_CSRS_SET_INDEX_W +
+                            IOB_CACHE_CSRS_WORD_OFFSET_W);
+  uint32_t accesses = 0;
+  uint32_t cycles = 0;
+  uint32_t errors = 0;
+
+  if (tput == NULL || strtoul(tput, NULL, 0) == 0) {
+    return 0;
+  }
+
+  printf("THROUGHPUT Test\n");
+  use_data();
+  accesses = iob_read(mbox, DATA_W);
+  cycles = iob_read(mbox + (DATA_W / 8), DATA_W);
+  errors = iob_read(mbox + 2 * (DATA_W / 8), DATA_W);
+  printf("\tAccesses:%d\n", accesses);
+  printf("\tCycles:%d\n", cycles);
+  if (accesses != expected) {
+    failed++;
+    printf("THROUGHPUT TEST ERROR: got %d accesses, expected %d\n", accesses,
+           expected);
+  }
+  if (errors != 0) {
+    failed++;
+    printf("THROUGHPUT TEST ERROR: %d load data errors\n", errors);
+  }
+  if (cycles != accesses + THROUGHPUT_FILL) {
+    failed++;
+    printf("THROUGHPUT TEST ERROR: %d cycles for %d accesses, expected %d\n",
+           cycles, accesses, accesses + THROUGHPUT_FILL);
+  }
+  return failed;
+}
+
+// bank stream of the simulation wrapper (NBANKS_W > 0): ports 0 and 1 load
+// BANK_WORDS pairs of words from different banks, which must both hit and
+// return their data in the same clock cycle, and BANK_WORDS pairs from the
+// same bank, served one after the other (a single bank if WORD_OFFSET_W = 0)
+int bank_test() {
+  uint32_t failed = 0;
+  uint32_t mbox = WRAPPER_MBOX(1);
+  uint32_t loads = 0;
+  uint32_t dual = 0;
+  uint32_t errors = 0;
+  uint32_t expected = IOB_CACHE_CSRS_WORD_OFFSET_W ? BANK_WORDS : 0;
+
+  if (!IOB_CACHE_CSRS_NBANKS_W) {
+    return 0;
+  }
+
+  printf("BANK Test\n");
+  use_data();
+  loads = iob_read(mbox, DATA_W);
+  dual = iob_read(mbox + (DATA_W / 8), DATA_W);
+  errors = iob_read(mbox + 2 * (DATA_W / 8), DATA_W);
+  printf("\tPort 1 loads:%d\n", loads);
+  printf("\tDual hits:%d\n", dual);
+  if (loads != 2 * BANK_WORDS) {
+    failed++;
+    printf("BANK TEST ERROR: got %d port 1 loads, expected %d\n", loads,
+           2 * BANK_WORDS);
+  }
+  if (dual != expected) {
+    failed++;
+    printf("BANK TEST ERROR: %d clock cycles with two hits, expected %d\n",
+           dual, expected);
+  }
+  if (errors != 0) {
+    failed++;
+    printf("BANK TEST ERROR: %d load data errors\n", errors);
+  }
+  return failed;
+}
+
+// instruction fetch stream of the simulation wrapper (HARVARD=1,
+// WRITE_POL=0): the data cache and the instruction cache load IFETCH_WORDS
+// words each at the same time, sharing the back-end read channel
+int ifetch_test() {
+  uint32_t failed = 0;
+  uint32_t mbox = WRAPPER_MBOX(2);
+  uint32_t loads = 0;
+  uint32_t fetches = 0;
+  uint32_t errors = 0;
+
+  if (!IOB_CACHE_CSRS_HARVARD || IOB_CACHE_CSRS_WRITE_POL) {
+    return 0;
+  }
+
+  printf("IFETCH Test\n");
+  use_data();
+  loads = iob_read(mbox, DATA_W);
+  fetches = iob_read(mbox + (DATA_W / 8), DATA_W);
+  errors = iob_read(mbox + 2 * (DATA_W / 8), DATA_W);
+  printf("\tData loads:%d\n", loads);
+  printf("\tInstruction fetches:%d\n", fetches);
+  if (loads != IFETCH_WORDS || fetches != IFETCH_WORDS) {
+    failed++;
+    printf("IFETCH TEST ERROR: got %d loads and %d fetches, expected %d\n",
+           loads, fetches, IFETCH_WORDS);
+  }
+  if (errors != 0) {
+    failed++;
+    printf("IFETCH TEST ERROR: %d load data errors\n", errors);
+  }
+  return failed;
+}
+
+// multi-port stream of the simulation wrapper (FE_PORTS > 1): all the ports
+// load PORTS_WORDS words each at the same time, and each must get its own
+// data; with round-robin arbitration, no port is granted twice in a row
+// while another one waits
+int ports_test() {
+  uint32_t failed = 0;
+  uint32_t mbox = WRAPPER_MBOX(3);
+  uint32_t loads = 0;
+  uint32_t unfair = 0;
+  uint32_t errors = 0;
+
+  if (IOB_CACHE_CSRS_FE_PORTS < 2) {
+    return 0;
+  }
+
+  printf("PORTS Test\n");
+  use_data();
+  loads = iob_read(mbox, DATA_W);
+  unfair = iob_read(mbox + (DATA_W / 8), DATA_W);
+  errors = iob_read(mbox + 2 * (DATA_W / 8), DATA_W);
+  printf("\tLoads:%d\n", loads);
+  printf("\tUnfair grants:%d\n", unfair);
+  if (loads != IOB_CACHE_CSRS_FE_PORTS * PORTS_WORDS) {
+    failed++;
+    printf("PORTS TEST ERROR: got %d loads, expected %d\n", loads,
+           IOB_CACHE_CSRS_FE_PORTS * PORTS_WORDS);
+  }
+  if (IOB_CACHE_CSRS_FE_ARB && unfair != 0) {
+    failed++;
+    printf("PORTS TEST ERROR: %d unfair round-robin grants\n", unfair);
+  }
+  if (errors != 0) {
+    failed++;
+    printf("PORTS TEST ERROR: %d load data errors\n", errors);
+  }
+  return failed;
+}
+
+// snoop stream of the simulation wrapper (SNOOP=1): the load right after the
+// snoop of a cached line must miss, and the loads of another cached line and
+// of the refilled line must hit
+int snoop_test() {
+  uint32_t failed = 0;
+  uint32_t mbox = WRAPPER_MBOX(4);
+  uint32_t misses = 0;
+  uint32_t hits = 0;
+  uint32_t errors = 0;
+
+  if (!IOB_CACHE_CSRS_SNOOP) {
+    return 0;
+  }
+
+  printf("SNOOP Test\n");
+  use_data();
+  misses = iob_read(mbox, DATA_W);
+  hits = iob_read(mbox + (DATA_W / 8), DATA_W);
+  errors = iob_read(mbox + 2 * (DATA_W / 8), DATA_W);
+  if (misses != 1) {
+    failed++;
+    printf("SNOOP TEST ERROR: the load of the snooped line hit\n");
+  }
+  if (hits != 2) {
+    failed++;
+    printf("SNOOP TEST ERROR: %d of the 2 loads of cached lines hit\n", hits);
+  }
+  if (errors != 0) {
+    failed++;
+    printf("SNOOP TEST ERROR: %d load data errors\n", errors);
+  }
+  return failed;
+}
+
 int ctrl_test() {
 
   printf("CTRL Test\n");
@@ -186,6 +645,13 @@ int iob_core_tb() {
   // init Cache Control
   iob_cache_csrs_init_baseaddr(CACHE_CTRL_BASE);
 
+  // first, before the other tests overwrite the results of the stream
+  failed += throughput_test();
+  failed += bank_test();
+  failed += ifetch_test();
+  failed += ports_test();
+  failed += snoop_test();
+
   // simple cache access test
   failed += simple_test(5);
 
@@ -195,6 +661,23 @@ int iob_core_tb() {
   failed += lru_test(IOB_CACHE_CSRS_NWAYS_W, IOB_CACHE_CSRS_SET_INDEX_W,
                      IOB_CACHE_CSRS_WORD_OFFSET_W);
 
+  failed += cosim_test();
+
+  if (IOB_CACHE_CSRS_MAINT) {
+    failed += maint_test(37);
+  }
+  if (IOB_CACHE_CSRS_WAY_LOCK && IOB_CACHE_CSRS_MAINT) {
+    failed +=
+        lock_test(IOB_CACHE_CSRS_SET_INDEX_W, IOB_CACHE_CSRS_WORD_OFFSET_W);
+  }
+  if (IOB_CACHE_CSRS_SPM) {
+    failed += spm_test(16);
+  }
+  if (IOB_CACHE_CSRS_REP_DUEL) {
+    failed += rep_test(IOB_CACHE_CSRS_NWAYS_W, IOB_CACHE_CSRS_SET_INDEX_W,
+                       IOB_CACHE_CSRS_WORD_OFFSET_W);
+  }
+
   failed += ctrl_test();
 
   printf("CACHE test complete.\n");